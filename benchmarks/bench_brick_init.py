@@ -0,0 +1,69 @@
+"""
+Brick 實例化成本 micro-benchmark
+
+比較舊版「每個實例掃描 dir(self)」與目前「類別層級 handler 表」的建構時間。
+
+用法:
+    python benchmarks/bench_brick_init.py [--number 20000]
+"""
+
+import argparse
+import timeit
+
+from llmbrick.bricks.llm.base_llm import LLMBrick
+from llmbrick.core.brick import (
+    _HANDLER_ATTRS,
+    BaseBrick,
+    get_service_info_handler,
+    output_streaming_handler,
+    unary_handler,
+)
+
+
+class _BenchLLMBrick(LLMBrick):
+    @unary_handler
+    async def unary(self, request):
+        return request
+
+    @output_streaming_handler
+    async def stream(self, request):
+        yield request
+
+    @get_service_info_handler
+    async def info(self):
+        return None
+
+
+def _legacy_discover(brick: BaseBrick) -> None:
+    """舊版 BaseBrick.__init__ 的 handler 掃描邏輯"""
+    for attr_name in dir(brick):
+        attr = getattr(brick, attr_name)
+        if callable(attr) and hasattr(attr, "_brick_handler_type"):
+            call_type = getattr(attr, "_brick_handler_type")
+            setattr(brick, _HANDLER_ATTRS[call_type], attr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    def cached() -> None:
+        _BenchLLMBrick(default_prompt="", verbose=False)
+
+    def legacy() -> None:
+        _legacy_discover(_BenchLLMBrick(default_prompt="", verbose=False))
+
+    t_cached = min(timeit.repeat(cached, number=args.number, repeat=3))
+    # legacy 也會先執行一次 cached 的建構，扣除後才是掃描本身的成本
+    t_legacy = min(timeit.repeat(legacy, number=args.number, repeat=3)) - t_cached
+
+    per_cached = t_cached / args.number * 1e6
+    per_legacy = (t_legacy + t_cached) / args.number * 1e6
+    print(f"class-level handler table : {per_cached:8.2f} us / instance")
+    print(f"per-instance dir() scan   : {per_legacy:8.2f} us / instance")
+    print(f"speedup                   : {per_legacy / per_cached:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
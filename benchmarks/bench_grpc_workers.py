@@ -0,0 +1,166 @@
+"""
+多行程 GrpcServer 吞吐量 benchmark
+
+以 CPU 密集的 GuardBrick (重複計算 sha256) 比較 workers=1,2,4... 的每秒請求數。
+負載由多個 client 行程產生，每個行程使用獨立的通道池 (各自一條 TCP 連線)，
+SO_REUSEPORT 依連線把負載分配到各 worker。吞吐量約與 min(workers, 核心數) 成正比。
+
+用法:
+    python benchmarks/bench_grpc_workers.py [--workers 1 2 4] [--clients 8]
+        [--duration 5] [--work 2000]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import subprocess
+import sys
+import time
+
+PORT = 50391
+
+
+def run_server(workers: int, work: int) -> None:
+    from llmbrick.bricks.guard.base_guard import GuardBrick
+    from llmbrick.core.brick import unary_handler
+    from llmbrick.protocols.models.bricks.guard_types import (
+        GuardRequest,
+        GuardResponse,
+        GuardResult,
+    )
+    from llmbrick.servers.grpc.config import GrpcServerConfig
+    from llmbrick.servers.grpc.server import GrpcServer
+
+    class HashGuard(GuardBrick):
+        @unary_handler
+        async def check(self, request: GuardRequest) -> GuardResponse:
+            digest = request.text.encode()
+            for _ in range(work):
+                digest = hashlib.sha256(digest).digest()
+            return GuardResponse(results=[GuardResult(detail=digest.hex())])
+
+    server = GrpcServer(
+        workers=workers, config=GrpcServerConfig(host="127.0.0.1", port=PORT)
+    )
+    server.register_service(HashGuard(verbose=False))
+    server.run()
+
+
+async def _client_loop(duration: float, concurrency: int) -> int:
+    from llmbrick.bricks.guard.base_guard import GuardBrick
+    from llmbrick.core.channel_pool import ChannelPool
+    from llmbrick.protocols.models.bricks.guard_types import GuardRequest
+
+    client = GuardBrick.toGrpcClient(
+        f"127.0.0.1:{PORT}", channel_pool=ChannelPool(), verbose=False
+    )
+    done = 0
+    deadline = time.monotonic() + duration
+
+    async def worker() -> None:
+        nonlocal done
+        while time.monotonic() < deadline:
+            await client.run_unary(GuardRequest(text="benchmark"))
+            done += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    await client.aclose()
+    return done
+
+
+def run_client(duration: float, concurrency: int) -> None:
+    print(asyncio.run(_client_loop(duration, concurrency)))
+
+
+async def _wait_ready(timeout: float = 15.0) -> None:
+    from llmbrick.bricks.guard.base_guard import GuardBrick
+    from llmbrick.core.channel_pool import ChannelPool
+    from llmbrick.protocols.models.bricks.guard_types import GuardRequest
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            async with GuardBrick.toGrpcClient(
+                f"127.0.0.1:{PORT}", channel_pool=ChannelPool(), verbose=False
+            ) as client:
+                await client.run_unary(GuardRequest(text="ping"))
+                return
+        except Exception:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+def bench(workers: int, args: argparse.Namespace) -> float:
+    script = os.path.abspath(__file__)
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            script,
+            "--role",
+            "server",
+            "--workers",
+            str(workers),
+            "--work",
+            str(args.work),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        asyncio.run(_wait_ready())
+        clients = [
+            subprocess.Popen(
+                [
+                    sys.executable,
+                    script,
+                    "--role",
+                    "client",
+                    "--duration",
+                    str(args.duration),
+                    "--concurrency",
+                    str(args.concurrency),
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+            for _ in range(args.clients)
+        ]
+        total = sum(int(c.communicate()[0].strip().splitlines()[-1]) for c in clients)
+        return total / args.duration
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--role", choices=("bench", "server", "client"), default="bench"
+    )
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--work", type=int, default=2000)
+    args = parser.parse_args()
+
+    if args.role == "server":
+        run_server(args.workers[0], args.work)
+        return
+    if args.role == "client":
+        run_client(args.duration, args.concurrency)
+        return
+
+    print(f"cores={os.cpu_count()} clients={args.clients} work={args.work}")
+    baseline = None
+    for workers in args.workers:
+        rps = bench(workers, args)
+        baseline = baseline or rps
+        print(f"  workers={workers:<3} {rps:10,.0f} req/s   x{rps / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
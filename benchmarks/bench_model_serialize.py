@@ -0,0 +1,83 @@
+"""
+*_types 模型序列化 benchmark
+
+比較舊版 (dataclasses.asdict / MessageToDict) 與產生的明確展開程式碼:
+- to_dict: asdict(model) vs model.to_dict()
+- from_pb2: from_dict(MessageToDict(pb)) vs from_pb2_model(pb)
+
+用法:
+    python benchmarks/bench_model_serialize.py [--iterations 20000]
+"""
+
+import argparse
+import time
+from dataclasses import asdict
+from typing import Any, Callable
+
+from google.protobuf.json_format import MessageToDict
+
+from llmbrick.protocols.models.bricks.common_types import ErrorDetail
+from llmbrick.protocols.models.bricks.intention_types import (
+    IntentionResponse,
+    IntentionResult,
+)
+from llmbrick.protocols.models.bricks.llm_types import Context, LLMRequest, LLMResponse
+from llmbrick.protocols.models.bricks.retrieval_types import (
+    Document,
+    RetrievalResponse,
+)
+
+
+def _bench(name: str, fn: Callable[[], Any], iterations: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = (time.perf_counter() - start) / iterations
+    print(f"  {name:<28} {elapsed * 1e6:8.2f} us")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    n = args.iterations
+
+    success = ErrorDetail(code=200, message="Success")
+    samples = {
+        "LLMResponse (chunk)": LLMResponse(text="tok", tokens=["tok"], error=success),
+        "LLMRequest (8 context)": LLMRequest(
+            prompt="hi",
+            context=[Context(role="user", content=f"m{i}") for i in range(8)],
+        ),
+        "IntentionResponse (5)": IntentionResponse(
+            results=[IntentionResult(f"c{i}", 0.5) for i in range(5)], error=success
+        ),
+        "RetrievalResponse (10 docs)": RetrievalResponse(
+            documents=[
+                Document(doc_id=str(i), title="t", snippet="s" * 64, metadata={"i": i})
+                for i in range(10)
+            ],
+            error=success,
+        ),
+    }
+
+    for label, model in samples.items():
+        cls = type(model)
+        pb = model.to_pb2()
+        print(label)
+        legacy = _bench("asdict", lambda: asdict(model), n)
+        fast = _bench("to_dict", model.to_dict, n)
+        print(f"  speedup: {legacy / fast:.1f}x")
+        legacy = _bench(
+            "from_dict(MessageToDict)",
+            lambda: cls.from_dict(MessageToDict(pb, preserving_proto_field_name=True)),
+            n,
+        )
+        fast = _bench("from_pb2_model", lambda: cls.from_pb2_model(pb), n)
+        print(f"  speedup: {legacy / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
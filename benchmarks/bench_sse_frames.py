@@ -0,0 +1,134 @@
+"""
+SSE 事件編碼 benchmark (單核 chunks/sec)
+
+frames: 只計算每個 chunk 的檢查與編碼
+- legacy   : 舊版 _validate_event (每個 chunk 重新轉換 progress) + f-string 包 model_dump_json()，
+             再由 StreamingResponse encode 為 bytes
+- adapter  : check_event + 共用 TypeAdapter 直接輸出 bytes
+- fast     : validate_events=False + exclude_none_fields=True
+
+app: 經過 SSEServer 的完整 ASGI 路徑 (httpx ASGITransport，不經網路)
+
+用法:
+    python benchmarks/bench_sse_frames.py [--chunks 20000]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Callable
+
+import httpx
+
+from llmbrick.protocols.models.http.conversation import (
+    ConversationResponseProgressEnum,
+    ConversationSSEResponse,
+)
+from llmbrick.servers.sse.config import SSEServerConfig
+from llmbrick.servers.sse.framing import check_event, encode_message
+from llmbrick.servers.sse.server import SSEServer
+
+
+def _event(i: int) -> ConversationSSEResponse:
+    return ConversationSSEResponse(
+        id=str(i),
+        type="text",
+        text="token",
+        progress=ConversationResponseProgressEnum.IN_PROGRESS,
+    )
+
+
+def _legacy_validate(event: Any) -> bool:
+    """重現舊版 _validate_event"""
+    if not isinstance(event, ConversationSSEResponse):
+        return False
+    if not getattr(event, "id", None) or not getattr(event, "type", None):
+        return False
+    if not getattr(event, "progress", None):
+        return False
+    if not isinstance(event.progress, ConversationResponseProgressEnum):
+        event.progress = ConversationResponseProgressEnum(event.progress)
+    return True
+
+
+def _legacy(event: ConversationSSEResponse) -> bytes:
+    _legacy_validate(event)
+    return f"event: message\ndata: {event.model_dump_json()}\n\n".encode("utf-8")
+
+
+def _adapter(event: ConversationSSEResponse) -> bytes:
+    check_event(event)
+    return encode_message(event)
+
+
+def _fast(event: ConversationSSEResponse) -> bytes:
+    return encode_message(event, exclude_none=True)
+
+
+def _bench_frames(name: str, encode: Callable[[Any], bytes], chunks: int) -> None:
+    events = [_event(i) for i in range(chunks)]
+    start = time.perf_counter()
+    size = 0
+    for event in events:
+        size += len(encode(event))
+    elapsed = time.perf_counter() - start
+    print(
+        f"  {name:<8} {chunks / elapsed:12,.0f} chunks/s   "
+        f"{size / chunks:5.1f} bytes/chunk"
+    )
+
+
+async def _bench_app(name: str, config: SSEServerConfig, chunks: int) -> None:
+    events = [_event(i) for i in range(chunks)]
+    server = SSEServer(config=config)
+
+    @server.handler
+    async def handler(request):
+        for event in events:
+            yield event
+
+    transport = httpx.ASGITransport(app=server.fastapi_app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        start = time.perf_counter()
+        resp = await client.post(
+            "/chat/completions",
+            json={
+                "model": "gpt-4o",
+                "messages": [{"role": "user", "content": "hi"}],
+                "stream": True,
+                "sessionId": "bench",
+            },
+            headers={"accept": "text/event-stream"},
+        )
+        elapsed = time.perf_counter() - start
+    assert resp.content.count(b"event: message") == chunks
+    print(f"  {name:<8} {chunks / elapsed:12,.0f} chunks/s")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=20000)
+    args = parser.parse_args()
+    n = args.chunks
+
+    print(f"{n} chunks, single core")
+    print("frames")
+    _bench_frames("legacy", _legacy, n)
+    _bench_frames("adapter", _adapter, n)
+    _bench_frames("fast", _fast, n)
+
+    print("app")
+    base = dict(enable_request_logging=False, request_timeout=0)
+    await _bench_app("default", SSEServerConfig(**base), n)
+    await _bench_app("deadline", SSEServerConfig(**{**base, "request_timeout": 30}), n)
+    await _bench_app(
+        "fast",
+        SSEServerConfig(**base, validate_events=False, exclude_none_fields=True),
+        n,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
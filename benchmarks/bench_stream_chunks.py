@@ -0,0 +1,112 @@
+"""
+LLM 串流 chunk 編解碼 benchmark (單核 chunks/sec)
+
+每個 chunk 走完: wrapper 建立 pb2 -> SerializeToString -> client 解析 -> LLMResponse
+- legacy  : 每個 chunk 新建 ErrorDetail，client 以 MessageToDict 解碼 error
+- shared  : 共用 SUCCESS_ERROR_DETAIL，client 直接 from_pb2_model
+- omitted : omit_intermediate_error=True，中間 chunk 不帶 error
+
+用法:
+    python benchmarks/bench_stream_chunks.py [--chunks 20000]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import AsyncIterator
+
+from google.protobuf.json_format import MessageToDict
+
+from llmbrick.bricks.llm.base_llm import LLMBrick
+from llmbrick.core.brick import output_streaming_handler
+from llmbrick.core.error_codes import ErrorCodes
+from llmbrick.protocols.grpc.common import common_pb2
+from llmbrick.protocols.grpc.llm import llm_pb2
+from llmbrick.protocols.models.bricks.common_types import ErrorDetail
+from llmbrick.protocols.models.bricks.llm_types import LLMRequest, LLMResponse
+from llmbrick.servers.grpc.wrappers.llm_grpc_wrapper import LLMGrpcWrapper
+
+SUCCESS = ErrorDetail(code=ErrorCodes.SUCCESS, message="Success")
+
+
+def _make_brick(chunks: int) -> LLMBrick:
+    class _TokenBrick(LLMBrick):
+        @output_streaming_handler
+        async def stream(self, request: LLMRequest) -> AsyncIterator[LLMResponse]:
+            for i in range(chunks):
+                yield LLMResponse(
+                    text="token",
+                    tokens=["token"],
+                    is_final=(i == chunks - 1),
+                    error=SUCCESS,
+                )
+
+    return _TokenBrick(default_prompt="")
+
+
+async def _legacy_stream(brick: LLMBrick, request: LLMRequest):
+    """重現舊版 wrapper: 每個 chunk 新建 ErrorDetail"""
+    async for response in brick.run_output_streaming(request):
+        error_data = common_pb2.ErrorDetail(
+            code=ErrorCodes.SUCCESS, message="", detail=""
+        )
+        yield llm_pb2.LLMResponse(
+            text=response.text,
+            tokens=response.tokens,
+            is_final=response.is_final,
+            error=error_data,
+        )
+
+
+def _legacy_decode(model: llm_pb2.LLMResponse) -> LLMResponse:
+    """重現舊版 client: error 經過 MessageToDict"""
+    error = ErrorDetail.from_dict(
+        MessageToDict(model.error, preserving_proto_field_name=True)
+    )
+    return LLMResponse(
+        text=model.text, tokens=list(model.tokens), is_final=model.is_final, error=error
+    )
+
+
+async def _run(name: str, stream, decode, chunks: int) -> None:
+    start = time.perf_counter()
+    size = 0
+    async for chunk in stream:
+        payload = chunk.SerializeToString()
+        size += len(payload)
+        decode(llm_pb2.LLMResponse.FromString(payload))
+    elapsed = time.perf_counter() - start
+    print(
+        f"  {name:<8} {chunks / elapsed:12,.0f} chunks/s   "
+        f"{size / chunks:5.1f} bytes/chunk"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=20000)
+    args = parser.parse_args()
+    n = args.chunks
+    request_pb = llm_pb2.LLMRequest(prompt="hi")
+
+    brick = _make_brick(n)
+    print(f"{n} chunks, single core")
+    await _run("legacy", _legacy_stream(brick, LLMRequest()), _legacy_decode, n)
+    shared = LLMGrpcWrapper(brick)
+    await _run(
+        "shared",
+        shared.OutputStreaming(request_pb, None),
+        LLMResponse.from_pb2_model,
+        n,
+    )
+    omitted = LLMGrpcWrapper(brick, omit_intermediate_error=True)
+    await _run(
+        "omitted",
+        omitted.OutputStreaming(request_pb, None),
+        LLMResponse.from_pb2_model,
+        n,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+"""
+BaseBrick 串流 dispatch 的每 chunk 開銷 benchmark
+
+比較:
+- raw     : 直接迭代 handler (理論下限)
+- legacy  : 舊版路徑，decorator wrapper + run_output_streaming 各多一層 re-yield
+- fast    : verbose=False，run_output_streaming 直接回傳 handler 的 iterator
+- verbose : verbose=True，保留例外記錄的包裝層
+
+用法:
+    python benchmarks/bench_stream_dispatch.py [--chunks 200000]
+"""
+
+import argparse
+import asyncio
+import functools
+import time
+from typing import AsyncIterator, Callable
+
+from llmbrick.core.brick import BaseBrick
+
+
+async def _tokens(n: int) -> AsyncIterator[int]:
+    for i in range(n):
+        yield i
+
+
+def _legacy_run(
+    handler: Callable[[int], AsyncIterator[int]], n: int
+) -> AsyncIterator[int]:
+    """重現舊版: decorator 的 wrapper 再加上 run_output_streaming 的 async generator"""
+
+    @functools.wraps(handler)
+    async def wrapper(*args, **kwargs):
+        async for val in handler(*args, **kwargs):
+            yield val
+
+    async def run_output_streaming(input_data):
+        try:
+            async for val in wrapper(input_data):
+                yield val
+        except Exception:
+            raise
+
+    return run_output_streaming(n)
+
+
+def _make_brick(verbose: bool) -> BaseBrick:
+    brick = BaseBrick(verbose=verbose)
+    if verbose:
+        # 略過 log_function，只量測 dispatch 層的開銷
+        brick._output_streaming_handler = _tokens
+    else:
+        brick.output_streaming()(_tokens)
+    return brick
+
+
+async def _consume(stream: AsyncIterator[int]) -> None:
+    async for _ in stream:
+        pass
+
+
+async def _measure(
+    label: str, make_stream: Callable[[], AsyncIterator[int]], n: int
+) -> float:
+    start = time.perf_counter()
+    await _consume(make_stream())
+    elapsed = time.perf_counter() - start
+    per_chunk = elapsed / n * 1e9
+    print(f"{label:<8}: {per_chunk:8.1f} ns / chunk  ({n / elapsed:,.0f} chunks/s)")
+    return per_chunk
+
+
+async def main(n: int) -> None:
+    fast_brick = _make_brick(verbose=False)
+    verbose_brick = _make_brick(verbose=True)
+    raw = await _measure("raw", lambda: _tokens(n), n)
+    legacy = await _measure("legacy", lambda: _legacy_run(_tokens, n), n)
+    fast = await _measure("fast", lambda: fast_brick.run_output_streaming(n), n)
+    await _measure("verbose", lambda: verbose_brick.run_output_streaming(n), n)
+    print(
+        f"dispatch overhead legacy: {legacy - raw:6.1f} ns, fast: {fast - raw:6.1f} ns"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=200000)
+    args = parser.parse_args()
+    asyncio.run(main(args.chunks))
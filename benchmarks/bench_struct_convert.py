@@ -0,0 +1,100 @@
+"""
+Struct <-> dict 轉換 benchmark
+
+比較:
+- MessageToDict / Struct.update (舊路徑，含 to_dict 的 asdict 深拷貝)
+- struct_to_dict / dict_to_struct
+- LazyStructView (只存取一個欄位)
+
+用法:
+    python benchmarks/bench_struct_convert.py [--iterations 200]
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict
+
+from google.protobuf import struct_pb2
+from google.protobuf.json_format import MessageToDict
+
+from llmbrick.protocols.models.bricks.common_types import CommonResponse
+from llmbrick.protocols.models.struct_utils import (
+    LazyStructView,
+    dict_to_struct,
+    struct_to_dict,
+)
+
+
+def _make_payload(target_bytes: int) -> Dict[str, Any]:
+    """產生巢狀 payload，JSON 大小約為 target_bytes"""
+    payload: Dict[str, Any] = {"id": "req-1", "items": []}
+    i = 0
+    while len(json.dumps(payload)) < target_bytes:
+        payload["items"].append(
+            {
+                "index": i,
+                "text": f"token {i}",
+                "score": i / 7,
+                "flags": [True, False, None],
+                "meta": {"lang": "zh-TW", "tags": ["a", "b"]},
+            }
+        )
+        i += 1
+    return payload
+
+
+def _bench(name: str, fn: Callable[[], Any], iterations: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = (time.perf_counter() - start) / iterations
+    print(f"  {name:<34} {elapsed * 1e6:10.1f} us")
+    return elapsed
+
+
+def _legacy_encode(response: CommonResponse) -> struct_pb2.Struct:
+    data = struct_pb2.Struct()
+    data.update(response.to_dict().get("data", {}))
+    return data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    for label, size in (("1KB", 1024), ("100KB", 100 * 1024)):
+        payload = _make_payload(size)
+        struct = dict_to_struct(payload)
+        response = CommonResponse(data=payload)
+        iterations = args.iterations if size > 1024 else args.iterations * 20
+        print(f"{label} payload ({struct.ByteSize()} bytes serialized)")
+
+        print(" decode")
+        legacy = _bench(
+            "MessageToDict",
+            lambda: MessageToDict(struct, preserving_proto_field_name=True),
+            iterations,
+        )
+        fast = _bench("struct_to_dict", lambda: struct_to_dict(struct), iterations)
+        _bench("LazyStructView['id']", lambda: LazyStructView(struct)["id"], iterations)
+        print(f"  speedup: {legacy / fast:.1f}x")
+
+        print(" encode")
+        legacy = _bench(
+            "asdict + Struct.update", lambda: _legacy_encode(response), iterations
+        )
+        fast = _bench(
+            "dict_to_struct", lambda: dict_to_struct(response.data), iterations
+        )
+        view = LazyStructView(struct)
+        _bench(
+            "dict_to_struct(LazyStructView)", lambda: dict_to_struct(view), iterations
+        )
+        print(f"  speedup: {legacy / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
-import grpc
 from google.protobuf import struct_pb2
 
 from llmbrick.core.brick import BaseBrick, BrickType
+from llmbrick.core.channel_pool import RemoteAddress
 from llmbrick.protocols.grpc.common import common_pb2_grpc
 from llmbrick.protocols.models.bricks.common_types import (
     CommonRequest,
@@ -10,6 +10,7 @@ from llmbrick.protocols.models.bricks.common_types import (
     ServiceInfoResponse,
     ModelInfo
 )
+from llmbrick.protocols.models.struct_utils import dict_to_struct
 
 
 class CommonBrick(BaseBrick[CommonRequest, CommonResponse]):
@@ -34,109 +35,133 @@ class CommonBrick(BaseBrick[CommonRequest, CommonResponse]):
     brick_type = BrickType.COMMON
 
     @classmethod
-    def toGrpcClient(cls, remote_address: str, **kwargs): # noqa: C901
+    def toGrpcClient(cls, remote_address: RemoteAddress, **kwargs): # noqa: C901
         """
         將 CommonBrick 轉換為異步 gRPC 客戶端。
 
         Args:
-            remote_address: gRPC 伺服器地址，格式為 "host:port"
-            **kwargs: 傳遞給 CommonBrick 建構子的額外參數
+            remote_address: gRPC 伺服器地址，格式為 "host:port"；
+                亦可為多個副本的地址列表或 "dns:///host:port"，呼叫會做 client 端負載平衡
+            **kwargs: 傳遞給 CommonBrick 建構子的額外參數，
+                通道參數 (channel_pool 等) 會先被取出，見 BaseBrick._build_grpc_channel
 
         Returns:
             配置為異步 gRPC 客戶端的 CommonBrick 實例
         """
         from llmbrick.protocols.grpc.common import common_pb2
 
+        # 從通道池取得共用通道，呼叫結束後不關閉，由 brick.aclose() 釋放
+        grpc_channel = cls._build_grpc_channel(remote_address, kwargs)
+
         # 建立 brick 實例
         brick = cls(**kwargs)
+        brick._grpc_channel = grpc_channel
 
         @brick.unary()
         async def unary_handler(request: struct_pb2.Struct) -> CommonResponse:
             """異步單次請求處理器"""
 
-            # 建立異步 gRPC 通道和客戶端
-            channel = grpc.aio.insecure_channel(remote_address)
-            grpc_client = common_pb2_grpc.CommonServiceStub(channel)
-            # 建立 gRPC 請求
-            grpc_request = common_pb2.CommonRequest()
-            grpc_request.data.update(request.data)
+            # 從通道池取得異步 gRPC 通道和客戶端
+            async with grpc_channel.connect() as channel:
+                grpc_client = common_pb2_grpc.CommonServiceStub(channel)
+                # 建立 gRPC 請求
+                grpc_request = common_pb2.CommonRequest()
+                dict_to_struct(request.data, grpc_request.data)
 
-            response = await grpc_client.Unary(grpc_request)
+                response = await grpc_client.Unary(
+                    grpc_request, timeout=grpc_channel.call_timeout()
+                )
 
-            return CommonResponse.from_pb2_model(response)
+                return CommonResponse.from_pb2_model(response)
 
         @brick.output_streaming()
         async def output_streaming_handler(request: struct_pb2.Struct):
             """異步流式輸出處理器"""
 
-            # 建立異步 gRPC 通道和客戶端
-            channel = grpc.aio.insecure_channel(remote_address)
-            grpc_client = common_pb2_grpc.CommonServiceStub(channel)
-            # 建立 gRPC 請求
-            grpc_request = common_pb2.CommonRequest()
-            grpc_request.data.update(request.data)
-
-            async for response in grpc_client.OutputStreaming(grpc_request):
-                # 將 protobuf 回應轉換為 CommonResponse
-                yield CommonResponse.from_pb2_model(response)
+            # 從通道池取得異步 gRPC 通道和客戶端
+            async with grpc_channel.connect() as channel:
+                grpc_client = common_pb2_grpc.CommonServiceStub(channel)
+                # 建立 gRPC 請求
+                grpc_request = common_pb2.CommonRequest()
+                dict_to_struct(request.data, grpc_request.data)
+
+                call = grpc_client.OutputStreaming(
+                    grpc_request, timeout=grpc_channel.call_timeout()
+                )
+                try:
+                    async for response in call:
+                        # 將 protobuf 回應轉換為 CommonResponse
+                        yield CommonResponse.from_pb2_model(response)
+                finally:
+                    # 呼叫端停止讀取 (取消或提前關閉) 時，一併取消下游的 RPC
+                    call.cancel()
 
         @brick.input_streaming()
         async def input_streaming_handler(request_stream) -> CommonResponse:
             """異步流式輸入處理器"""
 
-            # 建立異步 gRPC 通道和客戶端
-            channel = grpc.aio.insecure_channel(remote_address)
-            grpc_client = common_pb2_grpc.CommonServiceStub(channel)
-            async def grpc_request_generator():
-                async for req in request_stream:
-                    grpc_request = common_pb2.CommonRequest()
-                    grpc_request.data.update(req.data)
-                    yield grpc_request
+            # 從通道池取得異步 gRPC 通道和客戶端
+            async with grpc_channel.connect() as channel:
+                grpc_client = common_pb2_grpc.CommonServiceStub(channel)
+                async def grpc_request_generator():
+                    async for req in request_stream:
+                        grpc_request = common_pb2.CommonRequest()
+                        dict_to_struct(req.data, grpc_request.data)
+                        yield grpc_request
 
-            response = await grpc_client.InputStreaming(grpc_request_generator())
+                response = await grpc_client.InputStreaming(
+                    grpc_request_generator(), timeout=grpc_channel.call_timeout()
+                )
 
-            return CommonResponse.from_pb2_model(response)
+                return CommonResponse.from_pb2_model(response)
 
         @brick.bidi_streaming()
         async def bidi_streaming_handler(request_stream):
             """異步雙向流式處理器"""
 
-            # 建立異步 gRPC 通道和客戶端
-            channel = grpc.aio.insecure_channel(remote_address)
-            grpc_client = common_pb2_grpc.CommonServiceStub(channel)
-            async def grpc_request_generator():
-                async for req in request_stream:
-                    grpc_request = common_pb2.CommonRequest()
-                    grpc_request.data.update(req.data)
-                    yield grpc_request
-
-            async for response in grpc_client.BidiStreaming(grpc_request_generator()):
-                yield CommonResponse.from_pb2_model(response)
+            # 從通道池取得異步 gRPC 通道和客戶端
+            async with grpc_channel.connect() as channel:
+                grpc_client = common_pb2_grpc.CommonServiceStub(channel)
+                async def grpc_request_generator():
+                    async for req in request_stream:
+                        grpc_request = common_pb2.CommonRequest()
+                        dict_to_struct(req.data, grpc_request.data)
+                        yield grpc_request
+
+                call = grpc_client.BidiStreaming(
+                    grpc_request_generator(), timeout=grpc_channel.call_timeout()
+                )
+                try:
+                    async for response in call:
+                        yield CommonResponse.from_pb2_model(response)
+                finally:
+                    # 呼叫端停止讀取 (取消或提前關閉) 時，一併取消下游的 RPC
+                    call.cancel()
 
         @brick.get_service_info()
         async def get_service_info_handler() -> ServiceInfoResponse:
             """異步服務信息處理器"""
 
-            # 建立異步 gRPC 通道和客戶端
-            channel = grpc.aio.insecure_channel(remote_address)
-            grpc_client = common_pb2_grpc.CommonServiceStub(channel)
-            request = common_pb2.ServiceInfoRequest()
-            response = await grpc_client.GetServiceInfo(request)
-            return ServiceInfoResponse(
-                service_name=response.service_name,
-                version=response.version,
-                models=[
-                    ModelInfo(
-                        model_id=model.model_id,
-                        version=model.version,
-                        supported_languages=list(model.supported_languages),
-                        support_streaming=model.support_streaming,
-                    )
-                    for model in response.models
-                ],
-                error=ErrorDetail.from_pb2_model(response.error) if response.error else None,
-            )
-
-        # 儲存通道引用以便後續清理
+            # 從通道池取得異步 gRPC 通道和客戶端
+            async with grpc_channel.connect() as channel:
+                grpc_client = common_pb2_grpc.CommonServiceStub(channel)
+                request = common_pb2.ServiceInfoRequest()
+                response = await grpc_client.GetServiceInfo(
+                    request, timeout=grpc_channel.call_timeout()
+                )
+                return ServiceInfoResponse(
+                    service_name=response.service_name,
+                    version=response.version,
+                    models=[
+                        ModelInfo(
+                            model_id=model.model_id,
+                            version=model.version,
+                            supported_languages=list(model.supported_languages),
+                            support_streaming=model.support_streaming,
+                        )
+                        for model in response.models
+                    ],
+                    error=ErrorDetail.from_pb2_model(response.error) if response.error else None,
+                )
 
         return brick
@@ -3,6 +3,7 @@ import warnings
 from deprecated import deprecated
 
 from llmbrick.core.brick import BaseBrick, BrickType
+from llmbrick.core.channel_pool import RemoteAddress
 from llmbrick.protocols.models.bricks.common_types import (
     ErrorDetail,
     ServiceInfoResponse,
@@ -12,6 +13,7 @@ from llmbrick.protocols.models.bricks.compose_types import (
     ComposeRequest,
     ComposeResponse,
 )
+from llmbrick.protocols.models.struct_utils import dict_to_struct
 
 
 class ComposeBrick(BaseBrick[ComposeRequest, ComposeResponse]):
@@ -65,112 +67,128 @@ class ComposeBrick(BaseBrick[ComposeRequest, ComposeResponse]):
         )
 
     @classmethod
-    def toGrpcClient(cls, remote_address: str, **kwargs):
+    def toGrpcClient(cls, remote_address: RemoteAddress, **kwargs):
         """
         將 ComposeBrick 轉換為異步 gRPC 客戶端。
 
         Args:
-            remote_address: gRPC 伺服器地址，格式為 "host:port"
-            **kwargs: 傳遞給 ComposeBrick 建構子的額外參數
+            remote_address: gRPC 伺服器地址，格式為 "host:port"；
+                亦可為多個副本的地址列表或 "dns:///host:port"，呼叫會做 client 端負載平衡
+            **kwargs: 傳遞給 ComposeBrick 建構子的額外參數，
+                通道參數 (channel_pool 等) 會先被取出，見 BaseBrick._build_grpc_channel
 
         Returns:
             配置為異步 gRPC 客戶端的 ComposeBrick 實例
         """
-        import grpc
         from llmbrick.protocols.grpc.compose import compose_pb2_grpc, compose_pb2
         from llmbrick.protocols.grpc.common import common_pb2
 
+        # 從通道池取得共用通道，呼叫結束後不關閉，由 brick.aclose() 釋放
+        grpc_channel = cls._build_grpc_channel(remote_address, kwargs)
+
         # 建立 brick 實例
         brick = cls(**kwargs)
+        brick._grpc_channel = grpc_channel
 
         @brick.unary()
         async def unary_handler(request: ComposeRequest) -> ComposeResponse:
             """異步單次請求處理器"""
 
-            # 建立異步 gRPC 通道和客戶端
-            channel = grpc.aio.insecure_channel(remote_address)
-            grpc_client = compose_pb2_grpc.ComposeServiceStub(channel)
-
-            # 轉換 Document 列表
-            grpc_documents = []
-            for doc in request.input_documents:
-                grpc_doc = compose_pb2.Document()
-                grpc_doc.doc_id = doc.doc_id
-                grpc_doc.title = doc.title
-                grpc_doc.snippet = doc.snippet
-                grpc_doc.score = doc.score
-                # metadata 是 google.protobuf.Struct
-                grpc_doc.metadata.update(doc.metadata)
-                grpc_documents.append(grpc_doc)
-
-            # 建立 gRPC 請求
-            grpc_request = compose_pb2.ComposeRequest()
-            grpc_request.input_documents.extend(grpc_documents)
-            grpc_request.target_format = request.target_format
-            grpc_request.client_id = request.client_id
-            grpc_request.session_id = request.session_id
-            grpc_request.request_id = request.request_id
-            grpc_request.source_language = request.source_language
-
-            response = await grpc_client.Unary(grpc_request)
-
-            return ComposeResponse.from_pb2_model(response)
+            # 從通道池取得異步 gRPC 通道和客戶端
+            async with grpc_channel.connect() as channel:
+                grpc_client = compose_pb2_grpc.ComposeServiceStub(channel)
+
+                # 轉換 Document 列表
+                grpc_documents = []
+                for doc in request.input_documents:
+                    grpc_doc = compose_pb2.Document()
+                    grpc_doc.doc_id = doc.doc_id
+                    grpc_doc.title = doc.title
+                    grpc_doc.snippet = doc.snippet
+                    grpc_doc.score = doc.score
+                    # metadata 是 google.protobuf.Struct
+                    dict_to_struct(doc.metadata, grpc_doc.metadata)
+                    grpc_documents.append(grpc_doc)
+
+                # 建立 gRPC 請求
+                grpc_request = compose_pb2.ComposeRequest()
+                grpc_request.input_documents.extend(grpc_documents)
+                grpc_request.target_format = request.target_format
+                grpc_request.client_id = request.client_id
+                grpc_request.session_id = request.session_id
+                grpc_request.request_id = request.request_id
+                grpc_request.source_language = request.source_language
+
+                response = await grpc_client.Unary(
+                    grpc_request, timeout=grpc_channel.call_timeout()
+                )
+
+                return ComposeResponse.from_pb2_model(response)
 
         @brick.output_streaming()
         async def output_streaming_handler(request: ComposeRequest):
             """異步流式輸出處理器"""
 
-            # 建立異步 gRPC 通道和客戶端
-            channel = grpc.aio.insecure_channel(remote_address)
-            grpc_client = compose_pb2_grpc.ComposeServiceStub(channel)
-
-            # 轉換 Document 列表
-            grpc_documents = []
-            for doc in request.input_documents:
-                grpc_doc = compose_pb2.Document()
-                grpc_doc.doc_id = doc.doc_id
-                grpc_doc.title = doc.title
-                grpc_doc.snippet = doc.snippet
-                grpc_doc.score = doc.score
-                # metadata 是 google.protobuf.Struct
-                grpc_doc.metadata.update(doc.metadata)
-                grpc_documents.append(grpc_doc)
-
-            # 建立 gRPC 請求
-            grpc_request = compose_pb2.ComposeRequest()
-            grpc_request.input_documents.extend(grpc_documents)
-            grpc_request.target_format = request.target_format
-            grpc_request.client_id = request.client_id
-            grpc_request.session_id = request.session_id
-            grpc_request.request_id = request.request_id
-            grpc_request.source_language = request.source_language
-
-            async for response in grpc_client.OutputStreaming(grpc_request):
-                yield ComposeResponse.from_pb2_model(response)
+            # 從通道池取得異步 gRPC 通道和客戶端
+            async with grpc_channel.connect() as channel:
+                grpc_client = compose_pb2_grpc.ComposeServiceStub(channel)
+
+                # 轉換 Document 列表
+                grpc_documents = []
+                for doc in request.input_documents:
+                    grpc_doc = compose_pb2.Document()
+                    grpc_doc.doc_id = doc.doc_id
+                    grpc_doc.title = doc.title
+                    grpc_doc.snippet = doc.snippet
+                    grpc_doc.score = doc.score
+                    # metadata 是 google.protobuf.Struct
+                    dict_to_struct(doc.metadata, grpc_doc.metadata)
+                    grpc_documents.append(grpc_doc)
+
+                # 建立 gRPC 請求
+                grpc_request = compose_pb2.ComposeRequest()
+                grpc_request.input_documents.extend(grpc_documents)
+                grpc_request.target_format = request.target_format
+                grpc_request.client_id = request.client_id
+                grpc_request.session_id = request.session_id
+                grpc_request.request_id = request.request_id
+                grpc_request.source_language = request.source_language
+
+                call = grpc_client.OutputStreaming(
+                    grpc_request, timeout=grpc_channel.call_timeout()
+                )
+                try:
+                    async for response in call:
+                        yield ComposeResponse.from_pb2_model(response)
+                finally:
+                    # 呼叫端停止讀取 (取消或提前關閉) 時，一併取消下游的 RPC
+                    call.cancel()
 
         @brick.get_service_info()
         async def get_service_info_handler() -> ServiceInfoResponse:
             """異步服務信息處理器"""
 
-            # 建立異步 gRPC 通道和客戶端
-            channel = grpc.aio.insecure_channel(remote_address)
-            grpc_client = compose_pb2_grpc.ComposeServiceStub(channel)
-
-            request = common_pb2.ServiceInfoRequest()
-            response = await grpc_client.GetServiceInfo(request)
-            return ServiceInfoResponse(
-                service_name=response.service_name,
-                version=response.version,
-                models=[
-                    ModelInfo(
-                        model_id=model.model_id,
-                        version=model.version,
-                        supported_languages=list(model.supported_languages),
-                        support_streaming=model.support_streaming,
-                    )
-                    for model in response.models
-                ],
-                error=ErrorDetail.from_pb2_model(response.error) if response.error else None,
-            )
+            # 從通道池取得異步 gRPC 通道和客戶端
+            async with grpc_channel.connect() as channel:
+                grpc_client = compose_pb2_grpc.ComposeServiceStub(channel)
+
+                request = common_pb2.ServiceInfoRequest()
+                response = await grpc_client.GetServiceInfo(
+                    request, timeout=grpc_channel.call_timeout()
+                )
+                return ServiceInfoResponse(
+                    service_name=response.service_name,
+                    version=response.version,
+                    models=[
+                        ModelInfo(
+                            model_id=model.model_id,
+                            version=model.version,
+                            supported_languages=list(model.supported_languages),
+                            support_streaming=model.support_streaming,
+                        )
+                        for model in response.models
+                    ],
+                    error=ErrorDetail.from_pb2_model(response.error) if response.error else None,
+                )
 
         return brick
@@ -1,12 +1,17 @@
 import warnings
+from typing import Any, AsyncIterator, Dict, Optional
 
 from deprecated import deprecated
 
+from llmbrick.bricks.llm.prompt_cache import PromptCache
 from llmbrick.core.brick import BaseBrick, BrickType
+from llmbrick.core.channel_pool import RemoteAddress
+from llmbrick.core.coalesce import merge_text_chunks, text_chunk_size
+from llmbrick.core.error_codes import ErrorCodes
 from llmbrick.protocols.models.bricks.common_types import (
     ErrorDetail,
+    ModelInfo,
     ServiceInfoResponse,
-    ModelInfo
 )
 from llmbrick.protocols.models.bricks.llm_types import LLMRequest, LLMResponse
 
@@ -32,9 +37,103 @@ class LLMBrick(BaseBrick[LLMRequest, LLMResponse]):
     # 僅允許這三種 handler
     allowed_handler_types = {"unary", "output_streaming", "get_service_info"}
 
-    def __init__(self, default_prompt: str, *args, **kwargs):
+    def __init__(
+        self,
+        default_prompt: str,
+        *args,
+        prompt_cache: Optional[PromptCache] = None,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
         self.default_prompt = default_prompt
+        # 非 None 時 run_unary / run_output_streaming 先查詢 prompt 快取，見 enable_prompt_cache
+        self.prompt_cache: Optional[PromptCache] = prompt_cache
+        if prompt_cache is not None and not prompt_cache.name:
+            prompt_cache.name = self.brick_name
+
+    def enable_prompt_cache(self, **kwargs) -> PromptCache:
+        """
+        開啟 prompt 快取，參數見 PromptCache。
+        只有 temperature 不超過 max_temperature (預設 0.3) 的請求會使用快取。
+        """
+        kwargs.setdefault("name", self.brick_name)
+        self.prompt_cache = PromptCache(**kwargs)
+        return self.prompt_cache
+
+    def disable_prompt_cache(self) -> None:
+        self.prompt_cache = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # 與 response_cache 相同，子行程執行 handler 時不使用 prompt 快取
+        state = super().__getstate__()
+        state["prompt_cache"] = None
+        return state
+
+    def _prompt_cache_defaults(self) -> dict:
+        # 請求未指定時 handler 使用的 prompt / 模型，與請求中明確指定視為相同
+        return {
+            "default_prompt": self.default_prompt,
+            "default_model": getattr(self, "model_id", ""),
+        }
+
+    @staticmethod
+    def _is_success(response: LLMResponse) -> bool:
+        return response.error is None or response.error.code == ErrorCodes.SUCCESS
+
+    async def run_unary(self, input_data: LLMRequest) -> LLMResponse:
+        cache = self.prompt_cache
+        if cache is None or not cache.cacheable(input_data):
+            return await super().run_unary(input_data)
+        defaults = self._prompt_cache_defaults()
+        answer = await cache.alookup(input_data, **defaults)
+        if answer is not None:
+            return LLMResponse(
+                text=answer,
+                is_final=True,
+                error=ErrorDetail(code=ErrorCodes.SUCCESS, message="Success"),
+            )
+        response = await super().run_unary(input_data)
+        if self._is_success(response):
+            await cache.astore(input_data, response.text, **defaults)
+        return response
+
+    def run_output_streaming(
+        self, input_data: LLMRequest
+    ) -> AsyncIterator[LLMResponse]:
+        cache = self.prompt_cache
+        if cache is None or not cache.cacheable(input_data):
+            return super().run_output_streaming(input_data)
+        return self._prompt_cached_stream(cache, input_data)
+
+    async def _prompt_cached_stream(
+        self, cache: PromptCache, input_data: LLMRequest
+    ) -> AsyncIterator[LLMResponse]:
+        defaults = self._prompt_cache_defaults()
+        answer = await cache.alookup(input_data, **defaults)
+        if answer is not None:
+            async for chunk in cache.replay(answer):
+                yield chunk
+            return
+        parts = []
+        complete = True
+        finished = False
+        async for chunk in super().run_output_streaming(input_data):
+            parts.append(chunk.text)
+            complete = complete and self._is_success(chunk)
+            finished = finished or chunk.is_final
+            yield chunk
+        # 只快取完整且沒有錯誤的回答
+        if complete and finished:
+            await cache.astore(input_data, "".join(parts), **defaults)
+
+    def merge_output_chunks(
+        self, previous: LLMResponse, chunk: LLMResponse
+    ) -> Optional[LLMResponse]:
+        """串流合併時串接相鄰 chunk 的 text/tokens，最終或錯誤 chunk 不合併"""
+        return merge_text_chunks(previous, chunk)
+
+    def output_chunk_size(self, chunk: LLMResponse) -> int:
+        return text_chunk_size(chunk)
 
     @deprecated(reason="LLMBrick does not support bidi_streaming handler.")
     def bidi_streaming(self):
@@ -58,115 +157,134 @@ class LLMBrick(BaseBrick[LLMRequest, LLMResponse]):
         raise NotImplementedError("LLMBrick does not support input_streaming handler.")
 
     @classmethod
-    def toGrpcClient(cls, remote_address: str, default_prompt: str = "", **kwargs):
+    def toGrpcClient(
+        cls, remote_address: RemoteAddress, default_prompt: str = "", **kwargs
+    ):
         """
         將 LLMBrick 轉換為異步 gRPC 客戶端。
 
         Args:
-            remote_address: gRPC 伺服器地址，格式為 "host:port"
+            remote_address: gRPC 伺服器地址，格式為 "host:port"；
+                亦可為多個副本的地址列表或 "dns:///host:port"，呼叫會做 client 端負載平衡
             default_prompt: 預設提示詞
-            **kwargs: 傳遞給 LLMBrick 建構子的額外參數
+            **kwargs: 傳遞給 LLMBrick 建構子的額外參數，
+                通道參數 (channel_pool 等) 會先被取出，見 BaseBrick._build_grpc_channel
 
         Returns:
             配置為異步 gRPC 客戶端的 LLMBrick 實例
         """
-        import grpc
-
-        from llmbrick.protocols.grpc.llm import llm_pb2_grpc, llm_pb2
         from llmbrick.protocols.grpc.common import common_pb2
+        from llmbrick.protocols.grpc.llm import llm_pb2, llm_pb2_grpc
 
-
+        # 從通道池取得共用通道，呼叫結束後不關閉，由 brick.aclose() 釋放
+        grpc_channel = cls._build_grpc_channel(remote_address, kwargs)
 
         # 建立 brick 實例
         brick = cls(default_prompt=default_prompt, **kwargs)
+        brick._grpc_channel = grpc_channel
 
         @brick.unary()
         async def unary_handler(request: LLMRequest, context=None) -> LLMResponse:
             """異步單次請求處理器"""
 
-            # 建立異步 gRPC 通道和客戶端
-            channel = grpc.aio.insecure_channel(remote_address)
-            grpc_client = llm_pb2_grpc.LLMServiceStub(channel)
-            # 轉換 Context 列表
-            grpc_contexts = []
-            for ctx in request.context:
-                grpc_context = llm_pb2.Context()
-                grpc_context.role = ctx.role
-                grpc_context.content = ctx.content
-                grpc_contexts.append(grpc_context)
-
-            # 建立 gRPC 請求
-            grpc_request = llm_pb2.LLMRequest()
-            grpc_request.model_id = request.model_id
-            grpc_request.prompt = request.prompt
-            grpc_request.context.extend(grpc_contexts)
-            grpc_request.client_id = request.client_id
-            grpc_request.session_id = request.session_id
-            grpc_request.request_id = request.request_id
-            grpc_request.source_language = request.source_language
-            grpc_request.temperature = request.temperature
-            grpc_request.max_tokens = request.max_tokens
-
-            response = await grpc_client.Unary(grpc_request)
-
-            # 將 protobuf 回應轉換為 LLMResponse
-            return LLMResponse.from_pb2_model(response)
+            # 從通道池取得異步 gRPC 通道和客戶端
+            async with grpc_channel.connect() as channel:
+                grpc_client = llm_pb2_grpc.LLMServiceStub(channel)
+                # 轉換 Context 列表
+                grpc_contexts = []
+                for ctx in request.context:
+                    grpc_context = llm_pb2.Context()
+                    grpc_context.role = ctx.role
+                    grpc_context.content = ctx.content
+                    grpc_contexts.append(grpc_context)
+
+                # 建立 gRPC 請求
+                grpc_request = llm_pb2.LLMRequest()
+                grpc_request.model_id = request.model_id
+                grpc_request.prompt = request.prompt
+                grpc_request.context.extend(grpc_contexts)
+                grpc_request.client_id = request.client_id
+                grpc_request.session_id = request.session_id
+                grpc_request.request_id = request.request_id
+                grpc_request.source_language = request.source_language
+                grpc_request.temperature = request.temperature
+                grpc_request.max_tokens = request.max_tokens
+
+                response = await grpc_client.Unary(
+                    grpc_request, timeout=grpc_channel.call_timeout()
+                )
+
+                # 將 protobuf 回應轉換為 LLMResponse
+                return LLMResponse.from_pb2_model(response)
 
         @brick.output_streaming()
         async def output_streaming_handler(request: LLMRequest, context=None):
             """異步流式輸出處理器"""
 
-            # 建立異步 gRPC 通道和客戶端
-            channel = grpc.aio.insecure_channel(remote_address)
-            grpc_client = llm_pb2_grpc.LLMServiceStub(channel)
-
-            # 轉換 Context 列表
-            grpc_contexts = []
-            for ctx in request.context:
-                grpc_context = llm_pb2.Context()
-                grpc_context.role = ctx.role
-                grpc_context.content = ctx.content
-                grpc_contexts.append(grpc_context)
-
-            # 建立 gRPC 請求
-            grpc_request = llm_pb2.LLMRequest()
-            grpc_request.model_id = request.model_id
-            grpc_request.prompt = request.prompt
-            grpc_request.context.extend(grpc_contexts)
-            grpc_request.client_id = request.client_id
-            grpc_request.session_id = request.session_id
-            grpc_request.request_id = request.request_id
-            grpc_request.source_language = request.source_language
-            grpc_request.temperature = request.temperature
-            grpc_request.max_tokens = request.max_tokens
-
-            async for response in grpc_client.OutputStreaming(grpc_request):
-                yield LLMResponse.from_pb2_model(response)
+            # 從通道池取得異步 gRPC 通道和客戶端
+            async with grpc_channel.connect() as channel:
+                grpc_client = llm_pb2_grpc.LLMServiceStub(channel)
+
+                # 轉換 Context 列表
+                grpc_contexts = []
+                for ctx in request.context:
+                    grpc_context = llm_pb2.Context()
+                    grpc_context.role = ctx.role
+                    grpc_context.content = ctx.content
+                    grpc_contexts.append(grpc_context)
+
+                # 建立 gRPC 請求
+                grpc_request = llm_pb2.LLMRequest()
+                grpc_request.model_id = request.model_id
+                grpc_request.prompt = request.prompt
+                grpc_request.context.extend(grpc_contexts)
+                grpc_request.client_id = request.client_id
+                grpc_request.session_id = request.session_id
+                grpc_request.request_id = request.request_id
+                grpc_request.source_language = request.source_language
+                grpc_request.temperature = request.temperature
+                grpc_request.max_tokens = request.max_tokens
+
+                call = grpc_client.OutputStreaming(
+                    grpc_request, timeout=grpc_channel.call_timeout()
+                )
+                try:
+                    async for response in call:
+                        yield LLMResponse.from_pb2_model(response)
+                finally:
+                    # 呼叫端停止讀取 (取消或提前關閉) 時，一併取消下游的 RPC
+                    call.cancel()
 
         @brick.get_service_info()
         async def get_service_info_handler() -> ServiceInfoResponse:
             """異步服務信息處理器"""
-            
-            # 建立異步 gRPC 通道和客戶端
-            channel = grpc.aio.insecure_channel(remote_address)
-            grpc_client = llm_pb2_grpc.LLMServiceStub(channel)
-
-            request = common_pb2.ServiceInfoRequest()
-            response = await grpc_client.GetServiceInfo(request)
-            return ServiceInfoResponse(
-                service_name=response.service_name,
-                version=response.version,
-                models=[
-                    ModelInfo(
-                        model_id=model.model_id,
-                        version=model.version,
-                        supported_languages=list(model.supported_languages),
-                        support_streaming=model.support_streaming,
-                        description=model.description,
-                    )
-                    for model in response.models
-                ],
-                error=ErrorDetail.from_pb2_model(response.error) if response.error else None,
-            )
+
+            # 從通道池取得異步 gRPC 通道和客戶端
+            async with grpc_channel.connect() as channel:
+                grpc_client = llm_pb2_grpc.LLMServiceStub(channel)
+
+                request = common_pb2.ServiceInfoRequest()
+                response = await grpc_client.GetServiceInfo(
+                    request, timeout=grpc_channel.call_timeout()
+                )
+                return ServiceInfoResponse(
+                    service_name=response.service_name,
+                    version=response.version,
+                    models=[
+                        ModelInfo(
+                            model_id=model.model_id,
+                            version=model.version,
+                            supported_languages=list(model.supported_languages),
+                            support_streaming=model.support_streaming,
+                            description=model.description,
+                        )
+                        for model in response.models
+                    ],
+                    error=(
+                        ErrorDetail.from_pb2_model(response.error)
+                        if response.error
+                        else None
+                    ),
+                )
 
         return brick
@@ -10,6 +10,7 @@ from openai.types.chat import ChatCompletion, ChatCompletionChunk
 
 from llmbrick.bricks.llm.base_llm import LLMBrick
 from llmbrick.core.brick import unary_handler, output_streaming_handler, get_service_info_handler
+from llmbrick.core.context import time_remaining
 from llmbrick.protocols.models.bricks.common_types import ErrorDetail, ServiceInfoResponse
 from llmbrick.protocols.models.bricks.llm_types import LLMRequest, LLMResponse, Context
 from llmbrick.core.error_codes import ErrorCodes
@@ -86,13 +87,20 @@ class OpenAIGPTBrick(LLMBrick):
             "content": request.prompt or self.default_prompt
         })
         
+        # Bound the API call by the remaining request deadline, if any
+        options = {}
+        remaining = time_remaining()
+        if remaining is not None:
+            options["timeout"] = remaining
+
         # Call OpenAI API
         return await self.client.chat.completions.create(
             model=request.model_id or self.model_id,
             messages=messages,
             temperature=request.temperature,
             max_tokens=request.max_tokens if request.max_tokens > 0 else None,
-            stream=stream
+            stream=stream,
+            **options
         )
 
     @unary_handler
@@ -134,16 +142,23 @@ class OpenAIGPTBrick(LLMBrick):
             LLMResponse: Generated response chunks.
         """
         try:
-            async for chunk in await self._create_chat_completion(request, stream=True):
-                if not chunk.choices[0].delta.content:
-                    continue
-                    
-                yield LLMResponse(
-                    text=chunk.choices[0].delta.content,
-                    tokens=[],  # OpenAI doesn't provide token-by-token breakdown
-                    is_final=False,
-                    error=ErrorDetail(code=ErrorCodes.SUCCESS, message="Success")
-                )
+            stream = await self._create_chat_completion(request, stream=True)
+            try:
+                async for chunk in stream:
+                    if not chunk.choices[0].delta.content:
+                        continue
+
+                    yield LLMResponse(
+                        text=chunk.choices[0].delta.content,
+                        tokens=[],  # OpenAI doesn't provide token-by-token breakdown
+                        is_final=False,
+                        error=ErrorDetail(code=ErrorCodes.SUCCESS, message="Success")
+                    )
+            finally:
+                # Release the HTTP connection when the caller cancels or goes away
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    await close()
                 
             # Send final chunk
             yield LLMResponse(
@@ -0,0 +1,327 @@
+"""
+LLMBrick 的 prompt 快取
+
+許多 LLMRequest 只有空白、大小寫或 context 順序不同，卻每次都要付出完整的模型延遲與費用。
+開啟後 LLMBrick.run_unary / run_output_streaming 會先查詢快取：
+
+    brick.enable_prompt_cache(max_temperature=0.3)
+    brick.enable_prompt_cache(similarity_threshold=0.92, replay_rate=50)
+
+- 精確比對: (model_id, prompt, context, temperature, max_tokens) 正規化後雜湊；
+  文字去除多餘空白並忽略大小寫，context 依內容排序
+- 相似比對 (選用): 以本地 embedding 與向量索引找出最相近的已快取 prompt，
+  相似度達 similarity_threshold 才視為命中；model_id / temperature / max_tokens 必須完全相同
+- 重播: 串流請求命中時，依 replay_chunk_size 切分快取的回答，以 replay_rate (chunks/sec) 送出
+- 只有 temperature <= max_temperature 的請求會查詢與寫入快取，高溫度的請求預期每次結果不同
+- 開啟相似比對時，LLMBrick 以 alookup / astore 在執行緒池 (get_executor("thread"))
+  中計算 embedding 與搜尋向量索引，不阻塞 event loop；精確比對只做一次雜湊，直接在 event loop 上執行
+
+embedding 與向量索引可替換：embedder 為 str -> 向量的函式 (例如本地的 sentence-transformers 模型)，
+index_factory 建立 VectorIndex 的實作。預設的 HashedNgramEmbedder 不需要額外套件或下載模型，
+適合捕捉拼字與措辭上的小差異，但不理解語意。
+
+指標 (全域 MetricsRegistry)：
+- llmbrick_prompt_cache_hits_total: 命中數，標籤 brick / match (exact / similar)
+- llmbrick_prompt_cache_misses_total: 未命中數，標籤 brick
+"""
+
+import abc
+import asyncio
+import collections
+import hashlib
+import json
+import math
+import operator
+import threading
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from llmbrick.core.cache import MemoryBackend
+from llmbrick.core.error_codes import ErrorCodes
+from llmbrick.core.executors import THREAD, get_executor
+from llmbrick.protocols.models.bricks.common_types import ErrorDetail
+from llmbrick.protocols.models.bricks.llm_types import LLMRequest, LLMResponse
+from llmbrick.utils.metrics import MetricsRegistry, get_registry
+
+Vector = Sequence[float]
+Embedder = Callable[[str], Vector]
+
+MATCH_EXACT = "exact"
+MATCH_SIMILAR = "similar"
+
+
+def normalize_text(text: str) -> str:
+    """去除前後與重複的空白並忽略大小寫"""
+    return " ".join(text.split()).casefold()
+
+
+class HashedNgramEmbedder:
+    """
+    字元 n-gram 雜湊到固定維度的 embedding (feature hashing)，向量已做 L2 正規化。
+    不需要模型檔，對錯字、標點與措辭的小差異有效，不理解同義詞。
+
+    :param dim: 向量維度
+    :param ngram: 字元 n-gram 長度
+    """
+
+    def __init__(self, dim: int = 256, ngram: int = 3):
+        if dim <= 0 or ngram <= 0:
+            raise ValueError("dim and ngram must be > 0")
+        self.dim = dim
+        self.ngram = ngram
+
+    def __call__(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+        padded = f" {text} "
+        for i in range(max(1, len(padded) - self.ngram + 1)):
+            gram = padded[i : i + self.ngram].encode("utf-8")
+            h = int.from_bytes(hashlib.blake2b(gram, digest_size=8).digest(), "little")
+            # 以雜湊的最高位決定正負號，降低碰撞造成的偏差
+            vector[h % self.dim] += 1.0 if h >> 63 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm == 0:
+            return vector
+        return [v / norm for v in vector]
+
+
+class VectorIndex(abc.ABC):
+    """向量索引介面，向量需已做 L2 正規化 (內積即餘弦相似度)"""
+
+    @abc.abstractmethod
+    def add(self, key: str, vector: Vector) -> None: ...
+
+    @abc.abstractmethod
+    def remove(self, key: str) -> None: ...
+
+    @abc.abstractmethod
+    def search(self, vector: Vector) -> Optional[Tuple[str, float]]:
+        """回傳最相近的 (key, 相似度)，索引為空時回傳 None"""
+
+    @abc.abstractmethod
+    def clear(self) -> None: ...
+
+
+class InMemoryVectorIndex(VectorIndex):
+    """
+    暴力搜尋的記憶體向量索引，超過 max_entries 時移除最早加入的向量。
+    快取規模 (數千筆以內) 下搜尋時間遠小於一次模型呼叫。
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._vectors: "collections.OrderedDict[str, Vector]" = (
+            collections.OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def add(self, key: str, vector: Vector) -> None:
+        self._vectors[key] = vector
+        self._vectors.move_to_end(key)
+        while len(self._vectors) > self.max_entries:
+            self._vectors.popitem(last=False)
+
+    def remove(self, key: str) -> None:
+        self._vectors.pop(key, None)
+
+    def search(self, vector: Vector) -> Optional[Tuple[str, float]]:
+        best: Optional[Tuple[str, float]] = None
+        for key, candidate in self._vectors.items():
+            score = sum(map(operator.mul, vector, candidate))
+            if best is None or score > best[1]:
+                best = (key, score)
+        return best
+
+    def clear(self) -> None:
+        self._vectors.clear()
+
+
+class PromptCache:
+    """
+    LLM 回答的快取
+
+    :param max_entries: 最多保存的回答數 (LRU)
+    :param ttl: 回答存活秒數，None 表示不過期
+    :param max_temperature: temperature 不超過此值的請求才使用快取
+    :param similarity_threshold: 相似比對的餘弦相似度門檻，None 表示只做精確比對
+    :param embedder: 相似比對使用的 embedding 函式，預設 HashedNgramEmbedder
+    :param index_factory: 建立向量索引的函式，預設 InMemoryVectorIndex
+    :param replay_chunk_size: 串流重播時每個 chunk 的字元數
+    :param replay_rate: 串流重播每秒送出的 chunk 數，None 表示不延遲
+    :param name: 指標的 brick 標籤
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[float] = 3600.0,
+        max_temperature: float = 0.3,
+        similarity_threshold: Optional[float] = None,
+        embedder: Optional[Embedder] = None,
+        index_factory: Optional[Callable[[], VectorIndex]] = None,
+        replay_chunk_size: int = 16,
+        replay_rate: Optional[float] = None,
+        name: str = "",
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        if similarity_threshold is not None and not 0 < similarity_threshold <= 1:
+            raise ValueError("similarity_threshold must be in (0, 1]")
+        if replay_chunk_size <= 0:
+            raise ValueError("replay_chunk_size must be > 0")
+        if replay_rate is not None and replay_rate <= 0:
+            raise ValueError("replay_rate must be > 0")
+        self.max_entries = max_entries
+        self.max_temperature = max_temperature
+        self.similarity_threshold = similarity_threshold
+        self.embedder: Embedder = embedder or HashedNgramEmbedder()
+        self._index_factory = index_factory or (
+            lambda: InMemoryVectorIndex(max_entries)
+        )
+        self.replay_chunk_size = replay_chunk_size
+        self.replay_rate = replay_rate
+        self.name = name
+        self._answers = MemoryBackend(max_entries, ttl)
+        # 相似比對只在參數 (model_id / temperature / max_tokens) 相同的 prompt 之間進行
+        self._indexes: Dict[str, VectorIndex] = {}
+        # alookup / astore 在執行緒中存取向量索引
+        self._index_lock = threading.Lock()
+        registry = registry or get_registry()
+        self._hits = registry.counter(
+            "llmbrick_prompt_cache_hits_total",
+            "LLM requests answered from the prompt cache",
+            ("brick", "match"),
+        )
+        self._misses = registry.counter(
+            "llmbrick_prompt_cache_misses_total",
+            "LLM prompt cache misses",
+            ("brick",),
+        )
+
+    def cacheable(self, request: LLMRequest) -> bool:
+        return request.temperature <= self.max_temperature
+
+    @staticmethod
+    def _keys(
+        request: LLMRequest, default_prompt: str = "", default_model: str = ""
+    ) -> Tuple[str, str, str]:
+        """回傳 (參數 key, 正規化後的內容文字, 精確比對 key)"""
+        params = json.dumps(
+            [
+                request.model_id or default_model,
+                round(request.temperature, 3),
+                request.max_tokens,
+            ]
+        )
+        context = sorted(
+            (normalize_text(c.role), normalize_text(c.content)) for c in request.context
+        )
+        prompt = normalize_text(request.prompt or default_prompt)
+        content = "\n".join([f"{role}: {text}" for role, text in context] + [prompt])
+        digest = hashlib.sha256(f"{params}\n{content}".encode("utf-8")).hexdigest()
+        return params, content, digest
+
+    def lookup(
+        self, request: LLMRequest, default_prompt: str = "", default_model: str = ""
+    ) -> Optional[str]:
+        """回傳快取的回答，未命中或 temperature 過高時回傳 None"""
+        if not self.cacheable(request):
+            return None
+        params, content, key = self._keys(request, default_prompt, default_model)
+        answer = self._answers.get(key)
+        if answer is not None:
+            self._hits.inc(brick=self.name, match=MATCH_EXACT)
+            return answer.decode("utf-8")
+        if self.similarity_threshold is not None and params in self._indexes:
+            vector = self.embedder(content)
+            with self._index_lock:
+                index = self._indexes.get(params)
+                found = index.search(vector) if index else None
+            if found is not None and found[1] >= self.similarity_threshold:
+                answer = self._answers.get(found[0])
+                if answer is not None:
+                    self._hits.inc(brick=self.name, match=MATCH_SIMILAR)
+                    return answer.decode("utf-8")
+                # 回答已過期或被淘汰
+                with self._index_lock:
+                    if index is not None:
+                        index.remove(found[0])
+        self._misses.inc(brick=self.name)
+        return None
+
+    def store(
+        self,
+        request: LLMRequest,
+        answer: str,
+        default_prompt: str = "",
+        default_model: str = "",
+    ) -> None:
+        if not self.cacheable(request):
+            return
+        params, content, key = self._keys(request, default_prompt, default_model)
+        self._answers.set(key, answer.encode("utf-8"))
+        if self.similarity_threshold is not None:
+            vector = self.embedder(content)
+            with self._index_lock:
+                index = self._indexes.get(params)
+                if index is None:
+                    index = self._indexes[params] = self._index_factory()
+                index.add(key, vector)
+
+    async def alookup(
+        self, request: LLMRequest, default_prompt: str = "", default_model: str = ""
+    ) -> Optional[str]:
+        """lookup 的非同步版本，相似比對在執行緒池中進行"""
+        if self.similarity_threshold is None or not self.cacheable(request):
+            return self.lookup(request, default_prompt, default_model)
+        result: Optional[str] = await get_executor(THREAD).run(
+            self.lookup, request, default_prompt, default_model
+        )
+        return result
+
+    async def astore(
+        self,
+        request: LLMRequest,
+        answer: str,
+        default_prompt: str = "",
+        default_model: str = "",
+    ) -> None:
+        """store 的非同步版本，相似比對的 embedding 在執行緒池中計算"""
+        if self.similarity_threshold is None or not self.cacheable(request):
+            self.store(request, answer, default_prompt, default_model)
+            return
+        await get_executor(THREAD).run(
+            self.store, request, answer, default_prompt, default_model
+        )
+
+    def clear(self) -> None:
+        self._answers.clear()
+        with self._index_lock:
+            for index in self._indexes.values():
+                index.clear()
+            self._indexes.clear()
+
+    async def replay(self, answer: str) -> AsyncIterator[LLMResponse]:
+        """以串流形式重播快取的回答，最後送出 is_final 的空 chunk"""
+        interval = 1.0 / self.replay_rate if self.replay_rate else 0.0
+        size = self.replay_chunk_size
+        for start in range(0, len(answer), size):
+            if interval and start:
+                await asyncio.sleep(interval)
+            yield LLMResponse(
+                text=answer[start : start + size],
+                is_final=False,
+                error=ErrorDetail(code=ErrorCodes.SUCCESS, message="Success"),
+            )
+        yield LLMResponse(
+            text="",
+            is_final=True,
+            error=ErrorDetail(code=ErrorCodes.SUCCESS, message="Success"),
+        )
@@ -1,8 +1,12 @@
 import warnings
+from typing import List
 
+import grpc
 from deprecated import deprecated
 
 from llmbrick.core.brick import BaseBrick, BrickType
+from llmbrick.core.channel_pool import RemoteAddress
+from llmbrick.core.error_codes import ErrorCodes
 from llmbrick.protocols.models.bricks.common_types import (
     ErrorDetail,
     ServiceInfoResponse,
@@ -23,10 +27,12 @@ class RetrievalBrick(BaseBrick[RetrievalRequest, RetrievalResponse]):
     gRPC提中以下方法：
     - GetServiceInfo: 用於獲取服務信息。
     - Unary: 用於檢索數據。
+    - BatchUnary: 一次處理多筆 Unary 請求。
 
     gRPC服務與Brick的Handler對應表： (gRPC方法 -> Brick Handler)
     - GetServiceInfo -> get_service_info
     - Unary -> unary
+    - BatchUnary -> run_batch (@batch_handler，未定義時平行執行 unary)
 
     """
 
@@ -77,74 +83,112 @@ class RetrievalBrick(BaseBrick[RetrievalRequest, RetrievalResponse]):
         )
 
     @classmethod
-    def toGrpcClient(cls, remote_address: str, **kwargs):
+    def toGrpcClient(cls, remote_address: RemoteAddress, **kwargs):
         """
         將 RetrievalBrick 轉換為異步 gRPC 客戶端。
 
         Args:
-            remote_address: gRPC 伺服器地址，格式為 "host:port"
-            **kwargs: 傳遞給 RetrievalBrick 建構子的額外參數
+            remote_address: gRPC 伺服器地址，格式為 "host:port"；
+                亦可為多個副本的地址列表或 "dns:///host:port"，呼叫會做 client 端負載平衡
+            **kwargs: 傳遞給 RetrievalBrick 建構子的額外參數，
+                通道參數 (channel_pool 等) 會先被取出，見 BaseBrick._build_grpc_channel
 
         Returns:
             配置為異步 gRPC 客戶端的 RetrievalBrick 實例
         """
-        import grpc
-
         from llmbrick.protocols.grpc.retrieval import retrieval_pb2_grpc, retrieval_pb2
         from llmbrick.protocols.grpc.common import common_pb2
 
-        # 建立異步 gRPC 通道和客戶端
-        channel = grpc.aio.insecure_channel(remote_address)
-        grpc_client = retrieval_pb2_grpc.RetrievalServiceStub(channel)
+        # 從通道池取得共用通道，呼叫結束後不關閉，由 brick.aclose() 釋放
+        grpc_channel = cls._build_grpc_channel(remote_address, kwargs)
 
         # 建立 brick 實例
         brick = cls(**kwargs)
+        brick._grpc_channel = grpc_channel
 
         @brick.unary()
         async def unary_handler(request: RetrievalRequest) -> RetrievalResponse:
             """異步單次請求處理器"""
 
-            # 建立異步 gRPC 通道和客戶端
-            channel = grpc.aio.insecure_channel(remote_address)
-            grpc_client = retrieval_pb2_grpc.RetrievalServiceStub(channel)
-
-            # 建立 gRPC 請求
-            grpc_request = retrieval_pb2.RetrievalRequest()
-            grpc_request.query = request.query
-            grpc_request.max_results = request.max_results
-            grpc_request.client_id = request.client_id
-            grpc_request.session_id = request.session_id
-            grpc_request.request_id = request.request_id
-            grpc_request.source_language = request.source_language
-
-            response = await grpc_client.Unary(grpc_request)
-            
-            return RetrievalResponse.from_pb2_model(response)
+            # 從通道池取得異步 gRPC 通道和客戶端
+            async with grpc_channel.connect() as channel:
+                grpc_client = retrieval_pb2_grpc.RetrievalServiceStub(channel)
+
+                # 建立 gRPC 請求
+                grpc_request = retrieval_pb2.RetrievalRequest()
+                grpc_request.query = request.query
+                grpc_request.max_results = request.max_results
+                grpc_request.client_id = request.client_id
+                grpc_request.session_id = request.session_id
+                grpc_request.request_id = request.request_id
+                grpc_request.source_language = request.source_language
+
+                response = await grpc_client.Unary(
+                    grpc_request, timeout=grpc_channel.call_timeout()
+                )
+
+                return RetrievalResponse.from_pb2_model(response)
+
+        @brick.batch_unary()
+        async def batch_unary_handler(
+            requests: List[RetrievalRequest],
+        ) -> List[RetrievalResponse]:
+            """異步批次請求處理器，以一次 BatchUnary RPC 送出所有請求"""
+
+            async with grpc_channel.connect() as channel:
+                grpc_client = retrieval_pb2_grpc.RetrievalServiceStub(channel)
+                grpc_request = retrieval_pb2.RetrievalBatchRequest(
+                    requests=[request.to_pb2() for request in requests]
+                )
+                try:
+                    response = await grpc_client.BatchUnary(
+                        grpc_request, timeout=grpc_channel.call_timeout()
+                    )
+                    unimplemented = False
+                except grpc.aio.AioRpcError as e:
+                    if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+                        raise
+                    unimplemented = True
+
+            if unimplemented:
+                # 舊版伺服器沒有 BatchUnary：釋放通道後改為平行送出 Unary，
+                # 最多 batch_concurrency 個同時進行，單筆失敗只影響對應的結果
+                return await brick._run_unary_parallel(
+                    requests, brick.batch_concurrency
+                )
+
+            if response.error.code != ErrorCodes.SUCCESS:
+                # 整批失敗時每一筆都帶有同一個錯誤
+                error = ErrorDetail.from_pb2_model(response.error)
+                return [RetrievalResponse(error=error) for _ in requests]
+            return [RetrievalResponse.from_pb2_model(r) for r in response.responses]
 
         @brick.get_service_info()
         async def get_service_info_handler() -> ServiceInfoResponse:
             """異步服務信息處理器"""
 
-            # 建立異步 gRPC 通道和客戶端
-            channel = grpc.aio.insecure_channel(remote_address)
-            grpc_client = retrieval_pb2_grpc.RetrievalServiceStub(channel)
-            
-            request = common_pb2.ServiceInfoRequest()
-            response = await grpc_client.GetServiceInfo(request)
-            return ServiceInfoResponse(
-                service_name=response.service_name,
-                version=response.version,
-                models=[
-                    ModelInfo(
-                        model_id=model.model_id,
-                        version=model.version,
-                        supported_languages=list(model.supported_languages),
-                        support_streaming=model.support_streaming,
-                        description=getattr(model, "description", ""),
-                    )
-                    for model in response.models
-                ],
-                error=ErrorDetail.from_pb2_model(response.error) if response.error else None,
-            )
+            # 從通道池取得異步 gRPC 通道和客戶端
+            async with grpc_channel.connect() as channel:
+                grpc_client = retrieval_pb2_grpc.RetrievalServiceStub(channel)
+
+                request = common_pb2.ServiceInfoRequest()
+                response = await grpc_client.GetServiceInfo(
+                    request, timeout=grpc_channel.call_timeout()
+                )
+                return ServiceInfoResponse(
+                    service_name=response.service_name,
+                    version=response.version,
+                    models=[
+                        ModelInfo(
+                            model_id=model.model_id,
+                            version=model.version,
+                            supported_languages=list(model.supported_languages),
+                            support_streaming=model.support_streaming,
+                            description=getattr(model, "description", ""),
+                        )
+                        for model in response.models
+                    ],
+                    error=ErrorDetail.from_pb2_model(response.error) if response.error else None,
+                )
 
         return brick
@@ -1,8 +1,11 @@
 import warnings
+from typing import Optional
 
 from deprecated import deprecated
 
 from llmbrick.core.brick import BaseBrick, BrickType
+from llmbrick.core.channel_pool import RemoteAddress
+from llmbrick.core.coalesce import merge_text_chunks, text_chunk_size
 from llmbrick.protocols.models.bricks.common_types import (
     ErrorDetail,
     ServiceInfoResponse,
@@ -39,6 +42,15 @@ class TranslateBrick(BaseBrick[TranslateRequest, TranslateResponse]):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+    def merge_output_chunks(
+        self, previous: TranslateResponse, chunk: TranslateResponse
+    ) -> Optional[TranslateResponse]:
+        """串流合併時串接相鄰 chunk 的 text/tokens，最終或錯誤 chunk 不合併"""
+        return merge_text_chunks(previous, chunk)
+
+    def output_chunk_size(self, chunk: TranslateResponse) -> int:
+        return text_chunk_size(chunk)
+
     @deprecated(reason="TranslateBrick does not support bidi_streaming handler.")
     def bidi_streaming(self):
         """
@@ -66,93 +78,108 @@ class TranslateBrick(BaseBrick[TranslateRequest, TranslateResponse]):
         )
 
     @classmethod
-    def toGrpcClient(cls, remote_address: str, **kwargs):
+    def toGrpcClient(cls, remote_address: RemoteAddress, **kwargs):
         """
         將 TranslateBrick 轉換為異步 gRPC 客戶端。
 
         Args:
-            remote_address: gRPC 伺服器地址，格式為 "host:port"
-            **kwargs: 傳遞給 TranslateBrick 建構子的額外參數
+            remote_address: gRPC 伺服器地址，格式為 "host:port"；
+                亦可為多個副本的地址列表或 "dns:///host:port"，呼叫會做 client 端負載平衡
+            **kwargs: 傳遞給 TranslateBrick 建構子的額外參數，
+                通道參數 (channel_pool 等) 會先被取出，見 BaseBrick._build_grpc_channel
 
         Returns:
             配置為異步 gRPC 客戶端的 TranslateBrick 實例
         """
-        import grpc
-
         from llmbrick.protocols.grpc.translate import translate_pb2_grpc, translate_pb2
         from llmbrick.protocols.grpc.common import common_pb2
 
+        # 從通道池取得共用通道，呼叫結束後不關閉，由 brick.aclose() 釋放
+        grpc_channel = cls._build_grpc_channel(remote_address, kwargs)
+
         # 建立 brick 實例
         brick = cls(**kwargs)
+        brick._grpc_channel = grpc_channel
 
         @brick.unary()
         async def unary_handler(request: TranslateRequest) -> TranslateResponse:
             """異步單次請求處理器"""
 
-            # 建立異步 gRPC 通道和客戶端
-            channel = grpc.aio.insecure_channel(remote_address)
-            grpc_client = translate_pb2_grpc.TranslateServiceStub(channel)
+            # 從通道池取得異步 gRPC 通道和客戶端
+            async with grpc_channel.connect() as channel:
+                grpc_client = translate_pb2_grpc.TranslateServiceStub(channel)
 
-            # 建立 gRPC 請求
-            grpc_request = translate_pb2.TranslateRequest()
-            grpc_request.text = request.text
-            grpc_request.model_id = request.model_id
-            grpc_request.target_language = request.target_language
-            grpc_request.client_id = request.client_id
-            grpc_request.session_id = request.session_id
-            grpc_request.request_id = request.request_id
-            grpc_request.source_language = request.source_language
+                # 建立 gRPC 請求
+                grpc_request = translate_pb2.TranslateRequest()
+                grpc_request.text = request.text
+                grpc_request.model_id = request.model_id
+                grpc_request.target_language = request.target_language
+                grpc_request.client_id = request.client_id
+                grpc_request.session_id = request.session_id
+                grpc_request.request_id = request.request_id
+                grpc_request.source_language = request.source_language
 
-            response = await grpc_client.Unary(grpc_request)
+                response = await grpc_client.Unary(
+                    grpc_request, timeout=grpc_channel.call_timeout()
+                )
 
-            # 將 protobuf 回應轉換為 TranslateResponse
-            return TranslateResponse.from_pb2_model(response)
+                # 將 protobuf 回應轉換為 TranslateResponse
+                return TranslateResponse.from_pb2_model(response)
 
         @brick.output_streaming()
         async def output_streaming_handler(request: TranslateRequest):
             """異步流式輸出處理器"""
 
-            # 建立異步 gRPC 通道和客戶端
-            channel = grpc.aio.insecure_channel(remote_address)
-            grpc_client = translate_pb2_grpc.TranslateServiceStub(channel)
-
-            # 建立 gRPC 請求
-            grpc_request = translate_pb2.TranslateRequest()
-            grpc_request.text = request.text
-            grpc_request.model_id = request.model_id
-            grpc_request.target_language = request.target_language
-            grpc_request.client_id = request.client_id
-            grpc_request.session_id = request.session_id
-            grpc_request.request_id = request.request_id
-            grpc_request.source_language = request.source_language
-
-            async for response in grpc_client.OutputStreaming(grpc_request):
-                yield TranslateResponse.from_pb2_model(response)
+            # 從通道池取得異步 gRPC 通道和客戶端
+            async with grpc_channel.connect() as channel:
+                grpc_client = translate_pb2_grpc.TranslateServiceStub(channel)
+
+                # 建立 gRPC 請求
+                grpc_request = translate_pb2.TranslateRequest()
+                grpc_request.text = request.text
+                grpc_request.model_id = request.model_id
+                grpc_request.target_language = request.target_language
+                grpc_request.client_id = request.client_id
+                grpc_request.session_id = request.session_id
+                grpc_request.request_id = request.request_id
+                grpc_request.source_language = request.source_language
+
+                call = grpc_client.OutputStreaming(
+                    grpc_request, timeout=grpc_channel.call_timeout()
+                )
+                try:
+                    async for response in call:
+                        yield TranslateResponse.from_pb2_model(response)
+                finally:
+                    # 呼叫端停止讀取 (取消或提前關閉) 時，一併取消下游的 RPC
+                    call.cancel()
 
         @brick.get_service_info()
         async def get_service_info_handler() -> ServiceInfoResponse:
             """異步服務信息處理器"""
 
-            # 建立異步 gRPC 通道和客戶端
-            channel = grpc.aio.insecure_channel(remote_address)
-            grpc_client = translate_pb2_grpc.TranslateServiceStub(channel)
-
-            request = common_pb2.ServiceInfoRequest()
-            response = await grpc_client.GetServiceInfo(request)
-            return ServiceInfoResponse(
-                service_name=response.service_name,
-                version=response.version,
-                models=[
-                    ModelInfo(
-                        model_id=model.model_id,
-                        version=model.version,
-                        supported_languages=list(model.supported_languages),
-                        support_streaming=model.support_streaming,
-                        description=getattr(model, "description", ""),
-                    )
-                    for model in response.models
-                ],
-                error=ErrorDetail.from_pb2_model(response.error) if response.error else None,
-            )
+            # 從通道池取得異步 gRPC 通道和客戶端
+            async with grpc_channel.connect() as channel:
+                grpc_client = translate_pb2_grpc.TranslateServiceStub(channel)
+
+                request = common_pb2.ServiceInfoRequest()
+                response = await grpc_client.GetServiceInfo(
+                    request, timeout=grpc_channel.call_timeout()
+                )
+                return ServiceInfoResponse(
+                    service_name=response.service_name,
+                    version=response.version,
+                    models=[
+                        ModelInfo(
+                            model_id=model.model_id,
+                            version=model.version,
+                            supported_languages=list(model.supported_languages),
+                            support_streaming=model.support_streaming,
+                            description=getattr(model, "description", ""),
+                        )
+                        for model in response.models
+                    ],
+                    error=ErrorDetail.from_pb2_model(response.error) if response.error else None,
+                )
 
         return brick
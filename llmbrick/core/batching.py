@@ -0,0 +1,156 @@
+"""
+llmbrick.core.batching
+----------------------
+unary 請求的微批次 (micro-batching)。
+
+本地模型 (意圖分類、guard、embedding 檢索) 一次處理一批輸入遠比逐筆處理有效率。
+以 @batch_handler 標記的 handler 接收請求的 list 並回傳相同長度、相同順序的結果 list；
+同時進行的 run_unary 呼叫會被收集成一批，呼叫一次 handler 後再把結果分送回各呼叫端：
+
+    class MyIntention(IntentionBrick):
+        @batch_handler(max_batch_size=32, max_wait_ms=5)
+        async def classify(
+            self, requests: List[IntentionRequest]
+        ) -> List[IntentionResponse]:
+            ...
+
+- 收集到 max_batch_size 筆立即執行，否則自第一筆起最多等待 max_wait_ms
+- 結果 list 中的 Exception 只會拋給對應的呼叫端；handler 本身拋出例外時整批都收到該例外
+- 在等待中被取消的請求不會送進 handler
+- 同步 handler 與 @unary_handler 相同，可用 executor= 交給執行緒 / 行程池
+
+指標 (全域 MetricsRegistry，標籤 brick)：
+- llmbrick_batch_size: 每批的請求數
+- llmbrick_batch_wait_seconds: 每筆請求從送出到所屬批次開始執行的等待時間
+- llmbrick_batch_duration_seconds: 每批 handler 的執行時間
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+from llmbrick.utils.metrics import MetricsRegistry, get_registry
+
+BatchFunc = Callable[[List[Any]], Awaitable[List[Any]]]
+
+_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+_WAIT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+
+@dataclass
+class BatchPolicy:
+    """
+    :param max_batch_size: 每批最多的請求數
+    :param max_wait_ms: 第一筆請求最多等待其他請求的毫秒數
+    """
+
+    max_batch_size: int = 32
+    max_wait_ms: float = 5.0
+
+    def __post_init__(self) -> None:
+        if self.max_batch_size <= 0:
+            raise ValueError("max_batch_size must be > 0")
+        if self.max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be >= 0")
+
+
+class MicroBatcher:
+    """
+    將同時送出的單筆請求收集成批次後呼叫 func。須在單一 event loop 中使用。
+
+    :param func: 接收請求 list、回傳等長結果 list 的 async 函式
+    :param policy: 批次大小與等待時間
+    :param name: 指標的 brick 標籤
+    """
+
+    def __init__(
+        self,
+        func: BatchFunc,
+        policy: BatchPolicy,
+        name: str = "",
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        self.func = func
+        self.policy = policy
+        self.name = name
+        self._pending: List[Tuple[Any, "asyncio.Future[Any]", float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: Set["asyncio.Task[None]"] = set()
+        registry = registry or get_registry()
+        self._size = registry.histogram(
+            "llmbrick_batch_size",
+            "Requests per micro-batch",
+            ("brick",),
+            buckets=_SIZE_BUCKETS,
+        )
+        self._wait = registry.histogram(
+            "llmbrick_batch_wait_seconds",
+            "Time a request waited for its micro-batch to start",
+            ("brick",),
+            buckets=_WAIT_BUCKETS,
+        )
+        self._duration = registry.histogram(
+            "llmbrick_batch_duration_seconds",
+            "Micro-batch handler duration",
+            ("brick",),
+        )
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def submit(self, item: Any) -> Any:
+        """加入下一批並等待其結果"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+        if len(self._pending) >= self.policy.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.policy.max_wait_ms / 1000, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # 略過等待中已被取消的請求
+        pending = [entry for entry in self._pending if not entry[1].done()]
+        self._pending = []
+        size = self.policy.max_batch_size
+        for start in range(0, len(pending), size):
+            task = asyncio.ensure_future(self._run(pending[start : start + size]))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[Any, "asyncio.Future[Any]", float]]) -> None:
+        started = time.perf_counter()
+        self._size.observe(len(batch), brick=self.name)
+        for _, _, enqueued_at in batch:
+            self._wait.observe(started - enqueued_at, brick=self.name)
+        try:
+            results = await self.func([item for item, _, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"batch handler returned {len(results)} results "
+                    f"for {len(batch)} requests"
+                )
+        except asyncio.CancelledError:
+            for _, future, _ in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._duration.observe(time.perf_counter() - started, brick=self.name)
+        for (_, future, _), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
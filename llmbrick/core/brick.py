@@ -1,18 +1,82 @@
+import asyncio
 import functools
+import inspect
 from enum import Enum
-from typing import AsyncIterator, Awaitable, Callable, Generic, Optional, TypeVar
-
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from llmbrick.core.batching import BatchPolicy, MicroBatcher
+from llmbrick.core.cache import MISSING, ResponseCache, request_fingerprint
+from llmbrick.core.coalesce import StreamCoalescing, coalesce_stream
+from llmbrick.core.error_codes import ErrorCodes
+from llmbrick.core.exceptions import ValidationException
+from llmbrick.core.executors import get_executor
+from llmbrick.core.singleflight import SingleFlight
 from llmbrick.protocols.models.bricks.common_types import ServiceInfoResponse
 from llmbrick.utils.logging import log_function
+from llmbrick.utils.memory_profiler import get_memory_profiler
+
+if TYPE_CHECKING:
+    from llmbrick.core.channel_pool import BrickChannel, RemoteAddress
 
+_memory_profiler = get_memory_profiler()
 
 InputT = TypeVar("InputT")
 OutputT = TypeVar("OutputT")
 
 # --- 強型別 decorator，避免字串錯誤 ---
-def unary_handler(func: Callable[[InputT], Awaitable[OutputT]]):
-    return _brick_handler("unary")(func)
-    
+def unary_handler(
+    func: Optional[Callable[[InputT], Any]] = None, *, executor: Optional[str] = None
+):
+    """
+    標記 unary handler，可直接使用 @unary_handler 或 @unary_handler(executor="process")。
+
+    同步 (非 async) 的 handler 會交給 executor 執行，不阻塞 event loop：
+    executor 可為 "thread"、"process" 或 register_executor() 註冊的名稱，
+    未指定時使用 brick 的 handler_executor。
+    """
+    if func is None:
+        return _brick_handler("unary", executor)
+    return _brick_handler("unary", executor)(func)
+
+
+def batch_handler(
+    func: Optional[Callable[[List[InputT]], Any]] = None,
+    *,
+    max_batch_size: int = 32,
+    max_wait_ms: float = 5.0,
+    executor: Optional[str] = None,
+):
+    """
+    標記批次 unary handler：handler 接收請求 list，回傳等長、同順序的結果 list。
+    同時進行的 run_unary 呼叫會被收集成一批後呼叫一次 handler，見 llmbrick.core.batching。
+
+    :param max_batch_size: 每批最多的請求數
+    :param max_wait_ms: 第一筆請求最多等待其他請求的毫秒數
+    :param executor: 同步 handler 使用的 executor，與 @unary_handler 相同
+    """
+    policy = BatchPolicy(max_batch_size, max_wait_ms)
+
+    def decorator(f):
+        f = _brick_handler("unary", executor)(f)
+        setattr(f, "_brick_batch_policy", policy)
+        return f
+
+    if func is None:
+        return decorator
+    return decorator(func)
+
 
 def output_streaming_handler(func: Callable[[InputT], AsyncIterator[OutputT]]):
     return _brick_handler("output_streaming")(func)
@@ -31,13 +95,19 @@ def get_service_info_handler(func: Callable[[], ServiceInfoResponse]):
 
 
 # --- Brick Handler Decorator for Class-level Registration ---
-def _brick_handler(call_type: str):
+def _brick_handler(call_type: str, executor: Optional[str] = None):
     """
     用於標記 class method 為 brick handler，call_type 可為 'unary'、'output_streaming' 等
     """
 
     def decorator(func):
+        if executor is not None and inspect.iscoroutinefunction(func):
+            raise TypeError(
+                f"executor 只適用於同步 handler，{func.__qualname__} 是 async 函式"
+            )
         setattr(func, "_brick_handler_type", call_type)
+        if executor is not None:
+            setattr(func, "_brick_executor", executor)
         return func
 
     return decorator
@@ -68,13 +138,61 @@ class GRPCCallType(Enum):
     BIDI_STREAMING = "bidi_streaming"
 
 
+# call_type -> BaseBrick 上對應的 handler 屬性
+_HANDLER_ATTRS = {
+    "unary": "_unary_handler",
+    "output_streaming": "_output_streaming_handler",
+    "input_streaming": "_input_streaming_handler",
+    "bidi_streaming": "_bidi_streaming_handler",
+    "get_service_info": "_get_service_info_handler",
+}
+
+
+def _collect_brick_handlers(cls: type) -> Tuple[Tuple[str, str], ...]:
+    """
+    依 MRO 掃描類別 __dict__，找出帶有 _brick_handler_type 標記的方法。
+    不對實例做 getattr，因此不會觸發 property 等 descriptor。
+    回傳依名稱排序的 (屬性名稱, call_type)，同一 call_type 以排序較後者為準。
+    """
+    members: Dict[str, Any] = {}
+    for klass in reversed(cls.__mro__):
+        members.update(vars(klass))
+    table = []
+    for name in sorted(members):
+        call_type = getattr(members[name], "_brick_handler_type", None)
+        if call_type in _HANDLER_ATTRS and callable(members[name]):
+            table.append((name, call_type))
+    return tuple(table)
+
+
+async def _not_implemented_stream(message: str) -> AsyncIterator[Any]:
+    """未註冊串流 handler 時回傳，與原本的 async generator 一致於第一次迭代時才拋出"""
+    raise NotImplementedError(message)
+    yield  # pragma: no cover
+
+
 class BaseBrick(Generic[InputT, OutputT]):
 
     brick_type: Optional[BrickType] = None
     # 可由子類覆寫，若為 None 則不限制
     allowed_handler_types: Optional[set] = None
-
-    def __init__(self, verbose: bool = True):
+    # 由 __init_subclass__ 計算的 (屬性名稱, call_type) 表
+    _brick_handler_table: Tuple[Tuple[str, str], ...] = ()
+    # 同步 unary handler 預設使用的 executor ("thread" | "process" | 自訂名稱)，
+    # None 時只有以 @unary_handler(executor=...) 標記的同步 handler 會被交給 executor
+    handler_executor: Optional[str] = None
+    # run_batch 單次最多的請求數，超過時整批失敗 (ValidationException)；None 表示不限制
+    max_batch_size: Optional[int] = 1024
+    # run_batch 平行執行 run_unary 的預設最大並發數；None 表示不限制
+    batch_concurrency: Optional[int] = 32
+
+    def __init__(
+        self,
+        verbose: bool = True,
+        stream_coalescing: Optional[StreamCoalescing] = None,
+        response_cache: Optional[ResponseCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+    ):
         self._unary_handler: Optional[UnaryHandler] = None
         self._output_streaming_handler: Optional[OutputStreamingHandler] = None
         self._input_streaming_handler: Optional[InputStreamingHandler] = None
@@ -82,29 +200,50 @@ class BaseBrick(Generic[InputT, OutputT]):
         self._get_service_info_handler: Optional[Callable] = self.__get_service_info
         self.brick_name: str = self.__class__.__name__
         self._verbose: bool = verbose
-
-        # --- 自動註冊 class-level handler ---
-        for attr_name in dir(self):
-            attr = getattr(self, attr_name)
-            if callable(attr) and hasattr(attr, "_brick_handler_type"):
-                call_type = getattr(attr, "_brick_handler_type")
-                # 檢查是否允許此 handler
-                allowed = getattr(self, "allowed_handler_types", None)
-                if allowed is not None and call_type not in allowed:
-                    raise RuntimeError(
-                        f"[{self.brick_name}] 不允許定義 handler: '{call_type}'，"
-                        f"只允許: {sorted(allowed)}"
+        # 非 None 時 run_output_streaming 會合併相鄰的 chunk，見 enable_stream_coalescing
+        self.stream_coalescing: Optional[StreamCoalescing] = stream_coalescing
+        # 非 None 時 run_unary 先查詢快取，見 enable_response_cache
+        self.response_cache: Optional[ResponseCache] = response_cache
+        if response_cache is not None and not response_cache.name:
+            response_cache.name = self.brick_name
+        # 非 None 時 run_unary 合併相同且同時進行的請求，見 enable_single_flight
+        self.single_flight: Optional[SingleFlight] = single_flight
+        if single_flight is not None and not single_flight.name:
+            single_flight.name = self.brick_name
+        # 由 toGrpcClient 設定，指向池化的 gRPC 通道
+        self._grpc_channel: Optional["BrickChannel"] = None
+        # 以 @batch_handler 註冊時的批次 handler 與收集同時請求的 MicroBatcher
+        self._batch_handler: Optional[
+            Callable[[List[InputT]], Awaitable[List[OutputT]]]
+        ] = None
+        self._micro_batcher: Optional[MicroBatcher] = None
+
+        # --- 自動註冊 class-level handler (表格於類別建立時計算一次) ---
+        allowed = self.allowed_handler_types
+        for attr_name, call_type in type(self)._brick_handler_table:
+            # 檢查是否允許此 handler
+            if allowed is not None and call_type not in allowed:
+                raise RuntimeError(
+                    f"[{self.brick_name}] 不允許定義 handler: '{call_type}'，"
+                    f"只允許: {sorted(allowed)}"
+                )
+            handler = getattr(self, attr_name)
+            if call_type == "unary":
+                handler = self._maybe_offload(
+                    handler, getattr(handler, "_brick_executor", None)
+                )
+                policy = getattr(handler, "_brick_batch_policy", None)
+                if policy is not None:
+                    self._batch_handler = handler
+                    self._micro_batcher = MicroBatcher(
+                        handler, policy, name=self.brick_name
                     )
-                if call_type == "unary":
-                    self._unary_handler = attr
-                elif call_type == "output_streaming":
-                    self._output_streaming_handler = attr
-                elif call_type == "input_streaming":
-                    self._input_streaming_handler = attr
-                elif call_type == "bidi_streaming":
-                    self._bidi_streaming_handler = attr
-                elif call_type == "get_service_info":
-                    self._get_service_info_handler = attr
+                    handler = self._micro_batcher.submit
+            setattr(self, _HANDLER_ATTRS[call_type], handler)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._brick_handler_table = _collect_brick_handlers(cls)
 
     def __get_service_info(self) -> ServiceInfoResponse:
         """
@@ -126,20 +265,51 @@ class BaseBrick(Generic[InputT, OutputT]):
                     return res
 
             else:
-
-                @functools.wraps(func)
-                async def wrapper(*args, **kwargs):
-                    res = await func(*args, **kwargs)
-                    return res
+                # verbose 關閉時直接綁定原始 handler，不增加包裝層
+                wrapper = func
 
             self._get_service_info_handler = wrapper  # type: ignore
             return wrapper  # type: ignore
 
         return decorator
 
+    def _maybe_offload(self, func: Any, executor: Optional[str] = None) -> Any:
+        """
+        同步 handler 且有指定 executor (handler 或 brick 層級) 時，
+        包裝為在 executor 中執行的 async handler；其餘情況原樣回傳
+        """
+        name = executor or self.handler_executor
+        if name is None or inspect.iscoroutinefunction(func):
+            return func
+
+        @functools.wraps(func)
+        async def offloaded(input_data: InputT) -> OutputT:
+            # 於呼叫時才取得 executor，使 configure_executors 可在建立 brick 後設定
+            return await get_executor(name).run(func, input_data)
+
+        return offloaded
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # 行程池執行 handler 時會 pickle brick；已包裝的 handler 與 gRPC 通道不可 pickle，
+        # 子行程只直接呼叫原始方法，不需要它們
+        state = self.__dict__.copy()
+        for attr in _HANDLER_ATTRS.values():
+            state[attr] = None
+        state["_grpc_channel"] = None
+        state["response_cache"] = None
+        state["single_flight"] = None
+        state["_batch_handler"] = None
+        state["_micro_batcher"] = None
+        return state
+
     # Decorator for unary
-    def unary(self):
+    def unary(self, executor: Optional[str] = None):
+        """
+        :param executor: 同步 handler 使用的 executor，未指定時使用 handler_executor
+        """
+
         def decorator(func: UnaryHandler) -> UnaryHandler:
+            func = self._maybe_offload(func, executor)
             if self._verbose:
 
                 @functools.wraps(func)
@@ -149,11 +319,8 @@ class BaseBrick(Generic[InputT, OutputT]):
                     return res
 
             else:
-
-                @functools.wraps(func)
-                async def wrapper(*args, **kwargs):
-                    res = await func(*args, **kwargs)
-                    return res
+                # verbose 關閉時直接綁定原始 handler，不增加包裝層
+                wrapper = func
 
             self._unary_handler = wrapper  # type: ignore
             return wrapper  # type: ignore
@@ -172,11 +339,8 @@ class BaseBrick(Generic[InputT, OutputT]):
                         yield val
 
             else:
-
-                @functools.wraps(func)
-                async def wrapper(*args, **kwargs):
-                    async for val in func(*args, **kwargs):
-                        yield val
+                # verbose 關閉時直接綁定原始 handler，串流不多一層 re-yield
+                wrapper = func
 
             self._output_streaming_handler = wrapper  # type: ignore
             return wrapper  # type: ignore
@@ -195,11 +359,8 @@ class BaseBrick(Generic[InputT, OutputT]):
                     return res
 
             else:
-
-                @functools.wraps(func)
-                async def wrapper(*args, **kwargs):
-                    res = await func(*args, **kwargs)
-                    return res
+                # verbose 關閉時直接綁定原始 handler，不增加包裝層
+                wrapper = func
 
             self._input_streaming_handler = wrapper  # type: ignore
             return wrapper  # type: ignore
@@ -218,22 +379,39 @@ class BaseBrick(Generic[InputT, OutputT]):
                         yield val
 
             else:
-
-                @functools.wraps(func)
-                async def wrapper(*args, **kwargs):
-                    async for val in func(*args, **kwargs):
-                        yield val
+                # verbose 關閉時直接綁定原始 handler，串流不多一層 re-yield
+                wrapper = func
 
             self._bidi_streaming_handler = wrapper  # type: ignore
             return wrapper  # type: ignore
 
         return decorator
 
+    # Decorator for batch unary
+    def batch_unary(self):
+        """
+        註冊 run_batch 使用的批次 handler (接收請求 list、回傳等長同順序的結果 list)，
+        不影響 run_unary；toGrpcClient 以此將 run_batch 對應到 BatchUnary RPC。
+        """
+
+        def decorator(
+            func: Callable[[List[InputT]], Awaitable[List[OutputT]]]
+        ) -> Callable[[List[InputT]], Awaitable[List[OutputT]]]:
+            self._batch_handler = func
+            return func
+
+        return decorator
+
     # Entry: unary call
     async def run_unary(self, input_data: InputT) -> OutputT:
         if not self._unary_handler:
             raise NotImplementedError("Unary handler not registered")
         try:
+            if self.response_cache is not None or self.single_flight is not None:
+                return await self._shared_unary(input_data)
+            if _memory_profiler.active:
+                with _memory_profiler.track(self.brick_name, "unary"):
+                    return await self._unary_handler(input_data)
             return await self._unary_handler(input_data)
         except Exception as e:
             from llmbrick.utils.logging import logger
@@ -241,6 +419,197 @@ class BaseBrick(Generic[InputT, OutputT]):
             logger.error(f"[{self.brick_name}] run_unary exception: {e}", exc_info=True)
             raise e
 
+    # Entry: batch unary call
+    async def run_batch(
+        self,
+        inputs: List[InputT],
+        return_exceptions: bool = False,
+        max_concurrency: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        一次處理多筆 unary 請求，回傳與 inputs 等長、同順序的結果。
+
+        - 有批次 handler (@batch_handler，或 toGrpcClient 的 BatchUnary) 且未開啟
+          回應快取 / single-flight 時，依 max_batch_size 分批直接呼叫，不經過 micro-batching 的等待
+        - 否則平行執行 run_unary，最多 max_concurrency 個同時進行
+        - 超過 max_batch_size 筆時整批失敗，拋出 ValidationException；
+          gRPC 客戶端則依 max_batch_size 分成多次 BatchUnary 呼叫
+
+        :param return_exceptions: True 時單筆失敗的例外放在結果 list 中，
+            False 時拋出第一個失敗的例外 (與 asyncio.gather 相同)
+        :param max_concurrency: 平行執行 run_unary 時的最大並發數，
+            None 時使用 batch_concurrency
+        """
+        if not inputs:
+            return []
+        if (
+            self._grpc_channel is None
+            and self.max_batch_size is not None
+            and len(inputs) > self.max_batch_size
+        ):
+            raise ValidationException(
+                f"batch of {len(inputs)} requests exceeds "
+                f"max_batch_size={self.max_batch_size}"
+            )
+        if max_concurrency is None:
+            max_concurrency = self.batch_concurrency
+        try:
+            if (
+                self._batch_handler is not None
+                and self.response_cache is None
+                and self.single_flight is None
+            ):
+                results = await self._run_batch_handler(list(inputs))
+            else:
+                results = await self._run_unary_parallel(inputs, max_concurrency)
+        except Exception as e:
+            from llmbrick.utils.logging import logger
+
+            logger.error(f"[{self.brick_name}] run_batch exception: {e}", exc_info=True)
+            raise e
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        return results
+
+    async def _run_batch_handler(self, inputs: List[InputT]) -> List[Any]:
+        if self._micro_batcher is not None:
+            size = self._micro_batcher.policy.max_batch_size
+        else:
+            size = self.max_batch_size or len(inputs)
+        results: List[Any] = []
+        for start in range(0, len(inputs), size):
+            chunk = inputs[start : start + size]
+            try:
+                if _memory_profiler.active:
+                    with _memory_profiler.track(self.brick_name, "batch"):
+                        outputs = await self._batch_handler(chunk)
+                else:
+                    outputs = await self._batch_handler(chunk)
+                if len(outputs) != len(chunk):
+                    raise RuntimeError(
+                        f"batch handler returned {len(outputs)} results "
+                        f"for {len(chunk)} requests"
+                    )
+            except Exception as e:
+                # 整批失敗時每一筆都收到同一個例外
+                outputs = [e] * len(chunk)
+            results.extend(outputs)
+        return results
+
+    async def _run_unary_parallel(
+        self, inputs: List[InputT], max_concurrency: Optional[int]
+    ) -> List[Any]:
+        if max_concurrency is None:
+            return await asyncio.gather(
+                *(self.run_unary(item) for item in inputs), return_exceptions=True
+            )
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be > 0")
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def call(item: InputT) -> OutputT:
+            async with semaphore:
+                return await self.run_unary(item)
+
+        return await asyncio.gather(
+            *(call(item) for item in inputs), return_exceptions=True
+        )
+
+    async def _invoke_unary(self, input_data: InputT) -> OutputT:
+        if _memory_profiler.active:
+            with _memory_profiler.track(self.brick_name, "unary"):
+                return await self._unary_handler(input_data)
+        return await self._unary_handler(input_data)
+
+    async def _shared_unary(self, input_data: InputT) -> OutputT:
+        """回應快取與 single-flight：先查快取，未命中時合併相同的進行中請求"""
+        key = self.cache_key(input_data)
+        if key is None:
+            return await self._invoke_unary(input_data)
+        cache = self.response_cache
+        if cache is not None:
+            cached = await cache.get(key)
+            if cached is not MISSING:
+                return cached
+
+        async def compute() -> OutputT:
+            response = await self._invoke_unary(input_data)
+            if cache is not None and self.is_cacheable_response(response):
+                await cache.set(key, response)
+            return response
+
+        flight = self.single_flight
+        if flight is None:
+            return await compute()
+        return await flight.do(key, compute)
+
+    def enable_response_cache(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[float] = 300.0,
+        disk_dir: Optional[str] = None,
+        disk_ttl: Optional[float] = None,
+    ) -> ResponseCache:
+        """
+        開啟 run_unary 的回應快取 (記憶體 LRU + TTL，選用磁碟層)。
+        適用於相同請求必定得到相同結果的 brick，例如 Retrieval、Intention、Guard。
+
+        :param max_entries: 記憶體層最多保存的回應數
+        :param ttl: 回應存活秒數，None 表示不過期
+        :param disk_dir: 磁碟層目錄，None 表示只使用記憶體
+        :param disk_ttl: 磁碟層存活秒數，None 時沿用 ttl
+        """
+        self.response_cache = ResponseCache.create(
+            max_entries=max_entries,
+            ttl=ttl,
+            disk_dir=disk_dir,
+            disk_ttl=disk_ttl,
+            name=self.brick_name,
+        )
+        return self.response_cache
+
+    def disable_response_cache(self) -> None:
+        self.response_cache = None
+
+    def enable_single_flight(self, max_wait: Optional[float] = None) -> SingleFlight:
+        """
+        開啟 run_unary 的 single-flight：相同請求 (依 cache_key) 同時進行時只執行一次 handler，
+        其餘請求共用其結果。
+
+        :param max_wait: 等待進行中請求的秒數上限，逾時後自行執行，None 表示不限時
+        """
+        self.single_flight = SingleFlight(max_wait=max_wait, name=self.brick_name)
+        return self.single_flight
+
+    def disable_single_flight(self) -> None:
+        self.single_flight = None
+
+    async def invalidate_cache(self, input_data: Optional[InputT] = None) -> None:
+        """移除指定請求的快取回應，未指定請求時清空整個快取"""
+        cache = self.response_cache
+        if cache is None:
+            return
+        if input_data is None:
+            await cache.clear()
+            return
+        key = self.cache_key(input_data)
+        if key is not None:
+            await cache.invalidate(key)
+
+    def cache_key(self, input_data: InputT) -> Optional[str]:
+        """
+        請求的快取 / single-flight key，回傳 None 表示此請求不使用快取也不合併。
+        預設為不含 request_id / session_id 的請求指紋，子類可覆寫。
+        """
+        return request_fingerprint(input_data)
+
+    def is_cacheable_response(self, response: OutputT) -> bool:
+        """是否將回應寫入快取，預設只快取成功 (error.code == SUCCESS) 的回應"""
+        error = getattr(response, "error", None)
+        return error is None or error.code == ErrorCodes.SUCCESS
+
     # Entry: get_service_info call
     async def run_get_service_info(self) -> ServiceInfoResponse:
         try:
@@ -255,26 +624,67 @@ class BaseBrick(Generic[InputT, OutputT]):
             raise e
 
     # Entry: server streaming call
-    async def run_output_streaming(self, input_data: InputT) -> AsyncIterator[OutputT]:
+    def run_output_streaming(self, input_data: InputT) -> AsyncIterator[OutputT]:
         if not self._output_streaming_handler:
-            raise NotImplementedError("Server streaming handler not registered")
-        try:
-            async for val in self._output_streaming_handler(input_data):
-                yield val
-        except Exception as e:
-            from llmbrick.utils.logging import logger
-
-            logger.error(
-                f"[{self.brick_name}] run_output_streaming exception: {e}",
-                exc_info=True,
+            return _not_implemented_stream("Server streaming handler not registered")
+        if _memory_profiler.active:
+            stream = self._profiled_stream(
+                "output_streaming", self._output_streaming_handler(input_data)
             )
-            raise e
+        elif not self._verbose:
+            # 快速路徑：直接回傳 handler 的 async iterator，每個 chunk 不經過額外轉發
+            stream = self._output_streaming_handler(input_data)
+        else:
+            stream = self._logged_stream(
+                "run_output_streaming", self._output_streaming_handler(input_data)
+            )
+        coalescing = self.stream_coalescing
+        if coalescing is None:
+            return stream
+        return coalesce_stream(
+            stream,
+            self.merge_output_chunks,
+            self.output_chunk_size,
+            coalescing.max_delay_ms,
+            coalescing.max_bytes,
+        )
+
+    def enable_stream_coalescing(
+        self, max_delay_ms: float = 20.0, max_bytes: int = 4096
+    ) -> None:
+        """
+        開啟 run_output_streaming 的 chunk 合併：第一個 chunk 立即送出，
+        之後的 chunk 暫存至超過 max_delay_ms 或累計達 max_bytes 才送出。
+        合併規則由 merge_output_chunks 決定，預設不合併任何 chunk。
+
+        :param max_delay_ms: chunk 最多暫存的毫秒數
+        :param max_bytes: 暫存內容達到此大小時立即送出
+        """
+        self.stream_coalescing = StreamCoalescing(max_delay_ms, max_bytes)
+
+    def disable_stream_coalescing(self) -> None:
+        self.stream_coalescing = None
+
+    def merge_output_chunks(
+        self, previous: OutputT, chunk: OutputT
+    ) -> Optional[OutputT]:
+        """
+        合併兩個相鄰的串流 chunk，回傳 None 表示不可合併。子類可覆寫。
+        """
+        return None
+
+    def output_chunk_size(self, chunk: OutputT) -> int:
+        """串流合併時用來累計 max_bytes 的 chunk 大小，子類可覆寫"""
+        return 0
 
     # Entry: client streaming call
     async def run_input_streaming(self, input_stream: AsyncIterator[InputT]) -> OutputT:
         if not self._input_streaming_handler:
             raise NotImplementedError("Client streaming handler not registered")
         try:
+            if _memory_profiler.active:
+                with _memory_profiler.track(self.brick_name, "input_streaming"):
+                    return await self._input_streaming_handler(input_stream)
             return await self._input_streaming_handler(input_stream)
         except Exception as e:
             from llmbrick.utils.logging import logger
@@ -285,22 +695,101 @@ class BaseBrick(Generic[InputT, OutputT]):
             raise e
 
     # Entry: bidirectional streaming call
-    async def run_bidi_streaming(
+    def run_bidi_streaming(
         self, input_stream: AsyncIterator[InputT]
     ) -> AsyncIterator[OutputT]:
         if not self._bidi_streaming_handler:
-            raise NotImplementedError("Bidi streaming handler not registered")
+            return _not_implemented_stream("Bidi streaming handler not registered")
+        if _memory_profiler.active:
+            return self._profiled_stream(
+                "bidi_streaming", self._bidi_streaming_handler(input_stream)
+            )
+        if not self._verbose:
+            return self._bidi_streaming_handler(input_stream)
+        return self._logged_stream(
+            "run_bidi_streaming", self._bidi_streaming_handler(input_stream)
+        )
+
+    async def _logged_stream(
+        self, entry: str, stream: AsyncIterator[OutputT]
+    ) -> AsyncIterator[OutputT]:
+        """verbose 模式下包裝串流，於例外時記錄 log"""
         try:
-            async for val in self._bidi_streaming_handler(input_stream):
+            async for val in stream:
                 yield val
         except Exception as e:
             from llmbrick.utils.logging import logger
 
-            logger.error(
-                f"[{self.brick_name}] run_bidi_streaming exception: {e}", exc_info=True
-            )
+            logger.error(f"[{self.brick_name}] {entry} exception: {e}", exc_info=True)
             raise e
 
+    async def _profiled_stream(
+        self, handler: str, stream: AsyncIterator[OutputT]
+    ) -> AsyncIterator[OutputT]:
+        """記憶體分析時間窗內，將整個串流的配置歸屬到此 brick/handler"""
+        with _memory_profiler.track(self.brick_name, handler):
+            if self._verbose:
+                stream = self._logged_stream(f"run_{handler}", stream)
+            async for val in stream:
+                yield val
+
+    async def aclose(self) -> None:
+        """釋放 gRPC 客戶端持有的通道，非客戶端 brick 呼叫時無作用"""
+        if self._grpc_channel is not None:
+            await self._grpc_channel.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    @classmethod
+    def _build_grpc_channel(
+        cls, remote_address: "RemoteAddress", kwargs: Dict[str, Any]
+    ) -> "BrickChannel":
+        """
+        從 toGrpcClient 的 kwargs 取出通道相關參數並建立 BrickChannel，
+        其餘參數保留給 Brick 建構子。
+
+        支援的參數：
+            channel_pool: 使用的 ChannelPool，預設為全域共用通道池
+            grpc_config: GrpcClientConfig，訊息大小、keepalive、HTTP/2、壓縮等調校參數，
+                轉為 channel options 後放在 channel_options 之前
+            channel_options: 傳給 grpc.aio.insecure_channel 的 options
+            channels_per_target: 此 target 建立的通道數
+            lb_policy: 多端點時的負載平衡策略
+                ("round_robin" | "least_outstanding" | "power_of_two")
+            failure_threshold: 端點連續失敗幾次後暫時剔除
+            ejection_seconds: 端點剔除秒數
+            dns_refresh_seconds: remote_address 為 "dns:///host:port" 時重新解析的間隔
+            timeout: 每次呼叫的逾時秒數，在 RequestContext 中時以請求剩餘時間為上限
+        """
+        from llmbrick.core.channel_pool import BrickChannel
+
+        channel_kwargs = {
+            key: kwargs.pop(key)
+            for key in (
+                "lb_policy",
+                "failure_threshold",
+                "ejection_seconds",
+                "dns_refresh_seconds",
+                "timeout",
+            )
+            if key in kwargs
+        }
+        options = list(kwargs.pop("channel_options", None) or [])
+        grpc_config = kwargs.pop("grpc_config", None)
+        if grpc_config is not None:
+            options = grpc_config.to_options() + options
+        return BrickChannel(
+            remote_address,
+            pool=kwargs.pop("channel_pool", None),
+            options=options or None,
+            channels_per_target=kwargs.pop("channels_per_target", None),
+            **channel_kwargs,
+        )
+
     @classmethod
     def toGrpcClient(cls, remote_address: str, **kwargs):
         """
@@ -0,0 +1,355 @@
+"""
+llmbrick.core.cache
+-------------------
+unary 回應快取。
+
+Retrieval / Intention / Guard 等 brick 經常收到內容完全相同的請求 (常見問題、重試、
+同一段 prompt 的重複檢查)。開啟快取後 BaseBrick.run_unary 以請求指紋查詢快取，
+命中時不再執行 handler：
+
+    brick.enable_response_cache(max_entries=1024, ttl=300)
+    brick.enable_response_cache(ttl=300, disk_dir="/var/cache/llmbrick/retrieval")
+
+- 請求指紋 (request_fingerprint) 不含 request_id / session_id，只由影響結果的欄位決定
+- 記憶體層: LRU + TTL
+- 磁碟層 (選用): 每個 key 一個檔案，跨行程重啟保留；讀寫在執行緒中進行，不阻塞 event loop
+- 值以 pickle 保存，每次命中都回傳新的物件，呼叫端修改回應不會影響快取內容
+- 只快取成功的回應 (error.code == SUCCESS)，見 BaseBrick.is_cacheable_response
+
+指標 (全域 MetricsRegistry)：
+- llmbrick_response_cache_hits_total: 命中數，標籤 brick / tier (memory / disk)
+- llmbrick_response_cache_misses_total: 未命中數，標籤 brick
+"""
+
+import abc
+import asyncio
+import collections
+import dataclasses
+import hashlib
+import hmac
+import json
+import os
+import pickle
+import secrets
+import struct
+import tempfile
+import threading
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Iterable, Optional, Sequence, Tuple, Union
+
+from llmbrick.utils.metrics import MetricsRegistry, get_registry
+
+# 不影響處理結果、不納入指紋的欄位
+DEFAULT_EXCLUDED_FIELDS = ("request_id", "session_id")
+
+# ResponseCache.get 未命中時的回傳值 (None 可能是合法的快取內容)
+MISSING = object()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return dict(value)
+    to_dict = getattr(value, "to_dict", None)
+    if to_dict is not None:
+        return to_dict()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return repr(value)
+
+
+def request_fingerprint(
+    request: Any, exclude: Iterable[str] = DEFAULT_EXCLUDED_FIELDS
+) -> str:
+    """
+    請求內容的穩定雜湊，欄位順序與 dict key 順序不影響結果。
+
+    :param request: brick 請求 (產生的 dataclass、pydantic model 或可 JSON 化的值)
+    :param exclude: 不納入指紋的欄位
+    """
+    to_dict = getattr(request, "to_dict", None)
+    if to_dict is not None:
+        data = to_dict()
+    elif hasattr(request, "model_dump"):
+        data = request.model_dump()
+    elif dataclasses.is_dataclass(request) and not isinstance(request, type):
+        data = dataclasses.asdict(request)
+    else:
+        data = request
+    if isinstance(data, dict):
+        data = {k: v for k, v in data.items() if k not in exclude}
+    payload = json.dumps(
+        data, sort_keys=True, separators=(",", ":"), default=_json_default
+    )
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{type(request).__name__}:{digest}"
+
+
+class CacheBackend(abc.ABC):
+    """
+    快取儲存層的介面，值為已序列化的 bytes。
+    blocking 為 True 的儲存層由 ResponseCache 在執行緒中呼叫。
+    """
+
+    name = "backend"
+    blocking = False
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[bytes]: ...
+
+    @abc.abstractmethod
+    def set(self, key: str, value: bytes) -> None: ...
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abc.abstractmethod
+    def clear(self) -> None: ...
+
+
+class MemoryBackend(CacheBackend):
+    """
+    LRU + TTL 的記憶體儲存層
+
+    :param max_entries: 最多保存的項目數，超過時淘汰最久未使用的項目
+    :param ttl: 項目存活秒數，None 表示不過期
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = 300.0):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be > 0")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "collections.OrderedDict[str, Tuple[float, bytes]]" = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at and time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else 0.0
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# 磁碟快取檔案的標頭：過期時間 (系統時間秒數，0 表示不過期)，
+# 其後為 HMAC-SHA256 (32 bytes) 與原始 bytes
+_DISK_HEADER = struct.Struct("<d")
+_MAC_SIZE = hashlib.sha256().digest_size
+_KEY_FILE = ".key"
+
+
+class DiskBackend(CacheBackend):
+    """
+    每個 key 一個檔案的磁碟儲存層，以寫入暫存檔後 rename 的方式保證檔案完整。
+    檔案內容為固定長度的過期時間標頭、HMAC 與值的 bytes，讀取時不做反序列化；
+    HMAC 不符 (被竄改或由其他金鑰寫入) 的檔案視為未命中並刪除，
+    因此 ResponseCache 只會 unpickle 由持有金鑰的行程寫入的值。
+    get / set 為阻塞的檔案 I/O (blocking = True)，ResponseCache 會在執行緒中呼叫；
+    直接使用時請勿在 event loop 上呼叫。
+
+    :param directory: 快取目錄，不存在時自動建立
+    :param ttl: 項目存活秒數 (以系統時間計算，跨行程重啟有效)，None 表示不過期
+    :param secret: HMAC 金鑰；None 時使用目錄中的 .key 檔 (不存在時以權限 0600 建立)，
+        共用同一目錄的行程因此共用快取
+    """
+
+    name = "disk"
+    blocking = True
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        ttl: Optional[float] = None,
+        secret: Optional[bytes] = None,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self._secret = secret if secret is not None else self._load_secret()
+
+    def _load_secret(self) -> bytes:
+        path = self.directory / _KEY_FILE
+        if not path.exists():
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                os.chmod(tmp, 0o600)
+                with os.fdopen(fd, "wb") as f:
+                    f.write(secrets.token_bytes(32))
+                # link 不會覆蓋既有檔案，同時建立時以先完成者為準
+                os.link(tmp, path)
+            except FileExistsError:
+                pass
+            finally:
+                Path(tmp).unlink(missing_ok=True)
+        return path.read_bytes()
+
+    def _mac(self, key: str, header: bytes, value: bytes) -> bytes:
+        message = header + key.encode("utf-8") + value
+        return hmac.new(self._secret, message, hashlib.sha256).digest()
+
+    def _path(self, key: str) -> Path:
+        # key 可能含有不適合作為檔名的字元，一律再雜湊一次
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{name}.cache"
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        size = _DISK_HEADER.size
+        offset = size + _MAC_SIZE
+        header, mac, value = data[:size], data[size:offset], data[offset:]
+        if len(data) < offset or not hmac.compare_digest(
+            mac, self._mac(key, header, value)
+        ):
+            # 損毀、舊格式或被竄改的檔案視為未命中
+            path.unlink(missing_ok=True)
+            return None
+        (expires_at,) = _DISK_HEADER.unpack(header)
+        if expires_at and time.time() >= expires_at:
+            path.unlink(missing_ok=True)
+            return None
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        expires_at = time.time() + self.ttl if self.ttl is not None else 0.0
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                header = _DISK_HEADER.pack(expires_at)
+                f.write(header)
+                f.write(self._mac(key, header, value))
+                f.write(value)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.cache"):
+            path.unlink(missing_ok=True)
+
+
+class ResponseCache:
+    """
+    由一或多個儲存層組成的回應快取。查詢依序檢查各層，
+    在較後面的層命中時回填前面的層 (例如磁碟命中後放回記憶體)。
+
+    :param backends: 儲存層，依查詢順序排列
+    :param name: 指標的 brick 標籤
+    """
+
+    def __init__(
+        self,
+        backends: Sequence[CacheBackend],
+        name: str = "",
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        if not backends:
+            raise ValueError("ResponseCache requires at least one backend")
+        self.backends = list(backends)
+        registry = registry or get_registry()
+        self._hits = registry.counter(
+            "llmbrick_response_cache_hits_total",
+            "Unary responses served from the response cache",
+            ("brick", "tier"),
+        )
+        self._misses = registry.counter(
+            "llmbrick_response_cache_misses_total",
+            "Unary response cache misses",
+            ("brick",),
+        )
+        self.name = name
+
+    @classmethod
+    def create(
+        cls,
+        max_entries: int = 1024,
+        ttl: Optional[float] = 300.0,
+        disk_dir: Optional[Union[str, Path]] = None,
+        disk_ttl: Optional[float] = None,
+        name: str = "",
+    ) -> "ResponseCache":
+        """
+        建立記憶體 (與選用的磁碟) 兩層快取。
+
+        :param disk_dir: 磁碟層目錄，None 表示只使用記憶體
+        :param disk_ttl: 磁碟層存活秒數，None 時沿用 ttl
+        """
+        backends: list = [MemoryBackend(max_entries, ttl)]
+        if disk_dir is not None:
+            backends.append(
+                DiskBackend(disk_dir, disk_ttl if disk_ttl is not None else ttl)
+            )
+        return cls(backends, name=name)
+
+    @staticmethod
+    async def _call(backend: CacheBackend, method: str, *args: Any) -> Any:
+        func = getattr(backend, method)
+        if backend.blocking:
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
+
+    async def get(self, key: str) -> Any:
+        """回傳快取的值，未命中時回傳 MISSING"""
+        for index, backend in enumerate(self.backends):
+            payload = await self._call(backend, "get", key)
+            if payload is None:
+                continue
+            for upper in self.backends[:index]:
+                await self._call(upper, "set", key, payload)
+            self._hits.inc(brick=self.name, tier=backend.name)
+            # payload 由本行程寫入記憶體，或為 DiskBackend 驗證過 HMAC 的檔案內容
+            return pickle.loads(payload)  # nosec B301
+        self._misses.inc(brick=self.name)
+        return MISSING
+
+    async def set(self, key: str, value: Any) -> None:
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        for backend in self.backends:
+            await self._call(backend, "set", key, payload)
+
+    async def invalidate(self, key: str) -> None:
+        for backend in self.backends:
+            await self._call(backend, "delete", key)
+
+    async def clear(self) -> None:
+        for backend in self.backends:
+            await self._call(backend, "clear")
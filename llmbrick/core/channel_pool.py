@@ -0,0 +1,357 @@
+"""
+llmbrick.core.channel_pool
+--------------------------
+gRPC 通道池：依 (address, options) 共用 grpc.aio.Channel，
+避免 toGrpcClient 的每次呼叫都重新建立 TCP/HTTP2 連線並洩漏通道。
+
+grpc.aio.Channel 綁定建立時的 event loop，因此通道池以 event loop 為單位分開管理。
+"""
+
+import asyncio
+import socket
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+import grpc
+
+from llmbrick.core.context import time_remaining
+from llmbrick.core.load_balancer import LoadBalancer, LoadBalancingPolicy
+from llmbrick.utils.logging import logger
+
+ChannelOptions = Sequence[Tuple[str, Any]]
+# 單一 "host:port"、地址列表或 "dns:///host:port"
+RemoteAddress = Union[str, Sequence[str]]
+# (target, 通道數, options)
+_PoolKey = Tuple[str, int, Tuple[Tuple[str, Any], ...]]
+
+
+class _PoolEntry:
+    __slots__ = ("channels", "refs", "cursor", "ready")
+
+    def __init__(self, channels: List[grpc.aio.Channel]):
+        self.channels = channels
+        self.refs = 0
+        self.cursor = 0
+        self.ready: Optional["asyncio.Future[None]"] = None
+
+    def next_channel(self) -> grpc.aio.Channel:
+        channel = self.channels[self.cursor]
+        self.cursor = (self.cursor + 1) % len(self.channels)
+        return channel
+
+
+class ChannelPool:
+    """
+    以 (target, 通道數, options) 為鍵的 gRPC 通道池。
+    channels_per_target 不同的 client 各自使用獨立的通道組，不會共用先建立者的設定。
+
+    :param channels_per_target: 每個 target 建立的通道數，呼叫時以 round-robin 分配
+    :param warmup: 建立通道後是否先等待連線就緒再交付使用
+    :param warmup_timeout: 暖機等待秒數，逾時僅記錄警告，不中斷呼叫
+    """
+
+    def __init__(
+        self,
+        channels_per_target: int = 1,
+        warmup: bool = True,
+        warmup_timeout: float = 5.0,
+    ):
+        if channels_per_target < 1:
+            raise ValueError("channels_per_target must be >= 1")
+        self.channels_per_target = channels_per_target
+        self.warmup = warmup
+        self.warmup_timeout = warmup_timeout
+        self._entries: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, Dict[_PoolKey, _PoolEntry]
+        ] = weakref.WeakKeyDictionary()
+
+    def _make_key(
+        self,
+        target: str,
+        options: Optional[ChannelOptions],
+        channels_per_target: Optional[int] = None,
+    ) -> _PoolKey:
+        size = channels_per_target or self.channels_per_target
+        return (target, size, tuple(options or ()))
+
+    def _loop_entries(self) -> Dict[_PoolKey, _PoolEntry]:
+        loop = asyncio.get_running_loop()
+        entries = self._entries.get(loop)
+        if entries is None:
+            entries = {}
+            self._entries[loop] = entries
+        return entries
+
+    def _create_entry(self, key: _PoolKey) -> _PoolEntry:
+        target, size, options = key
+        channel_options = list(options or [])
+        # 每條通道使用獨立 subchannel，否則 grpc core 會把它們合併成同一條連線
+        if size > 1:
+            channel_options.append(("grpc.use_local_subchannel_pool", 1))
+        channels = [
+            grpc.aio.insecure_channel(target, options=channel_options)
+            for _ in range(size)
+        ]
+        return _PoolEntry(channels)
+
+    async def _warmup_entry(self, target: str, entry: _PoolEntry) -> None:
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(ch.channel_ready() for ch in entry.channels)),
+                timeout=self.warmup_timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"[ChannelPool] warmup for {target} timed out after "
+                f"{self.warmup_timeout}s"
+            )
+
+    async def acquire(
+        self,
+        target: str,
+        options: Optional[ChannelOptions] = None,
+        channels_per_target: Optional[int] = None,
+        retain: bool = False,
+    ) -> grpc.aio.Channel:
+        """
+        取得 target 的共用通道，首次建立時依設定進行暖機
+
+        :param retain: 同時增加引用數 (等同 retain)，在等待暖機之前生效，
+            避免等待期間其他 client release 使引用數歸零而關閉通道
+        """
+        entries = self._loop_entries()
+        key = self._make_key(target, options, channels_per_target)
+        entry = entries.get(key)
+        if entry is None:
+            entry = self._create_entry(key)
+            entries[key] = entry
+            if self.warmup:
+                entry.ready = asyncio.ensure_future(self._warmup_entry(target, entry))
+        if retain:
+            entry.refs += 1
+        if entry.ready is not None:
+            if not entry.ready.done():
+                await asyncio.shield(entry.ready)
+            entry.ready = None
+        return entry.next_channel()
+
+    def retain(
+        self,
+        target: str,
+        options: Optional[ChannelOptions] = None,
+        channels_per_target: Optional[int] = None,
+    ) -> None:
+        """增加 target 通道的引用數，需與 release 成對呼叫"""
+        key = self._make_key(target, options, channels_per_target)
+        entry = self._loop_entries().get(key)
+        if entry is not None:
+            entry.refs += 1
+
+    async def release(
+        self,
+        target: str,
+        options: Optional[ChannelOptions] = None,
+        channels_per_target: Optional[int] = None,
+    ) -> None:
+        """減少引用數，歸零時關閉該 target 的所有通道"""
+        entries = self._loop_entries()
+        key = self._make_key(target, options, channels_per_target)
+        entry = entries.get(key)
+        if entry is None:
+            return
+        entry.refs -= 1
+        if entry.refs <= 0:
+            del entries[key]
+            await self._close_entry(entry)
+
+    @staticmethod
+    async def _close_entry(entry: _PoolEntry) -> None:
+        if entry.ready is not None and not entry.ready.done():
+            entry.ready.cancel()
+        for channel in entry.channels:
+            await channel.close()
+
+    async def close(self) -> None:
+        """關閉目前 event loop 上的所有通道"""
+        entries = self._loop_entries()
+        while entries:
+            _, entry = entries.popitem()
+            await self._close_entry(entry)
+
+    def size(self) -> int:
+        """目前 event loop 上已開啟的通道數"""
+        return sum(len(e.channels) for e in self._loop_entries().values())
+
+
+_default_pool: Optional[ChannelPool] = None
+_DNS_SCHEME = "dns:///"
+
+
+def _split_host_port(target: str) -> Tuple[str, int]:
+    host, _, port = target.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"Invalid DNS target, expected 'dns:///host:port': {target}")
+    return host.strip("[]"), int(port)
+
+
+def get_default_channel_pool() -> ChannelPool:
+    """取得所有 client brick 共用的預設通道池"""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = ChannelPool()
+    return _default_pool
+
+
+def set_default_channel_pool(pool: ChannelPool) -> None:
+    """替換預設通道池，需在建立 client brick 前呼叫"""
+    global _default_pool
+    _default_pool = pool
+
+
+class BrickChannel:
+    """
+    單一 client brick 使用的通道把手。
+    由 toGrpcClient 建立，handler 透過 connect() 取得池化通道，
+    brick.aclose() 時釋放引用。
+
+    remote_address 可為單一 "host:port"、地址列表，或 "dns:///host:port"
+    (定期解析 DNS 取得所有副本)。多個端點時由 LoadBalancer 分配呼叫，
+    並在呼叫失敗 (見 failure_codes) 時記錄端點健康狀態。
+    DEADLINE_EXCEEDED 只在逾時由此通道的 timeout 決定時計入；由請求剩餘時間
+    (RequestContext) 決定的逾時代表呼叫端時間不足，不代表端點故障。
+
+    timeout 為每次呼叫的逾時秒數；在 RequestContext 中呼叫時改用請求剩餘時間 (取較小者)，
+    見 call_timeout()。
+    """
+
+    # 視為端點故障、計入剔除門檻的 gRPC 狀態碼
+    failure_codes = frozenset({grpc.StatusCode.UNAVAILABLE})
+
+    def __init__(
+        self,
+        remote_address: RemoteAddress,
+        pool: Optional[ChannelPool] = None,
+        options: Optional[ChannelOptions] = None,
+        channels_per_target: Optional[int] = None,
+        lb_policy: Union[str, LoadBalancingPolicy] = "round_robin",
+        failure_threshold: int = 3,
+        ejection_seconds: float = 30.0,
+        dns_refresh_seconds: float = 30.0,
+        timeout: Optional[float] = None,
+    ):
+        self.timeout = timeout
+        self._dns_target: Optional[Tuple[str, int]] = None
+        if isinstance(remote_address, str):
+            if remote_address.startswith(_DNS_SCHEME):
+                self._dns_target = _split_host_port(remote_address[len(_DNS_SCHEME) :])
+            addresses = [remote_address]
+        else:
+            addresses = list(remote_address)
+        self.remote_address = remote_address
+        self.options: List[Tuple[str, Any]] = list(options or [])
+        self.channels_per_target = channels_per_target
+        self.dns_refresh_seconds = dns_refresh_seconds
+        self._next_dns_refresh = 0.0
+        self.balancer = LoadBalancer(
+            addresses,
+            policy=lb_policy,
+            failure_threshold=failure_threshold,
+            ejection_seconds=ejection_seconds,
+        )
+        self._pool = pool or get_default_channel_pool()
+        self._retained: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, Set[str]
+        ] = weakref.WeakKeyDictionary()
+        self._closed = False
+
+    @property
+    def pool(self) -> ChannelPool:
+        return self._pool
+
+    async def _refresh_dns(self) -> None:
+        assert self._dns_target is not None
+        now = time.monotonic()
+        if now < self._next_dns_refresh:
+            return
+        self._next_dns_refresh = now + self.dns_refresh_seconds
+        host, port = self._dns_target
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError as e:
+            logger.warning(f"[BrickChannel] DNS resolution for {host} failed: {e}")
+            return
+        addresses = []
+        for family, _, _, _, sockaddr in infos:
+            ip = sockaddr[0]
+            address = f"[{ip}]:{port}" if family == socket.AF_INET6 else f"{ip}:{port}"
+            if address not in addresses:
+                addresses.append(address)
+        if addresses:
+            self.balancer.update(addresses)
+
+    def call_timeout(self) -> Optional[float]:
+        """傳給 stub 的 timeout：請求剩餘時間與 self.timeout 的較小者，皆無則為 None"""
+        return time_remaining(self.timeout)
+
+    def _owns_deadline(self) -> bool:
+        """呼叫的逾時是否由 self.timeout 決定 (而非呼叫端的請求剩餘時間)"""
+        if self.timeout is None:
+            return False
+        remaining = time_remaining()
+        return remaining is None or self.timeout <= remaining
+
+    @asynccontextmanager
+    async def connect(self) -> AsyncIterator[grpc.aio.Channel]:
+        """挑選端點並取得一條池化通道，僅在 context 內使用"""
+        if self._closed:
+            raise RuntimeError(f"gRPC client for {self.remote_address} is closed")
+        if self._dns_target is not None:
+            await self._refresh_dns()
+        endpoint = self.balancer.pick()
+        loop = asyncio.get_running_loop()
+        retained = self._retained.setdefault(loop, set())
+        # 首次使用此端點時由 acquire 在等待暖機前取得引用，aclose 時釋放
+        retain = endpoint.address not in retained
+        if retain:
+            retained.add(endpoint.address)
+        channel = await self._pool.acquire(
+            endpoint.address, self.options, self.channels_per_target, retain=retain
+        )
+
+        owns_deadline = self._owns_deadline()
+        endpoint.outstanding += 1
+        try:
+            yield channel
+        except grpc.aio.AioRpcError as e:
+            code = e.code()
+            if code in self.failure_codes or (
+                code == grpc.StatusCode.DEADLINE_EXCEEDED and owns_deadline
+            ):
+                self.balancer.record_failure(endpoint)
+            raise
+        else:
+            self.balancer.record_success(endpoint)
+        finally:
+            endpoint.outstanding -= 1
+
+    async def aclose(self) -> None:
+        """釋放在目前 event loop 上持有的通道引用"""
+        if self._closed:
+            return
+        self._closed = True
+        retained = self._retained.pop(asyncio.get_running_loop(), set())
+        for address in retained:
+            await self._pool.release(address, self.options, self.channels_per_target)
@@ -0,0 +1,161 @@
+"""
+串流 chunk 合併 (coalescing)
+
+LLM 的串流 delta 通常只有 1~3 個字元，逐一送出時每個 chunk 都是一則 gRPC 訊息
+與一個 SSE 事件。coalesce_stream 在兩個條件之一成立前把相鄰 chunk 合併：
+
+- 自暫存第一個 chunk 起已超過 max_delay_ms
+- 暫存內容累計達到 max_bytes
+
+第一個 chunk 一律立即送出，不影響 time-to-first-token。
+是否可合併與如何合併由 merge 決定 (回傳 None 表示不可合併，先送出暫存的 chunk)。
+"""
+
+import asyncio
+import dataclasses
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Optional, TypeVar
+
+from llmbrick.core.error_codes import ErrorCodes
+
+T = TypeVar("T")
+
+MergeFunc = Callable[[T, T], Optional[T]]
+SizeFunc = Callable[[T], int]
+
+
+@dataclass
+class StreamCoalescing:
+    """
+    串流合併設定
+
+    :param max_delay_ms: chunk 最多暫存的毫秒數
+    :param max_bytes: 暫存內容達到此大小時立即送出
+    """
+
+    max_delay_ms: float = 20.0
+    max_bytes: int = 4096
+
+    def __post_init__(self) -> None:
+        if self.max_delay_ms < 0:
+            raise ValueError("max_delay_ms must be >= 0")
+        if self.max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0")
+
+
+def _is_success(error: Any) -> bool:
+    return error is None or error.code == ErrorCodes.SUCCESS
+
+
+def merge_text_chunks(previous: Any, chunk: Any) -> Optional[Any]:
+    """
+    合併具有 text/tokens/is_final/error 欄位的回應 (LLMResponse、TranslateResponse)。
+    已是最終 chunk 或帶有錯誤的 chunk 不合併；其餘欄位取較新的 chunk。
+    """
+    if previous.is_final:
+        return None
+    if not (_is_success(previous.error) and _is_success(chunk.error)):
+        return None
+    return dataclasses.replace(
+        chunk,
+        text=previous.text + chunk.text,
+        tokens=previous.tokens + chunk.tokens,
+    )
+
+
+def text_chunk_size(chunk: Any) -> int:
+    """以 text 的 UTF-8 長度估算 chunk 大小"""
+    return len(chunk.text.encode("utf-8"))
+
+
+async def coalesce_stream(
+    stream: AsyncIterator[T],
+    merge: MergeFunc,
+    size_of: SizeFunc,
+    max_delay_ms: float = 20.0,
+    max_bytes: int = 4096,
+) -> AsyncIterator[T]:
+    """
+    合併相鄰的串流 chunk。
+
+    上游在暫存期間持續被讀取 (最多預讀一個 chunk)，逾時判斷不需等待上游的下一個 chunk。
+    上游拋出例外時，先送出暫存的 chunk 再拋出。
+
+    :param stream: 上游串流
+    :param merge: merge(previous, chunk)，回傳合併後的 chunk，不可合併時回傳 None
+    :param size_of: 計算 chunk 大小 (bytes)
+    :param max_delay_ms: chunk 最多暫存的毫秒數
+    :param max_bytes: 暫存內容達到此大小時立即送出
+    """
+    max_delay = max_delay_ms / 1000.0
+    loop = asyncio.get_running_loop()
+    iterator = stream.__aiter__()
+    next_task: Optional["asyncio.Future[T]"] = None
+    try:
+        try:
+            first = await iterator.__anext__()
+        except StopAsyncIteration:
+            return
+        yield first
+
+        pending: Optional[T] = None
+        pending_size = 0
+        deadline = 0.0
+        while True:
+            if pending is None and next_task is None:
+                # 沒有暫存時直接等待上游，不需要建立 task
+                try:
+                    item = await iterator.__anext__()
+                except StopAsyncIteration:
+                    return
+            else:
+                if next_task is None:
+                    next_task = asyncio.ensure_future(iterator.__anext__())
+                if pending is not None:
+                    timeout = deadline - loop.time()
+                    if timeout > 0:
+                        await asyncio.wait((next_task,), timeout=timeout)
+                    if not next_task.done():
+                        # 逾時：送出暫存的 chunk，上游的讀取繼續進行
+                        yield pending
+                        pending = None
+                        continue
+                task, next_task = next_task, None
+                try:
+                    item = await task
+                except StopAsyncIteration:
+                    if pending is not None:
+                        yield pending
+                    return
+                except Exception:
+                    if pending is not None:
+                        yield pending
+                    raise
+
+            if pending is None:
+                pending = item
+                pending_size = size_of(item)
+                deadline = loop.time() + max_delay
+            else:
+                merged = merge(pending, item)
+                if merged is None:
+                    yield pending
+                    pending = item
+                    pending_size = size_of(item)
+                    deadline = loop.time() + max_delay
+                else:
+                    pending = merged
+                    pending_size += size_of(item)
+            if pending_size >= max_bytes:
+                yield pending
+                pending = None
+    finally:
+        if next_task is not None:
+            next_task.cancel()
+            try:
+                await next_task
+            except (Exception, asyncio.CancelledError):
+                pass
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
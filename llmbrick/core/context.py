@@ -0,0 +1,179 @@
+"""
+llmbrick.core.context
+---------------------
+請求層級的 deadline 與取消傳遞。
+
+RequestContext 以 contextvar 隨 asyncio task 傳遞，進入點負責建立：
+- SSE server: 依 X-Request-Timeout header 與 SSEServerConfig.request_timeout (預設不限制)
+- gRPC server: 依呼叫端帶來的 gRPC deadline (context.time_remaining())
+
+toGrpcClient 產生的 client 會把剩餘時間作為 timeout= 傳給下游 stub，
+deadline 因此沿著 brick 呼叫鏈往下傳遞；iterate_with_deadline 以 deadline 限制串流的等待。
+
+用法::
+
+    with request_context(timeout=10):
+        response = await client.run_unary(request)
+"""
+
+import asyncio
+import contextvars
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Iterator, Optional, TypeVar
+
+# SSE / HTTP 請求指定逾時秒數的 header
+TIMEOUT_HEADER = "x-request-timeout"
+
+_T = TypeVar("_T")
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """請求超過 deadline，進行中的工作已被取消"""
+
+
+@dataclass
+class RequestContext:
+    """
+    單一請求的上下文
+
+    :param deadline: time.monotonic() 的絕對時間，None 表示沒有期限
+    :param request_id: 請求識別，僅供 log 使用
+    """
+
+    deadline: Optional[float] = None
+    request_id: str = ""
+    metadata: dict = field(default_factory=dict)
+
+    def time_remaining(self) -> Optional[float]:
+        """距離 deadline 的秒數 (不小於 0)，沒有期限時為 None"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+
+_current: contextvars.ContextVar[Optional[RequestContext]] = contextvars.ContextVar(
+    "llmbrick_request_context", default=None
+)
+
+
+def get_request_context() -> Optional[RequestContext]:
+    """目前 task 的 RequestContext，不在請求中時為 None"""
+    return _current.get()
+
+
+def time_remaining(default: Optional[float] = None) -> Optional[float]:
+    """
+    目前請求的剩餘秒數。
+
+    :param default: 呼叫端自己的逾時上限，與請求 deadline 取較小者
+    """
+    ctx = _current.get()
+    remaining = ctx.time_remaining() if ctx is not None else None
+    if remaining is None:
+        return default
+    if default is None:
+        return remaining
+    return min(remaining, default)
+
+
+@contextmanager
+def request_context(
+    timeout: Optional[float] = None, request_id: str = ""
+) -> Iterator[RequestContext]:
+    """
+    建立 RequestContext。已在請求中時只能縮短 deadline，不會延長外層的期限。
+
+    :param timeout: 從現在起算的逾時秒數，None 表示沿用外層 (或沒有期限)
+    """
+    parent = _current.get()
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    if parent is not None and parent.deadline is not None:
+        deadline = (
+            parent.deadline if deadline is None else min(deadline, parent.deadline)
+        )
+    ctx = RequestContext(
+        deadline=deadline,
+        request_id=request_id or (parent.request_id if parent else ""),
+        metadata=dict(parent.metadata) if parent else {},
+    )
+    token = _current.set(ctx)
+    try:
+        yield ctx
+    finally:
+        try:
+            _current.reset(token)
+        except ValueError:
+            # 非同步產生器在其他 task 中被關閉時，token 不屬於目前的 Context
+            pass
+
+
+async def iterate_with_deadline(stream: AsyncIterator[_T]) -> AsyncIterator[_T]:
+    """
+    逐一取出 stream 的元素，每次等待都受目前請求的 deadline 限制，到期時拋出 DeadlineExceeded。
+
+    計時只涵蓋等待 stream 的期間，不會在呼叫端處理元素
+    (例如寫出 HTTP 回應) 時取消 task。整個 stream 共用一個計時器，不為每個元素建立 task。
+    結束、逾時或被取消時都會關閉 stream。
+    """
+    iterator = stream.__aiter__()
+    ctx = _current.get()
+    remaining = ctx.time_remaining() if ctx is not None else None
+    if ctx is None or remaining is None:
+        try:
+            while True:
+                try:
+                    item = await iterator.__anext__()
+                except StopAsyncIteration:
+                    return
+                yield item
+        finally:
+            await _aclose(iterator)
+        return
+
+    task = asyncio.current_task()
+    assert task is not None
+    waiting = False
+    fired = False
+
+    def on_deadline() -> None:
+        nonlocal fired
+        # 呼叫端正在處理元素時不取消，留待下一次取值前檢查
+        if waiting:
+            fired = True
+            task.cancel()
+
+    handle = asyncio.get_running_loop().call_later(remaining, on_deadline)
+    try:
+        while True:
+            if ctx.expired:
+                raise DeadlineExceeded("request deadline exceeded")
+            waiting = True
+            try:
+                item = await iterator.__anext__()
+            except StopAsyncIteration:
+                return
+            except asyncio.CancelledError:
+                if not fired:
+                    raise
+                uncancel = getattr(task, "uncancel", None)
+                if uncancel is not None:
+                    uncancel()
+                raise DeadlineExceeded("request deadline exceeded") from None
+            finally:
+                waiting = False
+            yield item
+    finally:
+        handle.cancel()
+        await _aclose(iterator)
+
+
+async def _aclose(iterator: AsyncIterator) -> None:
+    aclose = getattr(iterator, "aclose", None)
+    if aclose is not None:
+        await aclose()
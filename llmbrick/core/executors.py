@@ -0,0 +1,169 @@
+"""
+llmbrick.core.executors
+-----------------------
+同步 handler 的執行緒池 / 行程池。
+
+同步的 unary handler (tokenizer、regex guard、embedding 計算等) 若直接在 event loop
+上執行，會阻塞同一行程中所有進行中的串流。BaseBrick 會把同步 handler 交給
+此模組管理的 executor 執行：
+
+- "thread": ThreadPoolExecutor，適合會釋放 GIL 的工作 (C 擴充、I/O)
+- "process": ProcessPoolExecutor，適合純 Python 的 CPU 密集工作；
+  handler 所屬的 brick、輸入與輸出都必須可 pickle
+- register_executor() 註冊的自訂 executor
+
+池在第一次使用時建立，大小可在使用前以 configure_executors() 設定。
+
+指標 (全域 MetricsRegistry，標籤 pool)：
+- llmbrick_executor_in_flight: 已提交尚未完成的工作數
+- llmbrick_executor_queue_depth: 等待空閒 worker 的工作數 (in_flight 超過 max_workers 的部分)
+- llmbrick_executor_tasks_total: 完成的工作數
+- llmbrick_executor_task_duration_seconds: 提交到完成的時間 (含排隊)
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from llmbrick.utils.metrics import get_registry
+
+THREAD = "thread"
+PROCESS = "process"
+
+
+class ManagedExecutor:
+    """包裝 concurrent.futures.Executor，記錄 in-flight 與佇列深度"""
+
+    def __init__(self, name: str, executor: Executor, max_workers: int):
+        self.name = name
+        self.executor = executor
+        self.max_workers = max_workers
+        self.in_flight = 0
+        registry = get_registry()
+        self._in_flight_gauge = registry.gauge(
+            "llmbrick_executor_in_flight",
+            "Tasks submitted to the executor and not yet finished",
+            ("pool",),
+        ).labels(pool=name)
+        self._queue_gauge = registry.gauge(
+            "llmbrick_executor_queue_depth",
+            "Tasks waiting for a free executor worker",
+            ("pool",),
+        ).labels(pool=name)
+        self._tasks = registry.counter(
+            "llmbrick_executor_tasks_total", "Finished executor tasks", ("pool",)
+        ).labels(pool=name)
+        self._duration = registry.histogram(
+            "llmbrick_executor_task_duration_seconds",
+            "Executor task duration including queueing",
+            ("pool",),
+        ).labels(pool=name)
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self.in_flight - self.max_workers)
+
+    def _update_gauges(self) -> None:
+        self._in_flight_gauge.set(self.in_flight)
+        self._queue_gauge.set(self.queue_depth)
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """在 executor 中執行 func(*args) 並等待結果，需於 event loop 中呼叫"""
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        self._update_gauges()
+        start = time.perf_counter()
+        try:
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self.in_flight -= 1
+            self._update_gauges()
+            self._tasks.inc()
+            self._duration.observe(time.perf_counter() - start)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.executor.shutdown(wait=wait)
+
+
+_lock = threading.Lock()
+_executors: Dict[str, ManagedExecutor] = {}
+_pool_sizes: Dict[str, Optional[int]] = {THREAD: None, PROCESS: None}
+_mp_context: Any = None
+
+
+def configure_executors(
+    thread_workers: Optional[int] = None,
+    process_workers: Optional[int] = None,
+    mp_context: Any = None,
+) -> None:
+    """
+    設定內建池的大小，需在池第一次使用前呼叫 (已建立的池不受影響)。
+
+    :param thread_workers: 執行緒池大小，None 使用 ThreadPoolExecutor 預設值
+    :param process_workers: 行程池大小，None 使用 CPU 核心數
+    :param mp_context: 行程池使用的 multiprocessing context，None 使用 Python 預設
+    """
+    global _mp_context
+    with _lock:
+        _pool_sizes[THREAD] = thread_workers
+        _pool_sizes[PROCESS] = process_workers
+        _mp_context = mp_context
+
+
+def register_executor(
+    name: str, executor: Executor, max_workers: int
+) -> ManagedExecutor:
+    """
+    註冊自訂 executor，handler 以 executor=name 指定使用。
+
+    :param max_workers: executor 的工作者數，用於計算佇列深度
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+    managed = ManagedExecutor(name, executor, max_workers)
+    with _lock:
+        previous = _executors.get(name)
+        _executors[name] = managed
+    if previous is not None:
+        previous.shutdown(wait=False)
+    return managed
+
+
+def _create(name: str) -> ManagedExecutor:
+    size = _pool_sizes.get(name)
+    if name == THREAD:
+        # 與 ThreadPoolExecutor 的預設值相同
+        size = size or min(32, (os.cpu_count() or 1) + 4)
+        thread_pool = ThreadPoolExecutor(
+            max_workers=size, thread_name_prefix="llmbrick-handler"
+        )
+        return ManagedExecutor(name, thread_pool, size)
+    if name == PROCESS:
+        size = size or os.cpu_count() or 1
+        process_pool = ProcessPoolExecutor(max_workers=size, mp_context=_mp_context)
+        return ManagedExecutor(name, process_pool, size)
+    raise KeyError(f"Unknown executor '{name}', use register_executor() first")
+
+
+def get_executor(name: str) -> ManagedExecutor:
+    """取得指定名稱的 executor，內建池於第一次使用時建立"""
+    managed = _executors.get(name)
+    if managed is not None:
+        return managed
+    with _lock:
+        managed = _executors.get(name)
+        if managed is None:
+            managed = _executors[name] = _create(name)
+        return managed
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    """關閉所有 executor；之後再次使用時會重新建立內建池"""
+    with _lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for managed in executors:
+        managed.shutdown(wait=wait)
@@ -0,0 +1,144 @@
+"""
+llmbrick.core.load_balancer
+---------------------------
+Client 端負載平衡：在多個 brick 副本之間分配呼叫，
+並追蹤各端點健康狀態，連續失敗後暫時剔除。
+
+支援的策略：
+- round_robin: 輪詢
+- least_outstanding: 進行中請求數最少者
+- power_of_two: 隨機取兩個端點，選進行中請求數較少者
+"""
+
+import random
+import time
+from typing import Dict, Iterable, List, Optional, Type, Union
+
+
+class Endpoint:
+    """單一後端端點及其健康狀態"""
+
+    __slots__ = ("address", "outstanding", "consecutive_failures", "ejected_until")
+
+    def __init__(self, address: str):
+        self.address = address
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+
+    def is_available(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+    def __repr__(self) -> str:
+        return (
+            f"Endpoint({self.address!r}, outstanding={self.outstanding}, "
+            f"failures={self.consecutive_failures})"
+        )
+
+
+class LoadBalancingPolicy:
+    """負載平衡策略基底類別，子類別實作 pick"""
+
+    name: str = ""
+
+    def pick(self, endpoints: List[Endpoint]) -> Endpoint:
+        raise NotImplementedError
+
+
+class RoundRobinPolicy(LoadBalancingPolicy):
+    name = "round_robin"
+
+    def __init__(self) -> None:
+        self._cursor = 0
+
+    def pick(self, endpoints: List[Endpoint]) -> Endpoint:
+        endpoint = endpoints[self._cursor % len(endpoints)]
+        self._cursor += 1
+        return endpoint
+
+
+class LeastOutstandingPolicy(LoadBalancingPolicy):
+    name = "least_outstanding"
+
+    def pick(self, endpoints: List[Endpoint]) -> Endpoint:
+        return min(endpoints, key=lambda ep: ep.outstanding)
+
+
+class PowerOfTwoChoicesPolicy(LoadBalancingPolicy):
+    name = "power_of_two"
+
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        self._rng = rng or random.Random()
+
+    def pick(self, endpoints: List[Endpoint]) -> Endpoint:
+        if len(endpoints) == 1:
+            return endpoints[0]
+        first, second = self._rng.sample(endpoints, 2)
+        return first if first.outstanding <= second.outstanding else second
+
+
+_POLICIES: Dict[str, Type[LoadBalancingPolicy]] = {
+    RoundRobinPolicy.name: RoundRobinPolicy,
+    LeastOutstandingPolicy.name: LeastOutstandingPolicy,
+    PowerOfTwoChoicesPolicy.name: PowerOfTwoChoicesPolicy,
+}
+
+
+def create_policy(policy: str) -> LoadBalancingPolicy:
+    """依名稱建立負載平衡策略"""
+    if policy not in _POLICIES:
+        raise ValueError(f"未知的負載平衡策略: {policy}，可用: {sorted(_POLICIES)}")
+    return _POLICIES[policy]()
+
+
+class LoadBalancer:
+    """
+    在多個端點間挑選呼叫目標，並做被動健康檢查。
+
+    :param addresses: 端點地址列表，格式為 "host:port"
+    :param policy: 策略名稱或 LoadBalancingPolicy 實例
+    :param failure_threshold: 連續失敗幾次後剔除端點
+    :param ejection_seconds: 剔除持續秒數，到期後自動恢復
+    """
+
+    def __init__(
+        self,
+        addresses: Iterable[str],
+        policy: Union[str, LoadBalancingPolicy] = "round_robin",
+        failure_threshold: int = 3,
+        ejection_seconds: float = 30.0,
+    ):
+        self.policy = create_policy(policy) if isinstance(policy, str) else policy
+        self.failure_threshold = failure_threshold
+        self.ejection_seconds = ejection_seconds
+        self.endpoints: List[Endpoint] = []
+        self.update(addresses)
+
+    def update(self, addresses: Iterable[str]) -> None:
+        """更新端點列表，保留既有端點的狀態"""
+        existing = {ep.address: ep for ep in self.endpoints}
+        endpoints = [existing.get(addr) or Endpoint(addr) for addr in addresses]
+        if not endpoints:
+            raise ValueError("LoadBalancer requires at least one endpoint")
+        self.endpoints = endpoints
+
+    def pick(self) -> Endpoint:
+        """挑選端點；若全部被剔除則退回使用所有端點"""
+        now = time.monotonic()
+        available = [ep for ep in self.endpoints if ep.is_available(now)]
+        return self.policy.pick(available or self.endpoints)
+
+    def record_success(self, endpoint: Endpoint) -> None:
+        endpoint.consecutive_failures = 0
+
+    def record_failure(self, endpoint: Endpoint) -> None:
+        endpoint.consecutive_failures += 1
+        if endpoint.consecutive_failures >= self.failure_threshold:
+            endpoint.ejected_until = time.monotonic() + self.ejection_seconds
+            endpoint.consecutive_failures = 0
+            from llmbrick.utils.logging import logger
+
+            logger.warning(
+                f"[LoadBalancer] endpoint {endpoint.address} ejected for "
+                f"{self.ejection_seconds}s after repeated failures"
+            )
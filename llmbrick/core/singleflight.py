@@ -0,0 +1,105 @@
+"""
+llmbrick.core.singleflight
+--------------------------
+相同 unary 請求的合併執行 (single-flight)。
+
+熱門問題湧入時，同一時間會有許多內容相同的 Retrieval / Intention 請求。開啟後
+BaseBrick.run_unary 以請求指紋 (BaseBrick.cache_key) 合併進行中的請求：
+第一個請求執行 handler，其餘請求等待並共用同一個結果 (包含例外)。
+與回應快取不同，結果只在執行期間共用，不會有過期資料的問題。
+
+    brick.enable_single_flight(max_wait=2.0)
+
+- max_wait: 等待中的請求最多等待秒數，逾時後改為自行執行 handler，不受慢請求拖累
+- 執行中的請求被取消時，等待中的請求各自重新執行，不會一起被取消
+- 共用的結果是同一個物件，呼叫端不應修改
+
+指標 (全域 MetricsRegistry，標籤 brick)：
+- llmbrick_singleflight_shared_total: 共用進行中結果的請求數
+- llmbrick_singleflight_wait_timeouts_total: 等待逾時後自行執行的請求數
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from llmbrick.utils.metrics import MetricsRegistry, get_registry
+
+_T = TypeVar("_T")
+
+
+class SingleFlight:
+    """
+    以 key 合併同時進行的非同步呼叫。須在單一 event loop 中使用。
+
+    :param max_wait: 等待進行中呼叫的秒數上限，None 表示等到結束為止
+    :param name: 指標的 brick 標籤
+    """
+
+    def __init__(
+        self,
+        max_wait: Optional[float] = None,
+        name: str = "",
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        if max_wait is not None and max_wait < 0:
+            raise ValueError("max_wait must be >= 0")
+        self.max_wait = max_wait
+        self.name = name
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+        registry = registry or get_registry()
+        self._shared = registry.counter(
+            "llmbrick_singleflight_shared_total",
+            "Unary calls that shared an in-flight execution",
+            ("brick",),
+        )
+        self._timeouts = registry.counter(
+            "llmbrick_singleflight_wait_timeouts_total",
+            "Unary calls that stopped waiting for an in-flight execution",
+            ("brick",),
+        )
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: str, func: Callable[[], Awaitable[_T]]) -> _T:
+        """執行 func()，若相同 key 的呼叫正在進行則等待並共用其結果"""
+        future = self._inflight.get(key)
+        if future is None:
+            return await self._lead(key, func)
+
+        self._shared.inc(brick=self.name)
+        try:
+            if self.max_wait is None:
+                return await asyncio.shield(future)
+            return await asyncio.wait_for(asyncio.shield(future), self.max_wait)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise
+            # 執行中的呼叫被取消 (例如其呼叫端斷線)，改為自行執行
+        except asyncio.TimeoutError:
+            if future.done():
+                # 執行中的呼叫本身拋出的 TimeoutError
+                raise
+            self._timeouts.inc(brick=self.name)
+        return await func()
+
+    async def _lead(self, key: str, func: Callable[[], Awaitable[_T]]) -> _T:
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # 沒有等待者時避免 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
@@ -25,7 +25,7 @@ _sym_db = _symbol_database.Default()
 from llmbrick.protocols.grpc.common import common_pb2 as protocols_dot_grpc_dot_common_dot_common__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n protocols/grpc/guard/guard.proto\x12\x14protocols.grpc.guard\x1a\"protocols/grpc/common/common.proto\"p\n\x0cGuardRequest\x12\x0c\n\x04text\x18\x01 \x01(\t\x12\x11\n\tclient_id\x18\x02 \x01(\t\x12\x12\n\nsession_id\x18\x03 \x01(\t\x12\x12\n\nrequest_id\x18\x04 \x01(\t\x12\x17\n\x0fsource_language\x18\x05 \x01(\t\"D\n\x0bGuardResult\x12\x11\n\tis_attack\x18\x01 \x01(\x08\x12\x12\n\nconfidence\x18\x02 \x01(\x02\x12\x0e\n\x06\x64\x65tail\x18\x03 \x01(\t\"v\n\rGuardResponse\x12\x32\n\x07results\x18\x01 \x03(\x0b\x32!.protocols.grpc.guard.GuardResult\x12\x31\n\x05\x65rror\x18\x02 \x01(\x0b\x32\".protocols.grpc.common.ErrorDetail2\xc9\x01\n\x0cGuardService\x12g\n\x0eGetServiceInfo\x12).protocols.grpc.common.ServiceInfoRequest\x1a*.protocols.grpc.common.ServiceInfoResponse\x12P\n\x05Unary\x12\".protocols.grpc.guard.GuardRequest\x1a#.protocols.grpc.guard.GuardResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n protocols/grpc/guard/guard.proto\x12\x14protocols.grpc.guard\x1a\"protocols/grpc/common/common.proto\"p\n\x0cGuardRequest\x12\x0c\n\x04text\x18\x01 \x01(\t\x12\x11\n\tclient_id\x18\x02 \x01(\t\x12\x12\n\nsession_id\x18\x03 \x01(\t\x12\x12\n\nrequest_id\x18\x04 \x01(\t\x12\x17\n\x0fsource_language\x18\x05 \x01(\t\"D\n\x0bGuardResult\x12\x11\n\tis_attack\x18\x01 \x01(\x08\x12\x12\n\nconfidence\x18\x02 \x01(\x02\x12\x0e\n\x06\x64\x65tail\x18\x03 \x01(\t\"v\n\rGuardResponse\x12\x32\n\x07results\x18\x01 \x03(\x0b\x32!.protocols.grpc.guard.GuardResult\x12\x31\n\x05\x65rror\x18\x02 \x01(\x0b\x32\".protocols.grpc.common.ErrorDetail\"I\n\x11GuardBatchRequest\x12\x34\n\x08requests\x18\x01 \x03(\x0b\x32\".protocols.grpc.guard.GuardRequest\"\x7f\n\x12GuardBatchResponse\x12\x36\n\tresponses\x18\x01 \x03(\x0b\x32#.protocols.grpc.guard.GuardResponse\x12\x31\n\x05\x65rror\x18\x02 \x01(\x0b\x32\".protocols.grpc.common.ErrorDetail2\xaa\x02\n\x0cGuardService\x12g\n\x0eGetServiceInfo\x12).protocols.grpc.common.ServiceInfoRequest\x1a*.protocols.grpc.common.ServiceInfoResponse\x12P\n\x05Unary\x12\".protocols.grpc.guard.GuardRequest\x1a#.protocols.grpc.guard.GuardResponse\x12_\n\nBatchUnary\x12\'.protocols.grpc.guard.GuardBatchRequest\x1a(.protocols.grpc.guard.GuardBatchResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -38,6 +38,10 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_GUARDRESULT']._serialized_end=276
   _globals['_GUARDRESPONSE']._serialized_start=278
   _globals['_GUARDRESPONSE']._serialized_end=396
-  _globals['_GUARDSERVICE']._serialized_start=399
-  _globals['_GUARDSERVICE']._serialized_end=600
+  _globals['_GUARDBATCHREQUEST']._serialized_start=398
+  _globals['_GUARDBATCHREQUEST']._serialized_end=471
+  _globals['_GUARDBATCHRESPONSE']._serialized_start=473
+  _globals['_GUARDBATCHRESPONSE']._serialized_end=600
+  _globals['_GUARDSERVICE']._serialized_start=603
+  _globals['_GUARDSERVICE']._serialized_end=901
 # @@protoc_insertion_point(module_scope)
@@ -44,6 +44,11 @@ class GuardServiceStub(object):
                 request_serializer=protocols_dot_grpc_dot_guard_dot_guard__pb2.GuardRequest.SerializeToString,
                 response_deserializer=protocols_dot_grpc_dot_guard_dot_guard__pb2.GuardResponse.FromString,
                 _registered_method=True)
+        self.BatchUnary = channel.unary_unary(
+                '/protocols.grpc.guard.GuardService/BatchUnary',
+                request_serializer=protocols_dot_grpc_dot_guard_dot_guard__pb2.GuardBatchRequest.SerializeToString,
+                response_deserializer=protocols_dot_grpc_dot_guard_dot_guard__pb2.GuardBatchResponse.FromString,
+                _registered_method=True)
 
 
 class GuardServiceServicer(object):
@@ -61,6 +66,12 @@ class GuardServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def BatchUnary(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_GuardServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -74,6 +85,11 @@ def add_GuardServiceServicer_to_server(servicer, server):
                     request_deserializer=protocols_dot_grpc_dot_guard_dot_guard__pb2.GuardRequest.FromString,
                     response_serializer=protocols_dot_grpc_dot_guard_dot_guard__pb2.GuardResponse.SerializeToString,
             ),
+            'BatchUnary': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchUnary,
+                    request_deserializer=protocols_dot_grpc_dot_guard_dot_guard__pb2.GuardBatchRequest.FromString,
+                    response_serializer=protocols_dot_grpc_dot_guard_dot_guard__pb2.GuardBatchResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'protocols.grpc.guard.GuardService', rpc_method_handlers)
@@ -138,3 +154,30 @@ class GuardService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def BatchUnary(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/protocols.grpc.guard.GuardService/BatchUnary',
+            protocols_dot_grpc_dot_guard_dot_guard__pb2.GuardBatchRequest.SerializeToString,
+            protocols_dot_grpc_dot_guard_dot_guard__pb2.GuardBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
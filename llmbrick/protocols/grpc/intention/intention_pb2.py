@@ -25,7 +25,7 @@ _sym_db = _symbol_database.Default()
 from llmbrick.protocols.grpc.common import common_pb2 as protocols_dot_grpc_dot_common_dot_common__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n(protocols/grpc/intention/intention.proto\x12\x18protocols.grpc.intention\x1a\"protocols/grpc/common/common.proto\"t\n\x10IntentionRequest\x12\x0c\n\x04text\x18\x01 \x01(\t\x12\x11\n\tclient_id\x18\x02 \x01(\t\x12\x12\n\nsession_id\x18\x03 \x01(\t\x12\x12\n\nrequest_id\x18\x04 \x01(\t\x12\x17\n\x0fsource_language\x18\x05 \x01(\t\">\n\x0fIntentionResult\x12\x17\n\x0fintent_category\x18\x01 \x01(\t\x12\x12\n\nconfidence\x18\x02 \x01(\x02\"\x82\x01\n\x11IntentionResponse\x12:\n\x07results\x18\x01 \x03(\x0b\x32).protocols.grpc.intention.IntentionResult\x12\x31\n\x05\x65rror\x18\x02 \x01(\x0b\x32\".protocols.grpc.common.ErrorDetail2\xdd\x01\n\x10IntentionService\x12g\n\x0eGetServiceInfo\x12).protocols.grpc.common.ServiceInfoRequest\x1a*.protocols.grpc.common.ServiceInfoResponse\x12`\n\x05Unary\x12*.protocols.grpc.intention.IntentionRequest\x1a+.protocols.grpc.intention.IntentionResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n(protocols/grpc/intention/intention.proto\x12\x18protocols.grpc.intention\x1a\"protocols/grpc/common/common.proto\"t\n\x10IntentionRequest\x12\x0c\n\x04text\x18\x01 \x01(\t\x12\x11\n\tclient_id\x18\x02 \x01(\t\x12\x12\n\nsession_id\x18\x03 \x01(\t\x12\x12\n\nrequest_id\x18\x04 \x01(\t\x12\x17\n\x0fsource_language\x18\x05 \x01(\t\">\n\x0fIntentionResult\x12\x17\n\x0fintent_category\x18\x01 \x01(\t\x12\x12\n\nconfidence\x18\x02 \x01(\x02\"\x82\x01\n\x11IntentionResponse\x12:\n\x07results\x18\x01 \x03(\x0b\x32).protocols.grpc.intention.IntentionResult\x12\x31\n\x05\x65rror\x18\x02 \x01(\x0b\x32\".protocols.grpc.common.ErrorDetail\"U\n\x15IntentionBatchRequest\x12<\n\x08requests\x18\x01 \x03(\x0b\x32*.protocols.grpc.intention.IntentionRequest\"\x8b\x01\n\x16IntentionBatchResponse\x12>\n\tresponses\x18\x01 \x03(\x0b\x32+.protocols.grpc.intention.IntentionResponse\x12\x31\n\x05\x65rror\x18\x02 \x01(\x0b\x32\".protocols.grpc.common.ErrorDetail2\xce\x02\n\x10IntentionService\x12g\n\x0eGetServiceInfo\x12).protocols.grpc.common.ServiceInfoRequest\x1a*.protocols.grpc.common.ServiceInfoResponse\x12`\n\x05Unary\x12*.protocols.grpc.intention.IntentionRequest\x1a+.protocols.grpc.intention.IntentionResponse\x12o\n\nBatchUnary\x12/.protocols.grpc.intention.IntentionBatchRequest\x1a\x30.protocols.grpc.intention.IntentionBatchResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -38,6 +38,10 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_INTENTIONRESULT']._serialized_end=286
   _globals['_INTENTIONRESPONSE']._serialized_start=289
   _globals['_INTENTIONRESPONSE']._serialized_end=419
-  _globals['_INTENTIONSERVICE']._serialized_start=422
-  _globals['_INTENTIONSERVICE']._serialized_end=643
+  _globals['_INTENTIONBATCHREQUEST']._serialized_start=421
+  _globals['_INTENTIONBATCHREQUEST']._serialized_end=506
+  _globals['_INTENTIONBATCHRESPONSE']._serialized_start=509
+  _globals['_INTENTIONBATCHRESPONSE']._serialized_end=648
+  _globals['_INTENTIONSERVICE']._serialized_start=651
+  _globals['_INTENTIONSERVICE']._serialized_end=985
 # @@protoc_insertion_point(module_scope)
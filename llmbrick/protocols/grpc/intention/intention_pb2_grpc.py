@@ -44,6 +44,11 @@ class IntentionServiceStub(object):
                 request_serializer=protocols_dot_grpc_dot_intention_dot_intention__pb2.IntentionRequest.SerializeToString,
                 response_deserializer=protocols_dot_grpc_dot_intention_dot_intention__pb2.IntentionResponse.FromString,
                 _registered_method=True)
+        self.BatchUnary = channel.unary_unary(
+                '/protocols.grpc.intention.IntentionService/BatchUnary',
+                request_serializer=protocols_dot_grpc_dot_intention_dot_intention__pb2.IntentionBatchRequest.SerializeToString,
+                response_deserializer=protocols_dot_grpc_dot_intention_dot_intention__pb2.IntentionBatchResponse.FromString,
+                _registered_method=True)
 
 
 class IntentionServiceServicer(object):
@@ -61,6 +66,12 @@ class IntentionServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def BatchUnary(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_IntentionServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -74,6 +85,11 @@ def add_IntentionServiceServicer_to_server(servicer, server):
                     request_deserializer=protocols_dot_grpc_dot_intention_dot_intention__pb2.IntentionRequest.FromString,
                     response_serializer=protocols_dot_grpc_dot_intention_dot_intention__pb2.IntentionResponse.SerializeToString,
             ),
+            'BatchUnary': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchUnary,
+                    request_deserializer=protocols_dot_grpc_dot_intention_dot_intention__pb2.IntentionBatchRequest.FromString,
+                    response_serializer=protocols_dot_grpc_dot_intention_dot_intention__pb2.IntentionBatchResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'protocols.grpc.intention.IntentionService', rpc_method_handlers)
@@ -138,3 +154,30 @@ class IntentionService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def BatchUnary(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/protocols.grpc.intention.IntentionService/BatchUnary',
+            protocols_dot_grpc_dot_intention_dot_intention__pb2.IntentionBatchRequest.SerializeToString,
+            protocols_dot_grpc_dot_intention_dot_intention__pb2.IntentionBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -45,6 +45,11 @@ class RectifyServiceStub(object):
                 request_serializer=protocols_dot_grpc_dot_rectify_dot_rectify__pb2.RectifyRequest.SerializeToString,
                 response_deserializer=protocols_dot_grpc_dot_rectify_dot_rectify__pb2.RectifyResponse.FromString,
                 _registered_method=True)
+        self.BatchUnary = channel.unary_unary(
+                '/protocols.grpc.rectify.RectifyService/BatchUnary',
+                request_serializer=protocols_dot_grpc_dot_rectify_dot_rectify__pb2.RectifyBatchRequest.SerializeToString,
+                response_deserializer=protocols_dot_grpc_dot_rectify_dot_rectify__pb2.RectifyBatchResponse.FromString,
+                _registered_method=True)
 
 
 class RectifyServiceServicer(object):
@@ -63,6 +68,12 @@ class RectifyServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def BatchUnary(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_RectifyServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -76,6 +87,11 @@ def add_RectifyServiceServicer_to_server(servicer, server):
                     request_deserializer=protocols_dot_grpc_dot_rectify_dot_rectify__pb2.RectifyRequest.FromString,
                     response_serializer=protocols_dot_grpc_dot_rectify_dot_rectify__pb2.RectifyResponse.SerializeToString,
             ),
+            'BatchUnary': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchUnary,
+                    request_deserializer=protocols_dot_grpc_dot_rectify_dot_rectify__pb2.RectifyBatchRequest.FromString,
+                    response_serializer=protocols_dot_grpc_dot_rectify_dot_rectify__pb2.RectifyBatchResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'protocols.grpc.rectify.RectifyService', rpc_method_handlers)
@@ -141,3 +157,30 @@ class RectifyService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def BatchUnary(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/protocols.grpc.rectify.RectifyService/BatchUnary',
+            protocols_dot_grpc_dot_rectify_dot_rectify__pb2.RectifyBatchRequest.SerializeToString,
+            protocols_dot_grpc_dot_rectify_dot_rectify__pb2.RectifyBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
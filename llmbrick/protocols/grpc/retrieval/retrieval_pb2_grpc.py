@@ -44,6 +44,11 @@ class RetrievalServiceStub(object):
                 request_serializer=protocols_dot_grpc_dot_retrieval_dot_retrieval__pb2.RetrievalRequest.SerializeToString,
                 response_deserializer=protocols_dot_grpc_dot_retrieval_dot_retrieval__pb2.RetrievalResponse.FromString,
                 _registered_method=True)
+        self.BatchUnary = channel.unary_unary(
+                '/protocols.grpc.retrieval.RetrievalService/BatchUnary',
+                request_serializer=protocols_dot_grpc_dot_retrieval_dot_retrieval__pb2.RetrievalBatchRequest.SerializeToString,
+                response_deserializer=protocols_dot_grpc_dot_retrieval_dot_retrieval__pb2.RetrievalBatchResponse.FromString,
+                _registered_method=True)
 
 
 class RetrievalServiceServicer(object):
@@ -61,6 +66,12 @@ class RetrievalServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def BatchUnary(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_RetrievalServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -74,6 +85,11 @@ def add_RetrievalServiceServicer_to_server(servicer, server):
                     request_deserializer=protocols_dot_grpc_dot_retrieval_dot_retrieval__pb2.RetrievalRequest.FromString,
                     response_serializer=protocols_dot_grpc_dot_retrieval_dot_retrieval__pb2.RetrievalResponse.SerializeToString,
             ),
+            'BatchUnary': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchUnary,
+                    request_deserializer=protocols_dot_grpc_dot_retrieval_dot_retrieval__pb2.RetrievalBatchRequest.FromString,
+                    response_serializer=protocols_dot_grpc_dot_retrieval_dot_retrieval__pb2.RetrievalBatchResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'protocols.grpc.retrieval.RetrievalService', rpc_method_handlers)
@@ -138,3 +154,30 @@ class RetrievalService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def BatchUnary(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/protocols.grpc.retrieval.RetrievalService/BatchUnary',
+            protocols_dot_grpc_dot_retrieval_dot_retrieval__pb2.RetrievalBatchRequest.SerializeToString,
+            protocols_dot_grpc_dot_retrieval_dot_retrieval__pb2.RetrievalBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -1,19 +1,41 @@
-from dataclasses import asdict, dataclass, field
-from typing import Any, Dict, List, Optional
+"""
+由 scripts/generate_dataclass.py 依 llmbrick/protocols/grpc/common/common.proto 產生。
+
+to_dict/from_dict/to_pb2/from_pb2_model 皆為明確展開的欄位存取，
+不經過 dataclasses.asdict 或 MessageToDict；to_dict 為淺拷貝。
+"""
 
-from google.protobuf.json_format import MessageToDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 from llmbrick.protocols.grpc.common import common_pb2
+from llmbrick.protocols.models.compat import DATACLASS_OPTIONS
+from llmbrick.protocols.models.struct_utils import (
+    LazyStructView,
+    dict_to_struct,
+    struct_to_dict,
+)
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class ErrorDetail:
     code: int
     message: str
     detail: str = ""
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "code": self.code,
+            "message": self.message,
+            "detail": self.detail,
+        }
+
+    def to_pb2(self) -> common_pb2.ErrorDetail:
+        return common_pb2.ErrorDetail(
+            code=self.code,
+            message=self.message,
+            detail=self.detail,
+        )
 
     @classmethod
     def from_pb2_model(cls, model: common_pb2.ErrorDetail) -> "ErrorDetail":
@@ -32,77 +54,148 @@ class ErrorDetail:
         )
 
 
-@dataclass
-class ModelInfo:
-    model_id: str
-    version: str
-    supported_languages: List[str] = field(default_factory=list)
-    support_streaming: bool = False
-    description: str = ""
+@dataclass(**DATACLASS_OPTIONS)
+class CommonRequest:
+    data: Dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "data": dict(self.data),
+        }
+
+    def to_pb2(self) -> common_pb2.CommonRequest:
+        model = common_pb2.CommonRequest()
+        dict_to_struct(self.data, model.data)
+        return model
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "ModelInfo":
+    def from_pb2_model(
+        cls, model: common_pb2.CommonRequest, lazy: bool = False
+    ) -> "CommonRequest":
+        """
+        :param lazy: True 時 Struct 欄位為唯讀的 LazyStructView，欄位在存取時才解碼
+        """
         return cls(
-            model_id=data.get("model_id", ""),
-            version=data.get("version", ""),
-            supported_languages=data.get("supported_languages", []),
-            support_streaming=data.get("support_streaming", False),
-            description=data.get("description", ""),
+            data=LazyStructView(model.data) if lazy else struct_to_dict(model.data),
         )
 
-
-@dataclass
-class CommonRequest:
-    data: Dict[str, Any] = field(default_factory=dict)
-
-    def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
-
     @classmethod
-    def from_pb2_model(cls, model: common_pb2.CommonRequest) -> "CommonRequest":
-        data = MessageToDict(model.data, preserving_proto_field_name=True)
-        return cls(data=data)
+    def from_dict(cls, data: Dict[str, Any]) -> "CommonRequest":
+        return cls(
+            data=data.get("data", {}),
+        )
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class CommonResponse:
     data: Dict[str, Any] = field(default_factory=dict)
     error: Optional[ErrorDetail] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "data": dict(self.data),
+            "error": self.error.to_dict() if self.error is not None else None,
+        }
+
+    def to_pb2(self) -> common_pb2.CommonResponse:
+        model = common_pb2.CommonResponse(
+            error=self.error.to_pb2() if self.error is not None else None,
+        )
+        dict_to_struct(self.data, model.data)
+        return model
 
     @classmethod
-    def from_pb2_model(cls, model: common_pb2.CommonResponse) -> "CommonResponse":
-        data = MessageToDict(model.data, preserving_proto_field_name=True)
-        error = (
-            ErrorDetail.from_dict(MessageToDict(model.error, preserving_proto_field_name=True)) if model.error else None
+    def from_pb2_model(
+        cls, model: common_pb2.CommonResponse, lazy: bool = False
+    ) -> "CommonResponse":
+        """
+        :param lazy: True 時 Struct 欄位為唯讀的 LazyStructView，欄位在存取時才解碼
+        """
+        return cls(
+            data=LazyStructView(model.data) if lazy else struct_to_dict(model.data),
+            error=(
+                ErrorDetail.from_pb2_model(model.error)
+                if model.HasField("error")
+                else None
+            ),
         )
-        return cls(data=data, error=error)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "CommonResponse":
         error_data = data.get("error")
-        error = ErrorDetail.from_dict(error_data) if error_data else None
-        return cls(data=data.get("data", {}), error=error)
+        return cls(
+            data=data.get("data", {}),
+            error=ErrorDetail.from_dict(error_data) if error_data else None,
+        )
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class ServiceInfoRequest:
-    pass
-
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {}
+
+    def to_pb2(self) -> common_pb2.ServiceInfoRequest:
+        return common_pb2.ServiceInfoRequest()
+
+    @classmethod
+    def from_pb2_model(
+        cls, model: common_pb2.ServiceInfoRequest
+    ) -> "ServiceInfoRequest":
+        return cls()
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ServiceInfoRequest":
         return cls()
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
+class ModelInfo:
+    model_id: str
+    version: str
+    supported_languages: List[str] = field(default_factory=list)
+    support_streaming: bool = False
+    description: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "model_id": self.model_id,
+            "version": self.version,
+            "supported_languages": list(self.supported_languages),
+            "support_streaming": self.support_streaming,
+            "description": self.description,
+        }
+
+    def to_pb2(self) -> common_pb2.ModelInfo:
+        return common_pb2.ModelInfo(
+            model_id=self.model_id,
+            version=self.version,
+            supported_languages=self.supported_languages,
+            support_streaming=self.support_streaming,
+            description=self.description,
+        )
+
+    @classmethod
+    def from_pb2_model(cls, model: common_pb2.ModelInfo) -> "ModelInfo":
+        return cls(
+            model_id=model.model_id,
+            version=model.version,
+            supported_languages=list(model.supported_languages),
+            support_streaming=model.support_streaming,
+            description=model.description,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ModelInfo":
+        return cls(
+            model_id=data.get("model_id", ""),
+            version=data.get("version", ""),
+            supported_languages=data.get("supported_languages", []),
+            support_streaming=data.get("support_streaming", False),
+            description=data.get("description", ""),
+        )
+
+
+@dataclass(**DATACLASS_OPTIONS)
 class ServiceInfoResponse:
     service_name: str = ""
     version: str = ""
@@ -110,17 +203,42 @@ class ServiceInfoResponse:
     error: Optional[ErrorDetail] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "service_name": self.service_name,
+            "version": self.version,
+            "models": [item.to_dict() for item in self.models],
+            "error": self.error.to_dict() if self.error is not None else None,
+        }
+
+    def to_pb2(self) -> common_pb2.ServiceInfoResponse:
+        return common_pb2.ServiceInfoResponse(
+            service_name=self.service_name,
+            version=self.version,
+            models=[item.to_pb2() for item in self.models],
+            error=self.error.to_pb2() if self.error is not None else None,
+        )
+
+    @classmethod
+    def from_pb2_model(
+        cls, model: common_pb2.ServiceInfoResponse
+    ) -> "ServiceInfoResponse":
+        return cls(
+            service_name=model.service_name,
+            version=model.version,
+            models=[ModelInfo.from_pb2_model(item) for item in model.models],
+            error=(
+                ErrorDetail.from_pb2_model(model.error)
+                if model.HasField("error")
+                else None
+            ),
+        )
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ServiceInfoResponse":
-        models_data = data.get("models", [])
-        models = [ModelInfo.from_dict(model) for model in models_data]
         error_data = data.get("error")
-        error = ErrorDetail.from_dict(error_data) if error_data else None
         return cls(
             service_name=data.get("service_name", ""),
             version=data.get("version", ""),
-            models=models,
-            error=error,
+            models=[ModelInfo.from_dict(item) for item in data.get("models", [])],
+            error=ErrorDetail.from_dict(error_data) if error_data else None,
         )
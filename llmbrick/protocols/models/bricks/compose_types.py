@@ -1,13 +1,24 @@
-from dataclasses import asdict, dataclass, field
-from typing import Any, Dict, List, Optional
+"""
+由 scripts/generate_dataclass.py 依 llmbrick/protocols/grpc/compose/compose.proto 產生。
+
+to_dict/from_dict/to_pb2/from_pb2_model 皆為明確展開的欄位存取，
+不經過 dataclasses.asdict 或 MessageToDict；to_dict 為淺拷貝。
+"""
 
-from google.protobuf.json_format import MessageToDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 from llmbrick.protocols.grpc.compose import compose_pb2
 from llmbrick.protocols.models.bricks.common_types import ErrorDetail
+from llmbrick.protocols.models.compat import DATACLASS_OPTIONS
+from llmbrick.protocols.models.struct_utils import (
+    LazyStructView,
+    dict_to_struct,
+    struct_to_dict,
+)
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class Document:
     doc_id: str = ""
     title: str = ""
@@ -16,7 +27,42 @@ class Document:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "doc_id": self.doc_id,
+            "title": self.title,
+            "snippet": self.snippet,
+            "score": self.score,
+            "metadata": dict(self.metadata),
+        }
+
+    def to_pb2(self) -> compose_pb2.Document:
+        model = compose_pb2.Document(
+            doc_id=self.doc_id,
+            title=self.title,
+            snippet=self.snippet,
+            score=self.score,
+        )
+        dict_to_struct(self.metadata, model.metadata)
+        return model
+
+    @classmethod
+    def from_pb2_model(
+        cls, model: compose_pb2.Document, lazy: bool = False
+    ) -> "Document":
+        """
+        :param lazy: True 時 Struct 欄位為唯讀的 LazyStructView，欄位在存取時才解碼
+        """
+        return cls(
+            doc_id=model.doc_id,
+            title=model.title,
+            snippet=model.snippet,
+            score=model.score,
+            metadata=(
+                LazyStructView(model.metadata)
+                if lazy
+                else struct_to_dict(model.metadata)
+            ),
+        )
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Document":
@@ -29,7 +75,7 @@ class Document:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class ComposeRequest:
     input_documents: List[Document] = field(default_factory=list)
     target_format: str = ""
@@ -39,14 +85,36 @@ class ComposeRequest:
     source_language: str = ""
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "input_documents": [item.to_dict() for item in self.input_documents],
+            "target_format": self.target_format,
+            "client_id": self.client_id,
+            "session_id": self.session_id,
+            "request_id": self.request_id,
+            "source_language": self.source_language,
+        }
+
+    def to_pb2(self) -> compose_pb2.ComposeRequest:
+        return compose_pb2.ComposeRequest(
+            input_documents=[item.to_pb2() for item in self.input_documents],
+            target_format=self.target_format,
+            client_id=self.client_id,
+            session_id=self.session_id,
+            request_id=self.request_id,
+            source_language=self.source_language,
+        )
 
     @classmethod
-    def from_pb2_model(cls, model: compose_pb2.ComposeRequest) -> "ComposeRequest":
-        docs_data = [MessageToDict(doc, preserving_proto_field_name=True) for doc in model.input_documents]
-        input_documents = [Document.from_dict(doc) for doc in docs_data]
+    def from_pb2_model(
+        cls, model: compose_pb2.ComposeRequest, lazy: bool = False
+    ) -> "ComposeRequest":
+        """
+        :param lazy: True 時 Struct 欄位為唯讀的 LazyStructView，欄位在存取時才解碼
+        """
         return cls(
-            input_documents=input_documents,
+            input_documents=[
+                Document.from_pb2_model(item, lazy) for item in model.input_documents
+            ],
             target_format=model.target_format,
             client_id=model.client_id,
             session_id=model.session_id,
@@ -56,10 +124,10 @@ class ComposeRequest:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ComposeRequest":
-        docs_data = data.get("input_documents", [])
-        input_documents = [Document.from_dict(doc) for doc in docs_data]
         return cls(
-            input_documents=input_documents,
+            input_documents=[
+                Document.from_dict(item) for item in data.get("input_documents", [])
+            ],
             target_format=data.get("target_format", ""),
             client_id=data.get("client_id", ""),
             session_id=data.get("session_id", ""),
@@ -68,24 +136,46 @@ class ComposeRequest:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class ComposeResponse:
     output: Dict[str, Any] = field(default_factory=dict)
     error: Optional[ErrorDetail] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "output": dict(self.output),
+            "error": self.error.to_dict() if self.error is not None else None,
+        }
+
+    def to_pb2(self) -> compose_pb2.ComposeResponse:
+        model = compose_pb2.ComposeResponse(
+            error=self.error.to_pb2() if self.error is not None else None,
+        )
+        dict_to_struct(self.output, model.output)
+        return model
 
     @classmethod
-    def from_pb2_model(cls, model: compose_pb2.ComposeResponse) -> "ComposeResponse":
-        output_dict = MessageToDict(model.output, preserving_proto_field_name=True) if model.output else {}
-        error = (
-            ErrorDetail.from_dict(MessageToDict(model.error, preserving_proto_field_name=True)) if model.error else None
+    def from_pb2_model(
+        cls, model: compose_pb2.ComposeResponse, lazy: bool = False
+    ) -> "ComposeResponse":
+        """
+        :param lazy: True 時 Struct 欄位為唯讀的 LazyStructView，欄位在存取時才解碼
+        """
+        return cls(
+            output=(
+                LazyStructView(model.output) if lazy else struct_to_dict(model.output)
+            ),
+            error=(
+                ErrorDetail.from_pb2_model(model.error)
+                if model.HasField("error")
+                else None
+            ),
         )
-        return cls(output=output_dict, error=error)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ComposeResponse":
         error_data = data.get("error")
-        error = ErrorDetail.from_dict(error_data) if error_data else None
-        return cls(output=data.get("output", {}), error=error)
+        return cls(
+            output=data.get("output", {}),
+            error=ErrorDetail.from_dict(error_data) if error_data else None,
+        )
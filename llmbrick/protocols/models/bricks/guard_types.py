@@ -1,13 +1,19 @@
-from dataclasses import asdict, dataclass, field
-from typing import Any, Dict, List, Optional
+"""
+由 scripts/generate_dataclass.py 依 llmbrick/protocols/grpc/guard/guard.proto 產生。
+
+to_dict/from_dict/to_pb2/from_pb2_model 皆為明確展開的欄位存取，
+不經過 dataclasses.asdict 或 MessageToDict；to_dict 為淺拷貝。
+"""
 
-from google.protobuf.json_format import MessageToDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 from llmbrick.protocols.grpc.guard import guard_pb2
 from llmbrick.protocols.models.bricks.common_types import ErrorDetail
+from llmbrick.protocols.models.compat import DATACLASS_OPTIONS
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class GuardRequest:
     text: str = ""
     client_id: str = ""
@@ -16,8 +22,23 @@ class GuardRequest:
     source_language: str = ""
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
-    
+        return {
+            "text": self.text,
+            "client_id": self.client_id,
+            "session_id": self.session_id,
+            "request_id": self.request_id,
+            "source_language": self.source_language,
+        }
+
+    def to_pb2(self) -> guard_pb2.GuardRequest:
+        return guard_pb2.GuardRequest(
+            text=self.text,
+            client_id=self.client_id,
+            session_id=self.session_id,
+            request_id=self.request_id,
+            source_language=self.source_language,
+        )
+
     @classmethod
     def from_pb2_model(cls, model: guard_pb2.GuardRequest) -> "GuardRequest":
         return cls(
@@ -39,19 +60,32 @@ class GuardRequest:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class GuardResult:
     is_attack: bool = False
     confidence: float = 0.0
     detail: str = ""
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "is_attack": self.is_attack,
+            "confidence": self.confidence,
+            "detail": self.detail,
+        }
+
+    def to_pb2(self) -> guard_pb2.GuardResult:
+        return guard_pb2.GuardResult(
+            is_attack=self.is_attack,
+            confidence=self.confidence,
+            detail=self.detail,
+        )
 
     @classmethod
     def from_pb2_model(cls, model: guard_pb2.GuardResult) -> "GuardResult":
         return cls(
-            is_attack=model.is_attack, confidence=model.confidence, detail=model.detail
+            is_attack=model.is_attack,
+            confidence=model.confidence,
+            detail=model.detail,
         )
 
     @classmethod
@@ -63,26 +97,108 @@ class GuardResult:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class GuardResponse:
     results: List[GuardResult] = field(default_factory=list)
     error: Optional[ErrorDetail] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "results": [item.to_dict() for item in self.results],
+            "error": self.error.to_dict() if self.error is not None else None,
+        }
+
+    def to_pb2(self) -> guard_pb2.GuardResponse:
+        return guard_pb2.GuardResponse(
+            results=[item.to_pb2() for item in self.results],
+            error=self.error.to_pb2() if self.error is not None else None,
+        )
 
     @classmethod
     def from_pb2_model(cls, model: guard_pb2.GuardResponse) -> "GuardResponse":
-        results = [GuardResult.from_pb2_model(result) for result in model.results]
-        error = (
-            ErrorDetail.from_dict(MessageToDict(model.error, preserving_proto_field_name=True)) if model.error else None
+        return cls(
+            results=[GuardResult.from_pb2_model(item) for item in model.results],
+            error=(
+                ErrorDetail.from_pb2_model(model.error)
+                if model.HasField("error")
+                else None
+            ),
         )
-        return cls(results=results, error=error)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "GuardResponse":
-        results_data = data.get("results", [])
-        results = [GuardResult.from_dict(result) for result in results_data]
         error_data = data.get("error")
-        error = ErrorDetail.from_dict(error_data) if error_data else None
-        return cls(results=results, error=error)
+        return cls(
+            results=[GuardResult.from_dict(item) for item in data.get("results", [])],
+            error=ErrorDetail.from_dict(error_data) if error_data else None,
+        )
+
+
+@dataclass(**DATACLASS_OPTIONS)
+class GuardBatchRequest:
+    requests: List[GuardRequest] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": [item.to_dict() for item in self.requests],
+        }
+
+    def to_pb2(self) -> guard_pb2.GuardBatchRequest:
+        return guard_pb2.GuardBatchRequest(
+            requests=[item.to_pb2() for item in self.requests],
+        )
+
+    @classmethod
+    def from_pb2_model(cls, model: guard_pb2.GuardBatchRequest) -> "GuardBatchRequest":
+        return cls(
+            requests=[GuardRequest.from_pb2_model(item) for item in model.requests],
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GuardBatchRequest":
+        return cls(
+            requests=[
+                GuardRequest.from_dict(item) for item in data.get("requests", [])
+            ],
+        )
+
+
+@dataclass(**DATACLASS_OPTIONS)
+class GuardBatchResponse:
+    responses: List[GuardResponse] = field(default_factory=list)
+    error: Optional[ErrorDetail] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "responses": [item.to_dict() for item in self.responses],
+            "error": self.error.to_dict() if self.error is not None else None,
+        }
+
+    def to_pb2(self) -> guard_pb2.GuardBatchResponse:
+        return guard_pb2.GuardBatchResponse(
+            responses=[item.to_pb2() for item in self.responses],
+            error=self.error.to_pb2() if self.error is not None else None,
+        )
+
+    @classmethod
+    def from_pb2_model(
+        cls, model: guard_pb2.GuardBatchResponse
+    ) -> "GuardBatchResponse":
+        return cls(
+            responses=[GuardResponse.from_pb2_model(item) for item in model.responses],
+            error=(
+                ErrorDetail.from_pb2_model(model.error)
+                if model.HasField("error")
+                else None
+            ),
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GuardBatchResponse":
+        error_data = data.get("error")
+        return cls(
+            responses=[
+                GuardResponse.from_dict(item) for item in data.get("responses", [])
+            ],
+            error=ErrorDetail.from_dict(error_data) if error_data else None,
+        )
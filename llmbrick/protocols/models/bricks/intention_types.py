@@ -1,13 +1,19 @@
-from dataclasses import asdict, dataclass, field
-from typing import Any, Dict, List, Optional
+"""
+由 scripts/generate_dataclass.py 依 llmbrick/protocols/grpc/intention/intention.proto 產生。
+
+to_dict/from_dict/to_pb2/from_pb2_model 皆為明確展開的欄位存取，
+不經過 dataclasses.asdict 或 MessageToDict；to_dict 為淺拷貝。
+"""
 
-from google.protobuf.json_format import MessageToDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 from llmbrick.protocols.grpc.intention import intention_pb2
 from llmbrick.protocols.models.bricks.common_types import ErrorDetail
+from llmbrick.protocols.models.compat import DATACLASS_OPTIONS
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class IntentionRequest:
     text: str = ""
     client_id: str = ""
@@ -16,7 +22,22 @@ class IntentionRequest:
     source_language: str = ""
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "text": self.text,
+            "client_id": self.client_id,
+            "session_id": self.session_id,
+            "request_id": self.request_id,
+            "source_language": self.source_language,
+        }
+
+    def to_pb2(self) -> intention_pb2.IntentionRequest:
+        return intention_pb2.IntentionRequest(
+            text=self.text,
+            client_id=self.client_id,
+            session_id=self.session_id,
+            request_id=self.request_id,
+            source_language=self.source_language,
+        )
 
     @classmethod
     def from_pb2_model(
@@ -41,13 +62,29 @@ class IntentionRequest:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class IntentionResult:
     intent_category: str = ""
     confidence: float = 0.0
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "intent_category": self.intent_category,
+            "confidence": self.confidence,
+        }
+
+    def to_pb2(self) -> intention_pb2.IntentionResult:
+        return intention_pb2.IntentionResult(
+            intent_category=self.intent_category,
+            confidence=self.confidence,
+        )
+
+    @classmethod
+    def from_pb2_model(cls, model: intention_pb2.IntentionResult) -> "IntentionResult":
+        return cls(
+            intent_category=model.intent_category,
+            confidence=model.confidence,
+        )
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "IntentionResult":
@@ -57,30 +94,116 @@ class IntentionResult:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class IntentionResponse:
     results: List[IntentionResult] = field(default_factory=list)
     error: Optional[ErrorDetail] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "results": [item.to_dict() for item in self.results],
+            "error": self.error.to_dict() if self.error is not None else None,
+        }
+
+    def to_pb2(self) -> intention_pb2.IntentionResponse:
+        return intention_pb2.IntentionResponse(
+            results=[item.to_pb2() for item in self.results],
+            error=self.error.to_pb2() if self.error is not None else None,
+        )
 
     @classmethod
     def from_pb2_model(
         cls, model: intention_pb2.IntentionResponse
     ) -> "IntentionResponse":
-        results = [
-            IntentionResult.from_dict(MessageToDict(result, preserving_proto_field_name=True)) for result in model.results
-        ]
-        error = (
-            ErrorDetail.from_dict(MessageToDict(model.error, preserving_proto_field_name=True)) if model.error else None
+        return cls(
+            results=[IntentionResult.from_pb2_model(item) for item in model.results],
+            error=(
+                ErrorDetail.from_pb2_model(model.error)
+                if model.HasField("error")
+                else None
+            ),
         )
-        return cls(results=results, error=error)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "IntentionResponse":
-        results_data = data.get("results", [])
-        results = [IntentionResult.from_dict(result) for result in results_data]
         error_data = data.get("error")
-        error = ErrorDetail.from_dict(error_data) if error_data else None
-        return cls(results=results, error=error)
+        return cls(
+            results=[
+                IntentionResult.from_dict(item) for item in data.get("results", [])
+            ],
+            error=ErrorDetail.from_dict(error_data) if error_data else None,
+        )
+
+
+@dataclass(**DATACLASS_OPTIONS)
+class IntentionBatchRequest:
+    requests: List[IntentionRequest] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": [item.to_dict() for item in self.requests],
+        }
+
+    def to_pb2(self) -> intention_pb2.IntentionBatchRequest:
+        return intention_pb2.IntentionBatchRequest(
+            requests=[item.to_pb2() for item in self.requests],
+        )
+
+    @classmethod
+    def from_pb2_model(
+        cls, model: intention_pb2.IntentionBatchRequest
+    ) -> "IntentionBatchRequest":
+        return cls(
+            requests=[IntentionRequest.from_pb2_model(item) for item in model.requests],
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IntentionBatchRequest":
+        return cls(
+            requests=[
+                IntentionRequest.from_dict(item) for item in data.get("requests", [])
+            ],
+        )
+
+
+@dataclass(**DATACLASS_OPTIONS)
+class IntentionBatchResponse:
+    responses: List[IntentionResponse] = field(default_factory=list)
+    error: Optional[ErrorDetail] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "responses": [item.to_dict() for item in self.responses],
+            "error": self.error.to_dict() if self.error is not None else None,
+        }
+
+    def to_pb2(self) -> intention_pb2.IntentionBatchResponse:
+        return intention_pb2.IntentionBatchResponse(
+            responses=[item.to_pb2() for item in self.responses],
+            error=self.error.to_pb2() if self.error is not None else None,
+        )
+
+    @classmethod
+    def from_pb2_model(
+        cls, model: intention_pb2.IntentionBatchResponse
+    ) -> "IntentionBatchResponse":
+        return cls(
+            responses=[
+                IntentionResponse.from_pb2_model(item) for item in model.responses
+            ],
+            error=(
+                ErrorDetail.from_pb2_model(model.error)
+                if model.HasField("error")
+                else None
+            ),
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IntentionBatchResponse":
+        error_data = data.get("error")
+        return cls(
+            responses=[
+                IntentionResponse.from_dict(item) for item in data.get("responses", [])
+            ],
+            error=ErrorDetail.from_dict(error_data) if error_data else None,
+        )
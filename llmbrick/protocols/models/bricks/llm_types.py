@@ -1,26 +1,51 @@
-from dataclasses import asdict, dataclass, field
-from typing import Any, Dict, List, Optional
+"""
+由 scripts/generate_dataclass.py 依 llmbrick/protocols/grpc/llm/llm.proto 產生。
+
+to_dict/from_dict/to_pb2/from_pb2_model 皆為明確展開的欄位存取，
+不經過 dataclasses.asdict 或 MessageToDict；to_dict 為淺拷貝。
+"""
 
-from google.protobuf.json_format import MessageToDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 from llmbrick.protocols.grpc.llm import llm_pb2
 from llmbrick.protocols.models.bricks.common_types import ErrorDetail
+from llmbrick.protocols.models.compat import DATACLASS_OPTIONS
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class Context:
     role: str = ""
     content: str = ""
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "role": self.role,
+            "content": self.content,
+        }
+
+    def to_pb2(self) -> llm_pb2.Context:
+        return llm_pb2.Context(
+            role=self.role,
+            content=self.content,
+        )
+
+    @classmethod
+    def from_pb2_model(cls, model: llm_pb2.Context) -> "Context":
+        return cls(
+            role=model.role,
+            content=model.content,
+        )
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Context":
-        return cls(role=data.get("role", ""), content=data.get("content", ""))
+        return cls(
+            role=data.get("role", ""),
+            content=data.get("content", ""),
+        )
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class LLMRequest:
     temperature: float = 0.7
     model_id: str = ""
@@ -33,17 +58,38 @@ class LLMRequest:
     max_tokens: int = 0
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "temperature": self.temperature,
+            "model_id": self.model_id,
+            "prompt": self.prompt,
+            "context": [item.to_dict() for item in self.context],
+            "client_id": self.client_id,
+            "session_id": self.session_id,
+            "request_id": self.request_id,
+            "source_language": self.source_language,
+            "max_tokens": self.max_tokens,
+        }
+
+    def to_pb2(self) -> llm_pb2.LLMRequest:
+        return llm_pb2.LLMRequest(
+            temperature=self.temperature,
+            model_id=self.model_id,
+            prompt=self.prompt,
+            context=[item.to_pb2() for item in self.context],
+            client_id=self.client_id,
+            session_id=self.session_id,
+            request_id=self.request_id,
+            source_language=self.source_language,
+            max_tokens=self.max_tokens,
+        )
 
     @classmethod
     def from_pb2_model(cls, model: llm_pb2.LLMRequest) -> "LLMRequest":
-        context_data = [MessageToDict(ctx, preserving_proto_field_name=True) for ctx in model.context]
-        context = [Context.from_dict(ctx) for ctx in context_data]
         return cls(
             temperature=model.temperature,
             model_id=model.model_id,
             prompt=model.prompt,
-            context=context,
+            context=[Context.from_pb2_model(item) for item in model.context],
             client_id=model.client_id,
             session_id=model.session_id,
             request_id=model.request_id,
@@ -53,13 +99,11 @@ class LLMRequest:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "LLMRequest":
-        context_data = data.get("context", [])
-        context = [Context.from_dict(ctx) for ctx in context_data]
         return cls(
             temperature=data.get("temperature", 0.7),
             model_id=data.get("model_id", ""),
             prompt=data.get("prompt", ""),
-            context=context,
+            context=[Context.from_dict(item) for item in data.get("context", [])],
             client_id=data.get("client_id", ""),
             session_id=data.get("session_id", ""),
             request_id=data.get("request_id", ""),
@@ -68,7 +112,7 @@ class LLMRequest:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class LLMResponse:
     text: str = ""
     tokens: List[str] = field(default_factory=list)
@@ -76,27 +120,40 @@ class LLMResponse:
     error: Optional[ErrorDetail] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "text": self.text,
+            "tokens": list(self.tokens),
+            "is_final": self.is_final,
+            "error": self.error.to_dict() if self.error is not None else None,
+        }
+
+    def to_pb2(self) -> llm_pb2.LLMResponse:
+        return llm_pb2.LLMResponse(
+            text=self.text,
+            tokens=self.tokens,
+            is_final=self.is_final,
+            error=self.error.to_pb2() if self.error is not None else None,
+        )
 
     @classmethod
     def from_pb2_model(cls, model: llm_pb2.LLMResponse) -> "LLMResponse":
-        error = (
-            ErrorDetail.from_dict(MessageToDict(model.error, preserving_proto_field_name=True)) if model.error else None
-        )
         return cls(
             text=model.text,
             tokens=list(model.tokens),
             is_final=model.is_final,
-            error=error,
+            error=(
+                ErrorDetail.from_pb2_model(model.error)
+                if model.HasField("error")
+                else None
+            ),
         )
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "LLMResponse":
         error_data = data.get("error")
-        error = ErrorDetail.from_dict(error_data) if error_data else None
         return cls(
             text=data.get("text", ""),
             tokens=data.get("tokens", []),
             is_final=data.get("is_final", False),
-            error=error,
+            error=ErrorDetail.from_dict(error_data) if error_data else None,
         )
@@ -1,13 +1,19 @@
-from dataclasses import asdict, dataclass
-from typing import Any, Dict, Optional
+"""
+由 scripts/generate_dataclass.py 依 llmbrick/protocols/grpc/rectify/rectify.proto 產生。
 
-from google.protobuf.json_format import MessageToDict
+to_dict/from_dict/to_pb2/from_pb2_model 皆為明確展開的欄位存取，
+不經過 dataclasses.asdict 或 MessageToDict；to_dict 為淺拷貝。
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 from llmbrick.protocols.grpc.rectify import rectify_pb2
 from llmbrick.protocols.models.bricks.common_types import ErrorDetail
+from llmbrick.protocols.models.compat import DATACLASS_OPTIONS
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class RectifyRequest:
     text: str = ""
     client_id: str = ""
@@ -16,7 +22,22 @@ class RectifyRequest:
     source_language: str = ""
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "text": self.text,
+            "client_id": self.client_id,
+            "session_id": self.session_id,
+            "request_id": self.request_id,
+            "source_language": self.source_language,
+        }
+
+    def to_pb2(self) -> rectify_pb2.RectifyRequest:
+        return rectify_pb2.RectifyRequest(
+            text=self.text,
+            client_id=self.client_id,
+            session_id=self.session_id,
+            request_id=self.request_id,
+            source_language=self.source_language,
+        )
 
     @classmethod
     def from_pb2_model(cls, model: rectify_pb2.RectifyRequest) -> "RectifyRequest":
@@ -39,23 +60,112 @@ class RectifyRequest:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class RectifyResponse:
     corrected_text: str = ""
     error: Optional[ErrorDetail] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "corrected_text": self.corrected_text,
+            "error": self.error.to_dict() if self.error is not None else None,
+        }
+
+    def to_pb2(self) -> rectify_pb2.RectifyResponse:
+        return rectify_pb2.RectifyResponse(
+            corrected_text=self.corrected_text,
+            error=self.error.to_pb2() if self.error is not None else None,
+        )
 
     @classmethod
     def from_pb2_model(cls, model: rectify_pb2.RectifyResponse) -> "RectifyResponse":
-        error = (
-            ErrorDetail.from_dict(MessageToDict(model.error, preserving_proto_field_name=True)) if model.error else None
+        return cls(
+            corrected_text=model.corrected_text,
+            error=(
+                ErrorDetail.from_pb2_model(model.error)
+                if model.HasField("error")
+                else None
+            ),
         )
-        return cls(corrected_text=model.corrected_text, error=error)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "RectifyResponse":
         error_data = data.get("error")
-        error = ErrorDetail.from_dict(error_data) if error_data else None
-        return cls(corrected_text=data.get("corrected_text", ""), error=error)
+        return cls(
+            corrected_text=data.get("corrected_text", ""),
+            error=ErrorDetail.from_dict(error_data) if error_data else None,
+        )
+
+
+@dataclass(**DATACLASS_OPTIONS)
+class RectifyBatchRequest:
+    requests: List[RectifyRequest] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": [item.to_dict() for item in self.requests],
+        }
+
+    def to_pb2(self) -> rectify_pb2.RectifyBatchRequest:
+        return rectify_pb2.RectifyBatchRequest(
+            requests=[item.to_pb2() for item in self.requests],
+        )
+
+    @classmethod
+    def from_pb2_model(
+        cls, model: rectify_pb2.RectifyBatchRequest
+    ) -> "RectifyBatchRequest":
+        return cls(
+            requests=[RectifyRequest.from_pb2_model(item) for item in model.requests],
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RectifyBatchRequest":
+        return cls(
+            requests=[
+                RectifyRequest.from_dict(item) for item in data.get("requests", [])
+            ],
+        )
+
+
+@dataclass(**DATACLASS_OPTIONS)
+class RectifyBatchResponse:
+    responses: List[RectifyResponse] = field(default_factory=list)
+    error: Optional[ErrorDetail] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "responses": [item.to_dict() for item in self.responses],
+            "error": self.error.to_dict() if self.error is not None else None,
+        }
+
+    def to_pb2(self) -> rectify_pb2.RectifyBatchResponse:
+        return rectify_pb2.RectifyBatchResponse(
+            responses=[item.to_pb2() for item in self.responses],
+            error=self.error.to_pb2() if self.error is not None else None,
+        )
+
+    @classmethod
+    def from_pb2_model(
+        cls, model: rectify_pb2.RectifyBatchResponse
+    ) -> "RectifyBatchResponse":
+        return cls(
+            responses=[
+                RectifyResponse.from_pb2_model(item) for item in model.responses
+            ],
+            error=(
+                ErrorDetail.from_pb2_model(model.error)
+                if model.HasField("error")
+                else None
+            ),
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RectifyBatchResponse":
+        error_data = data.get("error")
+        return cls(
+            responses=[
+                RectifyResponse.from_dict(item) for item in data.get("responses", [])
+            ],
+            error=ErrorDetail.from_dict(error_data) if error_data else None,
+        )
@@ -1,13 +1,24 @@
-from dataclasses import asdict, dataclass, field
-from typing import Any, Dict, List, Optional
+"""
+由 scripts/generate_dataclass.py 依 llmbrick/protocols/grpc/retrieval/retrieval.proto 產生。
+
+to_dict/from_dict/to_pb2/from_pb2_model 皆為明確展開的欄位存取，
+不經過 dataclasses.asdict 或 MessageToDict；to_dict 為淺拷貝。
+"""
 
-from google.protobuf.json_format import MessageToDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 from llmbrick.protocols.grpc.retrieval import retrieval_pb2
 from llmbrick.protocols.models.bricks.common_types import ErrorDetail
+from llmbrick.protocols.models.compat import DATACLASS_OPTIONS
+from llmbrick.protocols.models.struct_utils import (
+    LazyStructView,
+    dict_to_struct,
+    struct_to_dict,
+)
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class RetrievalRequest:
     query: str = ""
     max_results: int = 0
@@ -17,7 +28,24 @@ class RetrievalRequest:
     source_language: str = ""
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "query": self.query,
+            "max_results": self.max_results,
+            "client_id": self.client_id,
+            "session_id": self.session_id,
+            "request_id": self.request_id,
+            "source_language": self.source_language,
+        }
+
+    def to_pb2(self) -> retrieval_pb2.RetrievalRequest:
+        return retrieval_pb2.RetrievalRequest(
+            query=self.query,
+            max_results=self.max_results,
+            client_id=self.client_id,
+            session_id=self.session_id,
+            request_id=self.request_id,
+            source_language=self.source_language,
+        )
 
     @classmethod
     def from_pb2_model(
@@ -44,7 +72,7 @@ class RetrievalRequest:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class Document:
     doc_id: str = ""
     title: str = ""
@@ -53,7 +81,42 @@ class Document:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "doc_id": self.doc_id,
+            "title": self.title,
+            "snippet": self.snippet,
+            "score": self.score,
+            "metadata": dict(self.metadata),
+        }
+
+    def to_pb2(self) -> retrieval_pb2.Document:
+        model = retrieval_pb2.Document(
+            doc_id=self.doc_id,
+            title=self.title,
+            snippet=self.snippet,
+            score=self.score,
+        )
+        dict_to_struct(self.metadata, model.metadata)
+        return model
+
+    @classmethod
+    def from_pb2_model(
+        cls, model: retrieval_pb2.Document, lazy: bool = False
+    ) -> "Document":
+        """
+        :param lazy: True 時 Struct 欄位為唯讀的 LazyStructView，欄位在存取時才解碼
+        """
+        return cls(
+            doc_id=model.doc_id,
+            title=model.title,
+            snippet=model.snippet,
+            score=model.score,
+            metadata=(
+                LazyStructView(model.metadata)
+                if lazy
+                else struct_to_dict(model.metadata)
+            ),
+        )
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Document":
@@ -66,28 +129,120 @@ class Document:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class RetrievalResponse:
     documents: List[Document] = field(default_factory=list)
     error: Optional[ErrorDetail] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "documents": [item.to_dict() for item in self.documents],
+            "error": self.error.to_dict() if self.error is not None else None,
+        }
+
+    def to_pb2(self) -> retrieval_pb2.RetrievalResponse:
+        return retrieval_pb2.RetrievalResponse(
+            documents=[item.to_pb2() for item in self.documents],
+            error=self.error.to_pb2() if self.error is not None else None,
+        )
 
     @classmethod
     def from_pb2_model(
-        cls, model: retrieval_pb2.RetrievalResponse
+        cls, model: retrieval_pb2.RetrievalResponse, lazy: bool = False
     ) -> "RetrievalResponse":
-        docs = [Document.from_dict(MessageToDict(doc, preserving_proto_field_name=True)) for doc in model.documents]
-        error = (
-            ErrorDetail.from_dict(MessageToDict(model.error, preserving_proto_field_name=True)) if model.error else None
+        """
+        :param lazy: True 時 Struct 欄位為唯讀的 LazyStructView，欄位在存取時才解碼
+        """
+        return cls(
+            documents=[Document.from_pb2_model(item, lazy) for item in model.documents],
+            error=(
+                ErrorDetail.from_pb2_model(model.error)
+                if model.HasField("error")
+                else None
+            ),
         )
-        return cls(documents=docs, error=error)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "RetrievalResponse":
-        docs_data = data.get("documents", [])
-        documents = [Document.from_dict(doc) for doc in docs_data]
         error_data = data.get("error")
-        error = ErrorDetail.from_dict(error_data) if error_data else None
-        return cls(documents=documents, error=error)
+        return cls(
+            documents=[Document.from_dict(item) for item in data.get("documents", [])],
+            error=ErrorDetail.from_dict(error_data) if error_data else None,
+        )
+
+
+@dataclass(**DATACLASS_OPTIONS)
+class RetrievalBatchRequest:
+    requests: List[RetrievalRequest] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": [item.to_dict() for item in self.requests],
+        }
+
+    def to_pb2(self) -> retrieval_pb2.RetrievalBatchRequest:
+        return retrieval_pb2.RetrievalBatchRequest(
+            requests=[item.to_pb2() for item in self.requests],
+        )
+
+    @classmethod
+    def from_pb2_model(
+        cls, model: retrieval_pb2.RetrievalBatchRequest
+    ) -> "RetrievalBatchRequest":
+        return cls(
+            requests=[RetrievalRequest.from_pb2_model(item) for item in model.requests],
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RetrievalBatchRequest":
+        return cls(
+            requests=[
+                RetrievalRequest.from_dict(item) for item in data.get("requests", [])
+            ],
+        )
+
+
+@dataclass(**DATACLASS_OPTIONS)
+class RetrievalBatchResponse:
+    responses: List[RetrievalResponse] = field(default_factory=list)
+    error: Optional[ErrorDetail] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "responses": [item.to_dict() for item in self.responses],
+            "error": self.error.to_dict() if self.error is not None else None,
+        }
+
+    def to_pb2(self) -> retrieval_pb2.RetrievalBatchResponse:
+        return retrieval_pb2.RetrievalBatchResponse(
+            responses=[item.to_pb2() for item in self.responses],
+            error=self.error.to_pb2() if self.error is not None else None,
+        )
+
+    @classmethod
+    def from_pb2_model(
+        cls, model: retrieval_pb2.RetrievalBatchResponse, lazy: bool = False
+    ) -> "RetrievalBatchResponse":
+        """
+        :param lazy: True 時 Struct 欄位為唯讀的 LazyStructView，欄位在存取時才解碼
+        """
+        return cls(
+            responses=[
+                RetrievalResponse.from_pb2_model(item, lazy) for item in model.responses
+            ],
+            error=(
+                ErrorDetail.from_pb2_model(model.error)
+                if model.HasField("error")
+                else None
+            ),
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RetrievalBatchResponse":
+        error_data = data.get("error")
+        return cls(
+            responses=[
+                RetrievalResponse.from_dict(item) for item in data.get("responses", [])
+            ],
+            error=ErrorDetail.from_dict(error_data) if error_data else None,
+        )
@@ -1,13 +1,19 @@
-from dataclasses import asdict, dataclass, field
-from typing import Any, Dict, List, Optional
+"""
+由 scripts/generate_dataclass.py 依 llmbrick/protocols/grpc/translate/translate.proto 產生。
+
+to_dict/from_dict/to_pb2/from_pb2_model 皆為明確展開的欄位存取，
+不經過 dataclasses.asdict 或 MessageToDict；to_dict 為淺拷貝。
+"""
 
-from google.protobuf.json_format import MessageToDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 from llmbrick.protocols.grpc.translate import translate_pb2
 from llmbrick.protocols.models.bricks.common_types import ErrorDetail
+from llmbrick.protocols.models.compat import DATACLASS_OPTIONS
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class TranslateRequest:
     text: str = ""
     model_id: str = ""
@@ -18,7 +24,26 @@ class TranslateRequest:
     source_language: str = ""
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "text": self.text,
+            "model_id": self.model_id,
+            "target_language": self.target_language,
+            "client_id": self.client_id,
+            "session_id": self.session_id,
+            "request_id": self.request_id,
+            "source_language": self.source_language,
+        }
+
+    def to_pb2(self) -> translate_pb2.TranslateRequest:
+        return translate_pb2.TranslateRequest(
+            text=self.text,
+            model_id=self.model_id,
+            target_language=self.target_language,
+            client_id=self.client_id,
+            session_id=self.session_id,
+            request_id=self.request_id,
+            source_language=self.source_language,
+        )
 
     @classmethod
     def from_pb2_model(
@@ -47,7 +72,7 @@ class TranslateRequest:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class TranslateResponse:
     text: str = ""
     tokens: List[str] = field(default_factory=list)
@@ -56,31 +81,46 @@ class TranslateResponse:
     error: Optional[ErrorDetail] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "text": self.text,
+            "tokens": list(self.tokens),
+            "language_code": self.language_code,
+            "is_final": self.is_final,
+            "error": self.error.to_dict() if self.error is not None else None,
+        }
+
+    def to_pb2(self) -> translate_pb2.TranslateResponse:
+        return translate_pb2.TranslateResponse(
+            text=self.text,
+            tokens=self.tokens,
+            language_code=self.language_code,
+            is_final=self.is_final,
+            error=self.error.to_pb2() if self.error is not None else None,
+        )
 
     @classmethod
     def from_pb2_model(
         cls, model: translate_pb2.TranslateResponse
     ) -> "TranslateResponse":
-        error = (
-            ErrorDetail.from_dict(MessageToDict(model.error, preserving_proto_field_name=True)) if model.error else None
-        )
         return cls(
             text=model.text,
-            tokens=model.tokens,
+            tokens=list(model.tokens),
             language_code=model.language_code,
             is_final=model.is_final,
-            error=error,
+            error=(
+                ErrorDetail.from_pb2_model(model.error)
+                if model.HasField("error")
+                else None
+            ),
         )
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "TranslateResponse":
         error_data = data.get("error")
-        error = ErrorDetail.from_dict(error_data) if error_data else None
         return cls(
             text=data.get("text", ""),
             tokens=data.get("tokens", []),
             language_code=data.get("language_code", ""),
             is_final=data.get("is_final", False),
-            error=error,
+            error=ErrorDetail.from_dict(error_data) if error_data else None,
         )
@@ -0,0 +1,5 @@
+import sys
+
+# Python 3.10+ 的 dataclass 支援 slots=True，可減少每個實例的記憶體並加快屬性存取；
+# 3.9 仍使用一般 dataclass
+DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
@@ -0,0 +1,176 @@
+"""
+google.protobuf.Struct 與 Python dict 的快速轉換
+
+MessageToDict / Struct.update 走通用的反射程式碼，每個欄位都要查 descriptor。
+Struct 的結構是固定的 (Value 只有六種 kind)，這裡直接依 kind 分派：
+
+- struct_to_dict: Struct -> dict，數值一律為 float，與 MessageToDict 相同
+- dict_to_struct: dict -> Struct，LazyStructView 會直接複製底層訊息
+- LazyStructView: 唯讀 Mapping，存取欄位時才解碼，不複製原始訊息
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
+
+from google.protobuf import struct_pb2
+
+
+def value_to_python(value: struct_pb2.Value) -> Any:
+    """將單一 Value 轉為 Python 物件，未設定或 null 時為 None"""
+    kind = value.WhichOneof("kind")
+    if kind == "string_value":
+        return value.string_value
+    if kind == "number_value":
+        return value.number_value
+    if kind == "bool_value":
+        return value.bool_value
+    if kind == "struct_value":
+        return struct_to_dict(value.struct_value)
+    if kind == "list_value":
+        return list_to_python(value.list_value)
+    return None
+
+
+def list_to_python(list_value: struct_pb2.ListValue) -> List[Any]:
+    return [value_to_python(v) for v in list_value.values]
+
+
+def struct_to_dict(struct: struct_pb2.Struct) -> Dict[str, Any]:
+    """Struct -> dict，結果與 MessageToDict(struct) 相同 (NaN/Infinity 不會拋錯)"""
+    return {key: value_to_python(value) for key, value in struct.fields.items()}
+
+
+def _set_value(target: struct_pb2.Value, value: Any) -> None:
+    # 依出現頻率排列；bool 必須在 int 之前判斷
+    value_type = type(value)
+    if value_type is str:
+        target.string_value = value
+    elif value_type is bool:
+        target.bool_value = value
+    elif value_type is int or value_type is float:
+        target.number_value = value
+    elif value is None:
+        target.null_value = struct_pb2.NULL_VALUE
+    elif isinstance(value, LazyStructView):
+        target.struct_value.CopyFrom(value.message)
+    elif isinstance(value, Mapping):
+        if value:
+            _fill_struct(target.struct_value, value)
+        else:
+            # 空的子訊息不會自動設定 oneof
+            target.struct_value.SetInParent()
+    elif isinstance(value, (list, tuple)):
+        if value:
+            _fill_list(target.list_value, value)
+        else:
+            target.list_value.SetInParent()
+    elif isinstance(value, bool):
+        target.bool_value = value
+    elif isinstance(value, (int, float)):
+        target.number_value = value
+    elif isinstance(value, str):
+        target.string_value = value
+    else:
+        raise ValueError(f"Unexpected type for Struct value: {value_type.__name__}")
+
+
+def _fill_struct(struct: struct_pb2.Struct, data: Mapping) -> None:
+    fields = struct.fields
+    for key, value in data.items():
+        _set_value(fields[key], value)
+
+
+def _fill_list(list_value: struct_pb2.ListValue, items: Any) -> None:
+    values = list_value.values
+    for item in items:
+        _set_value(values.add(), item)
+
+
+def dict_to_struct(
+    data: Optional[Mapping], struct: Optional[struct_pb2.Struct] = None
+) -> struct_pb2.Struct:
+    """
+    dict -> Struct，語意與 Struct.update 相同 (不支援的型別拋出 ValueError)。
+
+    :param data: 要轉換的 dict 或 LazyStructView，None 視為空 dict
+    :param struct: 寫入目標，None 時建立新的 Struct
+    """
+    if struct is None:
+        struct = struct_pb2.Struct()
+    if not data:
+        return struct
+    fields = struct.fields
+    if fields:
+        # 與 Struct.update 相同：既有的 key 整個取代而非合併
+        for key in data:
+            if key in fields:
+                del fields[key]
+    if isinstance(data, LazyStructView):
+        struct.MergeFrom(data.message)
+        return struct
+    _fill_struct(struct, data)
+    return struct
+
+
+class LazyStructView(Mapping):
+    """
+    Struct 的唯讀 dict 視圖：只在存取欄位時解碼，並快取解碼結果。
+    巢狀 Struct 也以 LazyStructView 回傳；需要可修改的 dict 時呼叫 to_dict()。
+    """
+
+    __slots__ = ("_message", "_cache")
+
+    def __init__(self, message: struct_pb2.Struct):
+        self._message = message
+        self._cache: Dict[str, Any] = {}
+
+    @property
+    def message(self) -> struct_pb2.Struct:
+        """底層的 Struct 訊息，請勿修改"""
+        return self._message
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        fields = self._message.fields
+        if key not in fields:
+            raise KeyError(key)
+        value = self._decode(fields[key])
+        self._cache[key] = value
+        return value
+
+    @classmethod
+    def _decode(cls, value: struct_pb2.Value) -> Any:
+        kind = value.WhichOneof("kind")
+        if kind == "struct_value":
+            return cls(value.struct_value)
+        if kind == "list_value":
+            return [cls._decode(v) for v in value.list_value.values]
+        return value_to_python(value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._message.fields
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._message.fields)
+
+    def __len__(self) -> int:
+        return len(self._message.fields)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyStructView):
+            return self._message == other._message
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"LazyStructView({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """完整解碼為一般 dict"""
+        return struct_to_dict(self._message)
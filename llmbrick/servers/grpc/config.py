@@ -0,0 +1,195 @@
+"""
+gRPC server / client 調校參數
+
+GrpcServerConfig 與 GrpcClientConfig 轉為 grpc channel arguments 後分別傳給
+grpc.aio.server(options=...) 與 grpc.aio.insecure_channel(options=...)。
+預設值以正式環境為準：訊息上限放寬到 32MB (retrieval 回應常超過 grpc 預設的 4MB)，
+client 每 30 秒送出 keepalive ping，server 允許此頻率的 ping 而不回 GOAWAY。
+
+兩者皆可從 config/*.yaml 載入：
+
+    grpc_server:
+      port: 50051
+      max_receive_message_length: 33554432
+    grpc_client:
+      keepalive_time_ms: 30000
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional, Tuple, Type, TypeVar, Union
+
+import grpc
+import yaml
+from pydantic import BaseModel, Field, model_validator
+
+ChannelOption = Tuple[str, Any]
+CompressionName = Literal["none", "deflate", "gzip"]
+
+_ConfigT = TypeVar("_ConfigT", bound="_GrpcConfigBase")
+
+_COMPRESSION = {
+    "none": grpc.Compression.NoCompression,
+    "deflate": grpc.Compression.Deflate,
+    "gzip": grpc.Compression.Gzip,
+}
+
+_MB = 1024 * 1024
+
+
+class _GrpcConfigBase(BaseModel):
+    """server 與 client 共用的 channel arguments"""
+
+    max_receive_message_length: int = Field(
+        default=32 * _MB, description="單則接收訊息上限 (bytes)，-1 表示不限制"
+    )
+    max_send_message_length: int = Field(
+        default=32 * _MB, description="單則送出訊息上限 (bytes)，-1 表示不限制"
+    )
+    keepalive_time_ms: int = Field(default=30_000, description="keepalive ping 間隔")
+    keepalive_timeout_ms: int = Field(
+        default=10_000, description="等待 keepalive ping 回應的時間，逾時視為斷線"
+    )
+    keepalive_permit_without_calls: bool = Field(
+        default=True, description="沒有進行中的 RPC 時也送出 keepalive ping"
+    )
+    http2_max_pings_without_data: int = Field(
+        default=0, description="沒有資料時最多送出的 ping 數，0 表示不限制"
+    )
+    http2_lookahead_bytes: Optional[int] = Field(
+        default=None,
+        description=(
+            "grpc.http2.lookahead_bytes：預先接收的目標位元組數 (影響流量控制視窗)，"
+            "None 使用 grpc 預設；BDP 探測開啟時 grpc 會忽略，需同時設定 http2_bdp_probe=False"
+        ),
+    )
+    http2_bdp_probe: bool = Field(
+        default=True, description="依頻寬延遲積 (BDP) 自動調整 HTTP/2 視窗"
+    )
+    http2_max_frame_size: Optional[int] = Field(
+        default=None, description="HTTP/2 最大 frame 大小，None 使用 grpc 預設"
+    )
+    compression: CompressionName = Field(
+        default="none", description="預設壓縮演算法: none / deflate / gzip"
+    )
+    extra_options: List[Tuple[str, Union[int, str]]] = Field(
+        default_factory=list, description="額外直接傳給 grpc 的 channel arguments"
+    )
+
+    class Config:
+        extra = "forbid"
+
+    @model_validator(mode="after")
+    def _check_lookahead(self: _ConfigT) -> _ConfigT:
+        # BDP 探測會自行調整視窗，grpc 此時不使用 lookahead_bytes
+        if self.http2_lookahead_bytes is not None and self.http2_bdp_probe:
+            raise ValueError(
+                "http2_lookahead_bytes has no effect while http2_bdp_probe is enabled; "
+                "set http2_bdp_probe=False"
+            )
+        return self
+
+    def _common_options(self) -> List[ChannelOption]:
+        options: List[ChannelOption] = [
+            ("grpc.max_receive_message_length", self.max_receive_message_length),
+            ("grpc.max_send_message_length", self.max_send_message_length),
+            ("grpc.keepalive_time_ms", self.keepalive_time_ms),
+            ("grpc.keepalive_timeout_ms", self.keepalive_timeout_ms),
+            (
+                "grpc.keepalive_permit_without_calls",
+                int(self.keepalive_permit_without_calls),
+            ),
+            ("grpc.http2.max_pings_without_data", self.http2_max_pings_without_data),
+            ("grpc.http2.bdp_probe", int(self.http2_bdp_probe)),
+        ]
+        if self.http2_lookahead_bytes is not None:
+            options.append(("grpc.http2.lookahead_bytes", self.http2_lookahead_bytes))
+        if self.http2_max_frame_size is not None:
+            options.append(("grpc.http2.max_frame_size", self.http2_max_frame_size))
+        if self.compression != "none":
+            options.append(
+                (
+                    "grpc.default_compression_algorithm",
+                    int(_COMPRESSION[self.compression]),
+                )
+            )
+        return options
+
+    def to_options(self) -> List[ChannelOption]:
+        """轉為 grpc channel arguments，extra_options 放在最後以覆寫同名參數"""
+        return self._common_options() + [
+            (name, value) for name, value in self.extra_options
+        ]
+
+    @classmethod
+    def from_yaml(
+        cls: Type[_ConfigT], path: Union[str, Path], section: Optional[str] = None
+    ) -> _ConfigT:
+        """
+        從 YAML 檔載入設定。
+
+        :param path: YAML 檔路徑
+        :param section: 讀取的頂層 key，None 時使用類別的 yaml_section；
+            檔案為空或沒有該 key 時回傳預設設定
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data: Dict[str, Any] = yaml.safe_load(f) or {}
+        key = section or cls.yaml_section()
+        return cls(**(data.get(key) or {}))
+
+    @classmethod
+    def yaml_section(cls) -> str:
+        raise NotImplementedError
+
+
+class GrpcServerConfig(_GrpcConfigBase):
+    """gRPC Server 配置"""
+
+    host: str = Field(default="[::]", description="監聽位址")
+    port: int = Field(default=50051, description="監聽端口")
+    so_reuseport: Optional[bool] = Field(
+        default=None,
+        description="允許多個行程綁定同一端口 (SO_REUSEPORT)，None 時沿用 grpc 預設 (開啟)",
+    )
+    maximum_concurrent_rpcs: Optional[int] = Field(
+        default=None, description="整個 server 同時處理的 RPC 上限，None 表示不限制"
+    )
+    http2_min_recv_ping_interval_without_data_ms: int = Field(
+        default=10_000,
+        description="允許 client 在沒有資料時送出 ping 的最短間隔，需小於 client 的 keepalive_time_ms",
+    )
+    max_connection_idle_ms: Optional[int] = Field(
+        default=None, description="閒置連線在多久後關閉，None 表示不關閉"
+    )
+    max_connection_age_ms: Optional[int] = Field(
+        default=None,
+        description="連線最長存活時間，到期後 client 會重新連線 (利於負載重新分配)",
+    )
+    grace_period: float = Field(default=3.0, description="停止時等待進行中 RPC 的秒數")
+
+    @classmethod
+    def yaml_section(cls) -> str:
+        return "grpc_server"
+
+    def to_options(self) -> List[ChannelOption]:
+        options = self._common_options()
+        if self.so_reuseport is not None:
+            options.append(("grpc.so_reuseport", int(self.so_reuseport)))
+        options.append(
+            (
+                "grpc.http2.min_ping_interval_without_data_ms",
+                self.http2_min_recv_ping_interval_without_data_ms,
+            )
+        )
+        if self.max_connection_idle_ms is not None:
+            options.append(("grpc.max_connection_idle_ms", self.max_connection_idle_ms))
+        if self.max_connection_age_ms is not None:
+            options.append(("grpc.max_connection_age_ms", self.max_connection_age_ms))
+        return options + [(name, value) for name, value in self.extra_options]
+
+
+class GrpcClientConfig(_GrpcConfigBase):
+    """gRPC Client 配置，透過 toGrpcClient(..., grpc_config=...) 使用"""
+
+    @classmethod
+    def yaml_section(cls) -> str:
+        return "grpc_client"
@@ -5,44 +5,98 @@
 import asyncio
 import signal
 import sys
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import grpc
 
 from llmbrick.core.brick import BaseBrick
-from llmbrick.servers.grpc.wrappers import (
-    register_to_grpc_server as register_grpc_service,
-)
-from llmbrick.utils.logging import logger
+from llmbrick.core.executors import shutdown_executors
+from llmbrick.servers.grpc.config import GrpcServerConfig
+from llmbrick.servers.grpc.wrappers import ConcurrencyLimit, register_to_grpc_server
+from llmbrick.utils.logging import flush_logs, logger
+from llmbrick.utils.metrics import start_metrics_server
 
 
 class GrpcServer:
-    def __init__(self, port: int = 50051):
+    def __init__(
+        self,
+        port: Optional[int] = None,
+        metrics_port: Optional[int] = None,
+        omit_intermediate_error: bool = False,
+        maximum_concurrent_rpcs: Optional[int] = None,
+        config: Optional[GrpcServerConfig] = None,
+        workers: int = 1,
+    ):
+        """
+        :param port: gRPC 監聽端口，None 時使用 config.port (預設 50051)
+        :param metrics_port: 若設定，額外啟動 HTTP sidecar 於此端口提供 /metrics
+        :param omit_intermediate_error: LLM/Translate/Compose 串流的中間成功 chunk
+            不附帶 error 欄位，client 端該 chunk 的 error 為 None
+        :param maximum_concurrent_rpcs: 整個 server 同時處理的 RPC 上限，
+            超過時 grpc 直接以 RESOURCE_EXHAUSTED 拒絕；None 時使用 config 的設定
+        :param config: 訊息大小、keepalive、HTTP/2、壓縮等調校參數，
+            None 時使用 GrpcServerConfig 的預設值
+        :param workers: run() 啟動的行程數。大於 1 時 fork 出多個 worker，
+            各自以 SO_REUSEPORT 綁定同一端口，父行程負責重啟與轉送 SIGTERM；
+            metrics sidecar 於 metrics_port + worker 編號提供各 worker 的指標
+        """
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.config: GrpcServerConfig = config or GrpcServerConfig()
         self.server: Optional[grpc.aio.Server] = None
-        self.port: int = port
-        self._pending_bricks: list[BaseBrick] = []
+        self.port: int = port if port is not None else self.config.port
+        self.metrics_port: Optional[int] = metrics_port
+        self.omit_intermediate_error = omit_intermediate_error
+        self.maximum_concurrent_rpcs = (
+            maximum_concurrent_rpcs
+            if maximum_concurrent_rpcs is not None
+            else self.config.maximum_concurrent_rpcs
+        )
+        self._metrics_server: Optional[asyncio.AbstractServer] = None
+        self._pending_bricks: List[Tuple[BaseBrick, Optional[ConcurrencyLimit]]] = []
+        self.workers = workers
         self._is_stopping = False
 
-    def register_service(self, brick: BaseBrick) -> None:
-        """註冊服務到待處理列表"""
-        self._pending_bricks.append(brick)
+    def register_service(
+        self, brick: BaseBrick, concurrency_limit: Optional[ConcurrencyLimit] = None
+    ) -> None:
+        """
+        註冊服務到待處理列表
+
+        :param concurrency_limit: 此 brick 的並發上限與排隊策略，
+            超過時以 RESOURCE_EXHAUSTED 拒絕；None 表示不限制
+        """
+        self._pending_bricks.append((brick, concurrency_limit))
 
     async def start(self) -> None:
         """啟動 gRPC 服務器"""
         # 創建服務器
-        self.server = grpc.aio.server()
+        self.server = grpc.aio.server(
+            options=self.config.to_options(),
+            maximum_concurrent_rpcs=self.maximum_concurrent_rpcs,
+        )
         
         # 註冊所有服務
-        for brick in self._pending_bricks:
-            register_grpc_service(self.server, brick)
+        for brick, concurrency_limit in self._pending_bricks:
+            register_to_grpc_server(
+                self.server,
+                brick,
+                omit_intermediate_error=self.omit_intermediate_error,
+                concurrency_limit=concurrency_limit,
+            )
         self._pending_bricks.clear()
 
         # 綁定端口並啟動
-        listen_addr = f"[::]:{self.port}"
+        listen_addr = f"{self.config.host}:{self.port}"
         self.server.add_insecure_port(listen_addr)
         await self.server.start()
         
         logger.info(f"異步 gRPC server 已啟動，監聽端口 {self.port}")
+        if self.metrics_port is not None:
+            self._metrics_server = await start_metrics_server(self.metrics_port)
+            logger.info(
+                f"metrics sidecar 已啟動: http://0.0.0.0:{self.metrics_port}/metrics"
+            )
         # 等待終止
         try:
             await self.server.wait_for_termination()
@@ -58,16 +112,49 @@ class GrpcServer:
             logger.info("正在停止 gRPC 服務器...")
             
             try:
-                await self.server.stop(grace=3.0)
+                await self.server.stop(grace=self.config.grace_period)
                 logger.info("gRPC server 已停止")
+                if self._metrics_server is not None:
+                    self._metrics_server.close()
+                    await self._metrics_server.wait_closed()
+                    self._metrics_server = None
             except Exception as e:
                 logger.error(f"停止服務器時發生錯誤: {e}")
             finally:
                 self.server = None
                 self._is_stopping = False
+                # 等待 executor 中執行中的同步 handler 結束並關閉池
+                await asyncio.to_thread(shutdown_executors)
+                # 若啟用了佇列 log sink，確保關閉前的 log 都已寫出
+                await asyncio.to_thread(flush_logs)
 
     def run(self) -> None:
-        """運行服務器的主要入口"""
+        """運行服務器的主要入口，workers > 1 時以多行程模式運行"""
+        if self.workers > 1:
+            self._run_workers()
+            return
+        self._run_single()
+
+    def _run_workers(self) -> None:
+        from llmbrick.servers.grpc.workers import WorkerSupervisor
+
+        # 所有 worker 綁定同一端口
+        self.config = self.config.model_copy(update={"so_reuseport": True})
+        base_metrics_port = self.metrics_port
+
+        def run_worker(index: int) -> None:
+            if base_metrics_port is not None:
+                self.metrics_port = base_metrics_port + index
+            self._run_single()
+
+        logger.info(f"以 {self.workers} 個 worker 啟動 gRPC server，端口 {self.port}")
+        WorkerSupervisor(
+            run_worker,
+            self.workers,
+            shutdown_timeout=self.config.grace_period + 5.0,
+        ).run()
+
+    def _run_single(self) -> None:
         async def _run_with_signals():
             # 設置信號處理（僅適用於 Unix）
             if sys.platform != 'win32':
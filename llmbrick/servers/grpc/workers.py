@@ -0,0 +1,147 @@
+"""
+多行程 gRPC server 的 worker 管理
+
+GrpcServer.run() 在 workers > 1 時由 WorkerSupervisor fork 出 N 個子行程，
+每個子行程執行自己的 event loop 並以 SO_REUSEPORT 綁定同一端口，
+由 kernel 在各行程之間分配新連線，CPU 密集的 brick 可使用多個核心。
+
+父行程只負責監督：
+- 子行程非預期結束時重新啟動 (連續快速失敗時以指數退避延後重啟)
+- 收到 SIGTERM/SIGINT 時轉送 SIGTERM 給所有子行程，等待其優雅關閉，
+  逾時仍未結束則 SIGKILL
+
+父行程在 fork 前不可建立 gRPC server 或 channel，否則子行程會繼承 grpc core 的執行緒狀態。
+"""
+
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from multiprocessing.connection import wait
+from typing import Callable, Dict, cast
+
+from llmbrick.utils.logging import logger
+
+# 子行程啟動後存活超過此秒數才視為成功啟動，重置退避
+_STABLE_SECONDS = 5.0
+_MAX_BACKOFF = 30.0
+
+
+class WorkerSupervisor:
+    """
+    fork 並監督 N 個 worker 行程。
+
+    :param target: 子行程執行的函式，參數為 worker 編號 (0 ~ workers-1)
+    :param workers: worker 數量
+    :param shutdown_timeout: 轉送 SIGTERM 後等待子行程結束的秒數
+    """
+
+    def __init__(
+        self,
+        target: Callable[[int], None],
+        workers: int,
+        shutdown_timeout: float = 10.0,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if sys.platform == "win32":
+            raise RuntimeError("multi-process workers require fork and SO_REUSEPORT")
+        self.target = target
+        self.workers = workers
+        self.shutdown_timeout = shutdown_timeout
+        self.restarts = 0
+        self._ctx = multiprocessing.get_context("fork")
+        self._processes: Dict[int, multiprocessing.process.BaseProcess] = {}
+        self._started_at: Dict[int, float] = {}
+        self._failures: Dict[int, int] = {}
+        self._restart_at: Dict[int, float] = {}
+        self._stopping = False
+
+    def _run_child(self, index: int) -> None:
+        # 子行程不沿用父行程的監督用 signal handler
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        self.target(index)
+
+    def _spawn(self, index: int) -> None:
+        process = self._ctx.Process(
+            target=self._run_child, args=(index,), name=f"llmbrick-worker-{index}"
+        )
+        process.start()
+        self._processes[index] = process
+        self._started_at[index] = time.monotonic()
+        logger.info(f"[WorkerSupervisor] worker {index} 已啟動 (pid={process.pid})")
+
+    def _handle_exit(self, index: int) -> None:
+        process = self._processes.pop(index)
+        process.join()
+        if self._stopping:
+            return
+        uptime = time.monotonic() - self._started_at[index]
+        if uptime >= _STABLE_SECONDS:
+            self._failures[index] = 0
+        failures = self._failures.get(index, 0)
+        delay = 0.0 if failures == 0 else min(_MAX_BACKOFF, 0.5 * 2 ** (failures - 1))
+        self._failures[index] = failures + 1
+        self._restart_at[index] = time.monotonic() + delay
+        logger.warning(
+            f"[WorkerSupervisor] worker {index} (pid={process.pid}) 結束，"
+            f"exitcode={process.exitcode}，{delay:.1f}s 後重新啟動"
+        )
+
+    def stop(self, *_: object) -> None:
+        """轉送 SIGTERM 給所有 worker，可作為 signal handler"""
+        if self._stopping:
+            return
+        self._stopping = True
+        logger.info("[WorkerSupervisor] 收到停止信號，通知所有 worker 優雅關閉...")
+        for process in self._processes.values():
+            if process.is_alive() and process.pid is not None:
+                os.kill(process.pid, signal.SIGTERM)
+
+    def _drain(self) -> None:
+        deadline = time.monotonic() + self.shutdown_timeout
+        for process in list(self._processes.values()):
+            process.join(max(0.0, deadline - time.monotonic()))
+        for process in self._processes.values():
+            if process.is_alive():
+                logger.warning(
+                    f"[WorkerSupervisor] worker pid={process.pid} 未在時限內結束，強制終止"
+                )
+                process.kill()
+                process.join()
+        self._processes.clear()
+
+    def run(self, install_signal_handlers: bool = True) -> None:
+        """啟動所有 worker 並監督，直到 stop() 被呼叫後所有 worker 結束"""
+        if install_signal_handlers:
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+        for index in range(self.workers):
+            self._spawn(index)
+        try:
+            while not self._stopping:
+                now = time.monotonic()
+                for index, restart_at in list(self._restart_at.items()):
+                    if now >= restart_at:
+                        del self._restart_at[index]
+                        self.restarts += 1
+                        self._spawn(index)
+                sentinels = {p.sentinel: i for i, p in self._processes.items()}
+                # 定期醒來檢查 _stopping：signal handler 不會中斷 wait()
+                timeout = 0.5
+                if self._restart_at:
+                    timeout = min(
+                        timeout, max(0.0, min(self._restart_at.values()) - now)
+                    )
+                if not sentinels:
+                    time.sleep(timeout)
+                    continue
+                # 傳入的都是 process sentinel (int)，wait 只會回傳其中的項目
+                for ready in wait(list(sentinels), timeout=timeout):
+                    self._handle_exit(sentinels[cast(int, ready)])
+        finally:
+            self.stop()
+            self._drain()
+            logger.info("[WorkerSupervisor] 所有 worker 已停止")
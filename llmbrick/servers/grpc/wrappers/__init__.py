@@ -1,12 +1,46 @@
+from typing import Optional
+
+from llmbrick.servers.grpc.wrappers.admission import (
+    AdmissionController,
+    AdmissionRejected,
+    ConcurrencyLimit,
+    limit_servicer,
+)
 from llmbrick.servers.grpc.wrappers.common_grpc_wrapper import CommonGrpcWrapper
 from llmbrick.servers.grpc.wrappers.compose_grpc_wrapper import ComposeGrpcWrapper
+from llmbrick.servers.grpc.wrappers.deadline import propagate_deadline
 from llmbrick.servers.grpc.wrappers.guard_grpc_wrapper import GuardGrpcWrapper
+from llmbrick.servers.grpc.wrappers.instrumentation import (
+    RegistryRpcMetrics,
+    RpcMetrics,
+    get_rpc_metrics,
+    instrument_servicer,
+    set_rpc_metrics,
+)
 from llmbrick.servers.grpc.wrappers.intention_grpc_wrapper import IntentionGrpcWrapper
 from llmbrick.servers.grpc.wrappers.llm_grpc_wrapper import LLMGrpcWrapper
 from llmbrick.servers.grpc.wrappers.rectify_grpc_wrapper import RectifyGrpcWrapper
 from llmbrick.servers.grpc.wrappers.retrieval_grpc_wrapper import RetrievalGrpcWrapper
 from llmbrick.servers.grpc.wrappers.translate_grpc_wrapper import TranslateGrpcWrapper
 
+__all__ = [
+    "CommonGrpcWrapper",
+    "ComposeGrpcWrapper",
+    "GuardGrpcWrapper",
+    "IntentionGrpcWrapper",
+    "LLMGrpcWrapper",
+    "RectifyGrpcWrapper",
+    "RetrievalGrpcWrapper",
+    "TranslateGrpcWrapper",
+    "AdmissionRejected",
+    "ConcurrencyLimit",
+    "RegistryRpcMetrics",
+    "RpcMetrics",
+    "get_rpc_metrics",
+    "set_rpc_metrics",
+    "register_to_grpc_server",
+]
+
 _WRAPPER_MAP = {
     "LLM": LLMGrpcWrapper,
     "Common": CommonGrpcWrapper,
@@ -19,7 +53,16 @@ _WRAPPER_MAP = {
 }
 
 
-def register_to_grpc_server(server, brick):
+# 支援 omit_intermediate_error 的串流 wrapper
+_STREAMING_WRAPPERS = (LLMGrpcWrapper, TranslateGrpcWrapper, ComposeGrpcWrapper)
+
+
+def register_to_grpc_server(
+    server,
+    brick,
+    omit_intermediate_error: bool = False,
+    concurrency_limit: Optional[ConcurrencyLimit] = None,
+):
     service_type = getattr(brick.__class__, "brick_type", "Common")
     # 若是 Enum，取 value；否則直接用
     if hasattr(service_type, "value"):
@@ -27,4 +70,17 @@ def register_to_grpc_server(server, brick):
     else:
         service_type_key = service_type
     wrapper_cls = _WRAPPER_MAP.get(service_type_key, CommonGrpcWrapper)
-    wrapper_cls(brick).register(server)
+    if omit_intermediate_error and wrapper_cls in _STREAMING_WRAPPERS:
+        wrapper = wrapper_cls(brick, omit_intermediate_error=True)
+    else:
+        wrapper = wrapper_cls(brick)
+    # 將呼叫端的 gRPC deadline 綁定到 RequestContext，往下游呼叫傳遞
+    propagate_deadline(wrapper)
+    # 自動收集每個 RPC 的延遲、TTFT、吞吐量與錯誤碼指標
+    instrument_servicer(wrapper, service_type_key, brick.brick_name)
+    if concurrency_limit is not None:
+        # 在指標收集之外層，被拒絕的請求不計入延遲與錯誤碼
+        limit_servicer(
+            wrapper, AdmissionController(concurrency_limit, brick.brick_name)
+        )
+    wrapper.register(server)
@@ -0,0 +1,222 @@
+"""
+gRPC wrapper 的並發限制與准入控制 (admission control)
+
+每個 brick 可設定 ConcurrencyLimit：
+- max_concurrency: 同時執行的 RPC 上限
+- max_queue: 超過上限時最多排隊等待的請求數，佇列已滿立即拒絕
+- queue_timeout: 排隊最多等待的秒數，逾時拒絕
+
+被拒絕的請求以 grpc.StatusCode.RESOURCE_EXHAUSTED 結束，不會進入 brick。
+串流 RPC 在整個串流期間占用名額。GetServiceInfo 不受限制。
+
+指標 (預設寫入全域 MetricsRegistry)：
+- llmbrick_grpc_admission_active: 執行中的 RPC 數
+- llmbrick_grpc_admission_queue_depth: 排隊中的 RPC 數
+- llmbrick_grpc_admission_rejected_total: 依原因 (queue_full / timeout) 分類的拒絕數
+"""
+
+import asyncio
+import collections
+import functools
+import inspect
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Deque, Optional
+
+import grpc
+
+from llmbrick.servers.grpc.wrappers.instrumentation import _is_wrapper_method
+from llmbrick.utils.metrics import MetricsRegistry, get_registry
+
+# 受並發限制的 RPC 方法；BatchUnary 整批只佔一個並發名額，
+# 批次內最多 brick.batch_concurrency 個 handler 同時執行
+LIMITED_METHODS = (
+    "Unary",
+    "BatchUnary",
+    "OutputStreaming",
+    "InputStreaming",
+    "BidiStreaming",
+)
+
+REJECT_QUEUE_FULL = "queue_full"
+REJECT_TIMEOUT = "timeout"
+
+
+@dataclass
+class ConcurrencyLimit:
+    """
+    單一 brick 的並發限制
+
+    :param max_concurrency: 同時執行的 RPC 上限
+    :param max_queue: 排隊等待的請求上限，0 表示不排隊、超過上限立即拒絕
+    :param queue_timeout: 排隊最多等待秒數，None 表示不限時
+    """
+
+    max_concurrency: int
+    max_queue: int = 0
+    queue_timeout: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.max_concurrency <= 0:
+            raise ValueError("max_concurrency must be > 0")
+        if self.max_queue < 0:
+            raise ValueError("max_queue must be >= 0")
+        if self.queue_timeout is not None and self.queue_timeout < 0:
+            raise ValueError("queue_timeout must be >= 0")
+
+
+class AdmissionRejected(Exception):
+    """請求未取得執行名額，reason 為 queue_full 或 timeout"""
+
+    def __init__(self, reason: str, message: str):
+        self.reason = reason
+        super().__init__(message)
+
+
+class AdmissionController:
+    """
+    有界佇列的並發限制器。名額釋放時直接交給佇列中最早的請求 (FIFO)，
+    新請求不會插隊到排隊中的請求前面。
+    須在單一 event loop 中使用 (與 grpc.aio server 相同)。
+    """
+
+    def __init__(
+        self,
+        limit: ConcurrencyLimit,
+        brick: str = "",
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        self.limit = limit
+        self.brick = brick
+        self.active = 0
+        self._waiters: Deque["asyncio.Future[None]"] = collections.deque()
+        registry = registry or get_registry()
+        self._active_gauge = registry.gauge(
+            "llmbrick_grpc_admission_active",
+            "gRPC requests holding an admission slot",
+            ("brick",),
+        ).labels(brick=brick)
+        self._queue_gauge = registry.gauge(
+            "llmbrick_grpc_admission_queue_depth",
+            "gRPC requests waiting for an admission slot",
+            ("brick",),
+        ).labels(brick=brick)
+        self._rejected = registry.counter(
+            "llmbrick_grpc_admission_rejected_total",
+            "gRPC requests rejected by admission control",
+            ("brick", "reason"),
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def _reject(self, reason: str, message: str) -> AdmissionRejected:
+        self._rejected.inc(brick=self.brick, reason=reason)
+        return AdmissionRejected(reason, message)
+
+    async def acquire(self) -> None:
+        """取得執行名額，無法取得時拋出 AdmissionRejected"""
+        limit = self.limit
+        if self.active < limit.max_concurrency and not self._waiters:
+            self.active += 1
+            self._active_gauge.inc()
+            return
+        if len(self._waiters) >= limit.max_queue:
+            raise self._reject(
+                REJECT_QUEUE_FULL,
+                f"[{self.brick}] too many concurrent requests "
+                f"(max_concurrency={limit.max_concurrency}, "
+                f"max_queue={limit.max_queue})",
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._queue_gauge.inc()
+        try:
+            await asyncio.wait((waiter,), timeout=limit.queue_timeout)
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        if waiter.done() and not waiter.cancelled():
+            # release() 已把名額交給此請求，active 不需再增加
+            return
+        self._abandon(waiter)
+        raise self._reject(
+            REJECT_TIMEOUT,
+            f"[{self.brick}] request waited longer than {limit.queue_timeout}s "
+            "for an execution slot",
+        )
+
+    def _abandon(self, waiter: "asyncio.Future[None]") -> None:
+        if waiter.done() and not waiter.cancelled():
+            # 名額在取消的同時被交付，歸還給下一個請求
+            self.release()
+            return
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            return
+        self._queue_gauge.dec()
+
+    def release(self) -> None:
+        """釋放名額；有請求在排隊時直接交給最早的請求"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            self._queue_gauge.dec()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+        self._active_gauge.dec()
+
+
+async def _reject_rpc(context: Any, error: AdmissionRejected) -> None:
+    await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(error))
+
+
+def _limit_unary(method: Callable, controller: AdmissionController) -> Callable:
+    @functools.wraps(method)
+    async def wrapper(request: Any, context: Any) -> Any:
+        try:
+            await controller.acquire()
+        except AdmissionRejected as e:
+            await _reject_rpc(context, e)
+        try:
+            return await method(request, context)
+        finally:
+            controller.release()
+
+    return wrapper
+
+
+def _limit_stream(method: Callable, controller: AdmissionController) -> Callable:
+    @functools.wraps(method)
+    async def wrapper(request: Any, context: Any) -> AsyncIterator[Any]:
+        try:
+            await controller.acquire()
+        except AdmissionRejected as e:
+            await _reject_rpc(context, e)
+        try:
+            async for message in method(request, context):
+                yield message
+        finally:
+            controller.release()
+
+    return wrapper
+
+
+def limit_servicer(servicer: Any, controller: AdmissionController) -> Any:
+    """
+    以實例屬性覆蓋 servicer 的 RPC 方法，加入並發限制。
+    必須在 servicer.register(server) 之前呼叫。
+    """
+    for name in LIMITED_METHODS:
+        if not _is_wrapper_method(servicer, name):
+            continue
+        method = getattr(servicer, name)
+        if inspect.isasyncgenfunction(method):
+            setattr(servicer, name, _limit_stream(method, controller))
+        else:
+            setattr(servicer, name, _limit_unary(method, controller))
+    return servicer
@@ -0,0 +1,105 @@
+"""
+BatchUnary RPC 的共用處理
+
+BatchUnary 一次接收多筆請求，交給 brick.run_batch 處理
+(有 @batch_handler 時直接分批呼叫，否則平行執行 run_unary，
+最多 brick.batch_concurrency 個同時進行)。
+請求數超過 brick.max_batch_size 時不執行任何請求，整批回傳 PAYLOAD_TOO_LARGE。
+每一筆的結果轉換規則與 Unary 相同：單筆失敗只記錄在對應 response 的 error，
+不影響同批的其他請求；BatchResponse.error 只表示整批失敗。
+"""
+
+from typing import Any, Callable, List, Type
+
+import grpc
+
+from llmbrick.core.error_codes import ErrorCodes
+from llmbrick.protocols.grpc.common import common_pb2
+from llmbrick.servers.grpc.wrappers.errors import SUCCESS_ERROR_DETAIL
+
+
+def _item_response(result: Any, response_type: Type, response_pb2_cls: Type) -> Any:
+    """將 run_batch 的單筆結果轉為 pb2 response"""
+    if isinstance(result, NotImplementedError):
+        return response_pb2_cls(
+            error=common_pb2.ErrorDetail(
+                code=grpc.StatusCode.UNIMPLEMENTED.value[0],
+                message=str(result),
+                detail="The requested operation is not implemented.",
+            )
+        )
+    if isinstance(result, BaseException):
+        return response_pb2_cls(
+            error=common_pb2.ErrorDetail(
+                code=grpc.StatusCode.INTERNAL.value[0],
+                message=str(result),
+                detail="An error occurred while processing BatchUnary.",
+            )
+        )
+    if not isinstance(result, response_type):
+        return response_pb2_cls(
+            error=common_pb2.ErrorDetail(
+                code=grpc.StatusCode.INTERNAL.value[0],
+                message="Invalid unary response type!",
+                detail=(
+                    "The response from the brick is not of type "
+                    f"{response_type.__name__}."
+                ),
+            )
+        )
+    if result.error and result.error.code != ErrorCodes.SUCCESS:
+        return response_pb2_cls(error=result.error.to_pb2())
+    response = result.to_pb2()
+    response.error.CopyFrom(SUCCESS_ERROR_DETAIL)
+    return response
+
+
+async def run_batch_rpc(
+    brick: Any,
+    requests: List[Any],
+    from_pb2: Callable[[Any], Any],
+    response_type: Type,
+    response_pb2_cls: Type,
+    batch_response_pb2_cls: Type,
+) -> Any:
+    """
+    :param brick: 處理請求的 brick
+    :param requests: pb2 請求 list
+    :param from_pb2: pb2 請求轉為 brick 請求的函式
+    :param response_type: brick 回應的型別，用於檢查 handler 回傳值
+    :param response_pb2_cls: 單筆的 pb2 response 類別
+    :param batch_response_pb2_cls: 整批的 pb2 BatchResponse 類別
+    """
+    limit = brick.max_batch_size
+    if limit is not None and len(requests) > limit:
+        return batch_response_pb2_cls(
+            error=common_pb2.ErrorDetail(
+                code=ErrorCodes.PAYLOAD_TOO_LARGE,
+                message=f"Batch of {len(requests)} requests exceeds limit of {limit}",
+                detail="Split the requests into smaller BatchUnary calls.",
+            )
+        )
+    try:
+        inputs = [from_pb2(request) for request in requests]
+        results = await brick.run_batch(inputs, return_exceptions=True)
+        responses = [
+            _item_response(result, response_type, response_pb2_cls)
+            for result in results
+        ]
+    except NotImplementedError as ev:
+        return batch_response_pb2_cls(
+            error=common_pb2.ErrorDetail(
+                code=grpc.StatusCode.UNIMPLEMENTED.value[0],
+                message=str(ev),
+                detail="The requested operation is not implemented.",
+            )
+        )
+    except Exception as e:
+        return batch_response_pb2_cls(
+            error=common_pb2.ErrorDetail(
+                code=grpc.StatusCode.INTERNAL.value[0],
+                message=str(e),
+                detail="An error occurred while processing BatchUnary.",
+            )
+        )
+    return batch_response_pb2_cls(responses=responses, error=SUCCESS_ERROR_DETAIL)
@@ -1,7 +1,6 @@
 from typing import AsyncIterator
 
 import grpc
-from google.protobuf import struct_pb2
 
 from llmbrick.bricks.common.common import CommonBrick
 from llmbrick.protocols.grpc.common import common_pb2, common_pb2_grpc
@@ -11,6 +10,7 @@ from llmbrick.protocols.models.bricks.common_types import (
     ServiceInfoResponse,
 )
 from llmbrick.core.error_codes import ErrorCodes
+from llmbrick.protocols.models.struct_utils import dict_to_struct
 
 # common_pb2
 # message CommonRequest {
@@ -72,9 +72,8 @@ class CommonGrpcWrapper(common_pb2_grpc.CommonServiceServicer):
                 error_data.detail = result.error.detail
                 response = common_pb2.ServiceInfoResponse(error=error_data)
                 return response
-            response_dict = result.to_dict()
-            response_dict["error"] = error_data
-            response = common_pb2.ServiceInfoResponse(**response_dict)
+            response = result.to_pb2()
+            response.error.CopyFrom(error_data)
             return response
         except NotImplementedError as ev:
             # context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -117,8 +116,7 @@ class CommonGrpcWrapper(common_pb2_grpc.CommonServiceServicer):
                 error_data.detail = result.error.detail
                 return common_pb2.CommonResponse(error=error_data)
 
-            data = struct_pb2.Struct()
-            data.update(result.to_dict().get("data", {}))
+            data = dict_to_struct(result.data)
             response = common_pb2.CommonResponse(data=data, error=error_data)
 
             return response
@@ -165,8 +163,7 @@ class CommonGrpcWrapper(common_pb2_grpc.CommonServiceServicer):
                     error_data.detail = response.error.detail
                     yield common_pb2.CommonResponse(error=error_data)
                     break
-                data = struct_pb2.Struct()
-                data.update(response.to_dict().get("data", {}))
+                data = dict_to_struct(response.data)
                 yield common_pb2.CommonResponse(data=data, error=error_data)
         except NotImplementedError as ev:
             error_data = common_pb2.ErrorDetail(
@@ -212,8 +209,7 @@ class CommonGrpcWrapper(common_pb2_grpc.CommonServiceServicer):
                 error_data.message = result.error.message
                 error_data.detail = result.error.detail
                 return common_pb2.CommonResponse(error=error_data)
-            data = struct_pb2.Struct()
-            data.update(result.to_dict().get("data", {}))
+            data = dict_to_struct(result.data)
             return common_pb2.CommonResponse(data=data, error=error_data)
         except NotImplementedError as ev:
             # context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -263,8 +259,7 @@ class CommonGrpcWrapper(common_pb2_grpc.CommonServiceServicer):
                     error_data.detail = response.error.detail
                     yield common_pb2.CommonResponse(error=error_data)
                     break
-                data = struct_pb2.Struct()
-                data.update(response.to_dict().get("data", {}))
+                data = dict_to_struct(response.data)
                 yield common_pb2.CommonResponse(data=data, error=error_data)
         except NotImplementedError as ev:
             # context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -1,5 +1,4 @@
 import grpc
-from google.protobuf import struct_pb2
 
 from llmbrick.bricks.compose.base_compose import ComposeBrick
 from llmbrick.protocols.grpc.common import common_pb2
@@ -10,6 +9,8 @@ from llmbrick.protocols.models.bricks.compose_types import (
     ComposeResponse,
 )
 from llmbrick.core.error_codes import ErrorCodes
+from llmbrick.servers.grpc.wrappers.errors import SUCCESS_ERROR_DETAIL
+from llmbrick.protocols.models.struct_utils import dict_to_struct
 
 
 # /protocols/grpc/compose/compose.proto
@@ -28,10 +29,15 @@ class ComposeGrpcWrapper(compose_pb2_grpc.ComposeServiceServicer):
     以 common_grpc_wrapper.py 為基礎，統一異步方法的錯誤處理與型別檢查。
     """
 
-    def __init__(self, brick: ComposeBrick):
+    def __init__(self, brick: ComposeBrick, omit_intermediate_error: bool = False):
+        """
+        :param omit_intermediate_error: OutputStreaming 的成功 chunk 不附帶 error 欄位
+            (client 端解碼為 None)。ComposeResponse 沒有 is_final，因此套用到所有成功 chunk
+        """
         if not isinstance(brick, ComposeBrick):
             raise TypeError("brick must be an instance of ComposeBrick")
         self.brick = brick
+        self.omit_intermediate_error = omit_intermediate_error
 
     async def GetServiceInfo(self, request, context):
         """異步獲取服務信息"""
@@ -64,9 +70,8 @@ class ComposeGrpcWrapper(compose_pb2_grpc.ComposeServiceServicer):
                 error_data.detail = result.error.detail
                 response = common_pb2.ServiceInfoResponse(error=error_data)
                 return response
-            response_dict = result.to_dict()
-            response_dict["error"] = error_data
-            response = common_pb2.ServiceInfoResponse(**response_dict)
+            response = result.to_pb2()
+            response.error.CopyFrom(error_data)
             return response
         except NotImplementedError as ev:
             # context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -109,8 +114,7 @@ class ComposeGrpcWrapper(compose_pb2_grpc.ComposeServiceServicer):
                 error_data.detail = result.error.detail
                 return compose_pb2.ComposeResponse(error=error_data)
 
-            output = struct_pb2.Struct()
-            output.update(result.to_dict().get("output", {}))
+            output = dict_to_struct(result.output)
             response = compose_pb2.ComposeResponse(output=output, error=error_data)
 
             return response
@@ -136,8 +140,8 @@ class ComposeGrpcWrapper(compose_pb2_grpc.ComposeServiceServicer):
         request = ComposeRequest.from_pb2_model(request)
         try:
             async for response in self.brick.run_output_streaming(request):
-                error_data = common_pb2.ErrorDetail(code=ErrorCodes.SUCCESS, message="", detail="")
                 if not isinstance(response, ComposeResponse):
+                    error_data = common_pb2.ErrorDetail()
                     # context.set_code(grpc.StatusCode.INTERNAL)
                     # context.set_details('Invalid output streaming response type!')
                     error_data.code = grpc.StatusCode.INTERNAL.value[0]
@@ -150,14 +154,13 @@ class ComposeGrpcWrapper(compose_pb2_grpc.ComposeServiceServicer):
                 if response.error and response.error.code != ErrorCodes.SUCCESS:
                     # context.set_code(grpc.StatusCode.INTERNAL)
                     # context.set_details(response.error.message)
-                    error_data.code = response.error.code
-                    error_data.message = response.error.message
-                    error_data.detail = response.error.detail
-                    yield compose_pb2.ComposeResponse(error=error_data)
+                    yield compose_pb2.ComposeResponse(error=response.error.to_pb2())
                     break
-                output = struct_pb2.Struct()
-                output.update(response.to_dict().get("output", {}))
-                yield compose_pb2.ComposeResponse(output=output, error=error_data)
+                chunk = compose_pb2.ComposeResponse()
+                dict_to_struct(response.output, chunk.output)
+                if not self.omit_intermediate_error:
+                    chunk.error.CopyFrom(SUCCESS_ERROR_DETAIL)
+                yield chunk
         except NotImplementedError as ev:
             error_data = common_pb2.ErrorDetail(
                 code=grpc.StatusCode.UNIMPLEMENTED.value[0],
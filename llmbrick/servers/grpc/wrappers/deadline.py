@@ -0,0 +1,60 @@
+"""
+gRPC wrapper 的 deadline 傳遞
+
+呼叫端設定的 gRPC deadline 會在 server 端轉為 RequestContext，
+brick handler 中再透過 toGrpcClient 呼叫下游時，剩餘時間會作為下游呼叫的 timeout。
+deadline 到期或呼叫端取消時，grpc.aio 會取消處理該 RPC 的 task，handler 隨之停止。
+"""
+
+import functools
+import inspect
+from typing import Any, AsyncIterator, Callable
+
+from llmbrick.core.context import request_context
+from llmbrick.servers.grpc.wrappers.instrumentation import (
+    RPC_METHODS,
+    _is_wrapper_method,
+)
+
+
+def _deadline_unary(method: Callable) -> Callable:
+    @functools.wraps(method)
+    async def wrapper(request: Any, context: Any) -> Any:
+        timeout = context.time_remaining()
+        if timeout is None:
+            return await method(request, context)
+        with request_context(timeout=timeout):
+            return await method(request, context)
+
+    return wrapper
+
+
+def _deadline_stream(method: Callable) -> Callable:
+    @functools.wraps(method)
+    async def wrapper(request: Any, context: Any) -> AsyncIterator[Any]:
+        timeout = context.time_remaining()
+        if timeout is None:
+            async for message in method(request, context):
+                yield message
+            return
+        with request_context(timeout=timeout):
+            async for message in method(request, context):
+                yield message
+
+    return wrapper
+
+
+def propagate_deadline(servicer: Any) -> Any:
+    """
+    以實例屬性覆蓋 servicer 的 RPC 方法，將 gRPC deadline 綁定到 RequestContext。
+    必須在 servicer.register(server) 之前呼叫。
+    """
+    for name in RPC_METHODS:
+        if not _is_wrapper_method(servicer, name):
+            continue
+        method = getattr(servicer, name)
+        if inspect.isasyncgenfunction(method):
+            setattr(servicer, name, _deadline_stream(method))
+        else:
+            setattr(servicer, name, _deadline_unary(method))
+    return servicer
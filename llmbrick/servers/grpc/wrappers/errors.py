@@ -0,0 +1,14 @@
+"""
+wrapper 共用的 ErrorDetail 訊息
+
+串流每個 chunk 都要附上成功的 ErrorDetail，與其每次建立新訊息，
+各 wrapper 共用同一個實例；protobuf 建構子會複製子訊息，因此共用是安全的。
+protobuf 訊息無法凍結，請勿修改 SUCCESS_ERROR_DETAIL。
+"""
+
+from llmbrick.core.error_codes import ErrorCodes
+from llmbrick.protocols.grpc.common import common_pb2
+
+SUCCESS_ERROR_DETAIL = common_pb2.ErrorDetail(
+    code=ErrorCodes.SUCCESS, message="", detail=""
+)
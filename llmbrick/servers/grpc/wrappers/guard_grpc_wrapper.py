@@ -7,6 +7,7 @@ from llmbrick.protocols.grpc.guard import guard_pb2, guard_pb2_grpc
 from llmbrick.protocols.models.bricks.common_types import ServiceInfoResponse
 from llmbrick.protocols.models.bricks.guard_types import GuardRequest, GuardResponse
 from llmbrick.core.error_codes import ErrorCodes
+from llmbrick.servers.grpc.wrappers.batch import run_batch_rpc
 
 # /protocols/grpc/guard/guard.proto
 # guard_pb2
@@ -60,9 +61,8 @@ class GuardGrpcWrapper(guard_pb2_grpc.GuardServiceServicer):
                 error_data.detail = result.error.detail
                 response = common_pb2.ServiceInfoResponse(error=error_data)
                 return response
-            response_dict = result.to_dict()
-            response_dict["error"] = error_data
-            response = common_pb2.ServiceInfoResponse(**response_dict)
+            response = result.to_pb2()
+            response.error.CopyFrom(error_data)
             return response
         except NotImplementedError as ev:
             # context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -129,5 +129,15 @@ class GuardGrpcWrapper(guard_pb2_grpc.GuardServiceServicer):
             )
             return guard_pb2.GuardResponse(error=error_data)
 
+    async def BatchUnary(self, request: guard_pb2.GuardBatchRequest, context):
+        return await run_batch_rpc(
+            self.brick,
+            request.requests,
+            GuardRequest.from_pb2_model,
+            GuardResponse,
+            guard_pb2.GuardResponse,
+            guard_pb2.GuardBatchResponse,
+        )
+
     def register(self, server):
         guard_pb2_grpc.add_GuardServiceServicer_to_server(self, server)
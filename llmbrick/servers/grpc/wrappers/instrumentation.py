@@ -0,0 +1,237 @@
+"""
+gRPC wrapper 的 RPC 指標收集
+
+register_to_grpc_server 註冊 wrapper 時，會以 instrument_servicer 包裝
+Unary/OutputStreaming/... 等方法，記錄：
+- 請求延遲與進行中 RPC 數
+- OutputStreaming/BidiStreaming 的首個 chunk 時間 (TTFT)、chunk 數、chunks/sec
+- 回應位元組數
+- 依 ErrorDetail.code 分類的錯誤數
+
+指標透過可替換的 RpcMetrics 介面輸出，預設寫入 llmbrick.utils.metrics 的全域 registry；
+set_rpc_metrics(None) 可完全關閉收集。
+"""
+
+import functools
+import inspect
+import time
+from typing import Any, AsyncIterator, Callable, NamedTuple, Optional
+
+from llmbrick.core.error_codes import ErrorCodes
+from llmbrick.utils.metrics import MetricsRegistry, get_registry
+
+# 視為 RPC 進入點、需要收集指標的 servicer 方法
+RPC_METHODS = (
+    "GetServiceInfo",
+    "Unary",
+    "BatchUnary",
+    "OutputStreaming",
+    "InputStreaming",
+    "BidiStreaming",
+)
+
+# 例外逃出 wrapper 時使用的錯誤碼標籤
+EXCEPTION_CODE = "exception"
+
+
+class RpcInfo(NamedTuple):
+    brick_type: str
+    brick: str
+    method: str
+
+
+class RpcMetrics:
+    """
+    RPC 指標介面，所有方法預設不做事。
+    自訂實作 (例如轉送到 OpenTelemetry) 時覆寫需要的方法，再呼叫 set_rpc_metrics。
+    """
+
+    def rpc_started(self, rpc: RpcInfo) -> None:
+        pass
+
+    def first_chunk(self, rpc: RpcInfo, seconds: float) -> None:
+        pass
+
+    def rpc_finished(
+        self,
+        rpc: RpcInfo,
+        seconds: float,
+        code: Any,
+        chunks: int,
+        bytes_out: int,
+    ) -> None:
+        pass
+
+
+class RegistryRpcMetrics(RpcMetrics):
+    """將 RPC 指標寫入 MetricsRegistry 的預設實作"""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        registry = registry or get_registry()
+        labels = ("brick_type", "brick", "method")
+        self.in_flight = registry.gauge(
+            "llmbrick_grpc_requests_in_flight", "In-flight gRPC requests", labels
+        )
+        self.requests = registry.counter(
+            "llmbrick_grpc_requests_total", "Handled gRPC requests", labels
+        )
+        self.latency = registry.histogram(
+            "llmbrick_grpc_request_duration_seconds",
+            "gRPC request latency until the last message is sent",
+            labels,
+        )
+        self.ttft = registry.histogram(
+            "llmbrick_grpc_time_to_first_chunk_seconds",
+            "Time until the first streamed chunk is sent",
+            labels,
+        )
+        self.chunks = registry.counter(
+            "llmbrick_grpc_stream_chunks_total", "Streamed chunks sent", labels
+        )
+        self.chunk_rate = registry.histogram(
+            "llmbrick_grpc_stream_chunks_per_second",
+            "Chunks per second of finished streams",
+            labels,
+            buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000),
+        )
+        self.bytes_out = registry.counter(
+            "llmbrick_grpc_response_bytes_total", "Serialized response bytes", labels
+        )
+        self.errors = registry.counter(
+            "llmbrick_grpc_errors_total",
+            "gRPC responses with a non-success ErrorDetail.code",
+            labels + ("code",),
+        )
+
+    def rpc_started(self, rpc: RpcInfo) -> None:
+        self.in_flight.inc(**rpc._asdict())
+
+    def first_chunk(self, rpc: RpcInfo, seconds: float) -> None:
+        self.ttft.observe(seconds, **rpc._asdict())
+
+    def rpc_finished(
+        self,
+        rpc: RpcInfo,
+        seconds: float,
+        code: Any,
+        chunks: int,
+        bytes_out: int,
+    ) -> None:
+        labels = rpc._asdict()
+        self.in_flight.dec(**labels)
+        self.requests.inc(**labels)
+        self.latency.observe(seconds, **labels)
+        self.bytes_out.inc(bytes_out, **labels)
+        if rpc.method in ("OutputStreaming", "BidiStreaming"):
+            self.chunks.inc(chunks, **labels)
+            if seconds > 0:
+                self.chunk_rate.observe(chunks / seconds, **labels)
+        if code != ErrorCodes.SUCCESS:
+            self.errors.inc(code=code, **labels)
+
+
+_rpc_metrics: Optional[RpcMetrics] = None
+_rpc_metrics_configured = False
+
+
+def set_rpc_metrics(metrics: Optional[RpcMetrics]) -> None:
+    """替換 RPC 指標實作；None 表示停用。只影響之後註冊的 wrapper"""
+    global _rpc_metrics, _rpc_metrics_configured
+    _rpc_metrics = metrics
+    _rpc_metrics_configured = True
+
+
+def get_rpc_metrics() -> Optional[RpcMetrics]:
+    global _rpc_metrics
+    if not _rpc_metrics_configured and _rpc_metrics is None:
+        _rpc_metrics = RegistryRpcMetrics()
+    return _rpc_metrics
+
+
+def _message_code(message: Any) -> Any:
+    error = getattr(message, "error", None)
+    if error is None:
+        return ErrorCodes.SUCCESS
+    code = error.code
+    # 省略 error 的中間 chunk (code 為 0) 視為成功
+    return code if code else ErrorCodes.SUCCESS
+
+
+def _instrument_unary(method: Callable, rpc: RpcInfo, metrics: RpcMetrics) -> Callable:
+    @functools.wraps(method)
+    async def wrapper(request: Any, context: Any) -> Any:
+        metrics.rpc_started(rpc)
+        start = time.perf_counter()
+        code: Any = EXCEPTION_CODE
+        bytes_out = 0
+        try:
+            response = await method(request, context)
+            code = _message_code(response)
+            bytes_out = response.ByteSize()
+            return response
+        finally:
+            metrics.rpc_finished(rpc, time.perf_counter() - start, code, 1, bytes_out)
+
+    return wrapper
+
+
+def _instrument_stream(method: Callable, rpc: RpcInfo, metrics: RpcMetrics) -> Callable:
+    @functools.wraps(method)
+    async def wrapper(request: Any, context: Any) -> AsyncIterator[Any]:
+        metrics.rpc_started(rpc)
+        start = time.perf_counter()
+        code: Any = ErrorCodes.SUCCESS
+        chunks = 0
+        bytes_out = 0
+        try:
+            async for message in method(request, context):
+                if chunks == 0:
+                    metrics.first_chunk(rpc, time.perf_counter() - start)
+                chunks += 1
+                bytes_out += message.ByteSize()
+                message_code = _message_code(message)
+                if message_code != ErrorCodes.SUCCESS:
+                    code = message_code
+                yield message
+        except BaseException:
+            code = EXCEPTION_CODE
+            raise
+        finally:
+            metrics.rpc_finished(
+                rpc, time.perf_counter() - start, code, chunks, bytes_out
+            )
+
+    return wrapper
+
+
+def _is_wrapper_method(servicer: Any, name: str) -> bool:
+    """只處理 wrapper 實作的方法，忽略 *_pb2_grpc 產生的 UNIMPLEMENTED 預設方法"""
+    for klass in type(servicer).__mro__:
+        if name in vars(klass):
+            return not klass.__module__.endswith("_pb2_grpc")
+    return False
+
+
+def instrument_servicer(
+    servicer: Any,
+    brick_type: str,
+    brick_name: str,
+    metrics: Optional[RpcMetrics] = None,
+) -> Any:
+    """
+    以實例屬性覆蓋 servicer 的 RPC 方法，加入指標收集。
+    必須在 servicer.register(server) 之前呼叫。
+    """
+    metrics = metrics or get_rpc_metrics()
+    if metrics is None:
+        return servicer
+    for name in RPC_METHODS:
+        if not _is_wrapper_method(servicer, name):
+            continue
+        method = getattr(servicer, name)
+        rpc = RpcInfo(brick_type, brick_name, name)
+        if inspect.isasyncgenfunction(method):
+            setattr(servicer, name, _instrument_stream(method, rpc, metrics))
+        else:
+            setattr(servicer, name, _instrument_unary(method, rpc, metrics))
+    return servicer
@@ -10,6 +10,7 @@ from llmbrick.protocols.models.bricks.intention_types import (
     IntentionResponse,
 )
 from llmbrick.core.error_codes import ErrorCodes
+from llmbrick.servers.grpc.wrappers.batch import run_batch_rpc
 
 # /protocols/grpc/intention/intention.proto
 # intention_pb2
@@ -63,9 +64,8 @@ class IntentionGrpcWrapper(intention_pb2_grpc.IntentionServiceServicer):
                 error_data.detail = result.error.detail
                 response = common_pb2.ServiceInfoResponse(error=error_data)
                 return response
-            response_dict = result.to_dict()
-            response_dict["error"] = error_data
-            response = common_pb2.ServiceInfoResponse(**response_dict)
+            response = result.to_pb2()
+            response.error.CopyFrom(error_data)
             return response
         except NotImplementedError as ev:
             # context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -131,5 +131,15 @@ class IntentionGrpcWrapper(intention_pb2_grpc.IntentionServiceServicer):
             )
             return intention_pb2.IntentionResponse(error=error_data)
 
+    async def BatchUnary(self, request: intention_pb2.IntentionBatchRequest, context):
+        return await run_batch_rpc(
+            self.brick,
+            request.requests,
+            IntentionRequest.from_pb2_model,
+            IntentionResponse,
+            intention_pb2.IntentionResponse,
+            intention_pb2.IntentionBatchResponse,
+        )
+
     def register(self, server):
         intention_pb2_grpc.add_IntentionServiceServicer_to_server(self, server)
@@ -10,6 +10,7 @@ from llmbrick.protocols.models.bricks.rectify_types import (
     RectifyResponse,
 )
 from llmbrick.core.error_codes import ErrorCodes
+from llmbrick.servers.grpc.wrappers.batch import run_batch_rpc
 
 # /protocols/grpc/rectify/rectify.proto
 # rectify_pb2
@@ -63,9 +64,8 @@ class RectifyGrpcWrapper(rectify_pb2_grpc.RectifyServiceServicer):
                 error_data.detail = result.error.detail
                 response = common_pb2.ServiceInfoResponse(error=error_data)
                 return response
-            response_dict = result.to_dict()
-            response_dict["error"] = error_data
-            response = common_pb2.ServiceInfoResponse(**response_dict)
+            response = result.to_pb2()
+            response.error.CopyFrom(error_data)
             return response
         except NotImplementedError as ev:
             # context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -128,5 +128,15 @@ class RectifyGrpcWrapper(rectify_pb2_grpc.RectifyServiceServicer):
             )
             return rectify_pb2.RectifyResponse(error=error_data)
 
+    async def BatchUnary(self, request: rectify_pb2.RectifyBatchRequest, context):
+        return await run_batch_rpc(
+            self.brick,
+            request.requests,
+            RectifyRequest.from_pb2_model,
+            RectifyResponse,
+            rectify_pb2.RectifyResponse,
+            rectify_pb2.RectifyBatchResponse,
+        )
+
     def register(self, server):
         rectify_pb2_grpc.add_RectifyServiceServicer_to_server(self, server)
@@ -10,6 +10,7 @@ from llmbrick.protocols.models.bricks.retrieval_types import (
     RetrievalResponse,
 )
 from llmbrick.core.error_codes import ErrorCodes
+from llmbrick.servers.grpc.wrappers.batch import run_batch_rpc
 
 # /protocols/grpc/retrieval/retrieval.proto
 # retrieval_pb2
@@ -64,9 +65,8 @@ class RetrievalGrpcWrapper(retrieval_pb2_grpc.RetrievalServiceServicer):
                 error_data.detail = result.error.detail
                 response = common_pb2.ServiceInfoResponse(error=error_data)
                 return response
-            response_dict = result.to_dict()
-            response_dict["error"] = error_data
-            response = common_pb2.ServiceInfoResponse(**response_dict)
+            response = result.to_pb2()
+            response.error.CopyFrom(error_data)
             return response
         except NotImplementedError as ev:
             # context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -138,5 +138,15 @@ class RetrievalGrpcWrapper(retrieval_pb2_grpc.RetrievalServiceServicer):
             )
             return retrieval_pb2.RetrievalResponse(error=error_data)
 
+    async def BatchUnary(self, request: retrieval_pb2.RetrievalBatchRequest, context):
+        return await run_batch_rpc(
+            self.brick,
+            request.requests,
+            RetrievalRequest.from_pb2_model,
+            RetrievalResponse,
+            retrieval_pb2.RetrievalResponse,
+            retrieval_pb2.RetrievalBatchResponse,
+        )
+
     def register(self, server):
         retrieval_pb2_grpc.add_RetrievalServiceServicer_to_server(self, server)
@@ -10,6 +10,7 @@ from llmbrick.protocols.models.bricks.translate_types import (
     TranslateResponse,
 )
 from llmbrick.core.error_codes import ErrorCodes
+from llmbrick.servers.grpc.wrappers.errors import SUCCESS_ERROR_DETAIL
 
 # /protocols/grpc/translate/translate.proto
 # translate_pb2
@@ -30,10 +31,15 @@ class TranslateGrpcWrapper(translate_pb2_grpc.TranslateServiceServicer):
     以 common_grpc_wrapper.py 為基礎，統一異步方法的錯誤處理與型別檢查。
     """
 
-    def __init__(self, brick: TranslateBrick):
+    def __init__(self, brick: TranslateBrick, omit_intermediate_error: bool = False):
+        """
+        :param omit_intermediate_error: OutputStreaming 中 is_final=False 的成功 chunk
+            不附帶 error 欄位 (client 端解碼為 None)，減少每個 chunk 的編碼與傳輸量
+        """
         if not isinstance(brick, TranslateBrick):
             raise TypeError("brick must be an instance of TranslateBrick")
         self.brick = brick
+        self.omit_intermediate_error = omit_intermediate_error
 
     async def GetServiceInfo(self, request, context):
         error_data = common_pb2.ErrorDetail(code=ErrorCodes.SUCCESS, message="", detail="")
@@ -65,9 +71,8 @@ class TranslateGrpcWrapper(translate_pb2_grpc.TranslateServiceServicer):
                 error_data.detail = result.error.detail
                 response = common_pb2.ServiceInfoResponse(error=error_data)
                 return response
-            response_dict = result.to_dict()
-            response_dict["error"] = error_data
-            response = common_pb2.ServiceInfoResponse(**response_dict)
+            response = result.to_pb2()
+            response.error.CopyFrom(error_data)
             return response
         except NotImplementedError as ev:
             # context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -138,8 +143,8 @@ class TranslateGrpcWrapper(translate_pb2_grpc.TranslateServiceServicer):
         request = TranslateRequest.from_pb2_model(request)
         try:
             async for response in self.brick.run_output_streaming(request):
-                error_data = common_pb2.ErrorDetail(code=ErrorCodes.SUCCESS, message="", detail="")
                 if not isinstance(response, TranslateResponse):
+                    error_data = common_pb2.ErrorDetail()
                     # context.set_code(grpc.StatusCode.INTERNAL)
                     # context.set_details('Invalid output streaming response type!')
                     error_data.code = grpc.StatusCode.INTERNAL.value[0]
@@ -152,18 +157,18 @@ class TranslateGrpcWrapper(translate_pb2_grpc.TranslateServiceServicer):
                 if response.error and response.error.code != ErrorCodes.SUCCESS:
                     # context.set_code(grpc.StatusCode.INTERNAL)
                     # context.set_details(response.error.message)
-                    error_data.code = response.error.code
-                    error_data.message = response.error.message
-                    error_data.detail = response.error.detail
-                    yield translate_pb2.TranslateResponse(error=error_data)
+                    yield translate_pb2.TranslateResponse(error=response.error.to_pb2())
                     break
-                yield translate_pb2.TranslateResponse(
+                chunk = translate_pb2.TranslateResponse(
                     text=response.text,
                     tokens=response.tokens,
                     language_code=response.language_code,
                     is_final=response.is_final,
-                    error=error_data,
                 )
+                # 開啟 omit_intermediate_error 時中間 chunk 不帶 error，沒有 error 即代表成功
+                if response.is_final or not self.omit_intermediate_error:
+                    chunk.error.CopyFrom(SUCCESS_ERROR_DETAIL)
+                yield chunk
         except NotImplementedError as ev:
             error_data = common_pb2.ErrorDetail(
                 code=grpc.StatusCode.UNIMPLEMENTED.value[0],
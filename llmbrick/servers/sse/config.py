@@ -25,8 +25,17 @@ class SSEServerConfig(BaseModel):
     enable_validation_details: bool = Field(default=True, description="啟用詳細驗證錯誤訊息")
     
     # 效能配置
-    request_timeout: int = Field(default=30, description="請求超時時間(秒)")
-    max_concurrent_connections: int = Field(default=100, description="最大並發連線數")
+    request_timeout: int = Field(default=0, description="請求超時時間(秒)，0 表示不限制 (仍可由 X-Request-Timeout header 設定)")
+    max_concurrent_connections: int = Field(default=100, description="最大並發連線數 (同時進行的 SSE 串流)，0 表示不限制")
+    max_streams_per_client: Optional[int] = Field(default=None, description="單一 client 同時進行的串流上限 (依 clientId，沒有時依來源 IP)")
+    max_streams_per_session: Optional[int] = Field(default=None, description="單一 session 同時進行的串流上限")
+    validate_events: bool = Field(default=True, description="逐一檢查 handler 產生的事件，正式環境可關閉以減少每個 chunk 的開銷")
+    exclude_none_fields: bool = Field(default=False, description="事件 JSON 省略值為 None 的欄位")
+    stream_retry_after: int = Field(default=1, description="串流名額已滿時 429 回應的 Retry-After 秒數")
+
+    # 監控配置
+    enable_metrics: bool = Field(default=False, description="啟用 Prometheus 格式的 metrics 端點")
+    metrics_path: str = Field(default="/metrics", description="metrics 端點路徑")
     
     class Config:
         extra = "forbid"
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""
+SSE 事件的編碼
+
+每個串流 chunk 都會經過此處，因此：
+- ConversationSSEResponse 的 JSON 序列化使用模組層級建立一次的 TypeAdapter
+- 事件名稱與分隔符號預先編碼為 bytes，輸出直接是 bytes，StreamingResponse 不需再 encode
+- 事件檢查只比對必要欄位，不修改事件本身
+"""
+
+import json
+from typing import Any, Tuple
+
+from pydantic import TypeAdapter
+
+from llmbrick.protocols.models.http.conversation import (
+    ConversationResponseProgressEnum,
+    ConversationSSEResponse,
+)
+
+_EVENT_ADAPTER: TypeAdapter[ConversationSSEResponse] = TypeAdapter(
+    ConversationSSEResponse
+)
+
+_MESSAGE_PREFIX = b"event: message\ndata: "
+_ERROR_PREFIX = b"event: error\ndata: "
+_FRAME_END = b"\n\n"
+
+# str Enum 的成員與其值雜湊相同，同一個集合可比對兩者
+_PROGRESS_VALUES = frozenset(e.value for e in ConversationResponseProgressEnum)
+
+
+def encode_message(event: ConversationSSEResponse, exclude_none: bool = False) -> bytes:
+    """
+    將事件編碼為 `event: message` frame。
+
+    :param exclude_none: 省略值為 None 的欄位，縮小每個 chunk 的大小
+    """
+    return (
+        _MESSAGE_PREFIX
+        + _EVENT_ADAPTER.dump_json(event, exclude_none=exclude_none)
+        + _FRAME_END
+    )
+
+
+def encode_error(error: str, details: Any) -> bytes:
+    """編碼 `event: error` frame"""
+    payload = json.dumps({"error": error, "details": details}).encode()
+    return _ERROR_PREFIX + payload + _FRAME_END
+
+
+def check_event(event: Any) -> Tuple[bool, str]:
+    """檢查 handler 產生的事件，回傳 (是否有效, 錯誤訊息)"""
+    if not isinstance(event, ConversationSSEResponse):
+        return False, f"Event must be ConversationSSEResponse, got {type(event)}"
+    if not event.id:
+        return False, "Event.id is required"
+    if not event.type:
+        return False, "Event.type is required"
+    if not event.progress:
+        return False, "Event.progress is required"
+    if event.progress not in _PROGRESS_VALUES:
+        return False, f"Invalid progress value: {event.progress}"
+    return True, ""
@@ -0,0 +1,158 @@
+"""
+SSE 串流的並發計數與限制
+
+SSEServer 在開始串流前向 StreamTracker 申請名額，串流結束 (完成、逾時、client 斷線) 時釋放。
+限制分三層，任一層已滿即以 429 拒絕並帶上 Retry-After：
+- 整個行程同時進行的串流數 (SSEServerConfig.max_concurrent_connections)
+- 單一 client 的串流數 (max_streams_per_client，client 以請求的 clientId 識別，沒有時用來源 IP)
+- 單一 session 的串流數 (max_streams_per_session)
+
+指標 (預設寫入全域 MetricsRegistry)：
+- llmbrick_sse_active_streams: 進行中的串流數
+- llmbrick_sse_streams_total: 已開始的串流數
+- llmbrick_sse_streams_rejected_total: 依原因 (server / client / session) 分類的拒絕數
+- llmbrick_sse_stream_duration_seconds: 串流持續時間
+"""
+
+import time
+from typing import Dict, Optional
+
+from llmbrick.utils.metrics import MetricsRegistry, get_registry
+
+REJECT_SERVER = "server"
+REJECT_CLIENT = "client"
+REJECT_SESSION = "session"
+
+_DURATION_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+class StreamLimitExceeded(Exception):
+    """串流名額已滿，reason 為 server / client / session"""
+
+    def __init__(self, reason: str, message: str):
+        self.reason = reason
+        super().__init__(message)
+
+
+class StreamLease:
+    """一個串流占用的名額，release() 可重複呼叫"""
+
+    def __init__(self, tracker: "StreamTracker", client_id: str, session_id: str):
+        self._tracker = tracker
+        self.client_id = client_id
+        self.session_id = session_id
+        self.started_at = time.monotonic()
+        self.released = False
+
+    def release(self) -> None:
+        if self.released:
+            return
+        self.released = True
+        self._tracker._release(self)
+
+
+class StreamTracker:
+    """
+    記錄進行中的 SSE 串流並套用限制。須在單一 event loop 中使用。
+
+    :param max_streams: 行程內同時進行的串流上限，None 表示不限制
+    :param max_per_client: 單一 client 的串流上限，None 表示不限制
+    :param max_per_session: 單一 session 的串流上限，None 表示不限制
+    """
+
+    def __init__(
+        self,
+        max_streams: Optional[int] = None,
+        max_per_client: Optional[int] = None,
+        max_per_session: Optional[int] = None,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        self.max_streams = max_streams
+        self.max_per_client = max_per_client
+        self.max_per_session = max_per_session
+        self.active = 0
+        self._per_client: Dict[str, int] = {}
+        self._per_session: Dict[str, int] = {}
+        registry = registry or get_registry()
+        self._active_gauge = registry.gauge(
+            "llmbrick_sse_active_streams", "SSE streams currently open"
+        )
+        self._started = registry.counter(
+            "llmbrick_sse_streams_total", "SSE streams started"
+        )
+        self._rejected = registry.counter(
+            "llmbrick_sse_streams_rejected_total",
+            "SSE streams rejected by concurrency limits",
+            ("reason",),
+        )
+        self._duration = registry.histogram(
+            "llmbrick_sse_stream_duration_seconds",
+            "SSE stream duration",
+            buckets=_DURATION_BUCKETS,
+        )
+
+    def client_streams(self, client_id: str) -> int:
+        return self._per_client.get(client_id, 0)
+
+    def session_streams(self, session_id: str) -> int:
+        return self._per_session.get(session_id, 0)
+
+    def _reject(self, reason: str, message: str) -> StreamLimitExceeded:
+        self._rejected.inc(reason=reason)
+        return StreamLimitExceeded(reason, message)
+
+    def acquire(self, client_id: str = "", session_id: str = "") -> StreamLease:
+        """
+        申請一個串流名額，已滿時拋出 StreamLimitExceeded。
+        client_id 或 session_id 為空字串時不套用對應的限制。
+        """
+        if self.max_streams is not None and self.active >= self.max_streams:
+            raise self._reject(
+                REJECT_SERVER, f"Too many concurrent streams (limit {self.max_streams})"
+            )
+        if (
+            client_id
+            and self.max_per_client is not None
+            and self.client_streams(client_id) >= self.max_per_client
+        ):
+            raise self._reject(
+                REJECT_CLIENT,
+                f"Too many concurrent streams for client (limit {self.max_per_client})",
+            )
+        if (
+            session_id
+            and self.max_per_session is not None
+            and self.session_streams(session_id) >= self.max_per_session
+        ):
+            raise self._reject(
+                REJECT_SESSION,
+                "Too many concurrent streams for session "
+                f"(limit {self.max_per_session})",
+            )
+
+        self.active += 1
+        if client_id:
+            self._per_client[client_id] = self.client_streams(client_id) + 1
+        if session_id:
+            self._per_session[session_id] = self.session_streams(session_id) + 1
+        # 多個 SSEServer 可共用同一個 registry，以增減而非設定值更新
+        self._active_gauge.inc()
+        self._started.inc()
+        return StreamLease(self, client_id, session_id)
+
+    @staticmethod
+    def _decrement(counts: Dict[str, int], key: str) -> None:
+        if not key:
+            return
+        remaining = counts.get(key, 0) - 1
+        if remaining > 0:
+            counts[key] = remaining
+        else:
+            counts.pop(key, None)
+
+    def _release(self, lease: StreamLease) -> None:
+        self.active -= 1
+        self._decrement(self._per_client, lease.client_id)
+        self._decrement(self._per_session, lease.session_id)
+        self._active_gauge.dec()
+        self._duration.observe(time.monotonic() - lease.started_at)
@@ -1,4 +1,3 @@
-import json
 import os
 from pathlib import Path
 from typing import Any, AsyncGenerator, Callable, Optional
@@ -7,17 +6,26 @@ from fastapi.responses import HTMLResponse
 
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import ValidationError
 
+from llmbrick.core.context import (
+    TIMEOUT_HEADER,
+    DeadlineExceeded,
+    iterate_with_deadline,
+    request_context,
+)
 from llmbrick.core.exceptions import LLMBrickException, ValidationException
 from llmbrick.protocols.models.http.conversation import (
     ConversationSSERequest,
     ConversationSSEResponse,
-    ConversationResponseProgressEnum
 )
 from llmbrick.servers.sse.config import SSEServerConfig
+from llmbrick.servers.sse.framing import check_event, encode_error, encode_message
+from llmbrick.servers.sse.limits import StreamLimitExceeded, StreamTracker
 from llmbrick.utils.logging import logger
+from llmbrick.utils.metrics import PROMETHEUS_CONTENT_TYPE, get_registry
 
 
 class SSEServer:
@@ -57,6 +65,12 @@ class SSEServer:
             
         self.config = config
         self.custom_validator = custom_validator
+        # 進行中的 SSE 串流計數與並發限制
+        self.stream_tracker = StreamTracker(
+            max_streams=config.max_concurrent_connections or None,
+            max_per_client=config.max_streams_per_client,
+            max_per_session=config.max_streams_per_session,
+        )
         self._enable_test_page = enable_test_page  # Store the test page setting
         
         # Initialize FastAPI app with basic configuration
@@ -102,6 +116,14 @@ class SSEServer:
                     
                     return HTMLResponse(content=html)
 
+        # Register Prometheus metrics endpoint if enabled
+        if self.config.enable_metrics:
+            @self.app.get(self.config.metrics_path, include_in_schema=False)
+            async def metrics() -> PlainTextResponse:
+                return PlainTextResponse(
+                    get_registry().render(), media_type=PROMETHEUS_CONTENT_TYPE
+                )
+
         # 註冊 LLMBrickException handler
         @self.app.exception_handler(LLMBrickException)
         async def llmbrick_exception_handler(
@@ -179,24 +201,6 @@ class SSEServer:
         self.setup_routes()
         return func
 
-    def _validate_event(self, event: Any) -> tuple[bool, str]:
-        """強化型態與內容驗證，回傳(是否有效, 錯誤訊息)"""
-        if not isinstance(event, ConversationSSEResponse):
-            return False, f"Event must be ConversationSSEResponse, got {type(event)}"
-        # 必要欄位檢查
-        if not getattr(event, "id", None):
-            return False, "Event.id is required"
-        if not getattr(event, "type", None):
-            return False, "Event.type is required"
-        if not getattr(event, "progress", None):
-            return False, "Event.progress is required"
-        if not isinstance(event.progress, ConversationResponseProgressEnum):
-            try:
-                event.progress = ConversationResponseProgressEnum(event.progress)
-            except Exception:
-                return False, f"Invalid progress value: {event.progress}"
-        return True, ""
-
     def setup_routes(self) -> None:
         """設定 API 路由"""
         full_path = self.config.prefix + self.config.chat_completions_path
@@ -227,11 +231,51 @@ class SSEServer:
             from llmbrick.servers.sse.validators import ConversationSSERequestValidator
             from llmbrick.core.exceptions import ValidationException
             
+            # 請求逾時：config.request_timeout (0 表示不限制) 與 X-Request-Timeout header 取較小者
+            timeout: Optional[float] = (
+                float(self.config.request_timeout) if self.config.request_timeout > 0 else None
+            )
+            header_timeout = request.headers.get(TIMEOUT_HEADER)
+            if header_timeout is not None:
+                try:
+                    requested = float(header_timeout)
+                except ValueError:
+                    requested = -1.0
+                if requested <= 0:
+                    raise HTTPException(
+                        status_code=400,
+                        detail={"error": f"Invalid {TIMEOUT_HEADER} header: {header_timeout}"},
+                    )
+                timeout = requested if timeout is None else min(timeout, requested)
+
+            # 串流名額：整體、單一 client 與單一 session 的並發上限
+            client_id = body.client_id or (request.client.host if request.client else "")
+            try:
+                lease = self.stream_tracker.acquire(client_id, body.session_id)
+            except StreamLimitExceeded as e:
+                logger.warning(f"SSE stream rejected ({e.reason}): client_id={client_id}, session_id={body.session_id}")
+                raise HTTPException(
+                    status_code=429,
+                    detail={"error": "Too many concurrent streams", "details": str(e)},
+                    headers={"Retry-After": str(self.config.stream_retry_after)},
+                )
+
             # 請求日誌
             if self.config.enable_request_logging:
                 logger.info(f"SSE request received: model={body.model}, session_id={body.session_id}")
             
-            async def event_stream() -> AsyncGenerator[str, None]:
+            validate_events = self.config.validate_events
+            exclude_none = self.config.exclude_none_fields
+
+            async def event_stream() -> AsyncGenerator[bytes, None]:
+                try:
+                    with request_context(timeout=timeout, request_id=body.session_id):
+                        async for frame in _event_stream():
+                            yield frame
+                finally:
+                    lease.release()
+
+            async def _event_stream() -> AsyncGenerator[bytes, None]:
                 try:
                     # 業務邏輯驗證
                     try:
@@ -253,23 +297,39 @@ class SSEServer:
                             )
                     except ValidationException as ve:
                         error_details = str(ve) if self.config.enable_validation_details else "Business validation failed"
-                        yield f"event: error\ndata: {json.dumps({'error': 'Business validation failed', 'details': error_details})}\n\n"
+                        yield encode_error("Business validation failed", error_details)
                         return
                     
-                    async for event in self._handler(body):
-                        valid, err_msg = self._validate_event(event)
-                        if not valid:
-                            error_details = err_msg if self.config.debug_mode else "Server returned invalid event"
-                            yield f"event: error\ndata: {json.dumps({'error': 'Server returned invalid event', 'details': error_details})}\n\n"
-                            break
-                        yield f"event: message\ndata: {event.model_dump_json()}\n\n"
+                    # 逾時或 client 斷線時 handler 的 generator 會被關閉，下游的 gRPC 呼叫隨之取消
+                    events = iterate_with_deadline(self._handler(body))
+                    try:
+                        async for event in events:
+                            if not validate_events:
+                                yield encode_message(event, exclude_none)
+                                continue
+                            valid, err_msg = check_event(event)
+                            if not valid:
+                                error_details = err_msg if self.config.debug_mode else "Server returned invalid event"
+                                yield encode_error("Server returned invalid event", error_details)
+                                break
+                            yield encode_message(event, exclude_none)
+                    finally:
+                        await events.aclose()
+                except DeadlineExceeded:
+                    logger.warning(f"SSE request timeout: session_id={body.session_id}, timeout={timeout}s")
+                    yield encode_error("Request timeout", f"Request exceeded {timeout}s")
                 except Exception as e:
                     error_details = str(e) if self.config.debug_mode else "Handler exception occurred"
                     if self.config.debug_mode:
                         logger.exception("Handler exception in SSE stream")
-                    yield f"event: error\ndata: {json.dumps({'error': 'Handler exception', 'details': error_details})}\n\n"
+                    yield encode_error("Handler exception", error_details)
 
-            return StreamingResponse(event_stream(), media_type="text/event-stream")
+            # 串流未開始 (例如 client 在送出回應前斷線) 時由 background task 釋放名額
+            return StreamingResponse(
+                event_stream(),
+                media_type="text/event-stream",
+                background=BackgroundTask(lease.release),
+            )
 
     def run(self, host: Optional[str] = None, port: Optional[int] = None,
             ssl_keyfile: Optional[str] = None, ssl_certfile: Optional[str] = None) -> None:
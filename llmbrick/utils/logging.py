@@ -5,9 +5,18 @@ Pretty-Loguru 封裝，提供全域 logger、decorator 與動態配置功能。
 需先安裝 pretty-loguru: pip install pretty-loguru
 """
 
+import atexit
+import dataclasses
 import functools
 import inspect
-from typing import Any, Callable, Optional
+import os
+import queue
+import random
+import reprlib
+import sys
+import threading
+import time
+from typing import Any, Callable, Optional, Tuple
 
 from pretty_loguru import ConfigTemplates, EnhancedLogger, LoggerConfig, create_logger
 
@@ -69,6 +78,66 @@ def apply_template(
     return logger
 
 
+class _BoundedRepr(reprlib.Repr):
+    """
+    限制深度與長度的 repr，dataclass 逐欄位展開，
+    避免先產生完整字串再截斷。
+    """
+
+    def __init__(self, max_length: int):
+        super().__init__()
+        self.maxlevel = 4
+        self.maxstring = max_length
+        self.maxother = max_length
+        self.maxlist = self.maxtuple = self.maxset = self.maxfrozenset = 20
+        self.maxdeque = self.maxarray = 20
+        self.maxdict = 20
+
+    def repr1(self, x: Any, level: int) -> str:
+        if dataclasses.is_dataclass(x) and not isinstance(x, type):
+            if level <= 0:
+                return f"{type(x).__name__}(...)"
+            parts = []
+            for f in dataclasses.fields(x):
+                parts.append(f"{f.name}={self.repr1(getattr(x, f.name), level - 1)}")
+            return f"{type(x).__name__}({', '.join(parts)})"
+        return super().repr1(x, level)
+
+
+@functools.lru_cache(maxsize=None)
+def _bounded_repr(max_length: int) -> _BoundedRepr:
+    return _BoundedRepr(max_length)
+
+
+def _format_value(value: Any, max_length: Optional[int]) -> str:
+    if max_length is None:
+        return repr(value)
+    text = _bounded_repr(max_length).repr(value)
+    if len(text) > max_length:
+        return f"{text[:max_length]}...(truncated {len(text) - max_length} chars)"
+    return text
+
+
+def _resolve_level_no(log: Any, level: str) -> Optional[int]:
+    """取得 loguru level 數值，非 loguru logger 時回傳 None (視為永遠啟用)"""
+    if getattr(log, "_core", None) is None:
+        return None
+    try:
+        return log.level(str(level).upper()).no
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def _is_level_enabled(log: Any, level_no: Optional[int]) -> bool:
+    if level_no is None:
+        return True
+    # loguru 沒有公開最低等級的 API；內部屬性不存在時 (例如 loguru 改版) 視為啟用
+    min_level = getattr(getattr(log, "_core", None), "min_level", None)
+    if not isinstance(min_level, int):
+        return True
+    return level_no >= min_level
+
+
 def log_function(
     _func: Callable[..., Any] = None,
     *,
@@ -78,12 +147,21 @@ def log_function(
     log_exception: bool = True,
     level: str = "info",
     service_name: Optional[str] = None,
+    max_repr_length: Optional[int] = None,
+    sample_rate: float = 1.0,
 ) -> Callable[..., Any]:
     """
     Decorator: 自動 log 函式的輸入、輸出、例外。
     支援 async/sync 函式。
     service_name: 於 log 訊息前加上 [service_name] 標籤
+    max_repr_length: 參數與回傳值 repr 的長度上限，None (預設) 表示不截斷；
+        處理大型 context/documents 時可設定 (例如 2000) 避免產生巨大 log
+    sample_rate: 記錄輸入/輸出的呼叫比例 (0~1)，例如 0.01 僅記錄 1% 的呼叫；
+        例外一律記錄
+    level 未啟用時完全跳過字串格式化。
     """
+    if not 0.0 <= sample_rate <= 1.0:
+        raise ValueError("sample_rate must be between 0 and 1")
 
     def decorator_log_function(func):
         is_async = inspect.iscoroutinefunction(func)
@@ -92,41 +170,56 @@ def log_function(
         log_method = getattr(log, str(level).lower(), None)
         if not callable(log_method):
             log_method = log.info
+        level_no = _resolve_level_no(log, level)
+        name = func.__name__
+
+        def should_log() -> bool:
+            if not (log_input or log_output):
+                return False
+            if sample_rate < 1.0 and random.random() >= sample_rate:
+                return False
+            return _is_level_enabled(log, level_no)
+
+        def emit_input(args: tuple, kwargs: dict) -> None:
+            log_method(
+                f"{prefix}[{name}] input: "
+                f"args={_format_value(args, max_repr_length)}, "
+                f"kwargs={_format_value(kwargs, max_repr_length)}"
+            )
+
+        def emit_output(result: Any) -> None:
+            log_method(
+                f"{prefix}[{name}] output: {_format_value(result, max_repr_length)}"
+            )
 
         @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
-            if log_input:
-                log_method(
-                    f"{prefix}[{func.__name__}] input: args={args}, kwargs={kwargs}"
-                )
+            sampled = should_log()
+            if sampled and log_input:
+                emit_input(args, kwargs)
             try:
                 result = await func(*args, **kwargs)
-                if log_output:
-                    log_method(f"{prefix}[{func.__name__}] output: {result}")
+                if sampled and log_output:
+                    emit_output(result)
                 return result
             except Exception as e:
                 if log_exception:
-                    log.error(
-                        f"{prefix}[{func.__name__}] exception: {e}", exc_info=True
-                    )
+                    log.error(f"{prefix}[{name}] exception: {e}", exc_info=True)
                 raise
 
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
-            if log_input:
-                log_method(
-                    f"{prefix}[{func.__name__}] input: args={args}, kwargs={kwargs}"
-                )
+            sampled = should_log()
+            if sampled and log_input:
+                emit_input(args, kwargs)
             try:
                 result = func(*args, **kwargs)
-                if log_output:
-                    log_method(f"{prefix}[{func.__name__}] output: {result}")
+                if sampled and log_output:
+                    emit_output(result)
                 return result
             except Exception as e:
                 if log_exception:
-                    log.error(
-                        f"{prefix}[{func.__name__}] exception: {e}", exc_info=True
-                    )
+                    log.error(f"{prefix}[{name}] exception: {e}", exc_info=True)
                 raise
 
         return async_wrapper if is_async else sync_wrapper
@@ -137,6 +230,192 @@ def log_function(
         return decorator_log_function(_func)
 
 
+# =========================
+# 非同步佇列 sink
+# =========================
+
+_QUEUE_POLICIES = ("drop", "block", "sample")
+_ERROR_LEVEL_NO = 40
+
+
+class QueuedLogSink:
+    """
+    loguru sink：log 訊息放入有界記憶體佇列，由背景執行緒批次寫出，
+    讓 event loop 不必等待檔案或終端機 I/O。
+
+    :param target: 實際輸出目標，可為文字 stream (有 write/flush)、檔案路徑或 callable(str)
+    :param max_queue_size: 佇列上限
+    :param batch_size: 背景執行緒每次最多合併寫出的訊息數
+    :param policy: 佇列滿載時的策略
+        - "drop": 直接丟棄新訊息
+        - "block": 最多等待 block_timeout 秒，仍滿則丟棄
+        - "sample": 佇列超過一半時僅保留 sample_rate 比例的訊息，滿載時丟棄；
+          ERROR 以上等級不抽樣
+    :param flush_interval: 背景執行緒閒置時的輪詢間隔 (秒)
+    """
+
+    def __init__(
+        self,
+        target: Any = None,
+        max_queue_size: int = 10000,
+        batch_size: int = 256,
+        policy: str = "drop",
+        block_timeout: float = 0.1,
+        sample_rate: float = 0.1,
+        flush_interval: float = 0.05,
+    ):
+        if policy not in _QUEUE_POLICIES:
+            raise ValueError(f"未知的佇列策略: {policy}，可用: {_QUEUE_POLICIES}")
+        self.policy = policy
+        self.batch_size = batch_size
+        self.block_timeout = block_timeout
+        self.sample_rate = sample_rate
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: "queue.Queue[str]" = queue.Queue(maxsize=max_queue_size)
+        self._high_watermark = max_queue_size // 2
+        self._owns_target = False
+        self._write, self._flush = self._open_target(target)
+        self._closed = threading.Event()
+        self._thread = threading.Thread(
+            target=self._drain, name="llmbrick-log-sink", daemon=True
+        )
+        self._thread.start()
+
+    def _open_target(self, target: Any) -> Tuple[Callable[[str], Any], Callable[[], Any]]:
+        if target is None:
+            target = sys.stderr
+        if isinstance(target, (str, os.PathLike)):
+            target = open(target, "a", encoding="utf-8")
+            self._owns_target = True
+        if hasattr(target, "write"):
+            self._target = target
+            return target.write, getattr(target, "flush", lambda: None)
+        if callable(target):
+            self._target = None
+            return target, lambda: None
+        raise TypeError(f"Unsupported log sink target: {target!r}")
+
+    def __call__(self, message: Any) -> None:
+        if self._closed.is_set():
+            return
+        if self.policy == "sample" and self._queue.qsize() >= self._high_watermark:
+            record = getattr(message, "record", None)
+            level_no = record["level"].no if record else 0
+            if level_no < _ERROR_LEVEL_NO and random.random() >= self.sample_rate:
+                self.dropped += 1
+                return
+        try:
+            if self.policy == "block":
+                self._queue.put(str(message), timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(str(message))
+        except queue.Full:
+            self.dropped += 1
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                if self._closed.is_set():
+                    return
+                continue
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write("".join(batch))
+                self._flush()
+            except Exception:  # noqa: BLE001 - log sink 不可讓背景執行緒中止
+                pass
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """等待佇列寫完，回傳是否在 timeout 內完成"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if not self._thread.is_alive():
+                return False
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """寫出剩餘訊息並停止背景執行緒"""
+        self.flush(timeout)
+        self._closed.set()
+        self._thread.join(timeout)
+        if self._owns_target and self._target is not None:
+            self._target.close()
+
+
+_queued_sink: Optional[QueuedLogSink] = None
+_queued_sink_handler_id: Optional[int] = None
+
+_QUEUED_FORMAT = (
+    "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | "
+    "{name}:{function}:{line} - {message}"
+)
+
+
+def enable_queued_logging(
+    target: Any = None,
+    *,
+    level: str = "INFO",
+    format: str = _QUEUED_FORMAT,
+    replace_handlers: bool = True,
+    **sink_options: Any,
+) -> QueuedLogSink:
+    """
+    啟用非同步佇列 sink (opt-in)。
+    replace_handlers=True 時移除既有 handler，讓所有輸出都經由背景執行緒寫出；
+    sink_options 會傳給 QueuedLogSink (max_queue_size、policy 等)。
+    """
+    global _queued_sink, _queued_sink_handler_id
+    shutdown_queued_logging()
+    sink = QueuedLogSink(target, **sink_options)
+    if replace_handlers:
+        logger.remove()
+    _queued_sink_handler_id = logger.add(sink, level=level, format=format)
+    _queued_sink = sink
+    return sink
+
+
+def flush_logs(timeout: Optional[float] = 5.0) -> bool:
+    """等待佇列 sink 寫出所有訊息；未啟用佇列 sink 時直接回傳 True"""
+    if _queued_sink is None:
+        return True
+    return _queued_sink.flush(timeout)
+
+
+def shutdown_queued_logging(timeout: Optional[float] = 5.0) -> None:
+    """寫出剩餘訊息並移除佇列 sink"""
+    global _queued_sink, _queued_sink_handler_id
+    if _queued_sink is None:
+        return
+    if _queued_sink_handler_id is not None:
+        try:
+            logger.remove(_queued_sink_handler_id)
+        except ValueError:
+            pass
+    _queued_sink.close(timeout)
+    _queued_sink = None
+    _queued_sink_handler_id = None
+
+
+atexit.register(shutdown_queued_logging)
+
+
 # =========================
 # Decorator 使用範例
 # =========================
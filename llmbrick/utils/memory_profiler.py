@@ -0,0 +1,315 @@
+"""
+llmbrick.utils.memory_profiler
+------------------------------
+取樣式記憶體分析：tracemalloc 只在設定的時間窗內開啟，
+並以 snapshot 差異將配置的記憶體歸屬到各 brick/handler。
+
+tracemalloc 為行程全域狀態，本模組以引用計數管理：
+只有由本模組啟動的追蹤才會被本模組停止，不會關掉其他程式碼開啟的追蹤，
+並發呼叫也不會互相停止對方的追蹤。
+
+用法::
+
+    profiler = get_memory_profiler()
+    profiler.start(window_seconds=60, sample_rate=0.1)
+    ...
+    print(profiler.format_report())
+"""
+
+import random
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# =========================
+# tracemalloc 引用計數
+# =========================
+
+_tracing_lock = threading.Lock()
+_tracing_refs = 0
+_tracing_owned = False
+
+
+def acquire_tracing(nframes: int = 1) -> None:
+    """要求開啟 tracemalloc；已由他處開啟時僅增加引用數"""
+    global _tracing_refs, _tracing_owned
+    with _tracing_lock:
+        if _tracing_refs == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(nframes)
+            _tracing_owned = True
+        _tracing_refs += 1
+
+
+def release_tracing() -> None:
+    """釋放引用；最後一個引用釋放且追蹤由本模組開啟時才停止"""
+    global _tracing_refs, _tracing_owned
+    with _tracing_lock:
+        if _tracing_refs == 0:
+            return
+        _tracing_refs -= 1
+        if _tracing_refs == 0 and _tracing_owned:
+            tracemalloc.stop()
+            _tracing_owned = False
+
+
+def _reset_peak() -> None:
+    # tracemalloc.reset_peak 需要 Python 3.9+，較舊版本的峰值從追蹤開始起算
+    reset_peak = getattr(tracemalloc, "reset_peak", None)
+    if reset_peak is not None:
+        reset_peak()
+
+
+_peak_in_flight = 0
+
+
+@contextmanager
+def traced_peak() -> Iterator["_Sample"]:
+    """
+    量測 context 內的 tracemalloc 峰值 (相對於進入時的用量)，離開後可讀取 .peak。
+    只有在沒有其他量測進行中時才重設峰值；並發量測時峰值可能包含其他呼叫的配置，
+    但不會中斷彼此的追蹤。
+    """
+    global _peak_in_flight
+    acquire_tracing()
+    with _tracing_lock:
+        if _peak_in_flight == 0 and not _PROFILER._sampling:
+            _reset_peak()
+        _peak_in_flight += 1
+    sample = _Sample(tracemalloc.get_traced_memory()[0], None)
+    try:
+        yield sample
+    finally:
+        sample.peak = max(0, tracemalloc.get_traced_memory()[1] - sample.start_current)
+        with _tracing_lock:
+            _peak_in_flight -= 1
+        release_tracing()
+
+
+# =========================
+# Profiler
+# =========================
+
+
+@dataclass
+class AllocationSite:
+    """單一配置位置 (檔案:行號) 的累計統計"""
+
+    filename: str
+    lineno: int
+    size: int = 0
+    count: int = 0
+
+    def __str__(self) -> str:
+        return f"{self.filename}:{self.lineno} size={self.size}B count={self.count}"
+
+
+@dataclass
+class HandlerMemoryStats:
+    """單一 brick/handler 的取樣統計"""
+
+    brick: str
+    handler: str
+    samples: int = 0
+    allocated: int = 0
+    peak: int = 0
+
+
+class _Sample:
+    __slots__ = ("start_current", "snapshot", "peak")
+
+    def __init__(self, start_current: int, snapshot: Optional[tracemalloc.Snapshot]):
+        self.start_current = start_current
+        self.snapshot = snapshot
+        self.peak = 0
+
+
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class MemoryProfiler:
+    """
+    取樣式記憶體分析器。
+
+    - start() 開啟時間窗，窗內依 sample_rate 取樣呼叫；過期後於下次呼叫時自動關閉追蹤。
+    - 同一時間只會有一個呼叫被取樣，避免並發呼叫的配置互相混入 snapshot 差異。
+      (async handler 在 await 期間仍可能混入其他 coroutine 的配置，結果為近似值)
+    - low_overhead=True 時不拍 snapshot，只記錄 tracemalloc 的配置量與峰值，
+      report() 不會有配置位置。
+    """
+
+    def __init__(self) -> None:
+        self.active = False
+        self.sample_rate = 1.0
+        self.low_overhead = False
+        self.traceback_limit = 1
+        self._window_end = 0.0
+        self._sampling = False
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], HandlerMemoryStats] = {}
+        self._sites: Dict[Tuple[str, str], Dict[Tuple[str, int], AllocationSite]] = {}
+
+    def start(
+        self,
+        window_seconds: float = 60.0,
+        sample_rate: float = 0.1,
+        low_overhead: bool = False,
+        traceback_limit: int = 1,
+    ) -> None:
+        """
+        開啟取樣時間窗。
+
+        :param window_seconds: 追蹤維持的秒數
+        :param sample_rate: 窗內每個呼叫被取樣的機率 (0~1]
+        :param low_overhead: 只記錄配置量，不拍 snapshot
+        :param traceback_limit: tracemalloc 保存的 frame 數，越大越慢
+        """
+        if not 0 < sample_rate <= 1:
+            raise ValueError("sample_rate must be in (0, 1]")
+        with self._lock:
+            self.sample_rate = sample_rate
+            self.low_overhead = low_overhead
+            self.traceback_limit = traceback_limit
+            self._window_end = time.monotonic() + window_seconds
+            if not self.active:
+                acquire_tracing(traceback_limit)
+                self.active = True
+
+    def stop(self) -> None:
+        """結束時間窗並釋放追蹤，已收集的統計保留"""
+        with self._lock:
+            if self.active:
+                self.active = False
+                release_tracing()
+
+    def reset(self) -> None:
+        """清除已收集的統計"""
+        with self._lock:
+            self._stats.clear()
+            self._sites.clear()
+
+    def _begin_sample(self) -> Optional[_Sample]:
+        if time.monotonic() >= self._window_end:
+            self.stop()
+            return None
+        with self._lock:
+            if self._sampling or not self.active:
+                return None
+            if self.sample_rate < 1 and random.random() >= self.sample_rate:
+                return None
+            self._sampling = True
+        snapshot = None
+        if not self.low_overhead:
+            snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        if _peak_in_flight == 0:
+            _reset_peak()
+        return _Sample(tracemalloc.get_traced_memory()[0], snapshot)
+
+    def _end_sample(self, brick: str, handler: str, sample: _Sample) -> None:
+        try:
+            if not tracemalloc.is_tracing():
+                return
+            current, peak = tracemalloc.get_traced_memory()
+            sample.peak = max(0, peak - sample.start_current)
+            sites = None
+            if sample.snapshot is not None:
+                after = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+                sites = after.compare_to(sample.snapshot, "lineno")
+            key = (brick, handler)
+            with self._lock:
+                stats = self._stats.get(key)
+                if stats is None:
+                    stats = self._stats[key] = HandlerMemoryStats(brick, handler)
+                stats.samples += 1
+                stats.allocated += max(0, current - sample.start_current)
+                stats.peak = max(stats.peak, sample.peak)
+                if sites:
+                    per_handler = self._sites.setdefault(key, {})
+                    for diff in sites:
+                        if diff.size_diff <= 0:
+                            continue
+                        frame = diff.traceback[0]
+                        site_key = (frame.filename, frame.lineno)
+                        site = per_handler.get(site_key)
+                        if site is None:
+                            site = per_handler[site_key] = AllocationSite(*site_key)
+                        site.size += diff.size_diff
+                        site.count += max(0, diff.count_diff)
+        finally:
+            self._sampling = False
+
+    @contextmanager
+    def track(self, brick: str, handler: str) -> Iterator[Optional[_Sample]]:
+        """
+        在 context 內執行的程式碼若被取樣，配置會歸屬到 (brick, handler)。
+        未開啟或未被取樣時 yield None，幾乎沒有額外成本。
+        """
+        sample = self._begin_sample() if self.active else None
+        if sample is None:
+            yield None
+            return
+        try:
+            yield sample
+        finally:
+            self._end_sample(brick, handler, sample)
+
+    def stats(self) -> List[HandlerMemoryStats]:
+        """各 brick/handler 的取樣統計"""
+        with self._lock:
+            return list(self._stats.values())
+
+    def report(
+        self, brick: Optional[str] = None, limit: int = 10
+    ) -> Dict[str, List[AllocationSite]]:
+        """
+        依 brick 列出配置最多的呼叫位置。
+
+        :param brick: 只回傳指定 brick，None 表示全部
+        :param limit: 每個 brick 回傳的位置數
+        :return: {brick: [AllocationSite, ...]}，依 size 由大到小排序
+        """
+        merged: Dict[str, Dict[Tuple[str, int], AllocationSite]] = {}
+        with self._lock:
+            for (brick_name, _), sites in self._sites.items():
+                if brick is not None and brick_name != brick:
+                    continue
+                target = merged.setdefault(brick_name, {})
+                for key, site in sites.items():
+                    total = target.get(key)
+                    if total is None:
+                        total = target[key] = AllocationSite(*key)
+                    total.size += site.size
+                    total.count += site.count
+        return {
+            name: sorted(sites.values(), key=lambda s: s.size, reverse=True)[:limit]
+            for name, sites in merged.items()
+        }
+
+    def format_report(self, brick: Optional[str] = None, limit: int = 10) -> str:
+        """以純文字輸出 report() 與各 handler 統計"""
+        lines = []
+        for stats in self.stats():
+            if brick is not None and stats.brick != brick:
+                continue
+            lines.append(
+                f"[{stats.brick}] {stats.handler}: samples={stats.samples} "
+                f"allocated={stats.allocated}B peak={stats.peak}B"
+            )
+        for name, sites in self.report(brick, limit).items():
+            lines.append(f"[{name}] top allocation sites:")
+            lines.extend(f"  {site}" for site in sites)
+        return "\n".join(lines)
+
+
+_PROFILER = MemoryProfiler()
+
+
+def get_memory_profiler() -> MemoryProfiler:
+    """取得全域的 MemoryProfiler，BaseBrick 的各進入點會使用它"""
+    return _PROFILER
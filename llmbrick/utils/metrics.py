@@ -1,13 +1,415 @@
+import asyncio
+import bisect
 import functools
 import inspect
+import math
+import random
+import threading
 import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
 from llmbrick.utils.logging import logger
 
+# =========================
+# In-process metrics registry (Prometheus text format)
+# =========================
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    7.5,
+    10.0,
+)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape_label(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        try:
+            if len(labels) == len(self.labelnames):
+                return tuple(str(labels[n]) for n in self.labelnames)
+        except KeyError:
+            pass
+        raise ValueError(
+            f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+        )
+
+    def _header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class _Child:
+    """綁定 label 的 metric，熱路徑上避免重複建立 label tuple"""
+
+    __slots__ = ("_metric", "_key")
+
+    def __init__(self, metric: "_Metric", key: LabelValues):
+        self._metric = metric
+        self._key = key
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._metric._inc(self._key, amount)  # type: ignore[attr-defined]
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._metric._inc(self._key, -amount)  # type: ignore[attr-defined]
+
+    def set(self, value: float) -> None:
+        self._metric._set(self._key, value)  # type: ignore[attr-defined]
+
+    def observe(self, value: float) -> None:
+        self._metric._observe(self._key, value)  # type: ignore[attr-defined]
+
+
+class Counter(_Metric):
+    """只增不減的計數器"""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def labels(self, **labels: Any) -> _Child:
+        return _Child(self, self._key(labels))
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        self._inc(self._key(labels), amount)
 
-def measure_time(func):
+    def _inc(self, key: LabelValues, amount: float) -> None:
+        if amount < 0:
+            raise ValueError("Counter can only increase")
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}{labels} {_format_number(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """可增可減、也可直接設定的數值"""
+
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def labels(self, **labels: Any) -> _Child:
+        return _Child(self, self._key(labels))
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        self._inc(self._key(labels), amount)
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self._inc(self._key(labels), -amount)
+
+    def set(self, value: float, **labels: Any) -> None:
+        self._set(self._key(labels), value)
+
+    def _inc(self, key: LabelValues, amount: float) -> None:
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _set(self, key: LabelValues, value: float) -> None:
+        with self._lock:
+            self._values[key] = value
+
+    def get(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}{labels} {_format_number(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """固定 bucket 的直方圖"""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        # 每個 label 組合: [各 bucket 計數..., +Inf 計數], sum
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def labels(self, **labels: Any) -> _Child:
+        return _Child(self, self._key(labels))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        self._observe(self._key(labels), value)
+
+    def _observe(self, key: LabelValues, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    def get_count(self, **labels: Any) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def get_sum(self, **labels: Any) -> float:
+        return self._sums.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        with self._lock:
+            items = [(k, list(c), self._sums[k]) for k, c in self._counts.items()]
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_number(bound)}"'
+                bucket_labels = _format_labels(self.labelnames, key, le)
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_number(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Metric 容器。counter/gauge/histogram 以名稱取得或建立，
+    同名但型別不同時丟出 ValueError。
     """
-    Decorator: Measure function execution time and log it.
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls: type, name: str, *args: Any, **kwargs: Any) -> Any:
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = cls(name, *args, **kwargs)
+                    self._metrics[name] = metric
+        if not isinstance(metric, cls):
+            raise ValueError(
+                f"Metric {name} already registered as {metric.metric_type}"
+            )
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def render(self) -> str:
+        """輸出 Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 預設全域 registry
+REGISTRY = MetricsRegistry()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def get_registry() -> MetricsRegistry:
+    return REGISTRY
+
+
+async def start_metrics_server(
+    port: int,
+    host: str = "0.0.0.0",
+    registry: Optional[MetricsRegistry] = None,
+    path: str = "/metrics",
+) -> asyncio.AbstractServer:
+    """
+    啟動極簡 HTTP sidecar，在 path 上提供 Prometheus 格式的 metrics。
+    回傳 asyncio Server，呼叫端負責 close()。
+    """
+    registry = registry or REGISTRY
+
+    async def handle(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request_line = await reader.readline()
+            # 讀掉 header
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == path:
+                status, content_type = "200 OK", PROMETHEUS_CONTENT_TYPE
+                body = registry.render().encode("utf-8")
+            else:
+                status, content_type, body = (
+                    "404 Not Found",
+                    "text/plain",
+                    b"Not Found\n",
+                )
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode(
+                    "latin-1"
+                )
+                + body
+            )
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+# =========================
+# Decorators
+# =========================
+
+_CALL_DURATION = REGISTRY.histogram(
+    "llmbrick_call_duration_seconds",
+    "Execution time of measured brick calls",
+    ("brick", "call_type"),
+)
+_CALL_MEMORY_DIFF = REGISTRY.gauge(
+    "llmbrick_call_memory_rss_diff_bytes",
+    "RSS difference of the last measured brick call",
+    ("brick", "call_type"),
+)
+_CALL_PEAK_MEMORY = REGISTRY.gauge(
+    "llmbrick_call_peak_memory_bytes",
+    "tracemalloc peak memory of the last measured brick call",
+    ("brick", "call_type"),
+)
+
+
+def _metric_labels(
+    func: Callable, args: tuple, brick_name: Optional[str], call_type: Optional[str]
+) -> Dict[str, str]:
+    """brick label 優先順序: 參數 > self.brick_name > 函式全名"""
+    if brick_name is None:
+        owner = args[0] if args else None
+        brick_name = (
+            getattr(owner, "brick_name", None)
+            or f"{func.__module__}.{func.__qualname__}"
+        )
+    return {"brick": brick_name, "call_type": call_type or func.__name__}
+
+
+def _decorator_with_options(decorator: Callable) -> Callable:
+    """讓 decorator 同時支援 @measure_time 與 @measure_time(brick_name=...)"""
+
+    @functools.wraps(decorator)
+    def wrapper(func: Optional[Callable] = None, **options: Any) -> Any:
+        if func is None:
+            return lambda f: decorator(f, **options)
+        return decorator(func, **options)
+
+    return wrapper
+
+
+@_decorator_with_options
+def measure_time(
+    func: Callable,
+    brick_name: Optional[str] = None,
+    call_type: Optional[str] = None,
+    log: bool = True,
+):
+    """
+    Decorator: Measure function execution time, record it in the
+    llmbrick_call_duration_seconds histogram and optionally log it.
     Supports both sync and async functions.
+    Labels: brick (brick_name, self.brick_name or the function path)
+    and call_type (defaults to the function name).
     """
     if inspect.iscoroutinefunction(func):
 
@@ -19,10 +421,14 @@ def measure_time(func):
                 return result
             finally:
                 elapsed = time.perf_counter() - start
-                logger.info(
-                    f"[metrics] {func.__module__}.{func.__name__} execution " +
-                    f"time: {elapsed:.6f} seconds"
+                _CALL_DURATION.observe(
+                    elapsed, **_metric_labels(func, args, brick_name, call_type)
                 )
+                if log:
+                    logger.info(
+                        f"[metrics] {func.__module__}.{func.__name__} execution "
+                        + f"time: {elapsed:.6f} seconds"
+                    )
 
         return async_wrapper
     else:
@@ -35,34 +441,51 @@ def measure_time(func):
                 return result
             finally:
                 elapsed = time.perf_counter() - start
-                logger.info(
-                    f"[metrics] {func.__module__}.{func.__name__} execution " +
-                    f"time: {elapsed:.6f} seconds"
+                _CALL_DURATION.observe(
+                    elapsed, **_metric_labels(func, args, brick_name, call_type)
                 )
+                if log:
+                    logger.info(
+                        f"[metrics] {func.__module__}.{func.__name__} execution "
+                        + f"time: {elapsed:.6f} seconds"
+                    )
 
         return sync_wrapper
 
 
-def measure_memory(func):
+@_decorator_with_options
+def measure_memory(
+    func: Callable,
+    brick_name: Optional[str] = None,
+    call_type: Optional[str] = None,
+    log: bool = True,
+):
     """
-    Decorator: Measure function memory usage (RSS diff in MB) and log it.
+    Decorator: Measure function memory usage (RSS diff), record it in the
+    llmbrick_call_memory_rss_diff_bytes gauge and optionally log it (MB).
     Requires 'psutil' package. Supports both sync and async functions.
     """
     import psutil
 
     process = psutil.Process()
+
+    def record(mem_before: int, mem_after: int, args: tuple) -> None:
+        diff = mem_after - mem_before
+        _CALL_MEMORY_DIFF.set(diff, **_metric_labels(func, args, brick_name, call_type))
+        if log:
+            mem_diff_mb = diff / (1024 * 1024)
+            logger.info(
+                f"[metrics] {func.__module__}.{func.__name__} memory "
+                + f"usage diff: {mem_diff_mb:.6f} MB"
+            )
+
     if inspect.iscoroutinefunction(func):
 
         @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
             mem_before = process.memory_info().rss
             result = await func(*args, **kwargs)
-            mem_after = process.memory_info().rss
-            mem_diff_mb = (mem_after - mem_before) / (1024 * 1024)
-            logger.info(
-                f"[metrics] {func.__module__}.{func.__name__} memory " +
-                f"usage diff: {mem_diff_mb:.6f} MB"
-            )
+            record(mem_before, process.memory_info().rss, args)
             return result
 
         return async_wrapper
@@ -72,59 +495,65 @@ def measure_memory(func):
         def sync_wrapper(*args, **kwargs):
             mem_before = process.memory_info().rss
             result = func(*args, **kwargs)
-            mem_after = process.memory_info().rss
-            mem_diff_mb = (mem_after - mem_before) / (1024 * 1024)
-            logger.info(
-                f"[metrics] {func.__module__}.{func.__name__} memory " +
-                f"usage diff: {mem_diff_mb:.6f} MB"
-            )
+            record(mem_before, process.memory_info().rss, args)
             return result
 
         return sync_wrapper
 
 
-def measure_peak_memory(func):
+@_decorator_with_options
+def measure_peak_memory(
+    func: Callable,
+    brick_name: Optional[str] = None,
+    call_type: Optional[str] = None,
+    log: bool = True,
+    sample_rate: float = 1.0,
+):
     """
-    Decorator: Measure peak memory usage (in MB) during \n
-    function execution using tracemalloc.
+    Decorator: Measure peak memory usage during \n
+    function execution using tracemalloc, record it in the
+    llmbrick_call_peak_memory_bytes gauge and optionally log it (MB).
+    Tracing is reference counted (see llmbrick.utils.memory_profiler), so
+    concurrent calls never stop each other's tracing; with sample_rate < 1
+    only a fraction of calls is traced.
     Supports both sync and async functions.
     """
-    import tracemalloc
+    from llmbrick.utils.memory_profiler import traced_peak
+
+    def record(peak: int, args: tuple) -> None:
+        _CALL_PEAK_MEMORY.set(peak, **_metric_labels(func, args, brick_name, call_type))
+        if log:
+            peak_mb = peak / (1024 * 1024)
+            logger.info(
+                f"[metrics] {func.__module__}.{func.__name__} peak "
+                + f"memory usage: {peak_mb:.6f} MB (tracemalloc)"
+            )
+
+    def sampled() -> bool:
+        return sample_rate >= 1 or random.random() < sample_rate
 
     if inspect.iscoroutinefunction(func):
 
         @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
-            tracemalloc.start()
-            try:
+            if not sampled():
+                return await func(*args, **kwargs)
+            with traced_peak() as measurement:
                 result = await func(*args, **kwargs)
-                current, peak = tracemalloc.get_traced_memory()
-                peak_mb = peak / (1024 * 1024)
-                logger.info(
-                    f"[metrics] {func.__module__}.{func.__name__} peak " +
-                    f"memory usage: {peak_mb:.6f} MB (tracemalloc)"
-                )
-                return result
-            finally:
-                tracemalloc.stop()
+            record(measurement.peak, args)
+            return result
 
         return async_wrapper
     else:
 
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
-            tracemalloc.start()
-            try:
+            if not sampled():
+                return func(*args, **kwargs)
+            with traced_peak() as measurement:
                 result = func(*args, **kwargs)
-                current, peak = tracemalloc.get_traced_memory()
-                peak_mb = peak / (1024 * 1024)
-                logger.info(
-                    f"[metrics] {func.__module__}.{func.__name__} peak " +
-                    f"memory usage: {peak_mb:.6f} MB (tracemalloc)"
-                )
-                return result
-            finally:
-                tracemalloc.stop()
+            record(measurement.peak, args)
+            return result
 
         return sync_wrapper
 
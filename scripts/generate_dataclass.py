@@ -1,6 +1,8 @@
 import re
+import subprocess
 import sys
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 PROTO_TYPE_MAP = {
     "int32": "int",
@@ -12,13 +14,43 @@ PROTO_TYPE_MAP = {
     "google.protobuf.Struct": "Dict[str, Any]",
 }
 
-HEADER = """from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+TYPE_DEFAULTS = {
+    "int": "0",
+    "float": "0.0",
+    "str": '""',
+    "bool": "False",
+}
+
+STRUCT_TYPE = "google.protobuf.Struct"
+COMMON_PACKAGE = "protocols.grpc.common."
+
+# 與 proto 預設值不同、或需維持既有建構子參數順序的訊息設定
+# - required: 沒有預設值的欄位 (需位於最前面)
+# - defaults: 覆寫欄位預設值
+# - order: 覆寫 dataclass 欄位順序 (位置參數相容)
+MESSAGE_OPTIONS: Dict[str, Dict] = {
+    "ErrorDetail": {"required": ["code", "message"]},
+    "ModelInfo": {"required": ["model_id", "version"]},
+    "LLMRequest": {
+        "defaults": {"temperature": "0.7"},
+        "order": [
+            "temperature",
+            "model_id",
+            "prompt",
+            "context",
+            "client_id",
+            "session_id",
+            "request_id",
+            "source_language",
+            "max_tokens",
+        ],
+    },
+}
 
-"""
+Field = Tuple[str, str, bool]
 
 
-def parse_proto(proto_path: str) -> list[dict]:
+def parse_proto(proto_path: str) -> List[dict]:
     with open(proto_path, "r", encoding="utf-8") as f:
         lines = f.readlines()
 
@@ -27,8 +59,11 @@ def parse_proto(proto_path: str) -> list[dict]:
     for line in lines:
         line = line.strip()
         if line.startswith("message "):
-            name = line.split()[1].strip("{")
+            name = line.split()[1].strip("{}")
             current = {"name": name, "fields": []}  # type: ignore
+            if line.endswith("{}"):
+                messages.append(current)
+                current = None
         elif line == "}":
             if current:
                 current["fields"] = list(current["fields"])  # type: ignore
@@ -44,36 +79,273 @@ def parse_proto(proto_path: str) -> list[dict]:
     return messages
 
 
+def _message_name(typ: str) -> str:
+    return typ[len(COMMON_PACKAGE) :] if typ.startswith(COMMON_PACKAGE) else typ
+
+
+def _is_message(typ: str) -> bool:
+    return typ not in PROTO_TYPE_MAP
+
+
 def proto_type_to_py(typ: str, is_repeated: bool) -> str:
-    py_type = PROTO_TYPE_MAP.get(typ, typ)
+    py_type = PROTO_TYPE_MAP.get(typ, _message_name(typ))
     if is_repeated:
         return f"List[{py_type}]"
+    if _is_message(typ):
+        return f"Optional[{py_type}]"
     return py_type
 
 
-def gen_dataclass_code(messages: list[dict]) -> str:
-    code = HEADER
+def _ordered_fields(msg: dict) -> List[Field]:
+    options = MESSAGE_OPTIONS.get(msg["name"], {})
+    fields = list(msg["fields"])
+    order = options.get("order")
+    if order:
+        by_name = {f[0]: f for f in fields}
+        fields = [by_name[name] for name in order]
+    return fields
+
+
+def _field_default(
+    msg_name: str, fname: str, typ: str, is_repeated: bool
+) -> Optional[str]:
+    """dataclass 欄位的預設值，None 表示必填"""
+    options = MESSAGE_OPTIONS.get(msg_name, {})
+    if fname in options.get("required", ()):
+        return None
+    if fname in options.get("defaults", {}):
+        return options["defaults"][fname]
+    if is_repeated:
+        return "field(default_factory=list)"
+    if typ == STRUCT_TYPE:
+        return "field(default_factory=dict)"
+    if _is_message(typ):
+        return "None"
+    return TYPE_DEFAULTS[PROTO_TYPE_MAP[typ]]
+
+
+def _from_dict_default(msg_name: str, fname: str, typ: str, is_repeated: bool) -> str:
+    default = _field_default(msg_name, fname, typ, is_repeated)
+    if default is None:
+        return TYPE_DEFAULTS[PROTO_TYPE_MAP[typ]]
+    if is_repeated:
+        return "[]"
+    if typ == STRUCT_TYPE:
+        return "{}"
+    return default
+
+
+def _has_struct(msg: dict, lazy_messages: set) -> bool:
+    return any(
+        typ == STRUCT_TYPE or (_is_message(typ) and typ in lazy_messages)
+        for _, typ, _ in msg["fields"]
+    )
+
+
+def _gen_to_dict(msg: dict) -> List[str]:
+    lines = ["    def to_dict(self) -> Dict[str, Any]:"]
+    fields = _ordered_fields(msg)
+    if not fields:
+        return lines + ["        return {}", ""]
+    lines.append("        return {")
+    for fname, typ, is_repeated in fields:
+        attr = f"self.{fname}"
+        if is_repeated and _is_message(typ):
+            value = f"[item.to_dict() for item in {attr}]"
+        elif is_repeated:
+            value = f"list({attr})"
+        elif typ == STRUCT_TYPE:
+            value = f"dict({attr})"
+        elif _is_message(typ):
+            value = f"{attr}.to_dict() if {attr} is not None else None"
+        else:
+            value = attr
+        lines.append(f'            "{fname}": {value},')
+    return lines + ["        }", ""]
+
+
+def _gen_to_pb2(msg: dict, pb2_name: str) -> List[str]:
+    name = msg["name"]
+    lines = [f"    def to_pb2(self) -> {pb2_name}.{name}:"]
+    fields = _ordered_fields(msg)
+    if not fields:
+        return lines + [f"        return {pb2_name}.{name}()", ""]
+    kwargs = []
+    post = []
+    for fname, typ, is_repeated in fields:
+        attr = f"self.{fname}"
+        if typ == STRUCT_TYPE:
+            # 直接寫入訊息內的 Struct，避免建構子再複製一次
+            post.append(f"        dict_to_struct({attr}, model.{fname})")
+        elif is_repeated and _is_message(typ):
+            kwargs.append(f"{fname}=[item.to_pb2() for item in {attr}]")
+        elif _is_message(typ):
+            kwargs.append(f"{fname}={attr}.to_pb2() if {attr} is not None else None")
+        else:
+            kwargs.append(f"{fname}={attr}")
+    if not post:
+        lines.append(f"        return {pb2_name}.{name}(")
+        lines.extend(f"            {kw}," for kw in kwargs)
+        return lines + ["        )", ""]
+    if kwargs:
+        lines.append(f"        model = {pb2_name}.{name}(")
+        lines.extend(f"            {kw}," for kw in kwargs)
+        lines.append("        )")
+    else:
+        lines.append(f"        model = {pb2_name}.{name}()")
+    lines.extend(post)
+    return lines + ["        return model", ""]
+
+
+def _gen_from_pb2(msg: dict, pb2_name: str, lazy_messages: set) -> List[str]:
+    name = msg["name"]
+    lazy = _has_struct(msg, lazy_messages)
+    lines = ["    @classmethod"]
+    if lazy:
+        lines += [
+            "    def from_pb2_model(",
+            f"        cls, model: {pb2_name}.{name}, lazy: bool = False",
+            f'    ) -> "{name}":',
+            '        """',
+            "        :param lazy: True 時 Struct 欄位為唯讀的 LazyStructView，欄位在存取時才解碼",
+            '        """',
+        ]
+    else:
+        lines.append(
+            f'    def from_pb2_model(cls, model: {pb2_name}.{name}) -> "{name}":'
+        )
+    fields = _ordered_fields(msg)
+    if not fields:
+        return lines + ["        return cls()", ""]
+    lines.append("        return cls(")
+    for fname, typ, is_repeated in fields:
+        attr = f"model.{fname}"
+        cls_name = _message_name(typ)
+        lazy_arg = ", lazy" if typ in lazy_messages else ""
+        if typ == STRUCT_TYPE:
+            value = f"LazyStructView({attr}) if lazy else struct_to_dict({attr})"
+        elif is_repeated and _is_message(typ):
+            value = f"[{cls_name}.from_pb2_model(item{lazy_arg}) for item in {attr}]"
+        elif is_repeated:
+            value = f"list({attr})"
+        elif _is_message(typ):
+            # 未設定的子訊息 (例如串流中間 chunk 省略的 error) 轉為 None
+            value = (
+                f"{cls_name}.from_pb2_model({attr}{lazy_arg}) "
+                f'if model.HasField("{fname}") else None'
+            )
+        else:
+            value = attr
+        lines.append(f"            {fname}={value},")
+    return lines + ["        )", ""]
+
+
+def _gen_from_dict(msg: dict) -> List[str]:
+    name = msg["name"]
+    lines = [
+        "    @classmethod",
+        f'    def from_dict(cls, data: Dict[str, Any]) -> "{name}":',
+    ]
+    fields = _ordered_fields(msg)
+    if not fields:
+        return lines + ["        return cls()", ""]
+    singular_messages = [
+        fname
+        for fname, typ, is_repeated in fields
+        if _is_message(typ) and typ != STRUCT_TYPE and not is_repeated
+    ]
+    for fname in singular_messages:
+        lines.append(f'        {fname}_data = data.get("{fname}")')
+    lines.append("        return cls(")
+    for fname, typ, is_repeated in fields:
+        cls_name = _message_name(typ)
+        default = _from_dict_default(name, fname, typ, is_repeated)
+        if is_repeated and _is_message(typ):
+            value = f'[{cls_name}.from_dict(item) for item in data.get("{fname}", [])]'
+        elif fname in singular_messages:
+            value = f"{cls_name}.from_dict({fname}_data) if {fname}_data else None"
+        else:
+            value = f'data.get("{fname}", {default})'
+        lines.append(f"            {fname}={value},")
+    return lines + ["        )"]
+
+
+def _pb2_module(proto_path: str) -> Tuple[str, str]:
+    """回傳 (import 路徑, 模組名)，例如 (llmbrick.protocols.grpc.llm, llm_pb2)"""
+    path = Path(proto_path)
+    package = ".".join(path.parent.parts[path.parent.parts.index("llmbrick") :])
+    return package, f"{path.stem}_pb2"
+
+
+def gen_dataclass_code(messages: List[dict], proto_path: str) -> str:
+    package, pb2_name = _pb2_module(proto_path)
+    local = {msg["name"] for msg in messages}
+    common_refs = sorted(
+        {
+            _message_name(typ)
+            for msg in messages
+            for _, typ, _ in msg["fields"]
+            if typ.startswith(COMMON_PACKAGE) and _message_name(typ) not in local
+        }
+    )
+    # 含 Struct 欄位 (或巢狀含有) 的本地訊息，from_pb2_model 提供 lazy 參數
+    lazy_messages: set = set()
+    changed = True
+    while changed:
+        changed = False
+        for msg in messages:
+            if msg["name"] not in lazy_messages and _has_struct(msg, lazy_messages):
+                lazy_messages.add(msg["name"])
+                changed = True
+    uses_struct = any(
+        typ == STRUCT_TYPE for msg in messages for _, typ, _ in msg["fields"]
+    )
+
+    lines = [
+        '"""',
+        f"由 scripts/generate_dataclass.py 依 {Path(proto_path).as_posix()} 產生。",
+        "",
+        "to_dict/from_dict/to_pb2/from_pb2_model 皆為明確展開的欄位存取，",
+        "不經過 dataclasses.asdict 或 MessageToDict；to_dict 為淺拷貝。",
+        '"""',
+        "",
+        "from dataclasses import dataclass, field",
+        "from typing import Any, Dict, List, Optional",
+        "",
+        f"from {package} import {pb2_name}",
+    ]
+    if common_refs:
+        lines.append(
+            "from llmbrick.protocols.models.bricks.common_types import "
+            + ", ".join(common_refs)
+        )
+    lines.append("from llmbrick.protocols.models.compat import DATACLASS_OPTIONS")
+    if uses_struct:
+        lines += [
+            "from llmbrick.protocols.models.struct_utils import (",
+            "    LazyStructView,",
+            "    dict_to_struct,",
+            "    struct_to_dict,",
+            ")",
+        ]
+    lines.append("")
+
     for msg in messages:
-        code += f"@dataclass\nclass {msg['name']}:\n"
-        if not msg["fields"]:
-            code += "    pass\n\n"
-            continue
-        for fname, typ, is_repeated in msg["fields"]:
+        name = msg["name"]
+        lines += ["", "@dataclass(**DATACLASS_OPTIONS)", f"class {name}:"]
+        for fname, typ, is_repeated in _ordered_fields(msg):
             py_type = proto_type_to_py(typ, is_repeated)
-            default = " = field(default_factory=list)" if is_repeated else ""
-            if typ == "google.protobuf.Struct":
-                default = " = field(default_factory=dict)"
-            elif not is_repeated and py_type.startswith("Optional"):
-                default = " = None"
-            elif not is_repeated and py_type == "str":
-                default = ' = ""'
-            elif not is_repeated and py_type == "int":
-                default = " = 0"
-            elif not is_repeated and py_type == "bool":
-                default = " = False"
-            code += f"    {fname}: {py_type}{default}\n"
-        code += "\n"
-    return code
+            default = _field_default(name, fname, typ, is_repeated)
+            suffix = f" = {default}" if default is not None else ""
+            lines.append(f"    {fname}: {py_type}{suffix}")
+        if msg["fields"]:
+            lines.append("")
+        lines += _gen_to_dict(msg)
+        lines += _gen_to_pb2(msg, pb2_name)
+        lines += _gen_from_pb2(msg, pb2_name, lazy_messages)
+        lines += _gen_from_dict(msg)
+        lines.append("")
+    return "\n".join(lines).rstrip() + "\n"
 
 
 def main() -> None:
@@ -83,8 +355,10 @@ def main() -> None:
     proto_path = sys.argv[1]
     out_path = sys.argv[2]
     messages = parse_proto(proto_path)
-    code = gen_dataclass_code(messages)
+    code = gen_dataclass_code(messages, proto_path)
     Path(out_path).write_text(code, encoding="utf-8")
+    # 以 black 排版 (line-length 見 pyproject.toml)，未安裝時保留原始輸出
+    subprocess.run([sys.executable, "-m", "black", "-q", out_path], check=False)
     print(f"已產生: {out_path}")
 
 
@@ -92,4 +366,4 @@ if __name__ == "__main__":
     main()
 
 # Example usage:
-#  python scripts/generate_dataclass.py llmbrick/protocols/grpc/retrieval/retrieval.proto llmbrick/protocols/models/retrieval_type.py
+#  python scripts/generate_dataclass.py llmbrick/protocols/grpc/retrieval/retrieval.proto llmbrick/protocols/models/bricks/retrieval_types.py
@@ -0,0 +1,109 @@
+"""
+gRPC 通道池測試：確認 client brick 共用通道並可透過 aclose 釋放
+"""
+
+import asyncio
+from typing import AsyncIterator
+
+import pytest
+import pytest_asyncio
+
+from llmbrick.bricks.guard.base_guard import GuardBrick
+from llmbrick.core.brick import unary_handler
+from llmbrick.core.channel_pool import ChannelPool
+from llmbrick.core.error_codes import ErrorCodes
+from llmbrick.protocols.models.bricks.common_types import ErrorDetail
+from llmbrick.protocols.models.bricks.guard_types import (
+    GuardRequest,
+    GuardResponse,
+    GuardResult,
+)
+from llmbrick.servers.grpc.server import GrpcServer
+
+PORT = 50201
+
+
+class _PoolGuardBrick(GuardBrick):
+    @unary_handler
+    async def check(self, request: GuardRequest) -> GuardResponse:
+        return GuardResponse(
+            results=[GuardResult(is_attack=False, confidence=1.0, detail=request.text)],
+            error=ErrorDetail(code=ErrorCodes.SUCCESS, message="Success"),
+        )
+
+
+@pytest_asyncio.fixture
+async def grpc_server() -> AsyncIterator[None]:
+    server = GrpcServer(port=PORT)
+    server.register_service(_PoolGuardBrick())
+    server_task = asyncio.create_task(server.start())
+    await asyncio.sleep(0.5)
+    yield
+    await server.stop()
+    server_task.cancel()
+    try:
+        await server_task
+    except asyncio.CancelledError:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_calls_share_pooled_channels(grpc_server: None) -> None:
+    pool = ChannelPool(channels_per_target=2)
+    client = GuardBrick.toGrpcClient(f"127.0.0.1:{PORT}", channel_pool=pool)
+    for i in range(5):
+        response = await client.run_unary(GuardRequest(text=f"hi {i}"))
+        assert response.results[0].detail == f"hi {i}"
+    assert pool.size() == 2
+
+    await client.aclose()
+    assert pool.size() == 0
+
+
+@pytest.mark.asyncio
+async def test_clients_release_channels_on_exit(grpc_server: None) -> None:
+    pool = ChannelPool()
+    address = f"127.0.0.1:{PORT}"
+    async with GuardBrick.toGrpcClient(address, channel_pool=pool) as first:
+        async with GuardBrick.toGrpcClient(address, channel_pool=pool) as second:
+            await first.run_unary(GuardRequest(text="a"))
+            await second.run_unary(GuardRequest(text="b"))
+            assert pool.size() == 1
+        # 仍有 first 持有引用，通道不應被關閉
+        assert pool.size() == 1
+        await first.run_unary(GuardRequest(text="c"))
+    assert pool.size() == 0
+
+    with pytest.raises(RuntimeError):
+        await first.run_unary(GuardRequest(text="closed"))
+
+
+@pytest.mark.asyncio
+async def test_acquire_retains_before_warmup(grpc_server: None) -> None:
+    pool = ChannelPool()
+    address = f"127.0.0.1:{PORT}"
+    pending = asyncio.create_task(pool.acquire(address, retain=True))
+    await asyncio.sleep(0)
+    # 暖機期間另一個 client 取得並釋放引用，不應關閉等待中 client 的通道
+    pool.retain(address)
+    await pool.release(address)
+    assert pool.size() == 1
+    await pending
+    assert pool.size() == 1
+    await pool.release(address)
+    assert pool.size() == 0
+
+
+@pytest.mark.asyncio
+async def test_channels_per_target_is_part_of_pool_key(grpc_server: None) -> None:
+    pool = ChannelPool()
+    address = f"127.0.0.1:{PORT}"
+    async with GuardBrick.toGrpcClient(
+        address, channel_pool=pool, channels_per_target=2
+    ) as wide:
+        async with GuardBrick.toGrpcClient(address, channel_pool=pool) as narrow:
+            await wide.run_unary(GuardRequest(text="a"))
+            await narrow.run_unary(GuardRequest(text="b"))
+            assert pool.size() == 3
+        assert pool.size() == 2
+    assert pool.size() == 0
@@ -0,0 +1,82 @@
+"""
+gRPC 並發限制測試：超過 brick 上限的請求以 RESOURCE_EXHAUSTED 拒絕
+"""
+
+import asyncio
+from typing import AsyncIterator
+
+import grpc
+import pytest
+import pytest_asyncio
+
+from llmbrick.bricks.llm.base_llm import LLMBrick
+from llmbrick.core.brick import output_streaming_handler, unary_handler
+from llmbrick.protocols.models.bricks.llm_types import LLMRequest, LLMResponse
+from llmbrick.servers.grpc.server import GrpcServer
+from llmbrick.servers.grpc.wrappers import ConcurrencyLimit
+
+PORT = 50241
+
+
+class _SlowLLMBrick(LLMBrick):
+    @unary_handler
+    async def unary(self, request: LLMRequest) -> LLMResponse:
+        await asyncio.sleep(0.3)
+        return LLMResponse(text=request.prompt, is_final=True)
+
+    @output_streaming_handler
+    async def stream(self, request: LLMRequest) -> AsyncIterator[LLMResponse]:
+        for i in range(3):
+            await asyncio.sleep(0.1)
+            yield LLMResponse(text=str(i), is_final=(i == 2))
+
+
+@pytest_asyncio.fixture
+async def client() -> AsyncIterator[LLMBrick]:
+    server = GrpcServer(port=PORT, maximum_concurrent_rpcs=100)
+    server.register_service(
+        _SlowLLMBrick(default_prompt=""),
+        concurrency_limit=ConcurrencyLimit(max_concurrency=1, max_queue=1),
+    )
+    server_task = asyncio.create_task(server.start())
+    await asyncio.sleep(0.5)
+    client = LLMBrick.toGrpcClient(f"127.0.0.1:{PORT}")
+    yield client
+    await client.aclose()
+    await server.stop()
+    server_task.cancel()
+    try:
+        await server_task
+    except asyncio.CancelledError:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_unary_over_limit_rejected(client: LLMBrick) -> None:
+    results = await asyncio.gather(
+        *(client.run_unary(LLMRequest(prompt=str(i))) for i in range(3)),
+        return_exceptions=True,
+    )
+    rejected = [r for r in results if isinstance(r, grpc.aio.AioRpcError)]
+    served = [r for r in results if isinstance(r, LLMResponse)]
+    # 1 個執行、1 個排隊，第 3 個立即被拒絕
+    assert len(served) == 2
+    assert len(rejected) == 1
+    assert rejected[0].code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+
+
+@pytest.mark.asyncio
+async def test_stream_holds_slot_until_finished(client: LLMBrick) -> None:
+    async def consume():
+        return [r.text async for r in client.run_output_streaming(LLMRequest())]
+
+    results = await asyncio.gather(
+        *(consume() for _ in range(3)), return_exceptions=True
+    )
+    assert results.count(["0", "1", "2"]) == 2
+    errors = [r for r in results if isinstance(r, grpc.aio.AioRpcError)]
+    assert len(errors) == 1
+    assert errors[0].code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+
+    # 名額釋放後可再次處理
+    assert (await client.run_unary(LLMRequest(prompt="ok"))).text == "ok"
@@ -0,0 +1,262 @@
+"""
+BatchUnary RPC 測試：client 的 run_batch 以一次 RPC 送出多筆請求，
+server 端交給 brick.run_batch，單筆失敗只影響對應的 response
+"""
+
+import asyncio
+from typing import List
+
+import grpc
+import pytest
+import pytest_asyncio
+
+from llmbrick.bricks.intention.base_intention import IntentionBrick
+from llmbrick.bricks.rectify.base_rectify import RectifyBrick
+from llmbrick.bricks.retrieval.base_retrieval import RetrievalBrick
+from llmbrick.core.brick import batch_handler, unary_handler
+from llmbrick.core.error_codes import ErrorCodes
+from llmbrick.protocols.grpc.rectify import rectify_pb2, rectify_pb2_grpc
+from llmbrick.protocols.models.bricks.common_types import ErrorDetail
+from llmbrick.protocols.models.bricks.intention_types import (
+    IntentionRequest,
+    IntentionResponse,
+    IntentionResult,
+)
+from llmbrick.protocols.models.bricks.rectify_types import (
+    RectifyRequest,
+    RectifyResponse,
+)
+from llmbrick.protocols.models.bricks.retrieval_types import (
+    Document,
+    RetrievalRequest,
+    RetrievalResponse,
+)
+from llmbrick.servers.grpc.server import GrpcServer
+
+PORT = 50281
+LEGACY_PORT = 50282
+
+
+class _BatchIntentionBrick(IntentionBrick):
+    def __init__(self, **kwargs):
+        super().__init__(verbose=False, **kwargs)
+        self.batches: List[int] = []
+
+    @batch_handler(max_batch_size=8, max_wait_ms=5)
+    async def classify(
+        self, requests: List[IntentionRequest]
+    ) -> List[IntentionResponse]:
+        self.batches.append(len(requests))
+        return [
+            (
+                RuntimeError("bad input")
+                if r.text == "bad"
+                else IntentionResponse(
+                    results=[IntentionResult(intent_category=r.text, confidence=1.0)]
+                )
+            )
+            for r in requests
+        ]
+
+
+class _UpperRectifyBrick(RectifyBrick):
+    def __init__(self, **kwargs):
+        super().__init__(verbose=False, **kwargs)
+        self.calls = 0
+
+    @unary_handler
+    async def rectify(self, request: RectifyRequest) -> RectifyResponse:
+        self.calls += 1
+        if request.text == "reject":
+            return RectifyResponse(
+                error=ErrorDetail(code=ErrorCodes.BAD_REQUEST, message="rejected")
+            )
+        return RectifyResponse(
+            corrected_text=request.text.upper(),
+            error=ErrorDetail(code=ErrorCodes.SUCCESS, message="Success"),
+        )
+
+
+class _EchoRetrievalBrick(RetrievalBrick):
+    def __init__(self, **kwargs):
+        super().__init__(verbose=False, **kwargs)
+
+    @unary_handler
+    async def search(self, request: RetrievalRequest) -> RetrievalResponse:
+        return RetrievalResponse(
+            documents=[
+                Document(
+                    doc_id=request.query,
+                    title=request.query,
+                    metadata={"rank": i},
+                )
+                for i in range(request.max_results)
+            ],
+            error=ErrorDetail(code=ErrorCodes.SUCCESS, message="Success"),
+        )
+
+
+@pytest_asyncio.fixture
+async def served():
+    bricks = (_BatchIntentionBrick(), _UpperRectifyBrick(), _EchoRetrievalBrick())
+    bricks[1].max_batch_size = 4
+    server = GrpcServer(port=PORT)
+    for brick in bricks:
+        server.register_service(brick)
+    server_task = asyncio.create_task(server.start())
+    await asyncio.sleep(0.5)
+    address = f"127.0.0.1:{PORT}"
+    clients = (
+        IntentionBrick.toGrpcClient(address, verbose=False),
+        RectifyBrick.toGrpcClient(address, verbose=False),
+        RetrievalBrick.toGrpcClient(address, verbose=False),
+    )
+    yield bricks, clients
+    for client in clients:
+        await client.aclose()
+    await server.stop()
+    server_task.cancel()
+    try:
+        await server_task
+    except asyncio.CancelledError:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_batch_handler_over_grpc(served) -> None:
+    (intention, _, _), (client, _, _) = served
+    requests = [IntentionRequest(text=str(i)) for i in range(20)]
+    responses = await client.run_batch(requests)
+    assert [r.results[0].intent_category for r in responses] == [
+        str(i) for i in range(20)
+    ]
+    assert all(r.error.code == ErrorCodes.SUCCESS for r in responses)
+    assert intention.batches == [8, 8, 4]
+
+
+@pytest.mark.asyncio
+async def test_item_exception_only_fails_that_item(served) -> None:
+    _, (client, _, _) = served
+    responses = await client.run_batch(
+        [IntentionRequest(text="ok"), IntentionRequest(text="bad")]
+    )
+    assert responses[0].results[0].intent_category == "ok"
+    assert responses[1].results == []
+    assert responses[1].error.code == grpc.StatusCode.INTERNAL.value[0]
+    assert responses[1].error.message == "bad input"
+
+
+@pytest.mark.asyncio
+async def test_parallel_unary_fallback_over_grpc(served) -> None:
+    (_, rectify, _), (_, client, _) = served
+    responses = await client.run_batch(
+        [RectifyRequest(text="abc"), RectifyRequest(text="reject")]
+    )
+    assert responses[0].corrected_text == "ABC"
+    assert responses[1].error.code == ErrorCodes.BAD_REQUEST
+    assert responses[1].error.message == "rejected"
+    assert rectify.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_retrieval_batch_keeps_metadata(served) -> None:
+    _, (_, _, client) = served
+    responses = await client.run_batch(
+        [RetrievalRequest(query="a", max_results=1), RetrievalRequest(query="b")]
+    )
+    assert responses[0].documents[0].doc_id == "a"
+    assert responses[0].documents[0].metadata["rank"] == 0
+    assert responses[1].documents == []
+
+
+@pytest.mark.asyncio
+async def test_batch_unary_stub(served) -> None:
+    async with grpc.aio.insecure_channel(f"127.0.0.1:{PORT}") as channel:
+        stub = rectify_pb2_grpc.RectifyServiceStub(channel)
+        response = await stub.BatchUnary(
+            rectify_pb2.RectifyBatchRequest(
+                requests=[rectify_pb2.RectifyRequest(text="x")] * 3
+            )
+        )
+    assert response.error.code == ErrorCodes.SUCCESS
+    assert [r.corrected_text for r in response.responses] == ["X", "X", "X"]
+
+
+@pytest.mark.asyncio
+async def test_oversized_batch_is_rejected(served) -> None:
+    (_, rectify, _), _ = served
+    async with grpc.aio.insecure_channel(f"127.0.0.1:{PORT}") as channel:
+        stub = rectify_pb2_grpc.RectifyServiceStub(channel)
+        response = await stub.BatchUnary(
+            rectify_pb2.RectifyBatchRequest(
+                requests=[rectify_pb2.RectifyRequest(text="x")] * 5
+            )
+        )
+    assert response.error.code == ErrorCodes.PAYLOAD_TOO_LARGE
+    assert list(response.responses) == []
+    assert rectify.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_client_splits_batches_by_max_batch_size(served) -> None:
+    (_, rectify, _), (_, client, _) = served
+    requests = [RectifyRequest(text=str(i)) for i in range(10)]
+    rejected = await client.run_batch(requests)
+    assert all(r.error.code == ErrorCodes.PAYLOAD_TOO_LARGE for r in rejected)
+    assert rectify.calls == 0
+
+    client.max_batch_size = 4
+    responses = await client.run_batch(requests)
+    assert [r.corrected_text for r in responses] == [str(i) for i in range(10)]
+    assert rectify.calls == 10
+
+
+class _LegacyRectifyServicer(rectify_pb2_grpc.RectifyServiceServicer):
+    """沒有 BatchUnary 的舊版伺服器"""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def Unary(self, request, context):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.02)
+        finally:
+            self.active -= 1
+        if request.text == "boom":
+            await context.abort(grpc.StatusCode.INTERNAL, "boom")
+        return rectify_pb2.RectifyResponse(corrected_text=request.text.upper())
+
+    async def BatchUnary(self, request, context):
+        await context.abort(grpc.StatusCode.UNIMPLEMENTED, "Method not implemented!")
+
+
+@pytest.mark.asyncio
+async def test_unimplemented_falls_back_to_bounded_unary() -> None:
+    servicer = _LegacyRectifyServicer()
+    server = grpc.aio.server()
+    rectify_pb2_grpc.add_RectifyServiceServicer_to_server(servicer, server)
+    server.add_insecure_port(f"127.0.0.1:{LEGACY_PORT}")
+    await server.start()
+    client = RectifyBrick.toGrpcClient(f"127.0.0.1:{LEGACY_PORT}", verbose=False)
+    client.batch_concurrency = 2
+    try:
+        texts = ["a", "b", "boom", "c", "d", "e"]
+        results = await client.run_batch(
+            [RectifyRequest(text=t) for t in texts], return_exceptions=True
+        )
+    finally:
+        await client.aclose()
+        await server.stop(None)
+    # 單筆失敗只影響對應的結果
+    assert isinstance(results[2], grpc.aio.AioRpcError)
+    assert [r.corrected_text for i, r in enumerate(results) if i != 2] == [
+        "A",
+        "B",
+        "C",
+        "D",
+        "E",
+    ]
+    assert servicer.peak == 2
@@ -0,0 +1,100 @@
+"""
+gRPC deadline 傳遞測試：client 端的 RequestContext 逾時成為 gRPC deadline，
+server 端 handler 看得到剩餘時間，逾時後 handler 被取消
+"""
+
+import asyncio
+from typing import AsyncIterator
+
+import grpc
+import pytest
+import pytest_asyncio
+
+from llmbrick.bricks.llm.base_llm import LLMBrick
+from llmbrick.core.brick import output_streaming_handler, unary_handler
+from llmbrick.core.context import request_context, time_remaining
+from llmbrick.protocols.models.bricks.llm_types import LLMRequest, LLMResponse
+from llmbrick.servers.grpc.server import GrpcServer
+
+PORT = 50271
+
+
+class _DeadlineLLMBrick(LLMBrick):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.cancelled = asyncio.Event()
+
+    @unary_handler
+    async def unary(self, request: LLMRequest) -> LLMResponse:
+        if request.prompt == "slow":
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                self.cancelled.set()
+                raise
+        return LLMResponse(text=repr(time_remaining()), is_final=True)
+
+    @output_streaming_handler
+    async def stream(self, request: LLMRequest) -> AsyncIterator[LLMResponse]:
+        try:
+            for i in range(50):
+                yield LLMResponse(text=repr(time_remaining()), is_final=False)
+                await asyncio.sleep(0.1)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+        yield LLMResponse(text="", is_final=True)
+
+
+@pytest_asyncio.fixture
+async def served():
+    brick = _DeadlineLLMBrick(default_prompt="")
+    server = GrpcServer(port=PORT)
+    server.register_service(brick)
+    server_task = asyncio.create_task(server.start())
+    await asyncio.sleep(0.5)
+    client = LLMBrick.toGrpcClient(f"127.0.0.1:{PORT}")
+    yield brick, client
+    await client.aclose()
+    await server.stop()
+    server_task.cancel()
+    try:
+        await server_task
+    except asyncio.CancelledError:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_no_deadline_by_default(served) -> None:
+    _, client = served
+    response = await client.run_unary(LLMRequest(prompt="fast"))
+    assert response.text == "None"
+
+
+@pytest.mark.asyncio
+async def test_deadline_propagates_to_server(served) -> None:
+    _, client = served
+    with request_context(timeout=2.0):
+        response = await client.run_unary(LLMRequest(prompt="fast"))
+    remaining = float(response.text)
+    assert 0.0 < remaining <= 2.0
+
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_server_handler(served) -> None:
+    brick, client = served
+    with request_context(timeout=0.3):
+        with pytest.raises(grpc.aio.AioRpcError) as exc_info:
+            await client.run_unary(LLMRequest(prompt="slow"))
+    assert exc_info.value.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+    await asyncio.wait_for(brick.cancelled.wait(), timeout=2.0)
+
+
+@pytest.mark.asyncio
+async def test_stream_stops_when_caller_goes_away(served) -> None:
+    brick, client = served
+    stream = client.run_output_streaming(LLMRequest(prompt="stream"))
+    first = await stream.__anext__()
+    assert first.text == "None"
+    await stream.aclose()
+    await asyncio.wait_for(brick.cancelled.wait(), timeout=2.0)
@@ -0,0 +1,134 @@
+"""
+gRPC wrapper 指標測試：確認延遲、TTFT、chunk 數與錯誤碼會寫入 RpcMetrics
+"""
+
+import asyncio
+from typing import AsyncIterator, Iterator
+
+import pytest
+import pytest_asyncio
+
+from llmbrick.bricks.llm.base_llm import LLMBrick
+from llmbrick.core.brick import output_streaming_handler, unary_handler
+from llmbrick.core.error_codes import ErrorCodes
+from llmbrick.protocols.models.bricks.common_types import ErrorDetail
+from llmbrick.protocols.models.bricks.llm_types import LLMRequest, LLMResponse
+from llmbrick.servers.grpc.server import GrpcServer
+from llmbrick.servers.grpc.wrappers import (
+    RegistryRpcMetrics,
+    RpcMetrics,
+    get_rpc_metrics,
+    set_rpc_metrics,
+)
+from llmbrick.utils.metrics import MetricsRegistry
+
+PORT = 50221
+
+
+class _MetricsLLMBrick(LLMBrick):
+    @unary_handler
+    async def unary(self, request: LLMRequest) -> LLMResponse:
+        if request.prompt == "fail":
+            return LLMResponse(
+                error=ErrorDetail(code=ErrorCodes.BAD_REQUEST, message="bad prompt")
+            )
+        return LLMResponse(
+            text=request.prompt,
+            is_final=True,
+            error=ErrorDetail(code=ErrorCodes.SUCCESS, message="Success"),
+        )
+
+    @output_streaming_handler
+    async def stream(self, request: LLMRequest) -> AsyncIterator[LLMResponse]:
+        for i in range(3):
+            await asyncio.sleep(0.01)
+            yield LLMResponse(
+                text=f"{request.prompt} {i}",
+                is_final=(i == 2),
+                error=ErrorDetail(code=ErrorCodes.SUCCESS, message="Success"),
+            )
+
+
+@pytest.fixture
+def metrics() -> Iterator[RegistryRpcMetrics]:
+    previous = get_rpc_metrics()
+    rpc_metrics = RegistryRpcMetrics(MetricsRegistry())
+    set_rpc_metrics(rpc_metrics)
+    yield rpc_metrics
+    set_rpc_metrics(previous)
+
+
+@pytest_asyncio.fixture
+async def client(metrics: RegistryRpcMetrics) -> AsyncIterator[LLMBrick]:
+    server = GrpcServer(port=PORT)
+    server.register_service(_MetricsLLMBrick(default_prompt=""))
+    server_task = asyncio.create_task(server.start())
+    await asyncio.sleep(0.5)
+    client = LLMBrick.toGrpcClient(f"127.0.0.1:{PORT}")
+    yield client
+    await client.aclose()
+    await server.stop()
+    server_task.cancel()
+    try:
+        await server_task
+    except asyncio.CancelledError:
+        pass
+
+
+LABELS = {"brick_type": "LLM", "brick": "_MetricsLLMBrick"}
+
+
+@pytest.mark.asyncio
+async def test_unary_latency_and_error_codes(
+    client: LLMBrick, metrics: RegistryRpcMetrics
+) -> None:
+    await client.run_unary(LLMRequest(prompt="hi"))
+    await client.run_unary(LLMRequest(prompt="fail"))
+
+    labels = dict(LABELS, method="Unary")
+    assert metrics.requests.get(**labels) == 2
+    assert metrics.latency.get_count(**labels) == 2
+    assert metrics.bytes_out.get(**labels) > 0
+    assert metrics.errors.get(code=ErrorCodes.BAD_REQUEST, **labels) == 1
+    assert metrics.in_flight.get(**labels) == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_ttft_and_throughput(
+    client: LLMBrick, metrics: RegistryRpcMetrics
+) -> None:
+    chunks = [c async for c in client.run_output_streaming(LLMRequest(prompt="s"))]
+    assert len(chunks) == 3
+
+    labels = dict(LABELS, method="OutputStreaming")
+    assert metrics.ttft.get_count(**labels) == 1
+    assert metrics.ttft.get_sum(**labels) <= metrics.latency.get_sum(**labels)
+    assert metrics.chunks.get(**labels) == 3
+    assert metrics.chunk_rate.get_count(**labels) == 1
+    assert metrics.in_flight.get(**labels) == 0
+
+
+@pytest.mark.asyncio
+async def test_custom_metrics_backend(metrics: RegistryRpcMetrics) -> None:
+    events = []
+
+    class _Recorder(RpcMetrics):
+        def rpc_finished(self, rpc, seconds, code, chunks, bytes_out):
+            events.append((rpc.method, code, chunks))
+
+    set_rpc_metrics(_Recorder())
+    server = GrpcServer(port=PORT)
+    server.register_service(_MetricsLLMBrick(default_prompt=""))
+    server_task = asyncio.create_task(server.start())
+    await asyncio.sleep(0.5)
+    try:
+        async with LLMBrick.toGrpcClient(f"127.0.0.1:{PORT}") as client:
+            await client.run_unary(LLMRequest(prompt="hi"))
+    finally:
+        await server.stop()
+        server_task.cancel()
+        try:
+            await server_task
+        except asyncio.CancelledError:
+            pass
+    assert events == [("Unary", ErrorCodes.SUCCESS, 1)]
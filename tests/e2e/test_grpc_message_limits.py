@@ -0,0 +1,59 @@
+"""
+gRPC 調校參數測試：放寬訊息上限後可傳送超過 grpc 預設 4MB 的回應
+"""
+
+import asyncio
+from typing import AsyncIterator
+
+import grpc
+import pytest
+import pytest_asyncio
+
+from llmbrick.bricks.llm.base_llm import LLMBrick
+from llmbrick.core.brick import unary_handler
+from llmbrick.protocols.models.bricks.llm_types import LLMRequest, LLMResponse
+from llmbrick.servers.grpc.config import GrpcClientConfig, GrpcServerConfig
+from llmbrick.servers.grpc.server import GrpcServer
+
+PORT = 50251
+LARGE = 6 * 1024 * 1024
+
+
+class _LargeLLMBrick(LLMBrick):
+    @unary_handler
+    async def unary(self, request: LLMRequest) -> LLMResponse:
+        return LLMResponse(text="x" * LARGE, is_final=True)
+
+
+@pytest_asyncio.fixture
+async def server() -> AsyncIterator[GrpcServer]:
+    config = GrpcServerConfig(host="127.0.0.1", port=PORT, compression="gzip")
+    server = GrpcServer(config=config)
+    server.register_service(_LargeLLMBrick(default_prompt=""))
+    server_task = asyncio.create_task(server.start())
+    await asyncio.sleep(0.5)
+    yield server
+    await server.stop()
+    server_task.cancel()
+    try:
+        await server_task
+    except asyncio.CancelledError:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_large_response_with_client_config(server: GrpcServer) -> None:
+    assert server.port == PORT
+    async with LLMBrick.toGrpcClient(
+        f"127.0.0.1:{PORT}", grpc_config=GrpcClientConfig(), default_prompt=""
+    ) as client:
+        response = await client.run_unary(LLMRequest())
+    assert len(response.text) == LARGE
+
+
+@pytest.mark.asyncio
+async def test_default_client_limit_still_applies(server: GrpcServer) -> None:
+    async with LLMBrick.toGrpcClient(f"127.0.0.1:{PORT}", default_prompt="") as client:
+        with pytest.raises(grpc.aio.AioRpcError) as exc_info:
+            await client.run_unary(LLMRequest())
+    assert exc_info.value.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
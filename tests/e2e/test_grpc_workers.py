@@ -0,0 +1,107 @@
+"""
+多行程 gRPC server 測試：worker 共用端口、崩潰後重啟、SIGTERM 優雅關閉
+"""
+
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+from llmbrick.bricks.llm.base_llm import LLMBrick
+from llmbrick.core.channel_pool import ChannelPool
+from llmbrick.protocols.models.bricks.llm_types import LLMRequest
+
+PORT = 50261
+
+SERVER_SCRIPT = textwrap.dedent(f"""
+    import os
+
+    from llmbrick.bricks.llm.base_llm import LLMBrick
+    from llmbrick.core.brick import unary_handler
+    from llmbrick.protocols.models.bricks.llm_types import LLMResponse
+    from llmbrick.servers.grpc.config import GrpcServerConfig
+    from llmbrick.servers.grpc.server import GrpcServer
+
+
+    class PidBrick(LLMBrick):
+        @unary_handler
+        async def unary(self, request):
+            return LLMResponse(text=str(os.getpid()), is_final=True)
+
+
+    server = GrpcServer(
+        port={PORT},
+        workers=2,
+        config=GrpcServerConfig(host="127.0.0.1", grace_period=0.5),
+    )
+    server.register_service(PidBrick(default_prompt="", verbose=False))
+    server.run()
+    """)
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="workers require fork and SO_REUSEPORT"
+)
+
+
+async def _worker_pids(connections: int = 8) -> set:
+    """每個 client 使用獨立通道池，建立各自的 TCP 連線"""
+    pids = set()
+    for _ in range(connections):
+        async with LLMBrick.toGrpcClient(
+            f"127.0.0.1:{PORT}", default_prompt="", channel_pool=ChannelPool()
+        ) as client:
+            response = await client.run_unary(LLMRequest())
+            pids.add(int(response.text))
+    return pids
+
+
+async def _wait_for_pids(predicate, timeout: float = 15.0) -> set:
+    deadline = time.monotonic() + timeout
+    last_error = None
+    while time.monotonic() < deadline:
+        try:
+            pids = await _worker_pids()
+            if predicate(pids):
+                return pids
+        except Exception as e:  # worker 尚未就緒
+            last_error = e
+        await asyncio.sleep(0.3)
+    raise AssertionError(f"workers not ready: {last_error}")
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+@pytest.mark.asyncio
+async def test_workers_share_port_restart_and_drain() -> None:
+    parent = subprocess.Popen([sys.executable, "-c", SERVER_SCRIPT])
+    try:
+        pids = await _wait_for_pids(lambda p: len(p) == 2)
+        assert parent.pid not in pids
+
+        # 崩潰的 worker 會被重新啟動
+        crashed = pids.pop()
+        os.kill(crashed, signal.SIGKILL)
+        new_pids = await _wait_for_pids(lambda p: p and crashed not in p and p - pids)
+        assert crashed not in new_pids
+
+        # SIGTERM 轉送給所有 worker 並等待關閉
+        workers = pids | new_pids
+        parent.send_signal(signal.SIGTERM)
+        assert parent.wait(timeout=15) == 0
+        await asyncio.sleep(0.2)
+        assert not any(_alive(pid) for pid in workers)
+    finally:
+        if parent.poll() is None:
+            parent.kill()
+            parent.wait()
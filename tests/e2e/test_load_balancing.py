@@ -0,0 +1,127 @@
+"""
+Client 端負載平衡測試：多個 brick 副本間分配呼叫並剔除失效端點
+"""
+
+import asyncio
+from typing import AsyncIterator, List
+
+import grpc
+import pytest
+import pytest_asyncio
+
+from llmbrick.bricks.intention.base_intention import IntentionBrick
+from llmbrick.core.brick import unary_handler
+from llmbrick.core.channel_pool import ChannelPool
+from llmbrick.core.context import request_context
+from llmbrick.core.error_codes import ErrorCodes
+from llmbrick.protocols.models.bricks.common_types import ErrorDetail
+from llmbrick.protocols.models.bricks.intention_types import (
+    IntentionRequest,
+    IntentionResponse,
+    IntentionResult,
+)
+from llmbrick.servers.grpc.server import GrpcServer
+
+PORTS = [50211, 50212]
+DEAD_PORT = 50219
+
+
+def _make_brick(name: str) -> IntentionBrick:
+    class _ReplicaBrick(IntentionBrick):
+        @unary_handler
+        async def classify(self, request: IntentionRequest) -> IntentionResponse:
+            if request.text == "slow":
+                await asyncio.sleep(1.0)
+            return IntentionResponse(
+                results=[IntentionResult(intent_category=name, confidence=1.0)],
+                error=ErrorDetail(code=ErrorCodes.SUCCESS, message="Success"),
+            )
+
+    return _ReplicaBrick()
+
+
+@pytest_asyncio.fixture
+async def replicas() -> AsyncIterator[List[str]]:
+    servers = []
+    tasks = []
+    for i, port in enumerate(PORTS):
+        server = GrpcServer(port=port)
+        server.register_service(_make_brick(f"replica-{i}"))
+        servers.append(server)
+        tasks.append(asyncio.create_task(server.start()))
+    await asyncio.sleep(0.5)
+    yield [f"127.0.0.1:{port}" for port in PORTS]
+    for server in servers:
+        await server.stop()
+    for task in tasks:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+@pytest.mark.asyncio
+async def test_round_robin_across_replicas(replicas: List[str]) -> None:
+    async with IntentionBrick.toGrpcClient(
+        replicas, channel_pool=ChannelPool()
+    ) as client:
+        seen = []
+        for _ in range(4):
+            response = await client.run_unary(IntentionRequest(text="hi"))
+            seen.append(response.results[0].intent_category)
+    assert seen == ["replica-0", "replica-1", "replica-0", "replica-1"]
+
+
+@pytest.mark.asyncio
+async def test_dead_endpoint_is_ejected(replicas: List[str]) -> None:
+    addresses = [f"127.0.0.1:{DEAD_PORT}", replicas[0]]
+    async with IntentionBrick.toGrpcClient(
+        addresses,
+        channel_pool=ChannelPool(warmup=False),
+        lb_policy="round_robin",
+        failure_threshold=1,
+        ejection_seconds=60,
+    ) as client:
+        with pytest.raises(grpc.aio.AioRpcError):
+            await client.run_unary(IntentionRequest(text="first"))
+        for _ in range(3):
+            response = await client.run_unary(IntentionRequest(text="hi"))
+            assert response.results[0].intent_category == "replica-0"
+
+
+@pytest.mark.asyncio
+async def test_caller_deadline_does_not_eject_slow_endpoint(
+    replicas: List[str],
+) -> None:
+    async with IntentionBrick.toGrpcClient(
+        [replicas[0]],
+        channel_pool=ChannelPool(),
+        failure_threshold=1,
+        ejection_seconds=60,
+    ) as client:
+        with request_context(timeout=0.1):
+            with pytest.raises(grpc.aio.AioRpcError) as exc_info:
+                await client.run_unary(IntentionRequest(text="slow"))
+        assert exc_info.value.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+        endpoint = client._grpc_channel.balancer.endpoints[0]
+        assert endpoint.ejected_until == 0.0
+        assert endpoint.consecutive_failures == 0
+
+
+@pytest.mark.asyncio
+async def test_channel_timeout_counts_as_endpoint_failure(
+    replicas: List[str],
+) -> None:
+    async with IntentionBrick.toGrpcClient(
+        [replicas[0]],
+        channel_pool=ChannelPool(),
+        failure_threshold=1,
+        ejection_seconds=60,
+        timeout=0.1,
+    ) as client:
+        with pytest.raises(grpc.aio.AioRpcError) as exc_info:
+            await client.run_unary(IntentionRequest(text="slow"))
+        assert exc_info.value.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+        endpoint = client._grpc_channel.balancer.endpoints[0]
+        assert endpoint.ejected_until > 0.0
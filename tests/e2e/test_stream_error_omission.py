@@ -0,0 +1,60 @@
+"""
+串流 fast path 測試：omit_intermediate_error 開啟時，中間 chunk 不帶 error，
+最後一個 chunk 仍帶 SUCCESS
+"""
+
+import asyncio
+from typing import AsyncIterator
+
+import pytest
+
+from llmbrick.bricks.llm.base_llm import LLMBrick
+from llmbrick.core.brick import output_streaming_handler
+from llmbrick.core.error_codes import ErrorCodes
+from llmbrick.protocols.models.bricks.common_types import ErrorDetail
+from llmbrick.protocols.models.bricks.llm_types import LLMRequest, LLMResponse
+from llmbrick.servers.grpc.server import GrpcServer
+
+PORT = 50231
+
+
+class _TokenLLMBrick(LLMBrick):
+    @output_streaming_handler
+    async def stream(self, request: LLMRequest) -> AsyncIterator[LLMResponse]:
+        for i in range(3):
+            yield LLMResponse(
+                text=str(i),
+                is_final=(i == 2),
+                error=ErrorDetail(code=ErrorCodes.SUCCESS, message="Success"),
+            )
+
+
+async def _collect(omit: bool):
+    server = GrpcServer(port=PORT, omit_intermediate_error=omit)
+    server.register_service(_TokenLLMBrick(default_prompt=""))
+    server_task = asyncio.create_task(server.start())
+    await asyncio.sleep(0.5)
+    try:
+        async with LLMBrick.toGrpcClient(f"127.0.0.1:{PORT}") as client:
+            return [c async for c in client.run_output_streaming(LLMRequest())]
+    finally:
+        await server.stop()
+        server_task.cancel()
+        try:
+            await server_task
+        except asyncio.CancelledError:
+            pass
+
+
+@pytest.mark.asyncio
+async def test_intermediate_chunks_omit_error() -> None:
+    chunks = await _collect(omit=True)
+    assert [c.text for c in chunks] == ["0", "1", "2"]
+    assert chunks[0].error is None and chunks[1].error is None
+    assert chunks[2].error.code == ErrorCodes.SUCCESS
+
+
+@pytest.mark.asyncio
+async def test_chunks_carry_error_by_default() -> None:
+    chunks = await _collect(omit=False)
+    assert all(c.error.code == ErrorCodes.SUCCESS for c in chunks)
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from llmbrick.servers.grpc.wrappers.admission import (
+    AdmissionController,
+    AdmissionRejected,
+    ConcurrencyLimit,
+)
+from llmbrick.utils.metrics import MetricsRegistry
+
+
+def _controller(**kwargs):
+    registry = MetricsRegistry()
+    return AdmissionController(ConcurrencyLimit(**kwargs), "b", registry), registry
+
+
+@pytest.mark.asyncio
+async def test_rejects_immediately_without_queue():
+    controller, registry = _controller(max_concurrency=1)
+    await controller.acquire()
+    with pytest.raises(AdmissionRejected) as exc_info:
+        await controller.acquire()
+    assert exc_info.value.reason == "queue_full"
+    rejected = registry.get("llmbrick_grpc_admission_rejected_total")
+    assert rejected.get(brick="b", reason="queue_full") == 1
+    controller.release()
+    await controller.acquire()
+
+
+@pytest.mark.asyncio
+async def test_queue_is_fifo_and_hands_off_slot():
+    controller, registry = _controller(max_concurrency=1, max_queue=2)
+    order = []
+    await controller.acquire()
+
+    async def worker(name):
+        await controller.acquire()
+        order.append(name)
+        controller.release()
+
+    tasks = [asyncio.create_task(worker(n)) for n in ("a", "b")]
+    await asyncio.sleep(0)
+    depth = registry.get("llmbrick_grpc_admission_queue_depth")
+    assert controller.queue_depth == 2
+    assert depth.get(brick="b") == 2
+    with pytest.raises(AdmissionRejected):
+        await controller.acquire()
+
+    controller.release()
+    await asyncio.gather(*tasks)
+    assert order == ["a", "b"]
+    assert controller.active == 0
+    assert controller.queue_depth == 0
+    assert depth.get(brick="b") == 0
+    assert registry.get("llmbrick_grpc_admission_active").get(brick="b") == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout():
+    controller, registry = _controller(
+        max_concurrency=1, max_queue=1, queue_timeout=0.05
+    )
+    await controller.acquire()
+    with pytest.raises(AdmissionRejected) as exc_info:
+        await controller.acquire()
+    assert exc_info.value.reason == "timeout"
+    assert controller.queue_depth == 0
+    controller.release()
+    assert controller.active == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    controller, _ = _controller(max_concurrency=1, max_queue=1)
+    await controller.acquire()
+    task = asyncio.create_task(controller.acquire())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert controller.queue_depth == 0
+    controller.release()
+    assert controller.active == 0
+
+
+def test_invalid_limit():
+    with pytest.raises(ValueError):
+        ConcurrencyLimit(max_concurrency=0)
+    with pytest.raises(ValueError):
+        ConcurrencyLimit(max_concurrency=1, max_queue=-1)
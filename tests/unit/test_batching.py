@@ -0,0 +1,141 @@
+"""
+微批次 (@batch_handler / MicroBatcher) 的單元測試
+"""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from llmbrick.bricks.guard.base_guard import GuardBrick
+from llmbrick.bricks.intention.base_intention import IntentionBrick
+from llmbrick.core.batching import BatchPolicy, MicroBatcher
+from llmbrick.core.brick import batch_handler
+from llmbrick.protocols.models.bricks.guard_types import GuardRequest, GuardResponse
+from llmbrick.protocols.models.bricks.intention_types import (
+    IntentionRequest,
+    IntentionResponse,
+    IntentionResult,
+)
+from llmbrick.utils.metrics import MetricsRegistry, get_registry
+
+
+class _BatchIntentionBrick(IntentionBrick):
+    def __init__(self, **kwargs):
+        super().__init__(verbose=False, **kwargs)
+        self.batches: List[int] = []
+
+    @batch_handler(max_batch_size=4, max_wait_ms=20)
+    async def classify(
+        self, requests: List[IntentionRequest]
+    ) -> List[IntentionResponse]:
+        self.batches.append(len(requests))
+        return [
+            IntentionResponse(results=[IntentionResult(intent_category=r.text)])
+            for r in requests
+        ]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_batched() -> None:
+    brick = _BatchIntentionBrick()
+    responses = await asyncio.gather(
+        *(brick.run_unary(IntentionRequest(text=str(i))) for i in range(10))
+    )
+    assert [r.results[0].intent_category for r in responses] == [
+        str(i) for i in range(10)
+    ]
+    assert brick.batches == [4, 4, 2]
+    size = get_registry().get("llmbrick_batch_size")
+    assert size.get_count(brick="_BatchIntentionBrick") >= 3
+
+
+@pytest.mark.asyncio
+async def test_single_request_waits_at_most_max_wait() -> None:
+    brick = _BatchIntentionBrick()
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    response = await brick.run_unary(IntentionRequest(text="only"))
+    assert response.results[0].intent_category == "only"
+    assert loop.time() - start < 0.5
+    assert brick.batches == [1]
+
+
+@pytest.mark.asyncio
+async def test_sync_batch_handler_with_executor() -> None:
+    class _SyncGuard(GuardBrick):
+        @batch_handler(max_batch_size=8, max_wait_ms=10, executor="thread")
+        def check(self, requests: List[GuardRequest]) -> List[GuardResponse]:
+            return [GuardResponse() for _ in requests]
+
+    brick = _SyncGuard(verbose=False)
+    responses = await asyncio.gather(
+        *(brick.run_unary(GuardRequest(text="x")) for _ in range(3))
+    )
+    assert len(responses) == 3
+
+
+def test_executor_rejected_for_async_batch_handler() -> None:
+    with pytest.raises(TypeError):
+
+        class _Bad(IntentionBrick):
+            @batch_handler(executor="thread")
+            async def classify(self, requests):
+                return requests
+
+
+@pytest.mark.asyncio
+async def test_per_item_and_whole_batch_errors() -> None:
+    async def func(items):
+        if "all" in items:
+            raise RuntimeError("batch failed")
+        return [ValueError(i) if i == "bad" else i.upper() for i in items]
+
+    batcher = MicroBatcher(func, BatchPolicy(8, 10), registry=MetricsRegistry())
+    results = await asyncio.gather(
+        batcher.submit("ok"), batcher.submit("bad"), return_exceptions=True
+    )
+    assert results[0] == "OK"
+    assert isinstance(results[1], ValueError)
+
+    results = await asyncio.gather(
+        batcher.submit("all"), batcher.submit("ok"), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_wrong_result_length_fails_batch() -> None:
+    async def func(items):
+        return items[:-1]
+
+    batcher = MicroBatcher(func, BatchPolicy(8, 5), registry=MetricsRegistry())
+    with pytest.raises(RuntimeError):
+        await batcher.submit("a")
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_is_skipped() -> None:
+    seen = []
+
+    async def func(items):
+        seen.extend(items)
+        return items
+
+    registry = MetricsRegistry()
+    batcher = MicroBatcher(func, BatchPolicy(8, 20), registry=registry)
+    cancelled = asyncio.create_task(batcher.submit("cancelled"))
+    kept = asyncio.create_task(batcher.submit("kept"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    assert await kept == "kept"
+    assert seen == ["kept"]
+    wait = registry.get("llmbrick_batch_wait_seconds")
+    assert wait.get_count(brick="") == 1
+
+
+def test_invalid_policy() -> None:
+    with pytest.raises(ValueError):
+        BatchPolicy(max_batch_size=0)
+    with pytest.raises(ValueError):
+        BatchPolicy(max_wait_ms=-1)
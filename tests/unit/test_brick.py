@@ -31,9 +31,98 @@ async def test_run_unary_not_implemented():
     with pytest.raises(NotImplementedError):
         await b.run_unary(1)
 
+@pytest.mark.asyncio
+async def test_streaming_not_implemented_raises_on_iteration():
+    class NoStreaming(brick.BaseBrick):
+        pass
+    b = NoStreaming()
+    # 與 async generator 一致：呼叫時不拋出，第一次迭代才拋出
+    stream = b.run_output_streaming(1)
+    with pytest.raises(NotImplementedError, match="Server streaming"):
+        await stream.__anext__()
+
+    async def inputs():
+        yield 1
+    bidi = b.run_bidi_streaming(inputs())
+    with pytest.raises(NotImplementedError, match="Bidi streaming"):
+        async for _ in bidi:
+            pass
+
+
 @pytest.mark.asyncio
 async def test_run_get_service_info():
     b = MyBrick()
     info = await b.run_get_service_info()
     assert info["service_name"] == "MyBrick"
-    assert info["version"] == "test"
\ No newline at end of file
+    assert info["version"] == "test"
+
+
+def test_handler_table_is_computed_per_class():
+    assert MyBrick._brick_handler_table == (
+        ("my_info", "get_service_info"),
+        ("my_unary", "unary"),
+    )
+
+
+def test_handler_discovery_does_not_evaluate_properties():
+    calls = []
+
+    class PropertyBrick(MyBrick):
+        @property
+        def expensive(self):
+            calls.append(1)
+            return 1
+
+    PropertyBrick()
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_subclass_override_replaces_handler():
+    class Override(MyBrick):
+        @brick.unary_handler
+        async def my_unary(self, x):
+            return x * 10
+
+    assert await Override().run_unary(2) == 20
+
+
+def test_disallowed_handler_raises_on_init():
+    class Bad(brick.BaseBrick):
+        allowed_handler_types = {"unary"}
+
+        @brick.output_streaming_handler
+        async def stream(self, x):
+            yield x
+
+    with pytest.raises(RuntimeError):
+        Bad()
+
+
+@pytest.mark.asyncio
+async def test_non_verbose_binds_raw_handlers():
+    b = brick.BaseBrick(verbose=False)
+
+    async def stream(x):
+        for i in range(x):
+            yield i
+
+    assert b.output_streaming()(stream) is stream
+    gen = b.run_output_streaming(3)
+    # 快速路徑不應再包一層 async generator
+    assert gen.ag_code is stream.__code__
+    assert [v async for v in gen] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_verbose_stream_still_propagates_errors():
+    b = brick.BaseBrick(verbose=True)
+
+    @b.output_streaming()
+    async def stream(x):
+        yield x
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        async for _ in b.run_output_streaming(1):
+            pass
@@ -0,0 +1,142 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from llmbrick.core.brick import BaseBrick, unary_handler
+from llmbrick.core.executors import (
+    configure_executors,
+    get_executor,
+    register_executor,
+    shutdown_executors,
+)
+from llmbrick.utils.metrics import get_registry
+
+
+@pytest.fixture(autouse=True)
+def _reset_pools():
+    yield
+    shutdown_executors()
+    configure_executors()
+
+
+class ThreadBrick(BaseBrick):
+    @unary_handler(executor="thread")
+    def compute(self, x):
+        time.sleep(0.2)
+        return (x, threading.current_thread().name)
+
+
+class ProcessBrick(BaseBrick):
+    @unary_handler(executor="process")
+    def compute(self, x):
+        return (x * 2, os.getpid())
+
+
+class BrickLevelExecutor(BaseBrick):
+    handler_executor = "thread"
+
+    @unary_handler
+    def compute(self, x):
+        return threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_sync_handler_runs_in_thread_without_blocking_loop():
+    brick = ThreadBrick(verbose=False)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    value, thread_name = await brick.run_unary(1)
+    task.cancel()
+    assert value == 1
+    assert thread_name.startswith("llmbrick-handler")
+    # handler 執行期間 event loop 持續運作
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_sync_handler_runs_in_process_pool():
+    configure_executors(process_workers=1)
+    brick = ProcessBrick(verbose=True)
+    value, pid = await brick.run_unary(21)
+    assert value == 42
+    assert pid != os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_brick_level_executor():
+    brick = BrickLevelExecutor(verbose=False)
+    assert (await brick.run_unary(None)).startswith("llmbrick-handler")
+
+
+@pytest.mark.asyncio
+async def test_instance_decorator_with_executor():
+    brick = BaseBrick(verbose=False)
+
+    @brick.unary(executor="thread")
+    def handler(x):
+        return threading.current_thread().name
+
+    assert (await brick.run_unary(None)).startswith("llmbrick-handler")
+
+
+def test_executor_rejects_async_handler():
+    with pytest.raises(TypeError):
+
+        @unary_handler(executor="thread")
+        async def handler(self, x):
+            return x
+
+
+@pytest.mark.asyncio
+async def test_queue_metrics_and_custom_pool():
+    register_executor("tiny", ThreadPoolExecutor(max_workers=1), max_workers=1)
+
+    class TinyBrick(BaseBrick):
+        @unary_handler(executor="tiny")
+        def compute(self, x):
+            time.sleep(0.1)
+            return x
+
+    brick = TinyBrick(verbose=False)
+    pool = get_executor("tiny")
+    tasks = [asyncio.create_task(brick.run_unary(i)) for i in range(3)]
+    await asyncio.sleep(0.05)
+    assert pool.in_flight == 3
+    assert pool.queue_depth == 2
+    queue_gauge = get_registry().get("llmbrick_executor_queue_depth")
+    assert queue_gauge.get(pool="tiny") == 2
+
+    assert await asyncio.gather(*tasks) == [0, 1, 2]
+    assert pool.in_flight == 0
+    assert queue_gauge.get(pool="tiny") == 0
+    tasks_total = get_registry().get("llmbrick_executor_tasks_total")
+    assert tasks_total.get(pool="tiny") == 3
+
+
+@pytest.mark.asyncio
+async def test_unknown_executor():
+    class Unknown(BaseBrick):
+        @unary_handler(executor="missing")
+        def compute(self, x):
+            return x
+
+    with pytest.raises(KeyError):
+        await Unknown(verbose=False).run_unary(1)
+
+
+def test_register_executor_requires_worker_count():
+    with pytest.raises(ValueError):
+        register_executor("empty", ThreadPoolExecutor(max_workers=1), max_workers=0)
+    configure_executors(thread_workers=3)
+    assert get_executor("thread").max_workers == 3
@@ -0,0 +1,85 @@
+"""
+scripts/generate_dataclass.py 產生的模型測試：
+明確展開的 to_dict/from_dict/to_pb2/from_pb2_model 需與 asdict / MessageToDict 結果一致
+"""
+
+import sys
+from dataclasses import asdict
+
+import pytest
+from google.protobuf.json_format import MessageToDict
+
+from llmbrick.protocols.models.bricks.common_types import (
+    ErrorDetail,
+    ModelInfo,
+    ServiceInfoResponse,
+)
+from llmbrick.protocols.models.bricks.llm_types import Context, LLMRequest, LLMResponse
+from llmbrick.protocols.models.bricks.retrieval_types import (
+    Document,
+    RetrievalResponse,
+)
+from llmbrick.protocols.models.struct_utils import LazyStructView
+
+SAMPLES = [
+    LLMRequest(
+        temperature=0.5,
+        prompt="hi",
+        context=[Context(role="user", content="hello")],
+        max_tokens=16,
+    ),
+    LLMResponse(
+        text="ok", tokens=["o", "k"], is_final=True, error=ErrorDetail(200, "Success")
+    ),
+    RetrievalResponse(
+        documents=[Document(doc_id="1", score=0.5, metadata={"tags": ["a"], "n": 1.0})],
+        error=ErrorDetail(code=200, message="Success"),
+    ),
+    ServiceInfoResponse(
+        service_name="svc",
+        version="1.0",
+        models=[ModelInfo(model_id="m", version="1", supported_languages=["en"])],
+        error=ErrorDetail(code=200, message="Success"),
+    ),
+]
+
+
+@pytest.mark.parametrize("model", SAMPLES, ids=lambda m: type(m).__name__)
+def test_to_dict_matches_asdict(model) -> None:
+    assert model.to_dict() == asdict(model)
+
+
+@pytest.mark.parametrize("model", SAMPLES, ids=lambda m: type(m).__name__)
+def test_round_trips(model) -> None:
+    cls = type(model)
+    assert cls.from_dict(model.to_dict()) == model
+    assert cls.from_pb2_model(model.to_pb2()) == model
+
+
+def test_to_dict_is_shallow_copy() -> None:
+    response = LLMResponse(tokens=["a"])
+    data = response.to_dict()
+    data["tokens"].append("b")
+    assert response.tokens == ["a"]
+
+
+def test_to_pb2_matches_message_to_dict() -> None:
+    pb = LLMRequest(context=[Context(role="user", content="hello")]).to_pb2()
+    assert MessageToDict(pb, preserving_proto_field_name=True)["context"] == [
+        {"role": "user", "content": "hello"}
+    ]
+    # float32 欄位會損失精度，與原本的 from_pb2_model 行為相同
+    assert LLMRequest.from_pb2_model(pb).temperature == pytest.approx(0.7)
+
+
+def test_lazy_struct_fields() -> None:
+    pb = SAMPLES[2].to_pb2()
+    response = RetrievalResponse.from_pb2_model(pb, lazy=True)
+    metadata = response.documents[0].metadata
+    assert isinstance(metadata, LazyStructView)
+    assert metadata["tags"] == ["a"]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="slots 需要 Python 3.10+")
+def test_models_use_slots() -> None:
+    assert not hasattr(LLMResponse(), "__dict__")
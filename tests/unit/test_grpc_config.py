@@ -0,0 +1,87 @@
+from pathlib import Path
+
+import grpc
+import pytest
+from pydantic import ValidationError
+
+from llmbrick.core.brick import BaseBrick
+from llmbrick.servers.grpc.config import GrpcClientConfig, GrpcServerConfig
+
+CONFIG_DIR = Path(__file__).resolve().parents[2] / "config"
+
+
+def test_server_defaults_to_options():
+    options = dict(GrpcServerConfig().to_options())
+    assert options["grpc.max_receive_message_length"] == 32 * 1024 * 1024
+    # 未設定時不覆寫 grpc 的預設值
+    assert "grpc.so_reuseport" not in options
+    assert (
+        dict(GrpcServerConfig(so_reuseport=False).to_options())["grpc.so_reuseport"]
+        == 0
+    )
+    # server 允許的 ping 間隔需小於 client 的 keepalive 間隔
+    assert (
+        options["grpc.http2.min_ping_interval_without_data_ms"]
+        < GrpcClientConfig().keepalive_time_ms
+    )
+    assert "grpc.default_compression_algorithm" not in options
+
+
+def test_optional_options_and_extra_override():
+    config = GrpcClientConfig(
+        compression="gzip",
+        http2_lookahead_bytes=1 << 20,
+        http2_bdp_probe=False,
+        extra_options=[("grpc.keepalive_time_ms", 5000)],
+    )
+    options = config.to_options()
+    as_dict = dict(options)
+    assert as_dict["grpc.default_compression_algorithm"] == int(grpc.Compression.Gzip)
+    assert as_dict["grpc.http2.lookahead_bytes"] == 1 << 20
+    assert as_dict["grpc.http2.bdp_probe"] == 0
+    # extra_options 在最後，覆寫同名參數
+    assert as_dict["grpc.keepalive_time_ms"] == 5000
+
+
+def test_invalid_values_rejected():
+    with pytest.raises(ValidationError):
+        GrpcClientConfig(compression="brotli")
+    # BDP 探測開啟時 grpc 忽略 lookahead_bytes，不允許無效的組合
+    with pytest.raises(ValidationError, match="http2_bdp_probe"):
+        GrpcClientConfig(http2_lookahead_bytes=1 << 20)
+    with pytest.raises(ValidationError):
+        GrpcServerConfig(unknown_option=1)
+
+
+def test_from_yaml(tmp_path):
+    path = tmp_path / "grpc.yaml"
+    path.write_text(
+        "grpc_server:\n  port: 6000\n  compression: gzip\n"
+        "grpc_client:\n  keepalive_time_ms: 1000\n",
+        encoding="utf-8",
+    )
+    assert GrpcServerConfig.from_yaml(path).port == 6000
+    assert GrpcClientConfig.from_yaml(path).keepalive_time_ms == 1000
+
+    empty = tmp_path / "empty.yaml"
+    empty.write_text("", encoding="utf-8")
+    assert GrpcServerConfig.from_yaml(empty) == GrpcServerConfig()
+
+
+@pytest.mark.parametrize("name", ["development", "docker", "production"])
+def test_repo_config_files_load(name):
+    path = CONFIG_DIR / f"{name}.yaml"
+    GrpcServerConfig.from_yaml(path).to_options()
+    GrpcClientConfig.from_yaml(path).to_options()
+
+
+def test_client_config_merged_into_channel_options():
+    kwargs = {
+        "grpc_config": GrpcClientConfig(compression="gzip"),
+        "channel_options": [("grpc.primary_user_agent", "test")],
+        "verbose": False,
+    }
+    channel = BaseBrick._build_grpc_channel("127.0.0.1:1", kwargs)
+    assert kwargs == {"verbose": False}
+    assert channel.options[-1] == ("grpc.primary_user_agent", "test")
+    assert ("grpc.default_compression_algorithm", 2) in channel.options
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from llmbrick.core.load_balancer import (
+    LoadBalancer,
+    PowerOfTwoChoicesPolicy,
+    create_policy,
+)
+
+
+def test_round_robin_cycles_endpoints():
+    lb = LoadBalancer(["a:1", "b:1", "c:1"])
+    picked = [lb.pick().address for _ in range(6)]
+    assert picked == ["a:1", "b:1", "c:1", "a:1", "b:1", "c:1"]
+
+
+def test_least_outstanding_prefers_idle_endpoint():
+    lb = LoadBalancer(["a:1", "b:1"], policy="least_outstanding")
+    lb.endpoints[0].outstanding = 5
+    assert lb.pick().address == "b:1"
+
+
+def test_power_of_two_picks_less_loaded_of_pair():
+    lb = LoadBalancer(["a:1", "b:1"], policy=PowerOfTwoChoicesPolicy(random.Random(0)))
+    lb.endpoints[1].outstanding = 3
+    assert all(lb.pick().address == "a:1" for _ in range(10))
+
+
+def test_endpoint_ejected_after_repeated_failures():
+    lb = LoadBalancer(["a:1", "b:1"], failure_threshold=2, ejection_seconds=60)
+    bad = lb.endpoints[0]
+    lb.record_failure(bad)
+    assert bad.is_available(0.0)
+    lb.record_failure(bad)
+    assert all(lb.pick().address == "b:1" for _ in range(4))
+
+
+def test_all_ejected_falls_back_to_every_endpoint():
+    lb = LoadBalancer(["a:1"], failure_threshold=1, ejection_seconds=60)
+    lb.record_failure(lb.endpoints[0])
+    assert lb.pick().address == "a:1"
+
+
+def test_update_keeps_endpoint_state():
+    lb = LoadBalancer(["a:1"])
+    lb.endpoints[0].outstanding = 2
+    lb.update(["a:1", "b:1"])
+    assert lb.endpoints[0].outstanding == 2
+    assert len(lb.endpoints) == 2
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        create_policy("random")
@@ -26,4 +26,138 @@ def test_log_function_exception(monkeypatch):
     def fail(): raise ValueError("fail")
     with pytest.raises(ValueError):
         fail()
-    assert any("exception" in m for m in logs)
\ No newline at end of file
+    assert any("exception" in m for m in logs)
+
+
+class _CountingRepr:
+    def __init__(self):
+        self.calls = 0
+
+    def __repr__(self):
+        self.calls += 1
+        return "counted"
+
+
+def test_log_function_truncates_large_payloads(monkeypatch):
+    logs = []
+
+    class DummyLogger:
+        def info(self, msg): logs.append(msg)
+        def error(self, msg, exc_info=None): logs.append(msg)
+    monkeypatch.setattr(logmod, "logger", DummyLogger())
+
+    @logmod.log_function(service_name="svc")
+    def echo_all(x): return x
+
+    # 預設不截斷，與既有行為相同
+    echo_all("x" * 10000)
+    assert any("x" * 10000 in m for m in logs)
+    logs.clear()
+
+    @logmod.log_function(service_name="svc", max_repr_length=100)
+    def echo(x): return x
+
+    echo("x" * 10000)
+    assert logs
+    assert all(len(m) < 400 for m in logs)
+    assert any("truncated" in m for m in logs)
+
+
+def test_log_function_sampling_skips_formatting(monkeypatch):
+    logs = []
+
+    class DummyLogger:
+        def info(self, msg): logs.append(msg)
+        def error(self, msg, exc_info=None): logs.append(msg)
+    monkeypatch.setattr(logmod, "logger", DummyLogger())
+
+    @logmod.log_function(sample_rate=0.0)
+    def echo(x): return x
+
+    payload = _CountingRepr()
+    assert echo(payload) is payload
+    assert logs == []
+    assert payload.calls == 0
+
+
+def test_log_function_skips_formatting_when_level_disabled():
+    payload = _CountingRepr()
+
+    @logmod.log_function(level="trace")
+    def echo(x): return x
+
+    # 預設 logger 等級為 INFO，TRACE 不應觸發任何 repr
+    assert echo(payload) is payload
+    assert payload.calls == 0
+
+
+def test_log_function_rejects_invalid_sample_rate():
+    with pytest.raises(ValueError):
+        logmod.log_function(sample_rate=1.5)
+
+
+def test_queued_sink_writes_in_background():
+    written = []
+    sink = logmod.QueuedLogSink(written.append, batch_size=10)
+    for i in range(25):
+        sink(f"line {i}\n")
+    assert sink.flush(timeout=2)
+    assert "".join(written).count("line") == 25
+    sink.close()
+
+
+def test_queued_sink_drop_policy_counts_dropped():
+    import threading
+
+    gate = threading.Event()
+
+    def slow_target(text):
+        gate.wait(2)
+
+    sink = logmod.QueuedLogSink(slow_target, max_queue_size=2, policy="drop")
+    for i in range(20):
+        sink(f"line {i}\n")
+    assert sink.dropped > 0
+    gate.set()
+    sink.close()
+
+
+def test_queued_sink_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        logmod.QueuedLogSink(lambda _: None, policy="wait")
+
+
+def test_enable_queued_logging_routes_logger_output():
+    written = []
+    logmod.enable_queued_logging(written.append, replace_handlers=False)
+    try:
+        logmod.logger.info("queued hello")
+        assert logmod.flush_logs(timeout=2)
+        assert any("queued hello" in w for w in written)
+    finally:
+        logmod.shutdown_queued_logging()
+    assert logmod.flush_logs() is True
+
+
+def test_level_check_falls_back_when_loguru_internals_missing():
+    logs = []
+
+    class LoguruLike:
+        # 有 _core 但沒有 min_level (例如 loguru 改版)
+        _core = object()
+
+        def level(self, name):
+            return type("Level", (), {"no": 5})()
+
+        def trace(self, msg):
+            logs.append(msg)
+
+        def error(self, msg, exc_info=None):
+            logs.append(msg)
+
+    @logmod.log_function(logger_instance=LoguruLike(), level="trace")
+    def echo(x):
+        return x
+
+    assert echo(1) == 1
+    assert len(logs) == 2
@@ -0,0 +1,86 @@
+"""
+取樣式記憶體分析器測試
+"""
+
+import tracemalloc
+from typing import Iterator
+
+import pytest
+
+from llmbrick.core.brick import BaseBrick, unary_handler
+from llmbrick.utils.memory_profiler import (
+    MemoryProfiler,
+    acquire_tracing,
+    get_memory_profiler,
+    release_tracing,
+)
+
+
+class _AllocBrick(BaseBrick[int, int]):
+    @unary_handler
+    async def alloc(self, n: int) -> int:
+        self.buffer = [bytearray(1024) for _ in range(n)]
+        return len(self.buffer)
+
+
+@pytest.fixture
+def profiler() -> Iterator[MemoryProfiler]:
+    profiler = get_memory_profiler()
+    profiler.reset()
+    yield profiler
+    profiler.stop()
+    profiler.reset()
+
+
+def test_tracing_is_reference_counted() -> None:
+    acquire_tracing()
+    acquire_tracing()
+    release_tracing()
+    assert tracemalloc.is_tracing()
+    release_tracing()
+    assert not tracemalloc.is_tracing()
+
+
+@pytest.mark.asyncio
+async def test_brick_calls_are_attributed(profiler: MemoryProfiler) -> None:
+    brick = _AllocBrick()
+    profiler.start(window_seconds=60, sample_rate=1.0)
+    assert await brick.run_unary(100) == 100
+    profiler.stop()
+    assert not tracemalloc.is_tracing()
+
+    stats = {(s.brick, s.handler): s for s in profiler.stats()}
+    alloc = stats[("_AllocBrick", "unary")]
+    assert alloc.samples == 1
+    assert alloc.allocated >= 100 * 1024
+
+    sites = profiler.report("_AllocBrick")["_AllocBrick"]
+    assert sites[0].filename == __file__
+    assert sites[0].size >= 100 * 1024
+    assert "_AllocBrick" in profiler.format_report()
+
+
+@pytest.mark.asyncio
+async def test_low_overhead_mode_skips_snapshots(profiler: MemoryProfiler) -> None:
+    brick = _AllocBrick()
+    profiler.start(sample_rate=1.0, low_overhead=True)
+    await brick.run_unary(10)
+
+    assert profiler.stats()[0].samples == 1
+    assert profiler.report() == {}
+
+
+@pytest.mark.asyncio
+async def test_window_expiry_stops_tracing(profiler: MemoryProfiler) -> None:
+    brick = _AllocBrick()
+    profiler.start(window_seconds=0)
+    await brick.run_unary(10)
+
+    assert not profiler.active
+    assert not tracemalloc.is_tracing()
+    assert profiler.stats() == []
+
+
+def test_invalid_sample_rate(profiler: MemoryProfiler) -> None:
+    with pytest.raises(ValueError):
+        profiler.start(sample_rate=0)
@@ -1,9 +1,18 @@
+import asyncio
 import logging
+import tracemalloc
 
 import pytest
 from llmbrick.utils.logging import enable_standard_logging_bridge
 
-from llmbrick.utils.metrics import measure_memory, measure_peak_memory, measure_time
+from llmbrick.utils.metrics import (
+    MetricsRegistry,
+    get_registry,
+    measure_memory,
+    measure_peak_memory,
+    measure_time,
+    start_metrics_server,
+)
 
 # 設定 logging 輸出到 console
 logging.basicConfig(level=logging.INFO)
@@ -84,3 +93,96 @@ async def test_measure_peak_memory_async(caplog):
         result = await foo(9)
     assert result == 7
     assert any("peak memory usage" in r.message for r in caplog.records)
+
+
+@pytest.mark.asyncio
+async def test_measure_peak_memory_concurrent_calls_keep_tracing():
+    @measure_peak_memory(log=False)
+    async def foo(delay):
+        a = [0] * 10000  # noqa: F841 占用一點記憶體
+        await asyncio.sleep(delay)
+        # 另一個呼叫先結束時不可停止本呼叫的追蹤
+        assert tracemalloc.is_tracing()
+        return delay
+
+    assert await asyncio.gather(foo(0.01), foo(0.05)) == [0.01, 0.05]
+    assert not tracemalloc.is_tracing()
+
+
+def test_measure_peak_memory_keeps_external_tracing():
+    @measure_peak_memory(log=False)
+    def foo():
+        return [0] * 1000
+
+    tracemalloc.start()
+    try:
+        foo()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    registry.counter("req_total", "Requests", ("brick",)).inc(brick="A")
+    registry.gauge("in_flight", "In flight").set(3)
+    hist = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    hist.observe(0.05)
+    hist.observe(0.5)
+    hist.observe(5)
+
+    text = registry.render()
+    assert "# TYPE req_total counter" in text
+    assert 'req_total{brick="A"} 1' in text
+    assert "in_flight 3" in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "latency_seconds_count 3" in text
+
+
+def test_registry_rejects_mismatched_metrics():
+    registry = MetricsRegistry()
+    registry.counter("dup", "dup")
+    with pytest.raises(ValueError):
+        registry.gauge("dup", "dup")
+    counter = registry.counter("labelled", "labelled", ("a",))
+    with pytest.raises(ValueError):
+        counter.inc(b="x")
+    with pytest.raises(ValueError):
+        counter.inc(-1, a="x")
+
+
+@pytest.mark.asyncio
+async def test_measure_time_feeds_histogram_with_brick_labels():
+    class FakeBrick:
+        brick_name = "FakeBrick"
+
+        @measure_time(call_type="unary", log=False)
+        async def handle(self, x):
+            return x
+
+    assert await FakeBrick().handle(1) == 1
+    hist = get_registry().get("llmbrick_call_duration_seconds")
+    assert hist.get_count(brick="FakeBrick", call_type="unary") == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_sidecar_serves_registry():
+    import asyncio
+
+    registry = MetricsRegistry()
+    registry.counter("sidecar_total", "sidecar").inc(2)
+    server = await start_metrics_server(0, host="127.0.0.1", registry=registry)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: x\r\n\r\n")
+        await writer.drain()
+        response = (await reader.read()).decode()
+        writer.close()
+    finally:
+        server.close()
+        await server.wait_closed()
+    assert response.startswith("HTTP/1.1 200 OK")
+    assert "sidecar_total 2" in response
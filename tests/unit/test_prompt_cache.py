@@ -0,0 +1,213 @@
+"""
+LLMBrick prompt 快取的單元測試
+"""
+
+import pickle
+import threading
+import time
+from typing import AsyncIterator
+
+import pytest
+
+from llmbrick.bricks.llm.base_llm import LLMBrick
+from llmbrick.bricks.llm.prompt_cache import (
+    HashedNgramEmbedder,
+    InMemoryVectorIndex,
+    PromptCache,
+    VectorIndex,
+    normalize_text,
+)
+from llmbrick.core.brick import output_streaming_handler, unary_handler
+from llmbrick.core.error_codes import ErrorCodes
+from llmbrick.protocols.models.bricks.common_types import ErrorDetail
+from llmbrick.protocols.models.bricks.llm_types import Context, LLMRequest, LLMResponse
+from llmbrick.utils.metrics import MetricsRegistry
+
+
+class _CountingLLMBrick(LLMBrick):
+    def __init__(self, **kwargs):
+        super().__init__(default_prompt="", verbose=False, **kwargs)
+        self.calls = 0
+
+    @unary_handler
+    async def unary(self, request: LLMRequest) -> LLMResponse:
+        self.calls += 1
+        if request.prompt == "fail":
+            return LLMResponse(
+                is_final=True,
+                error=ErrorDetail(code=ErrorCodes.INTERNAL_ERROR, message="boom"),
+            )
+        return LLMResponse(text=f"answer {self.calls}", is_final=True)
+
+    @output_streaming_handler
+    async def stream(self, request: LLMRequest) -> AsyncIterator[LLMResponse]:
+        self.calls += 1
+        for word in ("hello ", "cached ", "world"):
+            yield LLMResponse(text=word, is_final=False)
+        yield LLMResponse(text="", is_final=True)
+
+
+def _request(prompt: str, temperature: float = 0.0, **kwargs) -> LLMRequest:
+    return LLMRequest(prompt=prompt, temperature=temperature, **kwargs)
+
+
+def test_normalize_text() -> None:
+    assert normalize_text("  Hello\n  World ") == "hello world"
+
+
+def test_exact_match_ignores_whitespace_case_and_context_order() -> None:
+    cache = PromptCache(registry=MetricsRegistry())
+    a = _request(
+        "What is  LLMBrick?",
+        context=[
+            Context(role="user", content="A"),
+            Context(role="system", content="B"),
+        ],
+    )
+    b = _request(
+        "what is llmbrick? ",
+        context=[
+            Context(role="system", content="b"),
+            Context(role="user", content="a"),
+        ],
+        request_id="other",
+    )
+    cache.store(a, "answer")
+    assert cache.lookup(b) == "answer"
+    assert cache.lookup(_request("What is LLMBrick?", max_tokens=10)) is None
+    assert cache.lookup(_request("What is LLMBrick?", model_id="gpt-4")) is None
+
+
+def test_temperature_threshold() -> None:
+    cache = PromptCache(max_temperature=0.3, registry=MetricsRegistry())
+    cache.store(_request("q", temperature=0.9), "hot")
+    assert cache.lookup(_request("q", temperature=0.9)) is None
+    cache.store(_request("q", temperature=0.2), "cold")
+    assert cache.lookup(_request("q", temperature=0.2)) == "cold"
+
+
+def test_similarity_match() -> None:
+    registry = MetricsRegistry()
+    cache = PromptCache(similarity_threshold=0.8, registry=registry, name="b")
+    cache.store(_request("How do I reset my password?"), "Use the reset link.")
+    assert cache.lookup(_request("How do I reset my pasword")) == "Use the reset link."
+    assert cache.lookup(_request("What is the weather in Taipei?")) is None
+    # 參數不同時不做相似比對
+    assert cache.lookup(_request("How do I reset my pasword", max_tokens=5)) is None
+    hits = registry.get("llmbrick_prompt_cache_hits_total")
+    assert hits.get(brick="b", match="similar") == 1
+    assert registry.get("llmbrick_prompt_cache_misses_total").get(brick="b") == 2
+
+
+def test_incomplete_vector_index_fails_on_construction() -> None:
+    class AddOnly(VectorIndex):
+        def add(self, key, vector):
+            pass
+
+    with pytest.raises(TypeError):
+        AddOnly()
+
+
+def test_similarity_disabled_by_default() -> None:
+    cache = PromptCache(registry=MetricsRegistry())
+    cache.store(_request("How do I reset my password?"), "answer")
+    assert cache.lookup(_request("How do I reset my pasword")) is None
+
+
+def test_hashed_embedder_and_index() -> None:
+    embed = HashedNgramEmbedder(dim=64)
+    vector = embed("hello")
+    assert len(vector) == 64
+    assert abs(sum(v * v for v in vector) - 1.0) < 1e-9
+    index = InMemoryVectorIndex(max_entries=2)
+    index.add("a", embed("hello"))
+    index.add("b", embed("goodbye"))
+    index.add("c", embed("something else"))
+    assert len(index) == 2
+    key, score = index.search(embed("goodbye"))
+    assert key == "b" and score > 0.99
+
+
+@pytest.mark.asyncio
+async def test_unary_hit_skips_handler() -> None:
+    brick = _CountingLLMBrick()
+    brick.enable_prompt_cache(registry=MetricsRegistry())
+    first = await brick.run_unary(_request("Hi"))
+    second = await brick.run_unary(_request(" hi "))
+    assert brick.calls == 1
+    assert second.text == first.text
+    assert second.is_final
+
+
+@pytest.mark.asyncio
+async def test_unary_errors_and_hot_requests_not_cached() -> None:
+    brick = _CountingLLMBrick()
+    brick.enable_prompt_cache(registry=MetricsRegistry())
+    await brick.run_unary(_request("fail"))
+    await brick.run_unary(_request("fail"))
+    await brick.run_unary(_request("Hi", temperature=0.7))
+    await brick.run_unary(_request("Hi", temperature=0.7))
+    assert brick.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_streaming_populates_and_replays() -> None:
+    brick = _CountingLLMBrick()
+    brick.enable_prompt_cache(
+        replay_chunk_size=4, replay_rate=100, registry=MetricsRegistry()
+    )
+    first = [c async for c in brick.run_output_streaming(_request("Hi"))]
+    assert "".join(c.text for c in first) == "hello cached world"
+
+    start = time.perf_counter()
+    replayed = [c async for c in brick.run_output_streaming(_request("hi"))]
+    elapsed = time.perf_counter() - start
+    assert brick.calls == 1
+    assert "".join(c.text for c in replayed) == "hello cached world"
+    assert [c.text for c in replayed[:2]] == ["hell", "o ca"]
+    assert replayed[-1].is_final
+    # 18 字元 / 4 = 5 個 chunk，間隔 10ms
+    assert elapsed >= 0.035
+
+    # 串流寫入的回答也可以由 unary 取得
+    response = await brick.run_unary(_request("HI"))
+    assert response.text == "hello cached world"
+    assert brick.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_abandoned_stream_not_cached() -> None:
+    brick = _CountingLLMBrick()
+    brick.enable_prompt_cache(registry=MetricsRegistry())
+    stream = brick.run_output_streaming(_request("Hi"))
+    await stream.__anext__()
+    await stream.aclose()
+    [c async for c in brick.run_output_streaming(_request("Hi"))]
+    assert brick.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_similarity_lookup_runs_off_event_loop() -> None:
+    threads = set()
+
+    def embedder(text: str):
+        threads.add(threading.get_ident())
+        return HashedNgramEmbedder()(text)
+
+    brick = _CountingLLMBrick()
+    brick.enable_prompt_cache(
+        similarity_threshold=0.8, embedder=embedder, registry=MetricsRegistry()
+    )
+    await brick.run_unary(_request("What is the capital of France?"))
+    response = await brick.run_unary(_request("what is the capital of france"))
+    assert brick.calls == 1
+    assert response.text == "answer 1"
+    assert threads and threading.get_ident() not in threads
+
+
+def test_brick_with_prompt_cache_is_picklable() -> None:
+    brick = _CountingLLMBrick()
+    brick.enable_prompt_cache(similarity_threshold=0.9, registry=MetricsRegistry())
+    clone = pickle.loads(pickle.dumps(brick))
+    assert clone.prompt_cache is None
+    assert brick.prompt_cache is not None
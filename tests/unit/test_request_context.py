@@ -0,0 +1,84 @@
+"""
+RequestContext 與 deadline 工具的單元測試
+"""
+
+import asyncio
+from typing import AsyncIterator
+
+import pytest
+
+from llmbrick.core.context import (
+    DeadlineExceeded,
+    get_request_context,
+    iterate_with_deadline,
+    request_context,
+    time_remaining,
+)
+
+
+def test_no_context() -> None:
+    assert get_request_context() is None
+    assert time_remaining() is None
+    assert time_remaining(5.0) == 5.0
+
+
+def test_request_context_sets_and_resets() -> None:
+    with request_context(timeout=10, request_id="r1") as ctx:
+        assert get_request_context() is ctx
+        assert ctx.request_id == "r1"
+        remaining = time_remaining()
+        assert remaining is not None and 9.0 < remaining <= 10.0
+        assert time_remaining(1.0) == 1.0
+    assert get_request_context() is None
+
+
+def test_nested_context_only_shortens_deadline() -> None:
+    with request_context(timeout=1, request_id="outer") as outer:
+        with request_context(timeout=100) as inner:
+            assert inner.deadline == outer.deadline
+            assert inner.request_id == "outer"
+        with request_context(timeout=0.5) as inner:
+            assert inner.deadline < outer.deadline
+        with request_context() as inner:
+            assert inner.deadline == outer.deadline
+
+
+def test_context_without_timeout() -> None:
+    with request_context() as ctx:
+        assert ctx.deadline is None
+        assert ctx.time_remaining() is None
+        assert not ctx.expired
+
+
+@pytest.mark.asyncio
+async def test_iterate_with_deadline_closes_stream() -> None:
+    closed = asyncio.Event()
+
+    async def slow() -> AsyncIterator[int]:
+        try:
+            yield 1
+            await asyncio.sleep(5)
+            yield 2
+        finally:
+            closed.set()
+
+    items = []
+    with request_context(timeout=0.2):
+        with pytest.raises(DeadlineExceeded):
+            async for item in iterate_with_deadline(slow()):
+                items.append(item)
+    assert items == [1]
+    assert closed.is_set()
+
+
+@pytest.mark.asyncio
+async def test_iterate_with_deadline_keeps_handler_timeout_error() -> None:
+    async def failing() -> AsyncIterator[int]:
+        raise asyncio.TimeoutError("upstream")
+        yield 0  # pragma: no cover
+
+    with request_context(timeout=5):
+        with pytest.raises(asyncio.TimeoutError) as exc_info:
+            async for _ in iterate_with_deadline(failing()):
+                pass
+    assert not isinstance(exc_info.value, DeadlineExceeded)
@@ -0,0 +1,194 @@
+"""
+unary 回應快取的單元測試
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from llmbrick.bricks.retrieval.base_retrieval import RetrievalBrick
+from llmbrick.core.brick import unary_handler
+from llmbrick.core.cache import (
+    MISSING,
+    CacheBackend,
+    DiskBackend,
+    MemoryBackend,
+    ResponseCache,
+    request_fingerprint,
+)
+from llmbrick.core.error_codes import ErrorCodes
+from llmbrick.protocols.models.bricks.common_types import ErrorDetail
+from llmbrick.protocols.models.bricks.retrieval_types import (
+    Document,
+    RetrievalRequest,
+    RetrievalResponse,
+)
+from llmbrick.utils.metrics import MetricsRegistry, get_registry
+
+
+class _CountingRetrievalBrick(RetrievalBrick):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = 0
+
+    @unary_handler
+    async def search(self, request: RetrievalRequest) -> RetrievalResponse:
+        self.calls += 1
+        if request.query == "fail":
+            return RetrievalResponse(
+                error=ErrorDetail(code=ErrorCodes.INTERNAL_ERROR, message="boom")
+            )
+        return RetrievalResponse(
+            documents=[Document(doc_id="1", title=request.query)],
+            error=ErrorDetail(code=ErrorCodes.SUCCESS, message="Success"),
+        )
+
+
+def test_fingerprint_ignores_request_and_session_id() -> None:
+    a = RetrievalRequest(query="q", max_results=3, request_id="r1", session_id="s1")
+    b = RetrievalRequest(query="q", max_results=3, request_id="r2", session_id="s2")
+    c = RetrievalRequest(query="q", max_results=4)
+    assert request_fingerprint(a) == request_fingerprint(b)
+    assert request_fingerprint(a) != request_fingerprint(c)
+
+
+def test_fingerprint_dict_order() -> None:
+    assert request_fingerprint({"a": 1, "b": 2}) == request_fingerprint(
+        {"b": 2, "a": 1}
+    )
+
+
+def test_memory_backend_lru_and_ttl() -> None:
+    backend = MemoryBackend(max_entries=2, ttl=None)
+    backend.set("a", b"1")
+    backend.set("b", b"2")
+    assert backend.get("a") == b"1"
+    backend.set("c", b"3")
+    # b 最久未使用，被淘汰
+    assert backend.get("b") is None
+    assert backend.get("a") == b"1"
+
+    expiring = MemoryBackend(ttl=0.05)
+    expiring.set("a", b"1")
+    assert expiring.get("a") == b"1"
+    time.sleep(0.06)
+    assert expiring.get("a") is None
+
+
+def test_incomplete_backend_fails_on_construction() -> None:
+    class GetOnly(CacheBackend):
+        def get(self, key: str):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnly()
+
+
+def test_disk_backend_stores_raw_authenticated_bytes(tmp_path) -> None:
+    backend = DiskBackend(tmp_path, ttl=None)
+    backend.set("k", b"raw-value")
+    path = backend._path("k")
+    data = path.read_bytes()
+    # 固定標頭 + HMAC + 原始 bytes，不經過 pickle
+    assert data.endswith(b"raw-value")
+    assert len(data) == 8 + 32 + len(b"raw-value")
+    assert backend.get("k") == b"raw-value"
+    assert oct((tmp_path / ".key").stat().st_mode & 0o777) == "0o600"
+    # 同目錄的新實例共用金鑰
+    assert DiskBackend(tmp_path).get("k") == b"raw-value"
+
+    # 被竄改的檔案視為未命中並刪除
+    path.write_bytes(data[:-1] + b"X")
+    assert backend.get("k") is None
+    assert not path.exists()
+
+    # 其他金鑰寫入或過短的檔案同樣視為未命中
+    DiskBackend(tmp_path, secret=b"other").set("k", b"raw-value")
+    assert backend.get("k") is None
+    path.write_bytes(b"\x00" * 4)
+    assert backend.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_backfills_memory(tmp_path) -> None:
+    registry = MetricsRegistry()
+    memory = MemoryBackend()
+    cache = ResponseCache([memory, DiskBackend(tmp_path)], name="b", registry=registry)
+    assert await cache.get("k") is MISSING
+    await cache.set("k", {"v": 1})
+    memory.clear()
+    assert await cache.get("k") == {"v": 1}
+    assert len(memory) == 1
+    assert await cache.get("k") == {"v": 1}
+    hits = registry.get("llmbrick_response_cache_hits_total")
+    assert hits.get(brick="b", tier="disk") == 1
+    assert hits.get(brick="b", tier="memory") == 1
+    assert registry.get("llmbrick_response_cache_misses_total").get(brick="b") == 1
+
+    # 磁碟層跨 ResponseCache 實例 (例如行程重啟) 保留
+    other = ResponseCache([DiskBackend(tmp_path)], registry=registry)
+    assert await other.get("k") == {"v": 1}
+    await other.invalidate("k")
+    assert await other.get("k") is MISSING
+
+
+@pytest.mark.asyncio
+async def test_brick_cache_hits_skip_handler() -> None:
+    brick = _CountingRetrievalBrick(verbose=False)
+    brick.enable_response_cache(max_entries=16, ttl=60)
+    first = await brick.run_unary(RetrievalRequest(query="faq", request_id="1"))
+    second = await brick.run_unary(RetrievalRequest(query="faq", request_id="2"))
+    assert brick.calls == 1
+    assert second.documents[0].title == "faq"
+    # 命中時回傳新的物件，修改不影響快取
+    second.documents[0].title = "changed"
+    third = await brick.run_unary(RetrievalRequest(query="faq"))
+    assert third.documents[0].title == "faq"
+    assert first is not second
+    hits = get_registry().get("llmbrick_response_cache_hits_total")
+    assert hits.get(brick="_CountingRetrievalBrick", tier="memory") >= 2
+
+
+@pytest.mark.asyncio
+async def test_brick_does_not_cache_errors() -> None:
+    brick = _CountingRetrievalBrick(verbose=False)
+    brick.enable_response_cache()
+    await brick.run_unary(RetrievalRequest(query="fail"))
+    await brick.run_unary(RetrievalRequest(query="fail"))
+    assert brick.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_brick_invalidate() -> None:
+    brick = _CountingRetrievalBrick(verbose=False)
+    brick.enable_response_cache()
+    request = RetrievalRequest(query="faq")
+    await brick.run_unary(request)
+    await brick.invalidate_cache(request)
+    await brick.run_unary(request)
+    assert brick.calls == 2
+    await brick.run_unary(RetrievalRequest(query="other"))
+    await brick.invalidate_cache()
+    await brick.run_unary(request)
+    await brick.run_unary(RetrievalRequest(query="other"))
+    assert brick.calls == 5
+    brick.disable_response_cache()
+    await brick.run_unary(request)
+    assert brick.calls == 6
+
+
+@pytest.mark.asyncio
+async def test_cache_key_override_skips_cache() -> None:
+    class _NoCacheForShortQueries(_CountingRetrievalBrick):
+        def cache_key(self, input_data):
+            if len(input_data.query) < 3:
+                return None
+            return super().cache_key(input_data)
+
+    brick = _NoCacheForShortQueries(verbose=False)
+    brick.enable_response_cache()
+    await asyncio.gather(
+        *(brick.run_unary(RetrievalRequest(query="q")) for _ in range(2))
+    )
+    assert brick.calls == 2
@@ -0,0 +1,158 @@
+"""
+BaseBrick.run_batch 的單元測試
+"""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from llmbrick.bricks.guard.base_guard import GuardBrick
+from llmbrick.bricks.intention.base_intention import IntentionBrick
+from llmbrick.core.brick import batch_handler, unary_handler
+from llmbrick.core.exceptions import ValidationException
+from llmbrick.protocols.models.bricks.guard_types import (
+    GuardRequest,
+    GuardResponse,
+    GuardResult,
+)
+from llmbrick.protocols.models.bricks.intention_types import (
+    IntentionRequest,
+    IntentionResponse,
+    IntentionResult,
+)
+
+
+class _UnaryGuardBrick(GuardBrick):
+    def __init__(self, **kwargs):
+        super().__init__(verbose=False, **kwargs)
+        self.active = 0
+        self.peak = 0
+
+    @unary_handler
+    async def check(self, request: GuardRequest) -> GuardResponse:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.active -= 1
+        if request.text == "boom":
+            raise ValueError("boom")
+        return GuardResponse(results=[GuardResult(detail=request.text)])
+
+
+class _BatchIntentionBrick(IntentionBrick):
+    def __init__(self, **kwargs):
+        super().__init__(verbose=False, **kwargs)
+        self.batches: List[int] = []
+
+    # max_wait_ms 很長：run_batch 不應等待 micro-batching
+    @batch_handler(max_batch_size=4, max_wait_ms=10_000)
+    async def classify(
+        self, requests: List[IntentionRequest]
+    ) -> List[IntentionResponse]:
+        self.batches.append(len(requests))
+        return [
+            (
+                ValueError(r.text)
+                if r.text == "bad"
+                else IntentionResponse(
+                    results=[IntentionResult(intent_category=r.text)]
+                )
+            )
+            for r in requests
+        ]
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_parallel_run_unary() -> None:
+    brick = _UnaryGuardBrick()
+    responses = await brick.run_batch([GuardRequest(text=str(i)) for i in range(10)])
+    assert [r.results[0].detail for r in responses] == [str(i) for i in range(10)]
+    assert brick.peak == 10
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_bounds_parallel_calls() -> None:
+    brick = _UnaryGuardBrick()
+    responses = await brick.run_batch(
+        [GuardRequest(text=str(i)) for i in range(10)], max_concurrency=3
+    )
+    assert len(responses) == 10
+    assert brick.peak == 3
+
+
+@pytest.mark.asyncio
+async def test_item_failures() -> None:
+    brick = _UnaryGuardBrick()
+    requests = [GuardRequest(text="a"), GuardRequest(text="boom")]
+    with pytest.raises(ValueError, match="boom"):
+        await brick.run_batch(requests)
+    results = await brick.run_batch(requests, return_exceptions=True)
+    assert results[0].results[0].detail == "a"
+    assert isinstance(results[1], ValueError)
+
+
+@pytest.mark.asyncio
+async def test_empty_batch() -> None:
+    assert await _UnaryGuardBrick().run_batch([]) == []
+
+
+@pytest.mark.asyncio
+async def test_batch_handler_is_called_directly_in_chunks() -> None:
+    brick = _BatchIntentionBrick()
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    responses = await brick.run_batch(
+        [IntentionRequest(text=str(i)) for i in range(10)]
+    )
+    assert loop.time() - start < 1.0
+    assert brick.batches == [4, 4, 2]
+    assert [r.results[0].intent_category for r in responses] == [
+        str(i) for i in range(10)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_handler_item_exception() -> None:
+    brick = _BatchIntentionBrick()
+    results = await brick.run_batch(
+        [IntentionRequest(text="ok"), IntentionRequest(text="bad")],
+        return_exceptions=True,
+    )
+    assert results[0].results[0].intent_category == "ok"
+    assert isinstance(results[1], ValueError)
+
+
+@pytest.mark.asyncio
+async def test_response_cache_uses_run_unary_path() -> None:
+    brick = _BatchIntentionBrick()
+    cache = brick.enable_response_cache()
+    request = IntentionRequest(text="cached")
+    await cache.set(
+        brick.cache_key(request),
+        IntentionResponse(results=[IntentionResult(intent_category="from-cache")]),
+    )
+    responses = await asyncio.wait_for(brick.run_batch([request]), timeout=1.0)
+    assert responses[0].results[0].intent_category == "from-cache"
+    assert brick.batches == []
+
+
+@pytest.mark.asyncio
+async def test_default_concurrency_bound() -> None:
+    brick = _UnaryGuardBrick()
+    brick.batch_concurrency = 4
+    responses = await brick.run_batch([GuardRequest(text=str(i)) for i in range(10)])
+    assert len(responses) == 10
+    assert brick.peak == 4
+
+
+@pytest.mark.asyncio
+async def test_oversized_batch_fails_whole_batch() -> None:
+    brick = _UnaryGuardBrick()
+    brick.max_batch_size = 3
+    with pytest.raises(ValidationException, match="max_batch_size=3"):
+        await brick.run_batch([GuardRequest(text=str(i)) for i in range(4)])
+    assert brick.peak == 0
+    assert len(await brick.run_batch([GuardRequest(text="a")] * 3)) == 3
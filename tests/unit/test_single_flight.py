@@ -0,0 +1,130 @@
+"""
+single-flight (合併相同的進行中 unary 請求) 的單元測試
+"""
+
+import asyncio
+
+import pytest
+
+from llmbrick.bricks.intention.base_intention import IntentionBrick
+from llmbrick.core.brick import unary_handler
+from llmbrick.core.singleflight import SingleFlight
+from llmbrick.protocols.models.bricks.intention_types import (
+    IntentionRequest,
+    IntentionResponse,
+)
+from llmbrick.utils.metrics import MetricsRegistry
+
+
+class _SlowIntentionBrick(IntentionBrick):
+    def __init__(self, delay: float = 0.1, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.calls = 0
+
+    @unary_handler
+    async def check(self, request: IntentionRequest) -> IntentionResponse:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if request.text == "fail":
+            raise RuntimeError("boom")
+        return IntentionResponse()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_execution() -> None:
+    brick = _SlowIntentionBrick(verbose=False)
+    brick.enable_single_flight()
+    results = await asyncio.gather(
+        *(
+            brick.run_unary(IntentionRequest(text="hi", request_id=str(i)))
+            for i in range(10)
+        )
+    )
+    assert brick.calls == 1
+    assert all(r is results[0] for r in results)
+    assert brick.single_flight.in_flight == 0
+    # 結束後不保留結果
+    await brick.run_unary(IntentionRequest(text="hi"))
+    assert brick.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_different_requests_run_separately() -> None:
+    brick = _SlowIntentionBrick(verbose=False)
+    brick.enable_single_flight()
+    await asyncio.gather(
+        brick.run_unary(IntentionRequest(text="a")),
+        brick.run_unary(IntentionRequest(text="b")),
+    )
+    assert brick.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_exception_is_shared() -> None:
+    brick = _SlowIntentionBrick(verbose=False)
+    brick.enable_single_flight()
+    results = await asyncio.gather(
+        *(brick.run_unary(IntentionRequest(text="fail")) for _ in range(3)),
+        return_exceptions=True,
+    )
+    assert brick.calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_bounded_wait_falls_back_to_own_call() -> None:
+    registry = MetricsRegistry()
+    brick = _SlowIntentionBrick(
+        delay=0.3,
+        verbose=False,
+        single_flight=SingleFlight(max_wait=0.05, registry=registry),
+    )
+    await asyncio.gather(
+        brick.run_unary(IntentionRequest(text="hi")),
+        brick.run_unary(IntentionRequest(text="hi")),
+    )
+    assert brick.calls == 2
+    timeouts = registry.get("llmbrick_singleflight_wait_timeouts_total")
+    assert timeouts.get(brick="_SlowIntentionBrick") == 1
+
+
+@pytest.mark.asyncio
+async def test_leader_cancel_does_not_cancel_followers() -> None:
+    brick = _SlowIntentionBrick(verbose=False)
+    brick.enable_single_flight()
+    leader = asyncio.create_task(brick.run_unary(IntentionRequest(text="hi")))
+    await asyncio.sleep(0.01)
+    follower = asyncio.create_task(brick.run_unary(IntentionRequest(text="hi")))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    result = await follower
+    assert isinstance(result, IntentionResponse)
+    assert brick.calls == 2
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.asyncio
+async def test_follower_cancel_does_not_cancel_leader() -> None:
+    brick = _SlowIntentionBrick(verbose=False)
+    brick.enable_single_flight()
+    leader = asyncio.create_task(brick.run_unary(IntentionRequest(text="hi")))
+    await asyncio.sleep(0.01)
+    follower = asyncio.create_task(brick.run_unary(IntentionRequest(text="hi")))
+    await asyncio.sleep(0.01)
+    follower.cancel()
+    assert isinstance(await leader, IntentionResponse)
+    assert brick.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_single_flight_with_cache() -> None:
+    brick = _SlowIntentionBrick(verbose=False)
+    brick.enable_single_flight()
+    brick.enable_response_cache()
+    await asyncio.gather(
+        *(brick.run_unary(IntentionRequest(text="q")) for _ in range(5))
+    )
+    await brick.run_unary(IntentionRequest(text="q"))
+    assert brick.calls == 1
@@ -0,0 +1,103 @@
+"""
+SSE 事件編碼 (framing) 的單元測試
+"""
+
+import json
+from http import HTTPStatus
+
+from fastapi.testclient import TestClient
+
+from llmbrick.protocols.models.http.conversation import (
+    ConversationResponseProgressEnum,
+    ConversationSSEResponse,
+)
+from llmbrick.servers.sse.config import SSEServerConfig
+from llmbrick.servers.sse.framing import check_event, encode_error, encode_message
+from llmbrick.servers.sse.server import SSEServer
+
+
+def _event(**kwargs) -> ConversationSSEResponse:
+    data = dict(
+        id="1", type="text", text="hi", progress=ConversationResponseProgressEnum.DONE
+    )
+    data.update(kwargs)
+    return ConversationSSEResponse(**data)
+
+
+def test_encode_message_matches_model_dump_json() -> None:
+    event = _event()
+    frame = encode_message(event)
+    assert isinstance(frame, bytes)
+    expected = f"event: message\ndata: {event.model_dump_json()}\n\n".encode()
+    assert frame == expected
+
+
+def test_encode_message_exclude_none() -> None:
+    frame = encode_message(_event(), exclude_none=True)
+    payload = json.loads(frame[len(b"event: message\ndata: ") : -2])
+    assert payload == {"id": "1", "type": "text", "text": "hi", "progress": "DONE"}
+
+
+def test_encode_error() -> None:
+    frame = encode_error("Request timeout", "details")
+    assert frame.startswith(b"event: error\ndata: ")
+    assert frame.endswith(b"\n\n")
+    payload = json.loads(frame[len(b"event: error\ndata: ") : -2])
+    assert payload == {"error": "Request timeout", "details": "details"}
+
+
+def test_check_event() -> None:
+    assert check_event(_event()) == (True, "")
+    assert check_event("not an event")[0] is False
+    assert check_event(_event(id=""))[1] == "Event.id is required"
+    event = _event()
+    event.progress = "UNKNOWN"
+    assert check_event(event)[0] is False
+    # 不修改事件本身
+    event = _event()
+    check_event(event)
+    assert event.progress == "DONE"
+
+
+def _post(server: SSEServer) -> str:
+    client = TestClient(server.fastapi_app)
+    resp = client.post(
+        "/chat/completions",
+        json={
+            "model": "gpt-4o",
+            "messages": [{"role": "user", "content": "Hello"}],
+            "stream": True,
+            "sessionId": "s1",
+        },
+        headers={"accept": "text/event-stream"},
+    )
+    assert resp.status_code == HTTPStatus.OK
+    return resp.content.decode()
+
+
+def test_server_exclude_none_fields() -> None:
+    server = SSEServer(config=SSEServerConfig(exclude_none_fields=True))
+
+    @server.handler
+    async def handler(data):
+        yield _event()
+
+    content = _post(server)
+    assert '"text":"hi"' in content
+    assert "null" not in content
+
+
+def test_server_validation_can_be_disabled() -> None:
+    def make(validate_events: bool) -> SSEServer:
+        server = SSEServer(config=SSEServerConfig(validate_events=validate_events))
+
+        @server.handler
+        async def handler(data):
+            yield _event(id="")
+
+        return server
+
+    assert "Server returned invalid event" in _post(make(True))
+    content = _post(make(False))
+    assert "event: message" in content
+    assert "invalid event" not in content
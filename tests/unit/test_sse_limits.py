@@ -0,0 +1,120 @@
+"""
+SSE 串流並發限制 (StreamTracker) 的單元測試
+"""
+
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+
+from llmbrick.protocols.models.http.conversation import (
+    ConversationResponseProgressEnum,
+    ConversationSSEResponse,
+)
+from llmbrick.servers.sse.config import SSEServerConfig
+from llmbrick.servers.sse.limits import (
+    REJECT_CLIENT,
+    REJECT_SERVER,
+    REJECT_SESSION,
+    StreamLimitExceeded,
+    StreamTracker,
+)
+from llmbrick.servers.sse.server import SSEServer
+from llmbrick.utils.metrics import MetricsRegistry
+
+
+def test_server_limit() -> None:
+    registry = MetricsRegistry()
+    tracker = StreamTracker(max_streams=2, registry=registry)
+    a = tracker.acquire("c1", "s1")
+    tracker.acquire("c2", "s2")
+    with pytest.raises(StreamLimitExceeded) as exc_info:
+        tracker.acquire("c3", "s3")
+    assert exc_info.value.reason == REJECT_SERVER
+    a.release()
+    tracker.acquire("c3", "s3")
+    assert tracker.active == 2
+    assert registry.get("llmbrick_sse_active_streams").get() == 2
+    assert registry.get("llmbrick_sse_streams_total").get() == 3
+    assert registry.get("llmbrick_sse_streams_rejected_total").get(reason="server") == 1
+
+
+def test_client_and_session_limits() -> None:
+    tracker = StreamTracker(
+        max_per_client=2, max_per_session=1, registry=MetricsRegistry()
+    )
+    tracker.acquire("c1", "s1")
+    with pytest.raises(StreamLimitExceeded) as exc_info:
+        tracker.acquire("c2", "s1")
+    assert exc_info.value.reason == REJECT_SESSION
+    tracker.acquire("c1", "s2")
+    with pytest.raises(StreamLimitExceeded) as exc_info:
+        tracker.acquire("c1", "s3")
+    assert exc_info.value.reason == REJECT_CLIENT
+    # 空字串不套用對應的限制
+    tracker.acquire("", "")
+    tracker.acquire("", "")
+    assert tracker.active == 4
+
+
+def test_release_is_idempotent() -> None:
+    registry = MetricsRegistry()
+    tracker = StreamTracker(max_per_client=1, registry=registry)
+    lease = tracker.acquire("c1", "s1")
+    lease.release()
+    lease.release()
+    assert tracker.active == 0
+    assert tracker.client_streams("c1") == 0
+    assert tracker.session_streams("s1") == 0
+    assert registry.get("llmbrick_sse_active_streams").get() == 0
+    assert registry.get("llmbrick_sse_stream_duration_seconds").get_count() == 1
+
+
+def _server(**config) -> SSEServer:
+    server = SSEServer(config=SSEServerConfig(**config))
+
+    @server.handler
+    async def handler(data):
+        yield ConversationSSEResponse(
+            id="test-1",
+            type="done",
+            progress=ConversationResponseProgressEnum.DONE,
+        )
+
+    return server
+
+
+def _post(client: TestClient, session_id: str = "s1", client_id: str = "c1"):
+    return client.post(
+        "/chat/completions",
+        json={
+            "model": "gpt-4o",
+            "messages": [{"role": "user", "content": "Hello"}],
+            "stream": True,
+            "sessionId": session_id,
+            "clientId": client_id,
+        },
+        headers={"accept": "text/event-stream"},
+    )
+
+
+def test_sse_rejects_with_retry_after() -> None:
+    server = _server(max_concurrent_connections=1, stream_retry_after=7)
+    client = TestClient(server.fastapi_app)
+    lease = server.stream_tracker.acquire("other", "other")
+    resp = _post(client)
+    assert resp.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert resp.headers["retry-after"] == "7"
+    lease.release()
+    resp = _post(client)
+    assert resp.status_code == HTTPStatus.OK
+    assert server.stream_tracker.active == 0
+
+
+def test_sse_session_limit() -> None:
+    server = _server(max_streams_per_session=1)
+    client = TestClient(server.fastapi_app)
+    lease = server.stream_tracker.acquire("c9", "s1")
+    assert _post(client, session_id="s1").status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert _post(client, session_id="s2").status_code == HTTPStatus.OK
+    lease.release()
@@ -198,4 +198,116 @@ def test_custom_validator():
     )
     assert resp.status_code == HTTPStatus.OK
     content = resp.content.decode()
-    assert "Temperature too high" in content
\ No newline at end of file
+    assert "Temperature too high" in content
+
+def test_metrics_endpoint_disabled_by_default(sse_server):
+    client = TestClient(sse_server.fastapi_app)
+    assert client.get("/metrics").status_code == HTTPStatus.NOT_FOUND
+
+
+def test_metrics_endpoint_exposes_registry():
+    from llmbrick.servers.sse.config import SSEServerConfig
+    from llmbrick.utils.metrics import get_registry
+
+    get_registry().counter("llmbrick_test_sse_metric_total", "test counter").inc()
+    server = SSEServer(config=SSEServerConfig(enable_metrics=True))
+    client = TestClient(server.fastapi_app)
+    resp = client.get("/metrics")
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert "llmbrick_test_sse_metric_total 1" in resp.text
+
+
+def _slow_server(config=None):
+    import asyncio
+
+    server = SSEServer(config=config)
+    state = {"closed": False}
+
+    @server.handler
+    async def handler(data):
+        try:
+            yield ConversationSSEResponse(
+                id="test-1",
+                type="text",
+                text="first",
+                progress=ConversationResponseProgressEnum.IN_PROGRESS
+            )
+            await asyncio.sleep(5)
+            yield ConversationSSEResponse(
+                id="test-2",
+                type="done",
+                progress=ConversationResponseProgressEnum.DONE
+            )
+        finally:
+            state["closed"] = True
+
+    return server, state
+
+
+def test_request_timeout_header(valid_request):
+    server, state = _slow_server()
+    client = TestClient(server.fastapi_app)
+    resp = client.post(
+        "/chat/completions",
+        json=valid_request,
+        headers={"accept": "text/event-stream", "x-request-timeout": "0.2"},
+    )
+    assert resp.status_code == HTTPStatus.OK
+    content = resp.content.decode()
+    assert "first" in content
+    assert "Request timeout" in content
+    assert state["closed"] is True
+
+
+def test_request_timeout_from_config(valid_request):
+    from llmbrick.servers.sse.config import SSEServerConfig
+
+    server, state = _slow_server(SSEServerConfig(request_timeout=1))
+    client = TestClient(server.fastapi_app)
+    # header 只能縮短 config 的逾時
+    resp = client.post(
+        "/chat/completions",
+        json=valid_request,
+        headers={"accept": "text/event-stream", "x-request-timeout": "60"},
+    )
+    assert "Request timeout" in resp.content.decode()
+    assert state["closed"] is True
+
+
+def test_no_deadline_by_default(valid_request):
+    from llmbrick.core.context import time_remaining
+
+    server = SSEServer()
+    remaining = []
+
+    @server.handler
+    async def handler(data):
+        remaining.append(time_remaining())
+        yield ConversationSSEResponse(
+            id="test-1",
+            type="done",
+            progress=ConversationResponseProgressEnum.DONE
+        )
+
+    client = TestClient(server.fastapi_app)
+    headers = {"accept": "text/event-stream"}
+    # 未設定 request_timeout 時只有 X-Request-Timeout header 會設定 deadline
+    client.post("/chat/completions", json=valid_request, headers=headers)
+    client.post(
+        "/chat/completions",
+        json=valid_request,
+        headers={**headers, "x-request-timeout": "10"},
+    )
+    assert remaining[0] is None
+    assert remaining[1] is not None and remaining[1] <= 10
+
+
+def test_invalid_request_timeout_header(sse_server, valid_request):
+    client = TestClient(sse_server.fastapi_app)
+    resp = client.post(
+        "/chat/completions",
+        json=valid_request,
+        headers={"accept": "text/event-stream", "x-request-timeout": "abc"},
+    )
+    assert resp.status_code == HTTPStatus.BAD_REQUEST
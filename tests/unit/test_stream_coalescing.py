@@ -0,0 +1,184 @@
+import asyncio
+
+import pytest
+
+from llmbrick.bricks.llm.base_llm import LLMBrick
+from llmbrick.core.brick import BaseBrick, output_streaming_handler
+from llmbrick.core.coalesce import (
+    StreamCoalescing,
+    coalesce_stream,
+    merge_text_chunks,
+    text_chunk_size,
+)
+from llmbrick.core.error_codes import ErrorCodes
+from llmbrick.protocols.models.bricks.common_types import ErrorDetail
+from llmbrick.protocols.models.bricks.llm_types import LLMRequest, LLMResponse
+
+
+async def _timed(items):
+    """items 為 (延遲秒數, chunk) 的列表"""
+    for delay, item in items:
+        if delay:
+            await asyncio.sleep(delay)
+        yield item
+
+
+def _chunk(text, is_final=False, error=None):
+    return LLMResponse(text=text, tokens=[text], is_final=is_final, error=error)
+
+
+async def _collect(stream):
+    return [item async for item in stream]
+
+
+@pytest.mark.asyncio
+async def test_first_chunk_sent_immediately_rest_merged():
+    items = [
+        (0, _chunk("a")),
+        (0, _chunk("b")),
+        (0, _chunk("c")),
+        (0, _chunk("", True)),
+    ]
+    out = await _collect(
+        coalesce_stream(_timed(items), merge_text_chunks, text_chunk_size, 50, 4096)
+    )
+    # 空的最終 chunk 併入前一個 chunk，is_final 取自較新的 chunk
+    assert [c.text for c in out] == ["a", "bc"]
+    assert out[1].tokens == ["b", "c", ""]
+    assert out[-1].is_final
+
+
+@pytest.mark.asyncio
+async def test_first_chunk_not_delayed_by_slow_upstream():
+    async def slow():
+        yield _chunk("first")
+        await asyncio.sleep(0.5)
+        yield _chunk("second")
+
+    loop = asyncio.get_running_loop()
+    stream = coalesce_stream(slow(), merge_text_chunks, text_chunk_size, 20, 4096)
+    start = loop.time()
+    first = await stream.__anext__()
+    assert first.text == "first"
+    assert loop.time() - start < 0.1
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_max_delay_flushes_without_waiting_for_upstream():
+    received = []
+
+    async def upstream():
+        yield _chunk("0")
+        yield _chunk("1")
+        await asyncio.sleep(0.3)
+        yield _chunk("2", True)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    async for chunk in coalesce_stream(
+        upstream(), merge_text_chunks, text_chunk_size, 20, 4096
+    ):
+        received.append((chunk.text, loop.time() - start))
+    assert [text for text, _ in received] == ["0", "1", "2"]
+    # "1" 在 max_delay 到期時送出，而不是等到上游的下一個 chunk
+    assert received[1][1] < 0.2
+
+
+@pytest.mark.asyncio
+async def test_max_bytes_flushes():
+    items = [(0, _chunk("x" * 4)) for _ in range(7)]
+    out = await _collect(
+        coalesce_stream(_timed(items), merge_text_chunks, text_chunk_size, 1000, 8)
+    )
+    assert [c.text for c in out] == ["xxxx", "x" * 8, "x" * 8, "x" * 8]
+
+
+@pytest.mark.asyncio
+async def test_error_chunk_not_merged():
+    error = ErrorDetail(code=ErrorCodes.INTERNAL_ERROR, message="boom")
+    items = [(0, _chunk("a")), (0, _chunk("b")), (0, _chunk("", True, error))]
+    out = await _collect(
+        coalesce_stream(_timed(items), merge_text_chunks, text_chunk_size, 50, 4096)
+    )
+    assert [c.text for c in out] == ["a", "b", ""]
+    assert out[-1].error.code == ErrorCodes.INTERNAL_ERROR
+
+
+@pytest.mark.asyncio
+async def test_upstream_exception_flushes_pending_first():
+    async def upstream():
+        yield _chunk("a")
+        yield _chunk("b")
+        raise RuntimeError("boom")
+
+    out = []
+    with pytest.raises(RuntimeError):
+        async for chunk in coalesce_stream(
+            upstream(), merge_text_chunks, text_chunk_size, 50, 4096
+        ):
+            out.append(chunk.text)
+    assert out == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_consumer_close_closes_upstream():
+    closed = asyncio.Event()
+
+    async def upstream():
+        try:
+            yield _chunk("a")
+            yield _chunk("b")
+            await asyncio.sleep(10)
+            yield _chunk("c")
+        finally:
+            closed.set()
+
+    stream = coalesce_stream(upstream(), merge_text_chunks, text_chunk_size, 10, 4096)
+    assert (await stream.__anext__()).text == "a"
+    assert (await stream.__anext__()).text == "b"
+    await stream.aclose()
+    assert closed.is_set()
+
+
+def test_invalid_config():
+    with pytest.raises(ValueError):
+        StreamCoalescing(max_bytes=0)
+    with pytest.raises(ValueError):
+        StreamCoalescing(max_delay_ms=-1)
+
+
+class _TokenBrick(LLMBrick):
+    @output_streaming_handler
+    async def stream(self, request: LLMRequest):
+        for text in ("Hel", "lo", " wor", "ld"):
+            yield LLMResponse(text=text, tokens=[text])
+        yield LLMResponse(is_final=True)
+
+
+@pytest.mark.asyncio
+async def test_llm_brick_coalescing_opt_in():
+    brick = _TokenBrick(default_prompt="")
+    out = await _collect(brick.run_output_streaming(LLMRequest()))
+    assert len(out) == 5
+
+    brick.enable_stream_coalescing(max_delay_ms=50)
+    out = await _collect(brick.run_output_streaming(LLMRequest()))
+    assert [c.text for c in out] == ["Hel", "lo world"]
+    assert out[-1].is_final
+    assert "".join(c.text for c in out) == "Hello world"
+
+    brick.disable_stream_coalescing()
+    assert len(await _collect(brick.run_output_streaming(LLMRequest()))) == 5
+
+
+@pytest.mark.asyncio
+async def test_base_brick_does_not_merge_by_default():
+    class Plain(BaseBrick):
+        @output_streaming_handler
+        async def stream(self, request):
+            for i in range(3):
+                yield i
+
+    brick = Plain(verbose=False, stream_coalescing=StreamCoalescing())
+    assert await _collect(brick.run_output_streaming(None)) == [0, 1, 2]
@@ -0,0 +1,79 @@
+"""
+Struct <-> dict 快速轉換測試：結果需與 MessageToDict / Struct.update 一致
+"""
+
+import pytest
+from google.protobuf import struct_pb2
+from google.protobuf.json_format import MessageToDict
+
+from llmbrick.protocols.grpc.common import common_pb2
+from llmbrick.protocols.models.bricks.common_types import CommonRequest
+from llmbrick.protocols.models.struct_utils import (
+    LazyStructView,
+    dict_to_struct,
+    struct_to_dict,
+)
+
+PAYLOAD = {
+    "text": "你好",
+    "count": 3,
+    "ratio": 0.5,
+    "flag": True,
+    "empty": None,
+    "nested": {"a": [1, "b", {"c": False}], "d": {}},
+    "items": [],
+}
+
+
+def _reference_struct(data):
+    struct = struct_pb2.Struct()
+    struct.update(data)
+    return struct
+
+
+def test_dict_to_struct_matches_update() -> None:
+    assert dict_to_struct(PAYLOAD) == _reference_struct(PAYLOAD)
+    assert dict_to_struct(None) == struct_pb2.Struct()
+
+
+def test_dict_to_struct_replaces_existing_keys() -> None:
+    struct = _reference_struct({"nested": {"old": 1}, "keep": "x"})
+    dict_to_struct({"nested": {"new": 2}}, struct)
+    assert struct_to_dict(struct) == {"nested": {"new": 2.0}, "keep": "x"}
+
+
+def test_dict_to_struct_rejects_unknown_types() -> None:
+    with pytest.raises(ValueError):
+        dict_to_struct({"bad": object()})
+
+
+def test_struct_to_dict_matches_message_to_dict() -> None:
+    struct = _reference_struct(PAYLOAD)
+    result = struct_to_dict(struct)
+    assert result == MessageToDict(struct)
+    # 與 MessageToDict 相同，數值一律為 float
+    assert isinstance(result["count"], float)
+
+
+def test_lazy_view_decodes_on_access() -> None:
+    struct = _reference_struct(PAYLOAD)
+    view = LazyStructView(struct)
+    assert len(view) == len(PAYLOAD)
+    assert "nested" in view and "missing" not in view
+    assert isinstance(view["nested"], LazyStructView)
+    assert view["nested"]["a"][2]["c"] is False
+    assert view.get("missing") is None
+    assert view == MessageToDict(struct)
+    assert view.to_dict() == MessageToDict(struct)
+    # 直接以底層訊息複製，不需重新編碼
+    assert dict_to_struct(view) == struct
+    assert dict_to_struct({"wrapped": view})["wrapped"] == struct
+
+
+def test_common_request_lazy_option() -> None:
+    model = common_pb2.CommonRequest(data=_reference_struct(PAYLOAD))
+    eager = CommonRequest.from_pb2_model(model)
+    lazy = CommonRequest.from_pb2_model(model, lazy=True)
+    assert isinstance(eager.data, dict)
+    assert isinstance(lazy.data, LazyStructView)
+    assert lazy.data == eager.data